@@ -27,6 +27,14 @@ from app.api.ai_endpoints import router as ai_router
 from app.api.luna_conversation_endpoints import router as luna_conversation_router
 from app.api.narrative_endpoints import router as narrative_router  # 🧠 NEW: Narrative Intelligence
 from app.core.logging_config import logger
+from app.core.adaptive_limiter import OverloadedError
+from app.core.pool_latency_sync import pool_latency_sync
+from app.core.llm_http_client import llm_http_client
+from app.core.llm_scheduler import llm_scheduler
+from app.core.prompt_registry import prompt_registry
+from app.core.request_deadline import (
+    DEADLINE_HEADER, DeadlineExceededError, budget_from_header, reset_deadline, set_deadline
+)
 
 # Lifespan management for FastAPI
 @asynccontextmanager
@@ -34,7 +42,14 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🔐 Phoenix Backend Unified - Luna Hub starting...")
     logger.info("✅ Enterprise Authentication System loaded")
+    prompt_registry.load()  # prompts invalides → échec au démarrage, pas en requête
+    await pool_latency_sync.start()
+    await llm_http_client.start()
+    await llm_scheduler.start()
     yield
+    await llm_scheduler.stop()
+    await llm_http_client.stop()
+    await pool_latency_sync.stop()
     # Shutdown (if needed)
     logger.info("🔐 Phoenix Backend Unified - Luna Hub shutting down...")
 
@@ -147,6 +162,16 @@ async def security_headers_middleware(request: Request, call_next):
         
     return response
 
+# ⏱️ Request deadline - propagated to Supabase, Redis, Gemini and Stripe calls
+@app.middleware("http")
+async def request_deadline_middleware(request: Request, call_next):
+    """Per-request deadline from X-Request-Timeout-Ms (or the default budget)"""
+    token = set_deadline(budget_from_header(request.headers.get(DEADLINE_HEADER)))
+    try:
+        return await call_next(request)
+    finally:
+        reset_deadline(token)
+
 # Trusted hosts middleware - Production lockdown  
 # Temporarily disabled due to Railway health check issues
 # TODO: Re-enable with proper Railway internal IPs whitelist
@@ -195,6 +220,25 @@ app.include_router(ai_router)
 app.include_router(luna_conversation_router)  # 🌙 Luna Distributed Architecture
 app.include_router(narrative_router, prefix="/luna")  # 🧠 Narrative Intelligence System
 
+# Dependency saturated (database pool, adaptive limits): fail fast instead of piling up requests
+@app.exception_handler(OverloadedError)
+async def overloaded_handler(request, exc: OverloadedError):
+    logger.warning(f"Request shed, dependency overloaded: {str(exc)}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Service temporarily overloaded, please retry"},
+        headers={"Retry-After": str(max(1, int(exc.retry_after)))}
+    )
+
+# Request deadline exceeded: the client has already given up, stop working for it
+@app.exception_handler(DeadlineExceededError)
+async def deadline_exceeded_handler(request, exc: DeadlineExceededError):
+    logger.warning(f"Request abandoned, deadline exceeded: {str(exc)}")
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "Request deadline exceeded"}
+    )
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -11,12 +11,23 @@ from pydantic import BaseModel, Field
 
 # Luna Hub imports
 from ..core.security_guardian import ensure_request_is_clean
+from ..core.adaptive_limiter import OverloadedError
+from ..core.request_deadline import DeadlineExceededError
 from ..core.rate_limiter import rate_limiter, RateLimitScope, RateLimitResult
 from ..api.auth_endpoints import get_current_user_dependency
 from ..core.events import create_event
 from ..core.logging_config import logger
-from ..core.llm_gateway import GeminiProvider
+from ..core.llm_gateway import LLMProviderError
+from ..core.llm_router import llm_router
+from ..core.llm_scheduler import LLMPriority, llm_caller_scope
+from ..core.llm_metering import llm_meter
 from ..core.energy_manager import EnergyManager
+from ..core.sse_stream import sse_response, stream_llm_events
+from ..core.prompt_registry import prompt_registry
+from ..core.ai_pipeline import admit_and_fetch
+from ..core.context_budget import (
+    ContextBudget, PRIORITY_EXTRA, PRIORITY_NARRATIVE, PRIORITY_PRIMARY, PRIORITY_RECENT_TURNS
+)
 from ..api.capital_narratif_endpoints import get_narrative_context
 
 router = APIRouter(prefix="/ai", tags=["AI Services"])
@@ -35,10 +46,167 @@ class AIChatResponse(BaseModel):
     energy_consumed: int
     session_info: Optional[Dict[str, Any]] = None
 
-# Initialize AI providers
-gemini_provider = GeminiProvider()
 energy_manager = EnergyManager()
 
+async def _check_rate_limit(user_id: str, http_request: Request, context: Dict[str, Any], detail: str) -> None:
+    rate_result, rate_data = await rate_limiter.check_rate_limit(
+        identifier=user_id,
+        scope=RateLimitScope.API_GENERAL,
+        user_agent=http_request.headers.get("user-agent", ""),
+        additional_context=context
+    )
+    if rate_result != RateLimitResult.ALLOWED:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=detail)
+
+async def _check_energy(user_id: str, action: str, energy_cost: int, detail: str) -> None:
+    if not await energy_manager.can_perform_action(user_id, action, energy_cost):
+        raise HTTPException(status_code=status.HTTP_402_PAYMENT_REQUIRED, detail=detail)
+
+async def _fetch_narrative_context(user_id: str) -> Dict[str, Any]:
+    """Contexte narratif facultatif : vide si indisponible, la génération continue"""
+    try:
+        return await get_narrative_context(user_id)
+    except Exception as e:
+        logger.warning(f"Failed to get narrative context", user_id=user_id, error=str(e))
+        return {}
+
+async def _prepare_aube_chat(request: AubeChatRequest, http_request: Request, user_id: str) -> Dict[str, Any]:
+    """
+    Étapes communes /aube/chat et /aube/chat/stream avant génération :
+    rate limiting, contrôle énergie, contexte narratif, prompts
+    """
+    # 1-3. Rate limiting, energy check and narrative context fetched concurrently
+    # (a rejection cancels the rest)
+    client_ip = http_request.client.host if http_request.client else "unknown"
+    energy_cost = 2  # Aube chat interaction cost
+    fetched = await admit_and_fetch(
+        checks=[
+            _check_rate_limit(user_id, http_request, {"endpoint": "ai_aube_chat", "persona": request.persona},
+                              "Rate limit exceeded for AI chat"),
+            _check_energy(user_id, "AUBE_CHAT_INTERACTION", energy_cost, "Insufficient Luna energy for AI interaction")
+        ],
+        fetches={"narrative_context": _fetch_narrative_context(user_id)}
+    )
+    narrative_context = fetched["narrative_context"]
+    history = narrative_context.get("recent_events", [])
+
+    # 4. Enhanced narrative context analysis
+    user_profile = narrative_context.get("user_profile", {})
+    career_stage = user_profile.get("career_stage", "unknown")
+    interests = user_profile.get("interests", [])
+    previous_assessments = narrative_context.get("aube_assessments", [])
+    recent_interactions = history[-10:] if history else []
+    
+    # Advanced context building
+    context_summary = {
+        "conversation_depth": len(recent_interactions),
+        "assessment_progress": len(previous_assessments),
+        "career_indicators": {
+            "stage": career_stage,
+            "interests": interests[:5],  # Top 5 interests
+            "persona_alignment": request.persona
+        }
+    }
+    
+    # 5. Build sophisticated multi-layered prompt
+    system_prompt = prompt_registry.render(
+        "aube_chat_system",
+        persona=request.persona,
+        career_stage=career_stage,
+        interests=', '.join(interests[:3]) if interests else 'À découvrir',
+        assessments_count=len(previous_assessments),
+        interactions_count=len(recent_interactions)
+    )
+    
+    user_context = {
+        "conversation_history": recent_interactions,
+        "persona": request.persona,
+        "career_context": context_summary,
+        "additional_context": request.context
+    }
+    
+    # Pack history and extra context into the token budget (newest turns first)
+    budget = ContextBudget("aube_chat")
+    budget.add("system", system_prompt, required=True)
+    budget.add("user_template", prompt_registry.get("aube_chat_user").source, required=True)
+    budget.add("message", request.message, required=True)
+    budget.add_items("history", [
+        f'- {event.get("content")}' for event in recent_interactions if event.get("content")
+    ], PRIORITY_RECENT_TURNS)
+    budget.add("additional_context", str(request.context) if request.context else "", PRIORITY_EXTRA,
+               truncatable=True, fallback="Aucun")
+    packed = budget.pack()
+    
+    history_text = packed.text("history")
+    conversation_context = f"\nHISTORIQUE RÉCENT:\n{history_text}\n" if history_text else ""
+    
+    user_prompt = prompt_registry.render(
+        "aube_chat_user",
+        message=request.message,
+        conversation_context=conversation_context,
+        additional_context=packed.text("additional_context")
+    )
+
+    return {
+        "system": system_prompt,
+        "user": user_prompt,
+        "context": user_context,
+        "energy_cost": energy_cost,
+        "client_ip": client_ip
+    }
+
+
+async def _record_aube_interaction(
+    request: AubeChatRequest,
+    http_request: Request,
+    user_id: str,
+    prepared: Dict[str, Any],
+    luna_response_text: str
+) -> int:
+    """Consommation d'énergie + event store, une fois la réponse complète"""
+    # 6. Consume energy
+    energy_consumed = await energy_manager.consume_energy(
+        user_id, 
+        "AUBE_CHAT_INTERACTION", 
+        prepared["energy_cost"]
+    )
+    # Tokens consommés ↔ énergie facturée (même fonctionnalité, même persona)
+    llm_meter.record_energy(user_id, "aube_chat", energy_consumed, persona=request.persona)
+
+    # 7. Track interaction in event store
+    await create_event({
+        "type": "ai_aube_chat_interaction",
+        "actor_user_id": user_id,
+        "payload": {
+            "app": "aube",
+            "user_message": request.message,
+            "luna_response": luna_response_text,
+            "persona": request.persona,
+            "energy_consumed": energy_consumed,
+            "ip": prepared["client_ip"],
+            "user_agent": http_request.headers.get("user-agent", "")
+        }
+    })
+
+    logger.info(f"Aube AI chat interaction completed",
+               user_id=user_id,
+               persona=request.persona,
+               energy_consumed=energy_consumed)
+    return energy_consumed
+
+
+async def _complete_or_503(*, system: str, user: str, context: Dict[str, Any]) -> str:
+    """LLM completion; every provider failed → 503 + Retry-After (no energy consumed, the client may retry)"""
+    try:
+        return await llm_router.complete(system=system, user=user, context=context)
+    except LLMProviderError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.message,
+            headers={"Retry-After": str(max(1, int(e.retry_after or 1)))}
+        )
+
+
 @router.post("/aube/chat", response_model=AIChatResponse)
 async def aube_chat_interaction(
     request: AubeChatRequest,
@@ -54,151 +222,20 @@ async def aube_chat_interaction(
     """
     try:
         user_id = current_user["id"]
-        
-        # 1. Rate limiting
-        client_ip = http_request.client.host if http_request.client else "unknown"
-        rate_result, rate_data = await rate_limiter.check_rate_limit(
-            identifier=user_id,
-            scope=RateLimitScope.API_GENERAL,
-            user_agent=http_request.headers.get("user-agent", ""),
-            additional_context={"endpoint": "ai_aube_chat", "persona": request.persona}
-        )
-        
-        if rate_result != RateLimitResult.ALLOWED:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded for AI chat"
-            )
-
-        # 2. Check energy availability
-        energy_cost = 2  # Aube chat interaction cost
-        if not await energy_manager.can_perform_action(user_id, "AUBE_CHAT_INTERACTION", energy_cost):
-            raise HTTPException(
-                status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                detail="Insufficient Luna energy for AI interaction"
+        prepared = await _prepare_aube_chat(request, http_request, user_id)
+
+        # 5. Generate AI response (chat: interactive scheduling class)
+        with llm_caller_scope(user_id, LLMPriority.INTERACTIVE, "aube_chat", persona=request.persona):
+            luna_response_text = await _complete_or_503(
+                system=prepared["system"],
+                user=prepared["user"],
+                context=prepared["context"]
             )
 
-        # 3. Get user's narrative context
-        try:
-            narrative_context = await get_narrative_context(user_id)
-            history = narrative_context.get("recent_events", [])
-        except Exception as e:
-            logger.warning(f"Failed to get narrative context", user_id=user_id, error=str(e))
-            history = []
-
-        # 4. Enhanced narrative context analysis
-        user_profile = narrative_context.get("user_profile", {})
-        career_stage = user_profile.get("career_stage", "unknown")
-        interests = user_profile.get("interests", [])
-        previous_assessments = narrative_context.get("aube_assessments", [])
-        recent_interactions = history[-10:] if history else []
-        
-        # Advanced context building
-        context_summary = {
-            "conversation_depth": len(recent_interactions),
-            "assessment_progress": len(previous_assessments),
-            "career_indicators": {
-                "stage": career_stage,
-                "interests": interests[:5],  # Top 5 interests
-                "persona_alignment": request.persona
-            }
-        }
-        
-        # 5. Build sophisticated multi-layered prompt
-        system_prompt = f"""Tu es Luna, une IA spécialisée en accompagnement de carrière et développement professionnel.
-
-        PERSONNALITÉ DE LUNA:
-        - Empathique et bienveillante
-        - Experte en psychologie du travail
-        - Pose des questions perspicaces et progressives
-        - Aide à découvrir les talents cachés
-        - Évite les conseils génériques
-        
-        CONTEXTE UTILISATEUR ACTUEL:
-        - Persona: {request.persona}
-        - Étape carrière: {career_stage}
-        - Centres d'intérêt: {', '.join(interests[:3]) if interests else 'À découvrir'}
-        - Nombre d'évaluations précédentes: {len(previous_assessments)}
-        - Profondeur de conversation: {len(recent_interactions)} interactions
-        
-        MISSION AUBE:
-        1. Guide l'utilisateur dans une auto-découverte progressive
-        2. Identifie ses valeurs, motivations et aspirations profondes
-        3. Révèle des pistes de carrière qu'il n'avait pas envisagées
-        4. Adapte le questionnement selon son niveau de maturité professionnelle
-        5. Crée un lien émotionnel et de confiance
-        
-        APPROCHE PERSONNALISÉE selon persona {request.persona}:
-        - jeune_diplome: Focus découverte, ouverture d'esprit, gestion de l'incertitude
-        - reconversion: Focus sur transfert de compétences, nouvelle identité professionnelle
-        - evolution: Focus sur l'épanouissement, leadership, impact
-        
-        STYLE DE RÉPONSE:
-        - Maximum 2-3 phrases
-        - Une question ouverte qui fait réfléchir
-        - Ton chaleureux mais professionnel
-        - Référence subtile aux éléments de contexte si pertinent"""
-        
-        user_context = {
-            "conversation_history": recent_interactions,
-            "persona": request.persona,
-            "career_context": context_summary,
-            "additional_context": request.context
-        }
-        
-        conversation_context = ""
-        if recent_interactions:
-            newline = chr(10)
-            interaction_list = [f'- {event.get("content", "")}' for event in recent_interactions[-3:]]
-            conversation_context = f"\nHISTORIQUE RÉCENT:\n{newline.join(interaction_list)}\n"
-        
-        user_prompt = f"""MESSAGE UTILISATEUR: "{request.message}"
-        {conversation_context}
-        CONTEXTE SUPPLÉMENTAIRE: {request.context if request.context else "Aucun"}
-        
-        Instructions spéciales:
-        1. Analyse le message dans le contexte de la conversation
-        2. Identifie les indices sur ses motivations/préoccupations
-        3. Pose UNE question pertinente qui approfondit sa réflexion
-        4. Évite de répéter des questions déjà posées
-        5. Si c'est le début, accueille-le chaleureusement
-        
-        Réponds directement en tant que Luna, sans préambule."""
-
-        # 5. Generate AI response
-        luna_response_text = gemini_provider.generate(
-            system=system_prompt,
-            user=user_prompt,
-            context=user_context
+        energy_consumed = await _record_aube_interaction(
+            request, http_request, user_id, prepared, luna_response_text
         )
 
-        # 6. Consume energy
-        energy_consumed = await energy_manager.consume_energy(
-            user_id, 
-            "AUBE_CHAT_INTERACTION", 
-            energy_cost
-        )
-
-        # 7. Track interaction in event store
-        await create_event({
-            "type": "ai_aube_chat_interaction",
-            "actor_user_id": user_id,
-            "payload": {
-                "app": "aube",
-                "user_message": request.message,
-                "luna_response": luna_response_text,
-                "persona": request.persona,
-                "energy_consumed": energy_consumed,
-                "ip": client_ip,
-                "user_agent": http_request.headers.get("user-agent", "")
-            }
-        })
-
-        logger.info(f"Aube AI chat interaction completed",
-                   user_id=user_id,
-                   persona=request.persona,
-                   energy_consumed=energy_consumed)
-
         return AIChatResponse(
             user_id=user_id,
             user_message=request.message,
@@ -210,8 +247,8 @@ async def aube_chat_interaction(
             }
         )
 
-    except HTTPException as e:
-        raise e
+    except (HTTPException, OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         logger.error(f"Aube AI chat error",
                     user_id=current_user.get("id", "unknown"),
@@ -221,6 +258,54 @@ async def aube_chat_interaction(
             detail="Failed to process AI chat interaction"
         )
 
+
+@router.post("/aube/chat/stream")
+async def aube_chat_interaction_stream(
+    request: AubeChatRequest,
+    http_request: Request,
+    current_user: dict = Depends(get_current_user_dependency()),
+    _: None = Depends(ensure_request_is_clean)
+):
+    """
+    📡 Luna AI Chat for Phoenix Aube - streaming (text/event-stream)
+    
+    Rate limit + contrôle énergie avant le premier octet (429/402 classiques) ;
+    l'énergie n'est consommée qu'une fois la réponse complète générée.
+    """
+    user_id = current_user["id"]
+    try:
+        prepared = await _prepare_aube_chat(request, http_request, user_id)
+    except (HTTPException, OverloadedError, DeadlineExceededError):
+        raise
+    except Exception as e:
+        logger.error(f"Aube AI chat stream setup error", user_id=user_id, error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to process AI chat interaction"
+        )
+
+    async def on_complete(luna_response_text: str) -> Dict[str, Any]:
+        energy_consumed = await _record_aube_interaction(
+            request, http_request, user_id, prepared, luna_response_text
+        )
+        return {
+            "user_id": user_id,
+            "energy_consumed": energy_consumed,
+            "session_info": {
+                "persona": request.persona,
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            }
+        }
+
+    with llm_caller_scope(user_id, LLMPriority.INTERACTIVE, "aube_chat", persona=request.persona):
+        chunks = llm_router.generate_stream(
+            system=prepared["system"],
+            user=prepared["user"],
+            context=prepared["context"]
+        )
+    return sse_response(stream_llm_events(chunks, on_complete, context={"user_id": user_id, "endpoint": "ai_aube_chat_stream"}))
+
+
 class CVAnalysisRequest(BaseModel):
     """CV Analysis request"""
     cv_content: str = Field(..., description="CV text content or structured data")
@@ -259,28 +344,16 @@ async def cv_ai_analysis(
     try:
         user_id = current_user["id"]
         
-        # 1. Rate limiting
+        # 1-2. Rate limiting and energy check concurrently
         client_ip = http_request.client.host if http_request.client else "unknown"
-        rate_result, rate_data = await rate_limiter.check_rate_limit(
-            identifier=user_id,
-            scope=RateLimitScope.API_GENERAL,
-            user_agent=http_request.headers.get("user-agent", ""),
-            additional_context={"endpoint": "ai_cv_analysis", "type": request.analysis_type}
-        )
-        
-        if rate_result != RateLimitResult.ALLOWED:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded for CV analysis"
-            )
-
-        # 2. Check energy availability
         energy_cost = 5  # CV analysis is more expensive
-        if not await energy_manager.can_perform_action(user_id, "CV_ANALYSIS", energy_cost):
-            raise HTTPException(
-                status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                detail="Insufficient Luna energy for CV analysis"
-            )
+        await admit_and_fetch(
+            checks=[
+                _check_rate_limit(user_id, http_request, {"endpoint": "ai_cv_analysis", "type": request.analysis_type},
+                                  "Rate limit exceeded for CV analysis"),
+                _check_energy(user_id, "CV_ANALYSIS", energy_cost, "Insufficient Luna energy for CV analysis")
+            ]
+        )
 
         # 3. Advanced CV Analysis with Gemini
         analysis_prompt = f"""
@@ -332,19 +405,22 @@ async def cv_ai_analysis(
         }}
         """
         
-        # 4. Generate AI analysis
-        ai_response = gemini_provider.generate(
-            system="Tu es un expert en analyse CV et matching emploi. Analyse précisément et objectivement.",
-            user=analysis_prompt,
-            context={"analysis_type": request.analysis_type, "user_id": user_id}
-        )
+        # 4. Generate AI analysis (document generation: background class, never ahead of chat)
+        with llm_caller_scope(user_id, LLMPriority.BACKGROUND, "cv_analysis"):
+            ai_response = await _complete_or_503(
+                system="Tu es un expert en analyse CV et matching emploi. Analyse précisément et objectivement.",
+                user=analysis_prompt,
+                context={"analysis_type": request.analysis_type, "user_id": user_id}
+            )
 
         # 5. Parse AI response
         try:
             import json
-            analysis_data = json.loads(ai_response) if isinstance(ai_response, str) else ai_response
-        except json.JSONDecodeError:
-            # Fallback structured response
+            analysis_data = json.loads(ai_response)
+            if not isinstance(analysis_data, dict):
+                raise ValueError("CV analysis is not a JSON object")
+        except ValueError:
+            # Malformed model response: fallback structured response
             analysis_data = {
                 "overall_compatibility": 75.0,
                 "skill_matches": [],
@@ -356,6 +432,7 @@ async def cv_ai_analysis(
 
         # 6. Consume energy
         energy_consumed = await energy_manager.consume_energy(user_id, "CV_ANALYSIS", energy_cost)
+        llm_meter.record_energy(user_id, "cv_analysis", energy_consumed)
 
         # 7. Track analysis event
         analysis_id = f"cv_analysis_{user_id}_{int(datetime.now().timestamp())}"
@@ -394,8 +471,8 @@ async def cv_ai_analysis(
             success_prediction=analysis_data.get("success_prediction", {})
         )
 
-    except HTTPException as e:
-        raise e
+    except (HTTPException, OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         logger.error(f"CV analysis error",
                     user_id=current_user.get("id", "unknown"),
@@ -446,38 +523,31 @@ async def letters_ai_generation(
     try:
         user_id = current_user["id"]
         
-        # 1. Rate limiting
+        # 1-3. Rate limiting, energy check and narrative context (personalization) concurrently
         client_ip = http_request.client.host if http_request.client else "unknown"
-        rate_result, rate_data = await rate_limiter.check_rate_limit(
-            identifier=user_id,
-            scope=RateLimitScope.API_GENERAL,
-            user_agent=http_request.headers.get("user-agent", ""),
-            additional_context={"endpoint": "ai_letter_generation", "company": request.company_name}
-        )
-        
-        if rate_result != RateLimitResult.ALLOWED:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded for letter generation"
-            )
-
-        # 2. Check energy availability
         energy_cost = 4  # Letter generation cost
-        if not await energy_manager.can_perform_action(user_id, "LETTER_GENERATION", energy_cost):
-            raise HTTPException(
-                status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                detail="Insufficient Luna energy for letter generation"
-            )
-
-        # 3. Get user's narrative context for personalization
-        try:
-            narrative_context = await get_narrative_context(user_id)
-            user_background = narrative_context.get("user_profile", {})
-        except Exception as e:
-            logger.warning(f"Failed to get narrative context for letter", user_id=user_id, error=str(e))
-            user_background = {}
-
-        # 4. Advanced Letter Generation with Gemini
+        fetched = await admit_and_fetch(
+            checks=[
+                _check_rate_limit(user_id, http_request, {"endpoint": "ai_letter_generation", "company": request.company_name},
+                                  "Rate limit exceeded for letter generation"),
+                _check_energy(user_id, "LETTER_GENERATION", energy_cost, "Insufficient Luna energy for letter generation")
+            ],
+            fetches={"narrative_context": _fetch_narrative_context(user_id)}
+        )
+        user_background = fetched["narrative_context"].get("user_profile", {})
+
+        # 4. Fit the free-text inputs into the token budget: job description and CV first,
+        # then achievements and narrative background, company research last
+        budget = ContextBudget("letter_generation")
+        budget.add("job_description", request.job_description, PRIORITY_PRIMARY, truncatable=True, fallback="Non fournie")
+        budget.add("cv_content", request.cv_content, PRIORITY_PRIMARY, truncatable=True, fallback="Non fourni")
+        budget.add("key_achievements", ', '.join(request.key_achievements) if request.key_achievements else "",
+                   PRIORITY_NARRATIVE, truncatable=True, fallback="Non spécifiées")
+        budget.add("background", user_background.get("professional_summary", ""), PRIORITY_NARRATIVE, truncatable=True)
+        budget.add("company_research", request.company_research, PRIORITY_EXTRA, truncatable=True, fallback="Non fournie")
+        packed = budget.pack()
+
+        # 5. Advanced Letter Generation with Gemini
         generation_prompt = f"""
         Tu es un expert en rédaction de lettres de motivation professionnelles.
         Génère une lettre de motivation personnalisée et percutante.
@@ -489,19 +559,19 @@ async def letters_ai_generation(
         - Ton souhaité: {request.letter_tone}
         
         DESCRIPTION DU POSTE:
-        {request.job_description or "Non fournie"}
+        {packed.text("job_description")}
         
         CV DU CANDIDAT:
-        {request.cv_content or "Non fourni"}
+        {packed.text("cv_content")}
         
         RÉALISATIONS CLÉS À METTRE EN AVANT:
-        {', '.join(request.key_achievements) if request.key_achievements else "Non spécifiées"}
+        {packed.text("key_achievements")}
         
         RECHERCHE SUR L'ENTREPRISE:
-        {request.company_research or "Non fournie"}
+        {packed.text("company_research")}
         
         CONTEXTE UTILISATEUR:
-        {user_background.get("professional_summary", "")}
+        {packed.text("background")}
         
         INSTRUCTIONS:
         1. Crée une lettre de motivation de 300-400 mots
@@ -534,19 +604,22 @@ async def letters_ai_generation(
         }}
         """
         
-        # 5. Generate AI letter
-        ai_response = gemini_provider.generate(
-            system=f"Tu es un expert en rédaction professionnelle, spécialisé dans les lettres de motivation {request.letter_tone}s et persuasives.",
-            user=generation_prompt,
-            context={"company": request.company_name, "position": request.position_title, "user_id": user_id}
-        )
+        # 6. Generate AI letter (document generation: background class)
+        with llm_caller_scope(user_id, LLMPriority.BACKGROUND, "letter_generation"):
+            ai_response = await _complete_or_503(
+                system=f"Tu es un expert en rédaction professionnelle, spécialisé dans les lettres de motivation {request.letter_tone}s et persuasives.",
+                user=generation_prompt,
+                context={"company": request.company_name, "position": request.position_title, "user_id": user_id}
+            )
 
-        # 6. Parse AI response
+        # 7. Parse AI response
         try:
             import json
-            generation_data = json.loads(ai_response) if isinstance(ai_response, str) else ai_response
-        except json.JSONDecodeError:
-            # Fallback structured response
+            generation_data = json.loads(ai_response)
+            if not isinstance(generation_data, dict):
+                raise ValueError("Letter generation is not a JSON object")
+        except ValueError:
+            # Malformed model response: fallback structured response
             generation_data = {
                 "letter_content": f"Madame, Monsieur,\n\nJe vous écris pour exprimer mon intérêt pour le poste de {request.position_title} chez {request.company_name}.\n\n[Contenu généré par IA]\n\nCordialement,\n[Nom]",
                 "quality_metrics": {"overall_quality": 75, "personalization_score": 70},
@@ -554,10 +627,11 @@ async def letters_ai_generation(
                 "word_count": 200
             }
 
-        # 7. Consume energy
+        # 8. Consume energy
         energy_consumed = await energy_manager.consume_energy(user_id, "LETTER_GENERATION", energy_cost)
+        llm_meter.record_energy(user_id, "letter_generation", energy_consumed)
 
-        # 8. Generate letter ID and track event
+        # 9. Generate letter ID and track event
         letter_id = f"letter_{user_id}_{int(datetime.now().timestamp())}"
         
         await create_event({
@@ -597,8 +671,8 @@ async def letters_ai_generation(
             optimization_suggestions=generation_data.get("optimization_suggestions", [])
         )
 
-    except HTTPException as e:
-        raise e
+    except (HTTPException, OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         logger.error(f"Letter generation error",
                     user_id=current_user.get("id", "unknown"),
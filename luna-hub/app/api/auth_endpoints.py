@@ -21,6 +21,10 @@ from ..core.security_guardian import ensure_request_is_clean
 from ..core.supabase_client import sb
 from ..core.logging_config import logger
 from ..core.events import create_event
+from ..core.user_lookup_cache import user_lookup_cache
+from ..core.connection_manager import get_connection_pool, OP_AUTH_READS
+from ..core.adaptive_limiter import OverloadedError
+from ..core.request_deadline import DeadlineExceededError
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -36,11 +40,10 @@ async def check_user_status(
     Returns user type: 'new', 'first_time', or 'returning'
     """
     try:
-        # Execute the Supabase function
-        result = sb.rpc('check_user_status', {'user_email': email}).execute()
+        # Execute the Supabase function (cached, unknown emails included)
+        user_status = await user_lookup_cache.get_user_status(email, _fetch_user_status)
         
-        if result.data and len(result.data) > 0:
-            user_status = result.data[0]
+        if user_status:
             return {
                 "user_exists": user_status.get("user_exists", False),
                 "user_type": user_status.get("user_type", "new"),
@@ -137,6 +140,9 @@ async def register_user(
                 detail="Failed to create user account"
             )
         
+        # Drop negative lookups cached for this email
+        await user_lookup_cache.invalidate(user_id=user_id, email=registration_data.email)
+        
         # Create refresh token and session
         refresh_token_data = await refresh_manager.create_refresh_token(
             user_id=user_id,
@@ -228,8 +234,8 @@ async def login_user(
                 headers={"Retry-After": "900"}  # 15 minutes
             )
         
-        # Verify user credentials
-        user = await get_user_by_email(email)
+        # Verify user credentials (always from database: needs password_hash)
+        user = await _fetch_user_by_email(email)
         if not user or not verify_password(password, user["password_hash"]):
             # Create failed login event
             await create_event({
@@ -276,6 +282,9 @@ async def login_user(
             }
         })
         
+        # Login count / last login changed: refresh smart-auth status
+        await user_lookup_cache.invalidate(email=email)
+        
         logger.info(f"User logged in successfully: {email}")
         
         return {
@@ -286,7 +295,7 @@ async def login_user(
             "email": user["email"]
         }
         
-    except HTTPException:
+    except (HTTPException, OverloadedError, DeadlineExceededError):
         raise
     except Exception as e:
         logger.error(f"Login error for {login_data.get('email', 'unknown')}: {str(e)}")
@@ -554,27 +563,50 @@ async def get_current_user(
 # Helper functions
 
 async def get_user_by_email(email: str) -> Optional[dict]:
-    """Get user by email from database"""
+    """Get user by email (cached, without password hash)"""
     try:
-        result = sb.table("users").select("*").eq("email", email).execute()
-        if result.data and len(result.data) > 0:
-            return result.data[0]
-        return None
+        return await user_lookup_cache.get_user_by_email(email, _fetch_user_by_email)
     except Exception as e:
         logger.error(f"Error fetching user by email {email}: {str(e)}")
         return None
 
 async def get_user_by_id(user_id: str) -> Optional[dict]:
-    """Get user by ID from database"""
+    """Get user by ID (cached, without password hash)"""
     try:
-        result = sb.table("users").select("*").eq("id", user_id).execute()
-        if result.data and len(result.data) > 0:
-            return result.data[0]
-        return None
+        return await user_lookup_cache.get_user_by_id(user_id, _fetch_user_by_id)
     except Exception as e:
         logger.error(f"Error fetching user by ID {user_id}: {str(e)}")
         return None
 
+# Database fetchers raise on error so failures are never cached as "unknown user"
+
+async def _fetch_user_status(email: str) -> Optional[dict]:
+    """Smart-auth status from the check_user_status database function"""
+    result = await get_connection_pool(OP_AUTH_READS).run_query(
+        sb.rpc('check_user_status', {'user_email': email}).execute, "auth_user_status", idempotent=True
+    )
+    if result.data and len(result.data) > 0:
+        return result.data[0]
+    return None
+
+async def _fetch_user_by_email(email: str) -> Optional[dict]:
+    """Get user by email from database"""
+    result = await get_connection_pool(OP_AUTH_READS).run_query(
+        sb.table("users").select("*").eq("email", email).execute, "auth_user_lookup", idempotent=True
+    )
+    if result.data and len(result.data) > 0:
+        return result.data[0]
+    return None
+
+async def _fetch_user_by_id(user_id: str) -> Optional[dict]:
+    """Get user by ID from database"""
+    result = await get_connection_pool(OP_AUTH_READS).run_query(
+        sb.table("users").select("*").eq("id", user_id).execute, "auth_user_lookup", idempotent=True
+    )
+    if result.data and len(result.data) > 0:
+        return result.data[0]
+    return None
+
 def get_current_user_dependency():
     """
     🔐 Dependency to get current authenticated user
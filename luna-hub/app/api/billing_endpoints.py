@@ -22,7 +22,10 @@ from ..models.billing import (
 from ..billing.stripe_manager import StripeManager, StripeError
 from ..core.energy_manager import energy_manager
 from ..core.supabase_client import event_store, sb
+from ..core.user_lookup_cache import user_lookup_cache
 from ..core.security_guardian import SecurityGuardian, ensure_request_is_clean
+from ..core.adaptive_limiter import OverloadedError
+from ..core.request_deadline import DeadlineExceededError
 
 logger = structlog.get_logger("billing_endpoints")
 
@@ -190,6 +193,8 @@ async def create_payment_intent(
                     duration_ms=duration_ms)
         raise HTTPException(status_code=502, detail=f"Payment service error: {str(e)}")
         
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         duration_ms = int((time.time() - start_time) * 1000)
         logger.error("Unexpected error creating intent",
@@ -333,7 +338,7 @@ async def confirm_payment(
             transaction_id=transaction_id
         )
         
-    except HTTPException:
+    except (HTTPException, OverloadedError, DeadlineExceededError):
         raise
     except Exception as e:
         duration_ms = int((time.time() - start_time) * 1000)
@@ -404,6 +409,8 @@ async def get_purchase_history(
             purchases=purchases
         )
         
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         logger.error("Error getting purchase history",
                     user_id=user_id,
@@ -445,6 +452,8 @@ async def activate_founder_unlimited(
         if not result.data:
             raise HTTPException(status_code=404, detail="User not found")
         
+        await user_lookup_cache.invalidate(user_id=user_id)
+        
         # Log événement
         await event_store.log_event(
             user_id=user_id,
@@ -471,6 +480,8 @@ async def activate_founder_unlimited(
             "expires_at": end_date.isoformat()
         }
         
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         logger.error("Error activating founder unlimited", 
                     user_id=user_id, 
@@ -574,6 +585,7 @@ async def create_subscription(
                 sb.table("users").update({
                     "stripe_customer_id": stripe_customer_id
                 }).eq("id", clean_user_id).execute()
+                await user_lookup_cache.invalidate(user_id=clean_user_id)
                 
                 logger.info("Stripe customer created and saved",
                            user_id=clean_user_id,
@@ -655,6 +667,8 @@ async def create_subscription(
                     duration_ms=duration_ms,
                     debug_step="http_exception")
         raise
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         duration_ms = int((time.time() - start_time) * 1000)
         logger.error("🔍 DEBUG: Unexpected error creating subscription",
@@ -703,7 +717,7 @@ async def stripe_webhook(request: Request):
         
         return {"received": True}
         
-    except HTTPException:
+    except (HTTPException, OverloadedError, DeadlineExceededError):
         raise
     except Exception as e:
         logger.error("Error processing webhook", error=str(e))
@@ -756,6 +770,7 @@ async def _handle_subscription_updated(subscription_data: Dict[str, Any]) -> Non
             ).isoformat()
         
         sb.table("users").update(update_data).eq("id", user_id).execute()
+        await user_lookup_cache.invalidate(user_id=user_id)
         
         # Création événement
         await event_store.create_event(
@@ -807,6 +822,7 @@ async def _handle_subscription_deleted(subscription_data: Dict[str, Any]) -> Non
             "subscription_status": "canceled",
             "subscription_ends_at": None
         }).eq("id", user_id).execute()
+        await user_lookup_cache.invalidate(user_id=user_id)
         
         # Événement de cancellation
         await event_store.create_event(
@@ -936,6 +952,8 @@ async def get_billing_stats(
             "generated_at": time.time()
         }
         
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         logger.error("Error getting billing stats", error=str(e))
         raise HTTPException(status_code=500, detail="Internal server error")
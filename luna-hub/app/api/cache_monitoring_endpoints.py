@@ -50,7 +50,7 @@ async def get_cache_statistics() -> Dict[str, Any]:
     """
     
     try:
-        stats = await energy_manager.get_cache_stats()
+        stats = await redis_cache.get_cache_stats()
         
         return {
             "timestamp": "2025-08-27T11:00:00Z",
@@ -76,7 +76,7 @@ async def invalidate_user_cache(user_id: str) -> Dict[str, Any]:
     """
     
     try:
-        success = await energy_manager.clear_user_cache(user_id)
+        success = await redis_cache.invalidate_user_cache(user_id)
         
         if success:
             logger.info("User cache invalidated successfully", user_id=user_id)
@@ -115,7 +115,7 @@ async def test_cache_performance(
         import time
         
         # Test sans cache (invalidation d'abord)
-        await energy_manager.clear_user_cache(user_id)
+        await redis_cache.invalidate_user_cache(user_id)
         
         # Premier appel (pas de cache)
         start_time = time.time()
@@ -221,6 +221,19 @@ def _get_cache_recommendations(stats: Dict[str, Any]) -> list[str]:
     if redis_memory > 100:
         recommendations.append(f"High Redis memory usage ({redis_memory}MB) - consider cache cleanup")
     
+    # Analyse par type de clé (TTL / placement)
+    for key_type, key_stats in stats.get("key_types", {}).items():
+        lookups = key_stats.get("hits", 0) + key_stats.get("misses", 0)
+        if lookups >= 100 and key_stats.get("hit_rate_pct", 0) < 30:
+            recommendations.append(
+                f"Key type '{key_type}' has a low hit rate ({key_stats['hit_rate_pct']}%) - "
+                "increase its TTL or stop caching it"
+            )
+        if key_stats.get("evictions", 0) > 0:
+            recommendations.append(
+                f"Key type '{key_type}' is being evicted from the fallback cache - review its footprint"
+            )
+    
     # Redis availability
     if not stats.get("redis_available", False):
         recommendations.append("Redis unavailable - using fallback memory cache only")
@@ -4,8 +4,16 @@ Monitoring du connection pooling et circuit breaker
 """
 
 from fastapi import APIRouter, Depends
-from typing import Dict, Any
-from app.core.connection_manager import connection_manager
+from typing import Dict, Any, List
+from app.core.connection_manager import (
+    circuit_breakers, connection_pools, get_all_pool_stats, get_pools_summary, pools_health_check
+)
+from app.core.adaptive_limiter import get_adaptive_limits_stats
+from app.core.dependency_guard import get_dependency_guards_stats
+from app.core.llm_http_client import llm_http_client
+from app.core.llm_router import llm_router
+from app.core.llm_scheduler import llm_scheduler
+from app.core.pool_latency_sync import pool_latency_sync
 from app.core.security_guardian import ensure_request_is_clean
 import structlog
 
@@ -15,20 +23,31 @@ router = APIRouter(prefix="/monitoring/connections", tags=["Connection Monitorin
 
 
 @router.get("/pool-stats", dependencies=[Depends(ensure_request_is_clean)])
-async def get_connection_pool_stats() -> Dict[str, Any]:
+async def get_connection_pool_stats(cluster: bool = False) -> Dict[str, Any]:
     """
-    📊 Statistiques complètes du pool de connexions
+    📊 Statistiques des pools de connexions Supabase (vue agrégée + détail par pool)
     Pour monitoring Grafana et debugging
+    
+    cluster=true : latences p50/p90/p99/max fusionnées de tous les workers (via Redis)
     """
     
     try:
-        stats = connection_manager.get_pool_stats()
+        pools = get_all_pool_stats()
+        stats = {"summary": get_pools_summary()}
+        if cluster:
+            stats["cluster_latency"] = await pool_latency_sync.get_cluster_latency_stats()
         
         return {
             "timestamp": "2025-08-27T10:55:00Z",
             "service": "phoenix-luna-hub", 
             **stats,
-            "recommendations": _get_performance_recommendations(stats)
+            "adaptive_limits": get_adaptive_limits_stats(),
+            "pools": pools,
+            "dependencies": get_dependency_guards_stats(),
+            "llm_http": llm_http_client.get_stats(),
+            "llm_scheduler": llm_scheduler.get_stats(),
+            "llm_router": llm_router.get_stats(),
+            "recommendations": _get_performance_recommendations(pools)
         }
         
     except Exception as e:
@@ -46,7 +65,7 @@ async def get_connection_health() -> Dict[str, Any]:
     """
     
     try:
-        health = await connection_manager.health_check()
+        health = await pools_health_check()
         
         return {
             "status": "healthy" if health["healthy"] else "unhealthy",
@@ -68,25 +87,36 @@ async def get_connection_health() -> Dict[str, Any]:
 @router.get("/circuit-breaker", dependencies=[Depends(ensure_request_is_clean)])
 async def get_circuit_breaker_status() -> Dict[str, Any]:
     """
-    ⚡ Status détaillé du circuit breaker
+    ⚡ Status détaillé des circuit breakers (pools Supabase, Gemini, Stripe, Redis)
     """
     
     try:
-        stats = connection_manager.get_pool_stats()
-        pool_state = stats["pool_state"]
-        statistics = stats["statistics"]
+        success_rates = {
+            pool.name: pool.get_pool_stats()["statistics"]["success_rate_pct"]
+            for pool in connection_pools.values()
+            if pool.stats.total_requests > 0
+        }
+        breakers = {}
+        for name, breaker in circuit_breakers.items():
+            breaker_stats = breaker.get_stats()
+            breakers[name] = {
+                **breaker_stats,
+                "success_rate_pct": success_rates.get(name),
+                "recommendations": _get_circuit_breaker_recommendations(
+                    breaker_stats["state"],
+                    success_rates.get(name, 100)
+                )
+            }
+        states = {breaker["state"] for breaker in breakers.values()}
         
         return {
-            "circuit_breaker_state": pool_state["circuit_breaker_state"],
-            "failure_count": pool_state["circuit_failure_count"],
-            "total_trips": statistics["circuit_breaker_trips"],
-            "success_rate_pct": statistics["success_rate_pct"],
-            "is_healthy": pool_state["circuit_breaker_state"] != "open",
-            "last_error": statistics["last_error"],
-            "recommendations": _get_circuit_breaker_recommendations(
-                pool_state["circuit_breaker_state"],
-                statistics["success_rate_pct"]
+            "circuit_breaker_state": next(
+                (state for state in ("open", "half_open") if state in states), "closed"
             ),
+            "open_breakers": [name for name, breaker in breakers.items() if breaker["state"] == "open"],
+            "total_trips": sum(breaker["trips"] for breaker in breakers.values()),
+            "is_healthy": "open" not in states,
+            "breakers": breakers,
             "timestamp": "2025-08-27T10:55:00Z"
         }
         
@@ -98,8 +128,21 @@ async def get_circuit_breaker_status() -> Dict[str, Any]:
         }
 
 
-def _get_performance_recommendations(stats: Dict[str, Any]) -> List[str]:
-    """💡 Recommandations de performance basées sur les stats"""
+def _get_performance_recommendations(pools: Dict[str, Dict[str, Any]]) -> List[str]:
+    """💡 Recommandations de performance, pool par pool"""
+    
+    recommendations = []
+    for name, stats in pools.items():
+        recommendations.extend(f"[{name}] {item}" for item in _get_pool_recommendations(stats))
+    
+    if not recommendations:
+        recommendations.append("Connection pool performance is optimal")
+    
+    return recommendations
+
+
+def _get_pool_recommendations(stats: Dict[str, Any]) -> List[str]:
+    """💡 Recommandations d'un pool basées sur ses stats"""
     
     recommendations = []
     statistics = stats.get("statistics", {})
@@ -110,12 +153,12 @@ def _get_performance_recommendations(stats: Dict[str, Any]) -> List[str]:
     if success_rate < 95:
         recommendations.append(f"Success rate is low ({success_rate}%) - investigate network issues")
     
-    # Response time
-    avg_response_time = statistics.get("avg_response_time_ms", 0)
-    if avg_response_time > 1000:
-        recommendations.append(f"High response time ({avg_response_time}ms) - consider connection optimization")
-    elif avg_response_time > 500:
-        recommendations.append(f"Moderate response time ({avg_response_time}ms) - monitor database performance")
+    # Response time (queue de distribution : p99 sur 5 min)
+    p99_response_time = statistics.get("p99_response_time_ms") or 0
+    if p99_response_time > 1000:
+        recommendations.append(f"High p99 response time ({p99_response_time}ms) - consider connection optimization")
+    elif p99_response_time > 500:
+        recommendations.append(f"Moderate p99 response time ({p99_response_time}ms) - monitor database performance")
     
     # Circuit breaker
     if pool_state.get("circuit_breaker_state") == "open":
@@ -130,9 +173,6 @@ def _get_performance_recommendations(stats: Dict[str, Any]) -> List[str]:
     if active_connections >= max_connections * 0.8:
         recommendations.append(f"High connection usage ({active_connections}/{max_connections}) - consider increasing pool size")
     
-    if not recommendations:
-        recommendations.append("Connection pool performance is optimal")
-    
     return recommendations
 
 
@@ -18,10 +18,14 @@ from ..services.luna_central_orchestrator import luna_orchestrator
 # Imports infrastructure existante
 from ..api.auth_endpoints import get_current_user_dependency
 from ..core.security_guardian import ensure_request_is_clean
+from ..core.adaptive_limiter import OverloadedError
+from ..core.request_deadline import DeadlineExceededError
 from ..core.rate_limiter import rate_limiter, RateLimitScope, RateLimitResult
 from ..core.events import create_event
 from ..core.logging_config import logger
 from ..core.jwt_manager import get_bearer_token
+from ..core.energy_manager import InsufficientEnergyError
+from ..core.sse_stream import sse_response
 
 router = APIRouter(prefix="/luna/conversation", tags=["Luna Conversation"])
 
@@ -149,7 +153,7 @@ async def send_luna_message(
                 "error": orchestrator_response.get("error", "unknown")
             }
     
-    except HTTPException:
+    except (HTTPException, OverloadedError, DeadlineExceededError):
         raise
     except Exception as e:
         logger.error("Luna conversation endpoint error",
@@ -166,6 +170,67 @@ async def send_luna_message(
             "error": "internal_error"
         }
 
+@router.post("/send-message/stream")
+async def send_luna_message_stream(
+    conversation_request: LunaConversationRequest,
+    request: Request,
+    authorization: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user_dependency()),
+    _: None = Depends(ensure_request_is_clean)
+):
+    """
+    📡 Conversation Luna en streaming (text/event-stream)
+    
+    Événements : token, validation, done (énergie consommée), error.
+    Rate limit, token et énergie vérifiés avant le premier fragment.
+    """
+    rate_result, rate_context = await rate_limiter.check_rate_limit(
+        identifier=current_user["id"],
+        scope=RateLimitScope.CONVERSATION,
+        user_agent=request.headers.get("user-agent", ""),
+        additional_context={"endpoint": "luna_conversation_stream"}
+    )
+    if rate_result != RateLimitResult.ALLOWED:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many conversation requests"
+        )
+    
+    central_token = get_bearer_token(authorization) if authorization else None
+    if not central_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authorization token required for Luna conversation"
+        )
+    
+    user_context = {
+        "user_id": current_user["id"],
+        "name": current_user.get("name", current_user.get("email", "")),
+        "email": current_user["email"],
+        "luna_energy": current_user.get("luna_energy", 100),
+        "luna_context": {
+            "current_module": conversation_request.current_module or "default",
+            "current_specialist": conversation_request.force_specialist,
+            "conversation_count": conversation_request.context.get("conversation_count", 0),
+            "frontend_context": conversation_request.context
+        }
+    }
+    
+    try:
+        events = await luna_orchestrator.handle_user_message_stream(
+            user_message=conversation_request.message,
+            user_context=user_context,
+            central_token=central_token,
+            session_id=conversation_request.session_id
+        )
+    except InsufficientEnergyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail={"error": "insufficient_energy", "message": str(e), "action": "recharge_energy"}
+        )
+    
+    return sse_response(events)
+
 @router.get("/session/{session_id}/history")
 async def get_conversation_history(
     session_id: str,
@@ -279,7 +344,7 @@ async def direct_specialist_conversation(
             }
         }
             
-    except HTTPException:
+    except (HTTPException, OverloadedError, DeadlineExceededError):
         raise
     except Exception as e:
         logger.error("Direct specialist conversation error",
@@ -9,9 +9,12 @@ from fastapi import APIRouter, HTTPException, Depends, status, Query
 from pydantic import BaseModel, Field, validator
 import structlog
 from app.core.energy_manager import energy_manager, InsufficientEnergyError, EnergyManagerError
+from app.core.adaptive_limiter import OverloadedError
+from app.core.request_deadline import DeadlineExceededError
 from app.models.user_energy import EnergyPackType
 from app.core.security_guardian import SecurityGuardian, SecureUserIdValidator, SecureActionValidator
 from app.core.luna_core_service import get_luna_core
+from app.core.llm_metering import llm_meter
 from app.core.narrative_analyzer_optimized import narrative_analyzer_optimized as narrative_analyzer
 from app.models.journal_dto import (
     JournalDTO, EnergyPreviewRequest, EnergyPreviewResponse,
@@ -20,6 +23,8 @@ from app.models.journal_dto import (
 from app.core.journal_service import journal_service
 from app.core.energy_preview_service import energy_preview_service
 from app.core.supabase_client import event_store
+from app.core.luna_voice_validator import luna_voice_validator
+from app.core.sse_stream import sse_response, stream_llm_events
 
 
 # Logger structuré
@@ -245,6 +250,8 @@ async def check_energy_balance(
             subscription_type=balance["subscription_type"]
         )
     
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -273,6 +280,8 @@ async def can_perform_action(
             deficit=result["deficit"]
         )
     
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -322,6 +331,8 @@ async def consume_energy(
             detail=f"Energy management error: {str(e)}"
         )
     
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -347,6 +358,8 @@ async def refund_energy(
         
         return result
     
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -379,6 +392,8 @@ async def purchase_energy_pack(
             amount_paid=result["amount_paid"]
         )
     
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -405,6 +420,8 @@ async def get_energy_transactions(
             total_count=len(transactions)
         )
     
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -429,6 +446,8 @@ async def get_energy_analytics(
             analytics=analytics
         )
     
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -484,7 +503,9 @@ Action standard : 5 points d'énergie ⚡ (conversation de base)
              responses={
                  400: {"description": "Message invalide ou contexte incorrect"},
                  402: {"description": "Énergie insuffisante pour la conversation"},
-                 500: {"description": "Erreur génération réponse Luna"}
+                 500: {"description": "Erreur génération réponse Luna"},
+                 503: {"description": "Luna saturée, réessayer après Retry-After"},
+                 504: {"description": "Génération Luna trop longue"}
              })
 async def luna_chat_message(
     request: LunaChatRequest
@@ -507,7 +528,7 @@ async def luna_chat_message(
             )
         
         # Consommation énergie AVANT génération
-        await energy_manager.consume(
+        consumption = await energy_manager.consume(
             user_id=user_id,
             action_name="conseil_rapide",
             context={
@@ -516,6 +537,8 @@ async def luna_chat_message(
                 "message_length": len(request.message)
             }
         )
+        # Tokens consommés ↔ énergie facturée (même fonctionnalité que le métrage LunaCore)
+        llm_meter.record_energy(user_id, "luna_chat", consumption["energy_consumed"])
         
         # Génération réponse Luna Core
         luna = get_luna_core()
@@ -530,7 +553,7 @@ async def luna_chat_message(
             success=response["success"],
             message=response["message"],
             context=response["context"],
-            energy_consumed=response["energy_consumed"],
+            energy_consumed=consumption["energy_consumed"],
             type=response["type"]
         )
     
@@ -544,6 +567,8 @@ async def luna_chat_message(
             }
         )
     
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -551,6 +576,77 @@ async def luna_chat_message(
         )
 
 
+@router.post("/chat/send-message/stream",
+             summary="Conversation Luna en streaming (SSE)",
+             description="""
+📡 **Conversation avec Luna - Réponse streamée**
+
+Même conversation que `/chat/send-message`, en `text/event-stream` :
+- `token` : fragment de réponse dès sa génération
+- `validation` : alerte de la validation de voix Luna au fil du texte
+- `done` : réponse complète, énergie consommée
+- `error` : génération interrompue, aucune énergie consommée
+
+### Consommation Énergie
+Vérifiée avant le premier fragment (402), consommée une fois la réponse complète.
+             """,
+             responses={
+                 400: {"description": "Message invalide ou contexte incorrect"},
+                 402: {"description": "Énergie insuffisante pour la conversation"}
+             })
+async def luna_chat_message_stream(request: LunaChatRequest):
+    """📡 Conversation avec Luna - fragments SSE, énergie consommée à la fin"""
+    user_id = await get_current_user_id(request.user_id)
+    
+    # Vérification énergie avant le premier octet : 402 classique
+    can_perform = await energy_manager.can_perform_action(user_id, "conseil_rapide")
+    if not can_perform["can_perform"]:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail={
+                "error": "insufficient_energy",
+                "message": f"Énergie insuffisante. Il vous faut {can_perform['deficit']} points supplémentaires.",
+                "current_energy": can_perform["current_energy"],
+                "required": can_perform["energy_required"]
+            }
+        )
+    
+    validation = luna_voice_validator.start_stream(
+        user_context={"user_id": user_id}, context_type=request.app_context
+    )
+    
+    async def on_complete(full_text: str) -> Dict[str, Any]:
+        result = await energy_manager.consume(
+            user_id=user_id,
+            action_name="conseil_rapide",
+            context={
+                "app_context": request.app_context,
+                "feature": "luna_chat_stream",
+                "message_length": len(request.message)
+            }
+        )
+        llm_meter.record_energy(user_id, "luna_chat", result["energy_consumed"])
+        report = validation.finalize()
+        return {
+            "success": True,
+            "context": request.app_context,
+            "energy_consumed": result["energy_consumed"],
+            "energy_remaining": result["energy_remaining"],
+            "validation": {"is_valid": report.is_valid, "score": report.score}
+        }
+    
+    chunks = get_luna_core().generate_response_stream(
+        user_id=user_id,
+        message=request.message,
+        app_context=request.app_context,
+        user_name=request.user_name
+    )
+    return sse_response(stream_llm_events(
+        chunks, on_complete, validation=validation,
+        context={"user_id": user_id, "endpoint": "luna_chat_stream"}
+    ))
+
+
 @router.get("/narrative/context-packet/{user_id}",
            response_model=ContextPacketResponse,
            summary="Génère Context Packet pour analyse narrative",
@@ -599,6 +695,8 @@ async def get_user_context_packet(user_id: str) -> ContextPacketResponse:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"User ID invalide: {str(e)}"
         )
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -672,6 +770,8 @@ async def get_journal_narratif(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Données invalides: {str(e)}"
         )
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -746,6 +846,8 @@ async def preview_energy_impact(request: EnergyPreviewRequest) -> EnergyPreviewR
                 "action": "check_energy_status"
             }
         )
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -818,6 +920,8 @@ async def export_journal_narratif(request: JournalExportRequest) -> JournalExpor
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Requête invalide: {str(e)}"
         )
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -886,6 +990,8 @@ async def get_action_confirmation_message(
             "action_description": energy_preview_service.get_action_description(action)
         }
         
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -21,6 +21,9 @@ from ..core.metrics_collector import metrics_collector, AlertSeverity
 from ..core.rate_limiter import rate_limiter
 from ..core.energy_manager import energy_manager
 from ..core.redis_cache import redis_cache
+from ..core.prompt_registry import prompt_registry
+from ..core.context_budget import get_context_budget_stats
+from ..core.llm_metering import llm_meter
 
 # Setup
 router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
@@ -311,7 +314,49 @@ async def version_info():
         ],
         "environment": os.getenv("PHOENIX_ENVIRONMENT", "development"),
         "python_version": f"{psutil.sys.version_info.major}.{psutil.sys.version_info.minor}",
-        "pack_catalog_version": "1.0"
+        "pack_catalog_version": "1.0",
+        "prompts_version": prompt_registry.version
+    }
+
+
+@router.get("/prompts", dependencies=[Depends(ensure_request_is_clean)])
+async def prompts_info():
+    """
+    📚 Prompts LLM chargés : version, variables par template, compteurs de rechargement,
+    tailles de contexte par fonctionnalité (tokens moyens / max, segments écartés)
+    """
+    return {**prompt_registry.get_stats(), "context_budgets": get_context_budget_stats()}
+
+
+@router.post("/prompts/reload", dependencies=[Depends(ensure_request_is_clean)])
+async def reload_prompts():
+    """
+    🔄 Recharge config/llm_prompts sans redémarrage (version conservée si invalide)
+    """
+    previous = prompt_registry.version
+    changed = prompt_registry.reload_if_changed()
+    return {"reloaded": changed, "previous_version": previous, "version": prompt_registry.version}
+
+
+@router.get("/llm-usage", dependencies=[Depends(ensure_request_is_clean)])
+async def llm_usage(top: int = Query(20, ge=1, le=200)):
+    """
+    🧮 Consommation LLM de ce worker : tokens, cache, latence et énergie facturée
+    par fonctionnalité, persona, fournisseur, et plus gros consommateurs
+    """
+    return llm_meter.get_stats(top)
+
+
+@router.get("/llm-usage/users/{user_id}", dependencies=[Depends(ensure_request_is_clean)])
+async def llm_usage_user(user_id: str, days: int = Query(7, ge=1, le=35)):
+    """
+    🧮 Consommation LLM d'un utilisateur : cumuls du worker par fonctionnalité
+    + cumuls journaliers tous workers (Redis)
+    """
+    return {
+        "user_id": user_id,
+        "worker": llm_meter.get_user_usage(user_id),
+        "daily": await llm_meter.get_daily_usage(user_id, days)
     }
 
 
@@ -562,6 +607,9 @@ async def prometheus_metrics_v2() -> PlainTextResponse:
             if isinstance(value, (int, float)):
                 format_prometheus_metric(f"phoenix_redis_{key}", value)
         
+        # Cache : compteurs par key_type + histogrammes de latence
+        prometheus_output.extend(redis_cache.telemetry.prometheus_lines())
+        
         # Alertes
         active_alerts = len(current_metrics.get("active_alerts", {}))
         format_prometheus_metric("phoenix_active_alerts_total", active_alerts)
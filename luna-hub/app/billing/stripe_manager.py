@@ -11,6 +11,9 @@ from typing import Tuple, Dict, Any, Optional
 from datetime import datetime, timezone
 
 import stripe
+from ..core.adaptive_limiter import get_adaptive_limiter
+from ..core.connection_manager import get_circuit_breaker
+from ..core.dependency_guard import DependencyGuard, dependency_guard, register_dependency_guard
 from ..models.billing import PackCode, get_pack_price, get_pack_energy, get_subscription_price
 
 # Configuration
@@ -27,6 +30,14 @@ else:
 
 logger = structlog.get_logger("stripe_manager")
 
+# Limite adaptative des appels Stripe : seules les erreurs réseau / serveur / 429
+# réduisent la limite (une carte refusée n'indique pas une dépendance saturée)
+stripe_limiter = get_adaptive_limiter("stripe", initial_limit=10, max_limit=50, latency_target_ms=3000.0)
+STRIPE_FAILURES = (stripe.error.APIConnectionError, stripe.error.APIError, stripe.error.RateLimitError)
+stripe_guard = register_dependency_guard(
+    DependencyGuard("stripe", stripe_limiter, get_circuit_breaker("stripe", threshold=5, timeout=30.0))
+)
+
 class StripeError(Exception):
     """Erreur Stripe personnalisée"""
     pass
@@ -37,6 +48,7 @@ class StripeManager:
     """
     
     @staticmethod
+    @dependency_guard(stripe_guard, STRIPE_FAILURES)
     def create_payment_intent(
         user_id: str, 
         pack: PackCode, 
@@ -129,6 +141,7 @@ class StripeManager:
             raise StripeError("Unexpected payment error")
     
     @staticmethod
+    @dependency_guard(stripe_guard, STRIPE_FAILURES)
     def retrieve_payment_intent(intent_id: str) -> stripe.PaymentIntent:
         """
         Récupère un PaymentIntent Stripe
@@ -219,6 +232,7 @@ class StripeManager:
             raise StripeError("Invalid webhook signature")
     
     @staticmethod
+    @dependency_guard(stripe_guard, STRIPE_FAILURES)
     def cancel_payment_intent(intent_id: str, reason: str = "requested_by_customer") -> bool:
         """
         Annule un PaymentIntent
@@ -250,6 +264,7 @@ class StripeManager:
             return False
     
     @staticmethod
+    @dependency_guard(stripe_guard, STRIPE_FAILURES)
     def get_payment_stats(start_date: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Récupère les statistiques de paiement
@@ -317,6 +332,7 @@ class StripeManager:
     # ============================================================================
     
     @staticmethod
+    @dependency_guard(stripe_guard, STRIPE_FAILURES)
     def create_subscription(
         user_id: str,
         customer_id: str, 
@@ -399,6 +415,7 @@ class StripeManager:
             raise StripeError("Unexpected subscription error")
     
     @staticmethod
+    @dependency_guard(stripe_guard, STRIPE_FAILURES)
     def create_customer(user_id: str, email: str) -> str:
         """
         Crée un Customer Stripe
@@ -428,6 +445,7 @@ class StripeManager:
             raise StripeError(f"Customer creation error: {str(e)}")
     
     @staticmethod
+    @dependency_guard(stripe_guard, STRIPE_FAILURES)
     def retrieve_subscription(subscription_id: str) -> stripe.Subscription:
         """
         Récupère une Subscription Stripe
@@ -454,6 +472,7 @@ class StripeManager:
             raise StripeError(f"Error retrieving subscription: {str(e)}")
     
     @staticmethod
+    @dependency_guard(stripe_guard, STRIPE_FAILURES)
     def cancel_subscription(subscription_id: str, cancel_immediately: bool = False) -> stripe.Subscription:
         """
         Annule une Subscription Stripe
@@ -0,0 +1,244 @@
+"""
+🎚️ Adaptive Concurrency Limiter - Phoenix Luna Hub
+Limite de concurrence AIMD pour les dépendances sortantes (Supabase, Gemini, Stripe)
+Oracle Directive: Stabilité & Résilience
+
+- Additive increase : +1 par "fenêtre" (≈ limit succès) tant que la latence est saine
+- Multiplicative decrease : limit × backoff_ratio sur latence > cible ou erreur
+- Au-delà de la limite : rejet immédiat (ConcurrencyLimitExceeded → 503)
+"""
+
+import os
+import time
+import inspect
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+import structlog
+
+logger = structlog.get_logger("adaptive_limiter")
+
+
+class OverloadedError(Exception):
+    """Dépendance saturée : la requête est délestée (→ 503 + Retry-After)"""
+    
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimitExceeded(OverloadedError):
+    """Limite adaptative atteinte : requête rejetée sans appeler la dépendance"""
+    pass
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    🎚️ Limiteur AIMD (additive increase / multiplicative decrease)
+
+    Utilisable depuis du code sync ou async : le compteur est protégé par un
+    verrou et la fenêtre mesurée couvre tout le bloc (await compris).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        latency_target_ms: float = 1000.0,
+        backoff_ratio: float = 0.7,
+        decrease_cooldown: float = 1.0
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_ms = latency_target_ms
+        self.backoff_ratio = backoff_ratio
+        self.decrease_cooldown = decrease_cooldown
+
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._lock = threading.Lock()
+        self._last_decrease = 0.0
+
+        self.in_flight = 0
+        self.stats = {
+            "accepted": 0,
+            "rejected": 0,
+            "successes": 0,
+            "failures": 0,
+            "slow_responses": 0,
+            "increases": 0,
+            "decreases": 0
+        }
+        self.avg_latency_ms = 0.0
+
+    @classmethod
+    def from_env(cls, name: str, **defaults: Any) -> "AdaptiveConcurrencyLimiter":
+        """Paramètres surchargeables par ADAPTIVE_<NAME>_{INITIAL,MIN,MAX,LATENCY_TARGET_MS}"""
+        prefix = f"ADAPTIVE_{name.upper()}_"
+        return cls(
+            name,
+            initial_limit=int(os.getenv(f"{prefix}INITIAL", defaults.get("initial_limit", 10))),
+            min_limit=int(os.getenv(f"{prefix}MIN", defaults.get("min_limit", 1))),
+            max_limit=int(os.getenv(f"{prefix}MAX", defaults.get("max_limit", 100))),
+            latency_target_ms=float(
+                os.getenv(f"{prefix}LATENCY_TARGET_MS", defaults.get("latency_target_ms", 1000.0))
+            )
+        )
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """Réserve une place si in_flight < limit (sinon rejet compté)"""
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.stats["rejected"] += 1
+                return False
+            self.in_flight += 1
+            self.stats["accepted"] += 1
+            return True
+
+    def start(self) -> None:
+        """Compte un appel admis par un mécanisme externe (ex: file du pool)"""
+        with self._lock:
+            self.in_flight += 1
+            self.stats["accepted"] += 1
+
+    def cancel(self) -> None:
+        """Annule une réservation sans échantillon (appel finalement non émis)"""
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.stats["accepted"] -= 1
+
+    def note_rejected(self) -> None:
+        with self._lock:
+            self.stats["rejected"] += 1
+
+    def release(self, latency_ms: float, success: bool = True) -> None:
+        """Libère la place et ajuste la limite selon l'échantillon"""
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._on_sample(latency_ms, success)
+
+    def _on_sample(self, latency_ms: float, success: bool) -> None:
+        self.avg_latency_ms = (
+            latency_ms if self.avg_latency_ms == 0
+            else self.avg_latency_ms * 0.9 + latency_ms * 0.1
+        )
+
+        slow = latency_ms > self.latency_target_ms
+        if success:
+            self.stats["successes"] += 1
+        else:
+            self.stats["failures"] += 1
+        if slow:
+            self.stats["slow_responses"] += 1
+
+        if not success or slow:
+            # Une seule réduction par cooldown : une rafale d'échecs d'une même
+            # génération de requêtes ne doit pas effondrer la limite
+            now = time.monotonic()
+            if now - self._last_decrease >= self.decrease_cooldown:
+                previous = self.limit
+                self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+                self._last_decrease = now
+                self.stats["decreases"] += 1
+                if self.limit != previous:
+                    logger.warning("Adaptive limit decreased",
+                                   dependency=self.name,
+                                   limit=self.limit,
+                                   latency_ms=round(latency_ms, 1),
+                                   success=success)
+            return
+
+        # Augmentation seulement si la limite est réellement sollicitée
+        if self.in_flight + 1 >= self._limit * 0.5 and self._limit < self.max_limit:
+            previous = self.limit
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+            if self.limit != previous:
+                self.stats["increases"] += 1
+
+    @contextmanager
+    def guard(self, failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,)):
+        """Bloc limité : rejet immédiat si saturé, échantillon mesuré à la sortie"""
+        if not self.try_acquire():
+            raise ConcurrencyLimitExceeded(
+                f"Adaptive concurrency limit reached for {self.name}",
+                retry_after=1.0
+            )
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release((time.monotonic() - started) * 1000, not is_dependency_failure(e, failure_exceptions))
+            raise
+        else:
+            self.release((time.monotonic() - started) * 1000, True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "latency_target_ms": self.latency_target_ms,
+            "avg_latency_ms": round(self.avg_latency_ms, 2),
+            **self.stats
+        }
+
+
+def is_dependency_failure(error: BaseException, failure_exceptions: Tuple[Type[BaseException], ...]) -> bool:
+    """Erreur de la dépendance ? (inspecte aussi l'exception d'origine si ré-emballée)"""
+    current: Optional[BaseException] = error
+    while current is not None:
+        if isinstance(current, failure_exceptions):
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+def adaptive_limit(
+    limiter: AdaptiveConcurrencyLimiter,
+    failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,)
+) -> Callable:
+    """Décorateur (sync ou async) appliquant un limiteur adaptatif"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with limiter.guard(failure_exceptions):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with limiter.guard(failure_exceptions):
+                return func(*args, **kwargs)
+        return sync_wrapper
+    return decorator
+
+
+# Limiteurs par dépendance
+adaptive_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_adaptive_limiter(name: str, **defaults: Any) -> AdaptiveConcurrencyLimiter:
+    """Limiteur partagé d'une dépendance (créé au premier appel)"""
+    limiter = adaptive_limiters.get(name)
+    if limiter is None:
+        limiter = adaptive_limiters[name] = AdaptiveConcurrencyLimiter.from_env(name, **defaults)
+    return limiter
+
+
+def register_adaptive_limiter(limiter: AdaptiveConcurrencyLimiter) -> AdaptiveConcurrencyLimiter:
+    """Expose un limiteur créé ailleurs (ex: pool de connexions) dans les stats"""
+    adaptive_limiters[limiter.name] = limiter
+    return limiter
+
+
+def get_adaptive_limits_stats() -> Dict[str, Any]:
+    return {name: limiter.get_stats() for name, limiter in adaptive_limiters.items()}
@@ -0,0 +1,62 @@
+"""
+🚦 AI Pipeline - Phoenix Luna Hub
+Étapes préalables à la génération IA exécutées en parallèle
+Oracle Directive: Latence & Performance
+
+- Contrôles d'admission (rate limit, énergie) et lectures indépendantes
+  (contexte narratif) lancés ensemble : un seul aller-retour au lieu de trois
+- Premier contrôle qui refuse → les autres tâches sont annulées et son
+  exception (HTTPException 429/402...) remonte telle quelle
+- Plusieurs refus : l'ordre de déclaration départage (rate limit avant énergie),
+  comme en exécution séquentielle
+- Les tâches héritent du contexte de la requête (échéance, appelant LLM)
+"""
+
+import time
+import asyncio
+from typing import Any, Awaitable, Dict, List, Optional
+import structlog
+
+logger = structlog.get_logger("ai_pipeline")
+
+
+async def admit_and_fetch(checks: List[Awaitable[Any]], fetches: Optional[Dict[str, Awaitable[Any]]] = None) -> Dict[str, Any]:
+    """
+    Lance contrôles et lectures en parallèle, renvoie le résultat des lectures par nom
+
+    Les lectures gèrent elles-mêmes leur valeur de repli : toute exception
+    (contrôle ou lecture) interrompt le pipeline.
+
+    Raises:
+        Exception: la première levée, dans l'ordre de déclaration des tâches
+    """
+    started = time.monotonic()
+    tasks = [asyncio.ensure_future(check) for check in checks]
+    named = {name: asyncio.ensure_future(fetch) for name, fetch in (fetches or {}).items()}
+    tasks.extend(named.values())
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        first = next((index for index, task in enumerate(tasks) if task in done and not task.cancelled() and task.exception() is not None), None)
+        if first is not None:
+            # Les tâches déclarées avant celle qui refuse vont à leur terme : le rate limit reste prioritaire
+            earlier = [task for task in tasks[:first] if not task.done()]
+            if earlier:
+                await asyncio.wait(earlier)
+    except BaseException:
+        # Requête annulée (client parti) : rien ne doit survivre en arrière-plan
+        for task in tasks:
+            task.cancel()
+        raise
+
+    if first is not None:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.debug("AI request rejected before generation", cancelled=len(pending),
+                     elapsed_ms=round((time.monotonic() - started) * 1000, 1))
+        failed = next(task for task in tasks if not task.cancelled() and task.exception() is not None)
+        raise failed.exception()
+
+    return {name: task.result() for name, task in named.items()}
@@ -0,0 +1,186 @@
+"""
+📦 Cache Codec - Phoenix Luna Hub
+Encodage binaire + compression transparente des valeurs du cache Redis
+Oracle Directive: Performance & Stabilité
+
+Format d'une entrée : [header 1 octet][payload]
+- bits 0-3 du header : identifiant du codec (json, msgpack...)
+- bit 4 du header    : payload compressé (zlib)
+
+Les entrées JSON historiques (sans header) commencent toujours par un
+caractère imprimable : elles restent décodables pendant le rollout.
+"""
+
+import os
+import json
+import zlib
+from typing import Any, Dict, Optional, Union
+import structlog
+
+logger = structlog.get_logger("cache_codec")
+
+MSGPACK_AVAILABLE = True
+try:
+    import msgpack
+except ImportError:
+    logger.warning("msgpack not available - cache codec falls back to JSON")
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+
+CODEC_ID_MASK = 0x0F
+COMPRESSED_FLAG = 0x10
+
+
+def _default_encoder(value: Any) -> Any:
+    """Conversion des types non natifs (parité avec json.dumps(default=str))"""
+    return str(value)
+
+
+class CacheCodec:
+    """Codec de base : transforme une valeur Python en octets et inversement"""
+
+    codec_id: int = 0
+    name: str = "base"
+
+    def dumps(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, payload: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(CacheCodec):
+    """Codec JSON (format historique du cache)"""
+
+    codec_id = 0x01
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=_default_encoder, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class MsgpackCodec(CacheCodec):
+    """Codec MessagePack : plus compact et plus rapide que JSON"""
+
+    codec_id = 0x02
+    name = "msgpack"
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=_default_encoder, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+class CacheSerializer:
+    """
+    📦 Sérialiseur pluggable pour RedisCache
+
+    Features:
+    - Codec préféré configurable (msgpack si disponible, sinon JSON)
+    - Compression zlib au-delà d'un seuil de taille
+    - Header de codec pour décoder n'importe quel format enregistré
+    - Lecture transparente des entrées JSON historiques
+    """
+
+    def __init__(
+        self,
+        preferred: Optional[str] = None,
+        compression_threshold: Optional[int] = None,
+        compression_level: Optional[int] = None
+    ):
+        self.codecs: Dict[int, CacheCodec] = {}
+        self.register(JsonCodec())
+        if MSGPACK_AVAILABLE:
+            self.register(MsgpackCodec())
+
+        preferred = preferred or os.getenv("CACHE_CODEC", "msgpack")
+        self.codec = self._select_codec(preferred)
+
+        self.compression_threshold = (
+            compression_threshold if compression_threshold is not None
+            else int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024"))
+        )
+        self.compression_level = (
+            compression_level if compression_level is not None
+            else int(os.getenv("CACHE_COMPRESSION_LEVEL", "6"))
+        )
+
+        self.stats = {
+            "encoded": 0,
+            "compressed": 0,
+            "bytes_raw": 0,
+            "bytes_stored": 0,
+            "legacy_decoded": 0
+        }
+
+    def register(self, codec: CacheCodec) -> None:
+        """Enregistre un codec (identifiant unique sur 4 bits)"""
+        if not 0 < codec.codec_id <= CODEC_ID_MASK:
+            raise ValueError(f"Invalid codec id: {codec.codec_id}")
+        self.codecs[codec.codec_id] = codec
+
+    def _select_codec(self, name: str) -> CacheCodec:
+        for codec in self.codecs.values():
+            if codec.name == name:
+                return codec
+        logger.warning("Cache codec unavailable, using JSON", requested=name)
+        return self.codecs[JsonCodec.codec_id]
+
+    def encode(self, value: Any) -> bytes:
+        """Encode une valeur avec header de codec (+ compression si volumineuse)"""
+        payload = self.codec.dumps(value)
+        header = self.codec.codec_id
+
+        self.stats["encoded"] += 1
+        self.stats["bytes_raw"] += len(payload)
+
+        if self.compression_threshold > 0 and len(payload) >= self.compression_threshold:
+            compressed = zlib.compress(payload, self.compression_level)
+            # Ne garder la version compressée que si elle est réellement plus petite
+            if len(compressed) < len(payload):
+                payload = compressed
+                header |= COMPRESSED_FLAG
+                self.stats["compressed"] += 1
+
+        self.stats["bytes_stored"] += len(payload) + 1
+        return bytes((header,)) + payload
+
+    def decode(self, raw: Union[bytes, str]) -> Any:
+        """Décode une entrée Redis (format codec ou JSON historique)"""
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        if not raw:
+            return None
+
+        header = raw[0]
+        codec = self.codecs.get(header & CODEC_ID_MASK) if header < 0x20 else None
+
+        if codec is None:
+            # Entrée historique : JSON brut sans header
+            self.stats["legacy_decoded"] += 1
+            try:
+                return json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                return raw.decode("utf-8", errors="replace")
+
+        payload = raw[1:]
+        if header & COMPRESSED_FLAG:
+            payload = zlib.decompress(payload)
+        return codec.loads(payload)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiques d'encodage (ratio de compression, volumes)"""
+        bytes_raw = self.stats["bytes_raw"]
+        ratio = (self.stats["bytes_stored"] / bytes_raw) if bytes_raw > 0 else 1.0
+        return {
+            "codec": self.codec.name,
+            "msgpack_available": MSGPACK_AVAILABLE,
+            "compression_threshold_bytes": self.compression_threshold,
+            "compression_ratio": round(ratio, 3),
+            **self.stats
+        }
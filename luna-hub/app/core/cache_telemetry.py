@@ -0,0 +1,175 @@
+"""
+📈 Cache Telemetry - Phoenix Luna Hub
+Compteurs par type de clé et histogrammes de latence du cache Redis
+Oracle Directive: Performance & Stabilité
+
+- Par key_type : hits, misses, sets, deletes, évictions, octets lus/écrits
+- Par opération (get, set, get_many...) : histogramme de latence à buckets fixes
+- Export JSON (/monitoring/cache/stats) et Prometheus
+"""
+
+import bisect
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+
+logger = structlog.get_logger("cache_telemetry")
+
+
+# Bornes supérieures des buckets de latence (ms) - style Prometheus
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+@dataclass
+class KeyTypeStats:
+    """Compteurs d'un type de clé"""
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    deletes: int = 0
+    evictions: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+    @property
+    def hit_rate_pct(self) -> float:
+        total = self.hits + self.misses
+        return round(self.hits / total * 100, 2) if total > 0 else 0.0
+
+    @property
+    def avg_value_bytes(self) -> float:
+        return round(self.bytes_written / self.sets, 1) if self.sets > 0 else 0.0
+
+
+class LatencyHistogram:
+    """Histogramme cumulable à buckets fixes (mémoire constante)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)  # dernier = +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, latency_ms)] += 1
+        self.count += 1
+        self.sum_ms += latency_ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimation d'un quantile (borne supérieure du bucket atteint)"""
+        if self.count == 0:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def cumulative_buckets(self) -> List[Tuple[str, int]]:
+        """Buckets cumulés [(le, count)] au format Prometheus"""
+        result = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            result.append((f"{bound:g}", cumulative))
+        result.append(("+Inf", self.count))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(self.cumulative_buckets())
+        }
+
+
+class CacheTelemetry:
+    """
+    📈 Télémétrie du cache par type de clé et par opération
+
+    Les key_types sont des constantes du code (cardinalité bornée) :
+    ils peuvent servir de label Prometheus sans risque d'explosion.
+    """
+
+    def __init__(self):
+        self.key_types: Dict[str, KeyTypeStats] = {}
+        self.latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def _key_type_stats(self, key_type: str) -> KeyTypeStats:
+        stats = self.key_types.get(key_type)
+        if stats is None:
+            stats = self.key_types[key_type] = KeyTypeStats()
+        return stats
+
+    def observe_latency(self, operation: str, key_type: str, latency_ms: float) -> None:
+        histogram = self.latency.get((operation, key_type))
+        if histogram is None:
+            histogram = self.latency[(operation, key_type)] = LatencyHistogram()
+        histogram.observe(latency_ms)
+
+    def record_get(self, key_type: str, hits: int, misses: int, bytes_read: int = 0) -> None:
+        stats = self._key_type_stats(key_type)
+        stats.hits += hits
+        stats.misses += misses
+        stats.bytes_read += bytes_read
+
+    def record_set(self, key_type: str, count: int, bytes_written: int = 0) -> None:
+        stats = self._key_type_stats(key_type)
+        stats.sets += count
+        stats.bytes_written += bytes_written
+
+    def record_delete(self, key_type: str, count: int) -> None:
+        self._key_type_stats(key_type).deletes += count
+
+    def record_eviction(self, key_type: str, count: int = 1) -> None:
+        self._key_type_stats(key_type).evictions += count
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Vue JSON : compteurs par key_type + histogrammes par opération"""
+        key_types = {
+            key_type: {
+                **asdict(stats),
+                "hit_rate_pct": stats.hit_rate_pct,
+                "avg_value_bytes": stats.avg_value_bytes
+            }
+            for key_type, stats in sorted(self.key_types.items())
+        }
+
+        latency: Dict[str, Dict[str, Any]] = {}
+        for (operation, key_type), histogram in sorted(self.latency.items()):
+            latency.setdefault(operation, {})[key_type] = histogram.to_dict()
+
+        return {"key_types": key_types, "latency": latency}
+
+    def prometheus_lines(self, prefix: str = "phoenix_cache") -> List[str]:
+        """Export au format texte Prometheus (compteurs + histogrammes)"""
+        lines: List[str] = []
+
+        counters = ("hits", "misses", "sets", "deletes", "evictions", "bytes_read", "bytes_written")
+        for counter in counters:
+            name = f"{prefix}_{counter}_total"
+            lines.append(f"# HELP {name} Cache {counter.replace('_', ' ')} per key type")
+            lines.append(f"# TYPE {name} counter")
+            for key_type, stats in sorted(self.key_types.items()):
+                lines.append(f'{name}{{key_type="{key_type}"}} {getattr(stats, counter)}')
+
+        name = f"{prefix}_operation_duration_ms"
+        lines.append(f"# HELP {name} Cache operation latency in milliseconds")
+        lines.append(f"# TYPE {name} histogram")
+        for (operation, key_type), histogram in sorted(self.latency.items()):
+            labels = f'operation="{operation}",key_type="{key_type}"'
+            for bound, cumulative in histogram.cumulative_buckets():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {round(histogram.sum_ms, 3)}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        return lines
+
+    def reset(self) -> None:
+        self.key_types.clear()
+        self.latency.clear()
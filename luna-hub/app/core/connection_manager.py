@@ -4,16 +4,28 @@ Connection pooling et retry automatique pour Supabase
 Directive Oracle: Stabilité & Résilience
 """
 
+import os
 import asyncio
 import time
-from typing import Optional, Dict, Any, Callable, Union
+import random
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Callable, List, Set, Union
 from dataclasses import dataclass
 from enum import Enum
 import structlog
 from datetime import datetime, timezone
 
+from .adaptive_limiter import AdaptiveConcurrencyLimiter, OverloadedError, register_adaptive_limiter
+from .latency_sketch import QuantileSketch, RollingLatencySketch, WINDOWS_MINUTES
+from .request_deadline import DeadlineExceededError, can_finish_within, check_deadline, clamp_timeout, remaining
+
 logger = structlog.get_logger()
 
+# Appels bloquants lancés par la tentative en cours (run_in_pool → _attempt)
+_attempt_calls: ContextVar[Optional[List[Future]]] = ContextVar("pool_attempt_calls", default=None)
+
 
 class RetryStrategy(Enum):
     """Stratégies de retry"""
@@ -31,10 +43,110 @@ class ConnectionPoolConfig:
     idle_timeout: float = 300.0  # 5 minutes
     retry_attempts: int = 3
     retry_strategy: RetryStrategy = RetryStrategy.EXPONENTIAL_BACKOFF
-    initial_retry_delay: float = 1.0
-    max_retry_delay: float = 30.0
+    initial_retry_delay: float = 0.2
+    max_retry_delay: float = 5.0
+    retry_jitter: bool = True          # "full jitter" : délai tiré dans [0, backoff]
+    retry_budget_ratio: float = 0.1    # retries ≤ 10% des requêtes de la fenêtre
+    retry_budget_min: int = 10         # plancher de retries par fenêtre (faible trafic)
+    retry_budget_window: float = 10.0  # secondes
+    hedge_percentile: float = 0.95     # requête de couverture après le p95 observé
+    hedge_min_delay_ms: float = 10.0
+    hedge_min_samples: int = 20        # pas de hedging sans historique suffisant
     circuit_breaker_threshold: int = 5
     circuit_breaker_timeout: float = 60.0
+    max_queue_size: int = 50       # Requêtes en attente avant délestage
+    queue_timeout: float = 2.0     # Attente max d'une connexion (secondes)
+    latency_target_ms: float = 500.0  # Au-delà : réduction de la limite adaptative
+    
+    @classmethod
+    def from_env(cls, operation_class: Optional[str] = None, **defaults: Any) -> "ConnectionPoolConfig":
+        """
+        Configuration depuis les variables DB_POOL_*
+        
+        Pour une classe d'opérations, DB_POOL_<CLASSE>_<PARAM> prime sur DB_POOL_<PARAM>
+        (ex: DB_POOL_EVENT_WRITES_MAX_CONNECTIONS).
+        """
+        def env(key: str, default: Any) -> str:
+            if operation_class:
+                value = os.getenv(f"DB_POOL_{operation_class.upper()}_{key}")
+                if value is not None:
+                    return value
+            return os.getenv(f"DB_POOL_{key}", str(defaults.get(key.lower(), default)))
+        
+        return cls(
+            min_connections=int(env("MIN_CONNECTIONS", 2)),
+            max_connections=int(env("MAX_CONNECTIONS", 10)),
+            connection_timeout=float(env("CONNECTION_TIMEOUT", 30.0)),
+            idle_timeout=float(env("IDLE_TIMEOUT", 300.0)),
+            max_queue_size=int(env("MAX_QUEUE_SIZE", 50)),
+            queue_timeout=float(env("QUEUE_TIMEOUT", 2.0)),
+            latency_target_ms=float(env("LATENCY_TARGET_MS", 500.0)),
+            retry_attempts=int(env("RETRY_ATTEMPTS", 3)),
+            initial_retry_delay=float(env("INITIAL_RETRY_DELAY", 0.2)),
+            max_retry_delay=float(env("MAX_RETRY_DELAY", 5.0)),
+            retry_budget_ratio=float(env("RETRY_BUDGET_RATIO", 0.1)),
+            retry_budget_min=int(env("RETRY_BUDGET_MIN", 10)),
+            hedge_percentile=float(env("HEDGE_PERCENTILE", 0.95)),
+            circuit_breaker_threshold=int(env("CIRCUIT_BREAKER_THRESHOLD", 5)),
+            circuit_breaker_timeout=float(env("CIRCUIT_BREAKER_TIMEOUT", 60.0))
+        )
+
+
+class PoolSaturatedError(OverloadedError):
+    """Pool saturé : requête délestée (file pleine ou attente trop longue)"""
+    pass
+
+
+class RetryBudget:
+    """
+    🪙 Budget de retries sur fenêtre glissante
+    
+    Les retries (et requêtes de couverture) sont plafonnés à `ratio` × requêtes
+    récentes, avec un plancher `min_retries` : une panne partielle ne multiplie
+    plus la charge par le nombre de tentatives.
+    """
+    
+    def __init__(self, ratio: float = 0.1, min_retries: int = 10, window: float = 10.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._buckets: deque = deque()  # [seconde, requêtes, retries]
+        self.exhausted = 0
+    
+    def _current_bucket(self) -> list:
+        now = int(time.monotonic())
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+        return self._buckets[-1]
+    
+    def _totals(self) -> tuple:
+        self._current_bucket()
+        return sum(b[1] for b in self._buckets), sum(b[2] for b in self._buckets)
+    
+    def record_request(self) -> None:
+        self._current_bucket()[1] += 1
+    
+    def try_spend(self) -> bool:
+        """Consomme un retry si le budget le permet"""
+        requests, retries = self._totals()
+        if retries >= max(self.min_retries, requests * self.ratio):
+            self.exhausted += 1
+            return False
+        self._current_bucket()[2] += 1
+        return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        requests, retries = self._totals()
+        return {
+            "ratio": self.ratio,
+            "min_retries": self.min_retries,
+            "window_s": self.window,
+            "requests_in_window": requests,
+            "retries_in_window": retries,
+            "exhausted": self.exhausted
+        }
 
 
 @dataclass  
@@ -44,8 +156,13 @@ class ConnectionStats:
     successful_requests: int = 0
     failed_requests: int = 0
     retried_requests: int = 0
+    hedged_requests: int = 0
+    hedge_wins: int = 0
     circuit_breaker_trips: int = 0
-    avg_response_time_ms: float = 0.0
+    shed_requests: int = 0
+    queue_timeouts: int = 0
+    abandoned_calls: int = 0
+    avg_queue_wait_ms: float = 0.0
     last_error: Optional[str] = None
     last_success: Optional[datetime] = None
 
@@ -57,40 +174,331 @@ class CircuitBreakerState(Enum):
     HALF_OPEN = "half_open"  # Test
 
 
+class CircuitOpenError(OverloadedError):
+    """Circuit ouvert : la dépendance n'est pas appelée"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    ⚡ Circuit breaker nommé (un par dépendance / classe d'opérations)
+    
+    CLOSED → OPEN après `threshold` échecs, OPEN → HALF_OPEN après `timeout`,
+    HALF_OPEN laisse passer une seule requête sonde. Une sonde sans issue
+    (annulée, échéance) est rendue par release_probe() ; à défaut, elle est
+    considérée perdue après `probe_timeout` et une nouvelle sonde part.
+    """
+    
+    def __init__(self, name: str, threshold: int = 5, timeout: float = 60.0, probe_timeout: Optional[float] = None):
+        self.name = name
+        self.threshold = threshold
+        self.timeout = timeout
+        self.probe_timeout = probe_timeout if probe_timeout is not None else min(timeout, 30.0)
+        self.state = CircuitBreakerState.CLOSED
+        self.failure_count = 0
+        self.next_attempt: Optional[float] = None
+        self.trips = 0
+        self.rejected = 0
+        self.lost_probes = 0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self._probe_generation = 0
+    
+    def _start_probe(self) -> None:
+        self._probe_in_flight = True
+        self._probe_started = time.time()
+        self._probe_generation += 1
+    
+    def allow_request(self) -> bool:
+        """La requête peut-elle appeler la dépendance ?"""
+        if self.state == CircuitBreakerState.CLOSED:
+            return True
+        
+        if self.state == CircuitBreakerState.OPEN:
+            if self.next_attempt and time.time() >= self.next_attempt:
+                self.state = CircuitBreakerState.HALF_OPEN
+                self._start_probe()
+                logger.info("Circuit breaker: OPEN → HALF_OPEN", breaker=self.name)
+                return True
+            self.rejected += 1
+            return False
+        
+        # HALF_OPEN : une seule sonde à la fois
+        if self._probe_in_flight:
+            if time.time() - self._probe_started < self.probe_timeout:
+                self.rejected += 1
+                return False
+            # Sonde jamais conclue (annulation non rendue) : le circuit ne reste pas bloqué
+            self.lost_probes += 1
+            logger.warning("Circuit breaker probe lost, starting a new one", breaker=self.name)
+        self._start_probe()
+        return True
+    
+    def check(self) -> Optional[int]:
+        """
+        Lève CircuitOpenError si la dépendance ne doit pas être appelée
+        
+        Returns:
+            Génération de la sonde si cet appel est la sonde HALF_OPEN (à rendre
+            via release_probe() s'il se termine sans succès ni échec), sinon None
+        """
+        if not self.allow_request():
+            raise self.open_error()
+        return self.current_probe()
+    
+    def open_error(self) -> CircuitOpenError:
+        """Refus d'un allow_request() déjà compté, avec Retry-After jusqu'à la prochaine sonde"""
+        retry_after = max(1.0, (self.next_attempt or time.time()) - time.time())
+        return CircuitOpenError(f"Circuit breaker OPEN for {self.name}", retry_after=retry_after)
+    
+    def current_probe(self) -> Optional[int]:
+        """Génération de la sonde en cours (juste après allow_request()), None hors HALF_OPEN"""
+        if self.state == CircuitBreakerState.HALF_OPEN and self._probe_in_flight:
+            return self._probe_generation
+        return None
+    
+    def release_probe(self, generation: Optional[int]) -> None:
+        """Sonde terminée sans verdict (annulée, échéance, délestage local) : la suivante peut partir"""
+        if (generation is not None and self._probe_in_flight
+                and self.state == CircuitBreakerState.HALF_OPEN and generation == self._probe_generation):
+            self._probe_in_flight = False
+    
+    def record_success(self) -> None:
+        self._probe_in_flight = False
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            # Retour à CLOSED après succès en HALF_OPEN
+            self.state = CircuitBreakerState.CLOSED
+            self.failure_count = 0
+            logger.info("Circuit breaker: HALF_OPEN → CLOSED (success)", breaker=self.name)
+        elif self.state == CircuitBreakerState.CLOSED:
+            # Reset failure count on success
+            self.failure_count = max(0, self.failure_count - 1)
+    
+    def record_failure(self) -> None:
+        self._probe_in_flight = False
+        self.failure_count += 1
+        
+        if self.state == CircuitBreakerState.HALF_OPEN or self.failure_count >= self.threshold:
+            if self.state != CircuitBreakerState.OPEN:
+                self.state = CircuitBreakerState.OPEN
+                self.next_attempt = time.time() + self.timeout
+                self.trips += 1
+                
+                logger.error("Circuit breaker OPENED",
+                           breaker=self.name,
+                           failure_count=self.failure_count,
+                           threshold=self.threshold,
+                           next_attempt_in=f"{self.timeout}s")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "failure_count": self.failure_count,
+            "threshold": self.threshold,
+            "timeout": self.timeout,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "lost_probes": self.lost_probes
+        }
+
+
+# Breakers par dépendance
+circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str, threshold: int = 5, timeout: float = 60.0,
+                        probe_timeout: Optional[float] = None) -> CircuitBreaker:
+    """Breaker partagé d'une dépendance (créé au premier appel)"""
+    breaker = circuit_breakers.get(name)
+    if breaker is None:
+        breaker = circuit_breakers[name] = CircuitBreaker(name, threshold, timeout, probe_timeout)
+    return breaker
+
+
 class ConnectionPoolManager:
     """
     🔄 Gestionnaire de pool de connexions avec circuit breaker
     
     Features:
-    - Pool de connexions configurables
+    - Pool borné : max_connections opérations simultanées (threads dédiés)
+    - File d'admission bornée avec timeout, délestage immédiat si pleine
     - Retry automatique avec backoff
     - Circuit breaker pour éviter cascades
     - Métriques et monitoring
     - Health checks périodiques
     """
     
-    def __init__(self, config: Optional[ConnectionPoolConfig] = None):
+    def __init__(self, config: Optional[ConnectionPoolConfig] = None, name: str = "supabase"):
+        self.name = name
         self.config = config or ConnectionPoolConfig()
         self.stats = ConnectionStats()
         
-        # Circuit breaker
-        self.circuit_state = CircuitBreakerState.CLOSED
-        self.circuit_failure_count = 0
-        self.circuit_last_failure = None
-        self.circuit_next_attempt = None
+        # Circuit breaker propre au pool (une panne d'une classe d'opérations
+        # n'ouvre pas le circuit des autres)
+        self.breaker = get_circuit_breaker(
+            name,
+            threshold=self.config.circuit_breaker_threshold,
+            timeout=self.config.circuit_breaker_timeout
+        )
         
-        # Pool state
+        # Pool state : capacité = limite adaptative AIMD bornée par max_connections
         self.active_connections = 0
-        self.connection_semaphore = asyncio.Semaphore(self.config.max_connections)
+        self._slot_condition = asyncio.Condition()
+        self.limiter: AdaptiveConcurrencyLimiter = AdaptiveConcurrencyLimiter.from_env(
+            name,
+            initial_limit=self.config.max_connections,
+            min_limit=self.config.min_connections,
+            max_limit=self.config.max_connections,
+            latency_target_ms=self.config.latency_target_ms
+        )
+        register_adaptive_limiter(self.limiter)
+        
+        # File d'admission
+        self.queue_depth = 0
+        self.max_queue_depth_seen = 0
+        self.queue_wait_samples: deque = deque(maxlen=1000)
+        
+        # Retries bornés + latences réussies (délai de hedging = p95 observé)
+        self.retry_budget = RetryBudget(
+            ratio=self.config.retry_budget_ratio,
+            min_retries=self.config.retry_budget_min,
+            window=self.config.retry_budget_window
+        )
+        self.latency_samples: deque = deque(maxlen=1000)
+        
+        # Distribution de latence bout-en-bout (retries compris) par operation_name
+        self.operation_latency: Dict[str, RollingLatencySketch] = {}
+        
+        # Threads dédiés aux appels bloquants (client Supabase synchrone) : un
+        # thread par slot, le slot n'est rendu qu'à la fin du thread
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.max_connections,
+            thread_name_prefix=f"db-pool-{name}"
+        )
+        self._abandoned: Set[asyncio.Task] = set()
         
         logger.info("Connection Pool Manager initialized", 
+                   pool=name,
                    max_connections=self.config.max_connections,
+                   max_queue_size=self.config.max_queue_size,
                    retry_attempts=self.config.retry_attempts)
     
+    @property
+    def circuit_state(self) -> CircuitBreakerState:
+        return self.breaker.state
+    
+    @property
+    def circuit_failure_count(self) -> int:
+        return self.breaker.failure_count
+    
+    async def run_in_pool(self, func: Callable, *args) -> Any:
+        """
+        Exécute un appel bloquant dans un thread du pool (sans bloquer la boucle)
+
+        Un thread ne s'interrompt pas : si la tentative expire ou est annulée,
+        elle garde son slot jusqu'à la fin de l'appel (voir _attempt).
+        """
+        call = self._executor.submit(func, *args)
+        calls = _attempt_calls.get()
+        if calls is not None:
+            calls.append(call)
+        return await asyncio.wrap_future(call)
+    
+    async def run_query(
+        self,
+        func: Callable,
+        operation_name: str = "database_operation",
+        idempotent: bool = False
+    ) -> Any:
+        """
+        Appel bloquant (ex: query.execute) avec admission, retry et circuit breaker
+        
+        idempotent=True (lectures) active les requêtes de couverture (hedging).
+        """
+        async def _operation():
+            return await self.run_in_pool(func)
+        return await self.execute_with_retry(_operation, operation_name=operation_name, hedge=idempotent)
+    
+    async def _acquire_slot(self, operation_name: str) -> None:
+        """
+        🚦 Admission dans le pool
+        
+        Raises:
+            PoolSaturatedError: file pleine (délestage) ou attente > queue_timeout
+        """
+        # Chemin rapide : slot libre, pas d'attente
+        if self.active_connections < self._capacity() and self.queue_depth == 0:
+            self._take_slot()
+            self.queue_wait_samples.append(0.0)
+            return
+        
+        if self.queue_depth >= self.config.max_queue_size:
+            self.stats.shed_requests += 1
+            self.limiter.note_rejected()
+            logger.warning("Connection pool saturated, shedding request",
+                         operation=operation_name,
+                         queue_depth=self.queue_depth)
+            raise PoolSaturatedError(
+                f"Connection pool saturated for {operation_name}",
+                retry_after=self.config.queue_timeout
+            )
+        
+        # Pas d'attente au-delà de l'échéance de la requête
+        left = remaining()
+        queue_timeout = self.config.queue_timeout if left is None else min(self.config.queue_timeout, left)
+        
+        self.queue_depth += 1
+        self.max_queue_depth_seen = max(self.max_queue_depth_seen, self.queue_depth)
+        wait_start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._wait_for_slot(), timeout=queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats.queue_timeouts += 1
+            self.stats.shed_requests += 1
+            self.limiter.note_rejected()
+            logger.warning("Connection pool queue timeout",
+                         operation=operation_name,
+                         queue_timeout=self.config.queue_timeout)
+            raise PoolSaturatedError(
+                f"Connection pool queue timeout for {operation_name}",
+                retry_after=self.config.queue_timeout
+            )
+        finally:
+            self.queue_depth -= 1
+        
+        wait_ms = (time.monotonic() - wait_start) * 1000
+        self.queue_wait_samples.append(wait_ms)
+        self.stats.avg_queue_wait_ms = (
+            wait_ms if self.stats.avg_queue_wait_ms == 0
+            else self.stats.avg_queue_wait_ms * 0.9 + wait_ms * 0.1
+        )
+    
+    def _capacity(self) -> int:
+        """Slots disponibles : limite adaptative courante (≤ max_connections)"""
+        return max(1, min(self.config.max_connections, self.limiter.limit))
+    
+    def _take_slot(self) -> None:
+        self.active_connections += 1
+        self.limiter.start()
+    
+    async def _wait_for_slot(self) -> None:
+        async with self._slot_condition:
+            await self._slot_condition.wait_for(lambda: self.active_connections < self._capacity())
+            self._take_slot()
+    
+    async def _release_slot(self, latency_ms: float, success: bool) -> None:
+        """Libère un slot, nourrit l'AIMD et réveille les requêtes en file"""
+        self.active_connections -= 1
+        self.limiter.release(latency_ms, success)
+        if self.queue_depth:
+            async with self._slot_condition:
+                self._slot_condition.notify(max(1, self._capacity() - self.active_connections))
+    
     async def execute_with_retry(
         self,
         operation: Callable,
         operation_name: str = "database_operation",
+        hedge: bool = False,
         **kwargs
     ) -> Any:
         """
@@ -99,48 +507,68 @@ class ConnectionPoolManager:
         Args:
             operation: Fonction à exécuter  
             operation_name: Nom pour logging
+            hedge: Opération idempotente : une 2e tentative part si la 1re dépasse le p95
             **kwargs: Arguments pour l'opération
             
         Returns:
             Résultat de l'opération
             
         Raises:
-            Exception: Si toutes les tentatives échouent
+            CircuitOpenError: Si le circuit du pool est ouvert
+            PoolSaturatedError: Si le pool est saturé (non retenté)
+            DeadlineExceededError: Si l'échéance de la requête ne laisse plus le temps d'aboutir
+            Exception: Si toutes les tentatives échouent ou si le budget de retries est épuisé
         """
         
-        # Vérifier circuit breaker
-        if not await self._check_circuit_breaker():
-            raise Exception(f"Circuit breaker OPEN for {operation_name}")
-        
+        # Vérifier circuit breaker et échéance de la requête
+        probe = self.breaker.check()
+        try:
+            check_deadline(operation_name)
+            return await self._execute_with_retry(operation, operation_name, hedge, kwargs)
+        finally:
+            # Sonde HALF_OPEN sortie sans succès ni échec enregistré (délestage,
+            # échéance, annulation) : rendue, sinon le circuit refuserait tout
+            self.breaker.release_probe(probe)
+    
+    async def _execute_with_retry(
+        self,
+        operation: Callable,
+        operation_name: str,
+        hedge: bool,
+        kwargs: Dict[str, Any]
+    ) -> Any:
         last_exception = None
         start_time = time.time()
+        self.retry_budget.record_request()
         
         for attempt in range(1, self.config.retry_attempts + 1):
+            # Timeout de la tentative rogné sur le temps restant de la requête
+            timeout = clamp_timeout(self.config.connection_timeout, operation_name)
             try:
-                # Acquérir une connexion du pool
-                async with self.connection_semaphore:
-                    self.active_connections += 1
-                    
-                    try:
-                        # Exécuter l'opération avec timeout
-                        result = await asyncio.wait_for(
-                            operation(**kwargs),
-                            timeout=self.config.connection_timeout
-                        )
-                        
-                        # Succès !
-                        await self._record_success(start_time)
-                        return result
-                        
-                    finally:
-                        self.active_connections -= 1
+                # PoolSaturatedError remonte sans retry : réessayer sur un pool
+                # saturé ne ferait qu'aggraver la file
+                if hedge:
+                    result = await self._hedged_attempt(operation, operation_name, timeout, kwargs)
+                else:
+                    result = await self._attempt(operation, operation_name, timeout, kwargs)
+                
+                # Succès !
+                await self._record_success(start_time, operation_name)
+                return result
+            
+            except OverloadedError:
+                raise
                         
             except asyncio.TimeoutError as e:
+                if timeout < self.config.connection_timeout:
+                    # Coupée par l'échéance de la requête, pas par la base :
+                    # ni retry ni échec compté pour le circuit breaker
+                    raise DeadlineExceededError(operation_name) from e
                 last_exception = e
                 logger.warning("Operation timeout", 
                              operation=operation_name,
                              attempt=attempt,
-                             timeout=self.config.connection_timeout)
+                             timeout=timeout)
                              
             except Exception as e:
                 last_exception = e
@@ -149,19 +577,127 @@ class ConnectionPoolManager:
                              attempt=attempt,
                              error=str(e))
             
-            # Retry delay (sauf dernière tentative)
+            # Retry (sauf dernière tentative) si le budget le permet
             if attempt < self.config.retry_attempts:
+                if not self.retry_budget.try_spend():
+                    logger.warning("Retry budget exhausted, giving up",
+                                 operation=operation_name,
+                                 attempt=attempt)
+                    break
+                
                 delay = self._calculate_retry_delay(attempt)
+                if not can_finish_within(delay):
+                    logger.warning("Skipping retry, request deadline too close",
+                                 operation=operation_name,
+                                 attempt=attempt)
+                    await self._record_failure(last_exception, start_time, operation_name)
+                    raise DeadlineExceededError(operation_name) from last_exception
+                
+                self.stats.retried_requests += 1
                 logger.info("Retrying operation",
                            operation=operation_name,
                            attempt=attempt,
-                           next_attempt_in=f"{delay}s")
+                           next_attempt_in=f"{delay:.3f}s")
                 await asyncio.sleep(delay)
         
         # Toutes les tentatives ont échoué
-        await self._record_failure(last_exception)
+        await self._record_failure(last_exception, start_time, operation_name)
         raise last_exception
     
+    async def _attempt(
+        self,
+        operation: Callable,
+        operation_name: str,
+        timeout: float,
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """Une tentative : slot du pool, timeout, échantillon AIMD"""
+        await self._acquire_slot(operation_name)
+        attempt_start = time.monotonic()
+        attempt_ok = False
+        calls: List[Future] = []
+        token = _attempt_calls.set(calls)
+        try:
+            result = await asyncio.wait_for(operation(**kwargs), timeout=timeout)
+            attempt_ok = True
+            return result
+        finally:
+            _attempt_calls.reset(token)
+            running = [call for call in calls if not call.done()]
+            if running:
+                # Expirée / annulée mais le thread occupe toujours sa connexion
+                self._release_when_done(running, attempt_start)
+            else:
+                latency_ms = (time.monotonic() - attempt_start) * 1000
+                if attempt_ok:
+                    self.latency_samples.append(latency_ms)
+                await self._release_slot(latency_ms, attempt_ok)
+    
+    def _release_when_done(self, calls: List[Future], attempt_start: float) -> None:
+        """Slot rendu à la fin des threads abandonnés (échantillon AIMD = occupation réelle)"""
+        self.stats.abandoned_calls += 1
+        
+        async def _release():
+            await asyncio.gather(*(asyncio.wrap_future(call) for call in calls), return_exceptions=True)
+            await self._release_slot((time.monotonic() - attempt_start) * 1000, False)
+        
+        task = asyncio.get_running_loop().create_task(_release())
+        self._abandoned.add(task)
+        task.add_done_callback(self._abandoned.discard)
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """Délai avant la requête de couverture (secondes), None sans historique"""
+        if len(self.latency_samples) < self.config.hedge_min_samples:
+            return None
+        delay_ms = self._percentile(self.latency_samples, self.config.hedge_percentile)
+        return max(delay_ms, self.config.hedge_min_delay_ms) / 1000
+    
+    async def _hedged_attempt(
+        self,
+        operation: Callable,
+        operation_name: str,
+        timeout: float,
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        """
+        🪃 Tentative couverte : si la 1re dépasse le p95 observé, une 2e part en
+        parallèle (slot libre + budget de retries requis) ; la première réponse gagne.
+        """
+        primary = asyncio.ensure_future(self._attempt(operation, operation_name, timeout, kwargs))
+        delay = self._hedge_delay()
+        if delay is None:
+            return await primary
+        
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        
+        # Jamais de file pour une couverture : uniquement sur capacité libre
+        slot_free = self.active_connections < self._capacity() and self.queue_depth == 0
+        if not slot_free or not self.retry_budget.try_spend():
+            return await primary
+        
+        self.stats.hedged_requests += 1
+        hedge_task = asyncio.ensure_future(self._attempt(operation, operation_name, timeout, kwargs))
+        pending = {primary, hedge_task}
+        errors = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    errors.append(task.exception())
+        finally:
+            # Le perdant est annulé (son slot est libéré à la fin de son thread)
+            for task in pending:
+                task.cancel()
+        
+        # Les deux ont échoué : privilégier l'erreur de la dépendance sur le délestage
+        raise next((e for e in errors if not isinstance(e, OverloadedError)), errors[0])
+    
     def _calculate_retry_delay(self, attempt: int) -> float:
         """📈 Calcule le délai de retry selon la stratégie"""
         
@@ -174,80 +710,78 @@ class ConnectionPoolManager:
         elif self.config.retry_strategy == RetryStrategy.EXPONENTIAL_BACKOFF:
             delay = self.config.initial_retry_delay * (2 ** (attempt - 1))
         
-        # Appliquer le maximum
-        return min(delay, self.config.max_retry_delay)
+        # Appliquer le maximum, puis "full jitter" : les clients ne se
+        # resynchronisent pas sur les mêmes instants de retry
+        delay = min(delay, self.config.max_retry_delay)
+        if self.config.retry_jitter:
+            delay = random.uniform(0, delay)
+        return delay
     
-    async def _check_circuit_breaker(self) -> bool:
-        """⚡ Vérification du circuit breaker"""
-        
-        now = time.time()
-        
-        if self.circuit_state == CircuitBreakerState.CLOSED:
-            return True
-            
-        elif self.circuit_state == CircuitBreakerState.OPEN:
-            # Vérifier si on peut passer en HALF_OPEN
-            if (self.circuit_next_attempt and 
-                now >= self.circuit_next_attempt):
-                self.circuit_state = CircuitBreakerState.HALF_OPEN
-                logger.info("Circuit breaker: OPEN → HALF_OPEN")
-                return True
-            return False
-            
-        elif self.circuit_state == CircuitBreakerState.HALF_OPEN:
-            # En test - autoriser une tentative
-            return True
-        
-        return False
+    def _record_latency(self, operation_name: str, start_time: float) -> None:
+        sketch = self.operation_latency.get(operation_name)
+        if sketch is None:
+            sketch = self.operation_latency[operation_name] = RollingLatencySketch()
+        sketch.record((time.time() - start_time) * 1000)
     
-    async def _record_success(self, start_time: float) -> None:
+    async def _record_success(self, start_time: float, operation_name: str = "database_operation") -> None:
         """✅ Enregistre un succès"""
         
-        response_time = (time.time() - start_time) * 1000  # ms
-        
         self.stats.total_requests += 1
         self.stats.successful_requests += 1
         self.stats.last_success = datetime.now(timezone.utc)
-        
-        # Mettre à jour moyenne response time
-        if self.stats.avg_response_time_ms == 0:
-            self.stats.avg_response_time_ms = response_time
-        else:
-            # Moyenne mobile
-            self.stats.avg_response_time_ms = (
-                self.stats.avg_response_time_ms * 0.9 + response_time * 0.1
-            )
+        self._record_latency(operation_name, start_time)
         
         # Circuit breaker: succès
-        if self.circuit_state == CircuitBreakerState.HALF_OPEN:
-            # Retour à CLOSED après succès en HALF_OPEN
-            self.circuit_state = CircuitBreakerState.CLOSED
-            self.circuit_failure_count = 0
-            logger.info("Circuit breaker: HALF_OPEN → CLOSED (success)")
-        elif self.circuit_state == CircuitBreakerState.CLOSED:
-            # Reset failure count on success
-            self.circuit_failure_count = max(0, self.circuit_failure_count - 1)
+        self.breaker.record_success()
     
-    async def _record_failure(self, exception: Exception) -> None:
+    async def _record_failure(
+        self,
+        exception: Exception,
+        start_time: Optional[float] = None,
+        operation_name: str = "database_operation"
+    ) -> None:
         """❌ Enregistre un échec"""
         
+        if start_time is not None:
+            self._record_latency(operation_name, start_time)
         self.stats.total_requests += 1
         self.stats.failed_requests += 1
         self.stats.last_error = str(exception)
         
         # Circuit breaker: échec
-        self.circuit_failure_count += 1
-        
-        if self.circuit_failure_count >= self.config.circuit_breaker_threshold:
-            if self.circuit_state != CircuitBreakerState.OPEN:
-                self.circuit_state = CircuitBreakerState.OPEN
-                self.circuit_next_attempt = time.time() + self.config.circuit_breaker_timeout
-                self.stats.circuit_breaker_trips += 1
-                
-                logger.error("Circuit breaker OPENED",
-                           failure_count=self.circuit_failure_count,
-                           threshold=self.config.circuit_breaker_threshold,
-                           next_attempt_in=f"{self.config.circuit_breaker_timeout}s")
+        self.breaker.record_failure()
+        self.stats.circuit_breaker_trips = self.breaker.trips
+    
+    @staticmethod
+    def _percentile(samples: deque, percentile: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile))
+        return round(ordered[index], 2)
+    
+    def _queue_wait_percentile(self, percentile: float) -> float:
+        return self._percentile(self.queue_wait_samples, percentile)
+    
+    def latency_window(self, minutes: int) -> QuantileSketch:
+        """Distribution toutes opérations confondues sur la fenêtre"""
+        merged = QuantileSketch()
+        for sketch in self.operation_latency.values():
+            merged.merge(sketch.window(minutes))
+        return merged
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """p50/p90/p99/max par opération sur fenêtres glissantes (1m, 5m, 15m)"""
+        return {
+            "all": {f"{minutes}m": self.latency_window(minutes).summary() for minutes in WINDOWS_MINUTES},
+            "operations": {
+                operation: sketch.summary()
+                for operation, sketch in sorted(self.operation_latency.items())
+            }
+        }
+    
+    def _avg_response_time_ms(self) -> float:
+        return self.latency_window(5).summary()["avg_ms"] or 0.0
     
     def get_pool_stats(self) -> Dict[str, Any]:
         """📊 Statistiques du pool de connexions"""
@@ -258,24 +792,52 @@ class ConnectionPoolManager:
         )
         
         return {
+            "pool": self.name,
             "pool_config": {
                 "max_connections": self.config.max_connections,
+                "max_queue_size": self.config.max_queue_size,
+                "queue_timeout": self.config.queue_timeout,
                 "connection_timeout": self.config.connection_timeout,
                 "retry_attempts": self.config.retry_attempts,
                 "retry_strategy": self.config.retry_strategy.value
             },
             "pool_state": {
                 "active_connections": self.active_connections,
+                "abandoned_calls": self.stats.abandoned_calls,
+                "abandoned_in_flight": len(self._abandoned),
+                "queue_depth": self.queue_depth,
+                "max_queue_depth_seen": self.max_queue_depth_seen,
                 "circuit_breaker_state": self.circuit_state.value,
                 "circuit_failure_count": self.circuit_failure_count
             },
+            "adaptive_limit": self.limiter.get_stats(),
+            "latency": self.get_latency_stats(),
+            "queue": {
+                "shed_requests": self.stats.shed_requests,
+                "queue_timeouts": self.stats.queue_timeouts,
+                "avg_wait_ms": round(self.stats.avg_queue_wait_ms, 2),
+                "p50_wait_ms": self._queue_wait_percentile(0.50),
+                "p95_wait_ms": self._queue_wait_percentile(0.95),
+                "p99_wait_ms": self._queue_wait_percentile(0.99)
+            },
+            "retries": {
+                "retried_requests": self.stats.retried_requests,
+                "budget": self.retry_budget.get_stats(),
+                "hedged_requests": self.stats.hedged_requests,
+                "hedge_wins": self.stats.hedge_wins,
+                "hedge_delay_ms": round(self._hedge_delay() * 1000, 2) if self._hedge_delay() else None,
+                "p50_latency_ms": self._percentile(self.latency_samples, 0.50),
+                "p95_latency_ms": self._percentile(self.latency_samples, 0.95)
+            },
             "statistics": {
                 "total_requests": self.stats.total_requests,
                 "successful_requests": self.stats.successful_requests,
                 "failed_requests": self.stats.failed_requests,
                 "success_rate_pct": round(success_rate, 2),
-                "avg_response_time_ms": round(self.stats.avg_response_time_ms, 2),
-                "circuit_breaker_trips": self.stats.circuit_breaker_trips,
+                "avg_response_time_ms": self._avg_response_time_ms(),
+                "p99_response_time_ms": self.latency_window(5).summary()["p99_ms"],
+                "circuit_breaker_trips": self.breaker.trips,
+                "circuit_breaker_rejected": self.breaker.rejected,
                 "last_error": self.stats.last_error,
                 "last_success": self.stats.last_success.isoformat() if self.stats.last_success else None
             }
@@ -293,13 +855,66 @@ class ConnectionPoolManager:
             "healthy": is_healthy,
             "circuit_breaker_state": self.circuit_state.value,
             "active_connections": self.active_connections,
+            "queue_depth": self.queue_depth,
+            "shed_requests": self.stats.shed_requests,
             "success_rate_pct": (
                 (self.stats.successful_requests / self.stats.total_requests * 100)
                 if self.stats.total_requests > 0 else 100
             ),
-            "avg_response_time_ms": round(self.stats.avg_response_time_ms, 2)
+            "avg_response_time_ms": self._avg_response_time_ms()
         }
 
 
-# Instance globale
-connection_manager = ConnectionPoolManager()
\ No newline at end of file
+# Classes d'opérations Supabase isolées (bulkheads) : chacune a son pool,
+# ses threads, sa limite adaptative et son circuit breaker
+OP_EVENT_WRITES = "event_writes"
+OP_EVENT_READS = "event_reads"
+OP_AUTH_READS = "auth_reads"
+OP_ENERGY_WRITES = "energy_writes"
+
+connection_pools: Dict[str, ConnectionPoolManager] = {}
+
+
+def get_connection_pool(operation_class: str) -> ConnectionPoolManager:
+    """Pool dédié à une classe d'opérations (créé au premier appel)"""
+    pool = connection_pools.get(operation_class)
+    if pool is None:
+        pool = connection_pools[operation_class] = ConnectionPoolManager(
+            ConnectionPoolConfig.from_env(operation_class),
+            name=f"supabase.{operation_class}"
+        )
+    return pool
+
+
+def get_all_pool_stats() -> Dict[str, Any]:
+    """Statistiques de chaque pool de classe d'opérations"""
+    return {name: pool.get_pool_stats() for name, pool in connection_pools.items()}
+
+
+def get_pools_summary() -> Dict[str, Any]:
+    """📊 Vue agrégée de tous les pools Supabase (sommes, circuits ouverts)"""
+    pools = list(connection_pools.values())
+    total = sum(pool.stats.total_requests for pool in pools)
+    successful = sum(pool.stats.successful_requests for pool in pools)
+    return {
+        "pool_count": len(pools),
+        "active_connections": sum(pool.active_connections for pool in pools),
+        "max_connections": sum(pool.config.max_connections for pool in pools),
+        "queue_depth": sum(pool.queue_depth for pool in pools),
+        "total_requests": total,
+        "successful_requests": successful,
+        "failed_requests": sum(pool.stats.failed_requests for pool in pools),
+        "shed_requests": sum(pool.stats.shed_requests for pool in pools),
+        "success_rate_pct": round(successful / total * 100, 2) if total > 0 else 100,
+        "circuit_breaker_trips": sum(pool.breaker.trips for pool in pools),
+        "open_circuits": [pool.name for pool in pools if pool.circuit_state == CircuitBreakerState.OPEN]
+    }
+
+
+async def pools_health_check() -> Dict[str, Any]:
+    """🏥 Health check de tous les pools : sain si chaque pool l'est"""
+    pools = {name: await pool.health_check() for name, pool in connection_pools.items()}
+    return {
+        "healthy": all(health["healthy"] for health in pools.values()),
+        "pools": pools
+    }
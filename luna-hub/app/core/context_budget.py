@@ -0,0 +1,213 @@
+"""
+📐 Context Budget - Phoenix Luna Hub
+Assemblage du contexte des prompts Luna sous budget de tokens
+Oracle Directive: Performance & Coûts LLM
+
+- Chaque segment (tours récents, faits narratifs, persona, contexte libre)
+  est estimé en tokens puis classé par priorité
+- Les segments obligatoires (prompt système, message) passent toujours ;
+  les autres remplissent le budget restant par priorité, les moins prioritaires
+  sont tronqués (si autorisé) ou écartés — et journalisés
+- Budget par fonctionnalité via LLM_CONTEXT_BUDGET_<FEATURE> : la taille du
+  prompt reste bornée même pour un utilisateur avec des mois d'historique
+"""
+
+import os
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+import structlog
+
+logger = structlog.get_logger("context_budget")
+
+
+# Rang des segments : plus petit = conservé en premier
+PRIORITY_PRIMARY = 0  # documents au cœur de la demande (offre, CV)
+PRIORITY_RECENT_TURNS = 10
+PRIORITY_NARRATIVE = 20
+PRIORITY_PERSONA = 30
+PRIORITY_EXTRA = 40
+
+DEFAULT_BUDGETS = {
+    "aube_chat": 2500,
+    "luna_conversation": 2500,
+    "letter_generation": 6000,
+}
+DEFAULT_BUDGET = int(os.getenv("LLM_CONTEXT_BUDGET_DEFAULT", "3000"))
+# En dessous, un segment tronqué n'apporte plus rien : il est écarté
+MIN_TRUNCATED_TOKENS = 32
+TRUNCATION_MARKER = " […]"
+
+
+def count_tokens(text: str) -> int:
+    """Estimation sans tokenizer (~4 caractères par token), volontairement pessimiste"""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def budget_for(feature: str) -> int:
+    """Budget de tokens d'une fonctionnalité (LLM_CONTEXT_BUDGET_AUBE_CHAT, ...)"""
+    value = os.getenv(f"LLM_CONTEXT_BUDGET_{feature.upper()}")
+    if value:
+        return int(value)
+    return DEFAULT_BUDGETS.get(feature, DEFAULT_BUDGET)
+
+
+@dataclass
+class ContextSegment:
+    name: str
+    text: str
+    priority: float
+    group: str
+    required: bool = False
+    truncatable: bool = False
+    sequence: bool = False
+    index: int = 0
+
+    @property
+    def tokens(self) -> int:
+        return count_tokens(self.text)
+
+
+class PackedContext:
+    """Résultat d'un assemblage : texte par groupe + ce qui a été écarté"""
+
+    def __init__(self, feature: str, budget: int, kept: List[ContextSegment], dropped: List[ContextSegment],
+                 truncated: List[str], fallbacks: Dict[str, str], separators: Dict[str, str]):
+        self.feature = feature
+        self.budget = budget
+        self.kept = sorted(kept, key=lambda segment: segment.index)
+        self.dropped = dropped
+        self.truncated = truncated
+        self._fallbacks = fallbacks
+        self._separators = separators
+        self.tokens = sum(segment.tokens for segment in kept)
+
+    def text(self, group: str) -> str:
+        """Segments conservés d'un groupe, dans l'ordre d'ajout (valeur de repli si tout est écarté)"""
+        parts = [segment.text for segment in self.kept if segment.group == group]
+        if not parts:
+            return self._fallbacks.get(group, "")
+        return self._separators.get(group, "\n").join(parts)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "feature": self.feature,
+            "budget": self.budget,
+            "tokens": self.tokens,
+            "kept": len(self.kept),
+            "dropped": [segment.name for segment in self.dropped],
+            "truncated": self.truncated
+        }
+
+
+class ContextBudget:
+    """
+    📐 Collecte les segments d'un prompt puis les empaquette dans le budget
+
+    Usage:
+        budget = ContextBudget("aube_chat")
+        budget.add("system", system_prompt, required=True)
+        budget.add_items("history", turns, PRIORITY_RECENT_TURNS)
+        packed = budget.pack()
+        packed.text("history")
+    """
+
+    def __init__(self, feature: str, max_tokens: Optional[int] = None):
+        self.feature = feature
+        self.max_tokens = max_tokens if max_tokens is not None else budget_for(feature)
+        self._segments: List[ContextSegment] = []
+        self._fallbacks: Dict[str, str] = {}
+        self._separators: Dict[str, str] = {}
+
+    def add(self, name: str, text: Optional[str], priority: float = PRIORITY_EXTRA, *,
+            required: bool = False, truncatable: bool = False, fallback: str = "") -> "ContextBudget":
+        self._fallbacks[name] = fallback
+        if text:
+            self._segments.append(ContextSegment(
+                name=name, text=text, priority=priority, group=name,
+                required=required, truncatable=truncatable, index=len(self._segments)
+            ))
+        return self
+
+    def add_items(self, group: str, items: Iterable[str], priority: float = PRIORITY_RECENT_TURNS, *,
+                  separator: str = "\n", fallback: str = "") -> "ContextBudget":
+        """
+        Liste ordonnée du plus ancien au plus récent (tours de conversation) :
+        les plus récents sont servis en premier, les plus anciens écartés d'abord
+        """
+        self._fallbacks[group] = fallback
+        self._separators[group] = separator
+        items = [item for item in items if item]
+        first = len(self._segments)
+        for position, item in enumerate(items):
+            age = len(items) - position  # 1 = le plus récent
+            self._segments.append(ContextSegment(
+                name=f"{group}[-{age}]", text=item, group=group,
+                priority=priority + age / (len(items) + 1),
+                sequence=True, index=first + position
+            ))
+        return self
+
+    def pack(self) -> PackedContext:
+        required = [segment for segment in self._segments if segment.required]
+        optional = sorted(
+            (segment for segment in self._segments if not segment.required),
+            key=lambda segment: (segment.priority, segment.index)
+        )
+        used = sum(segment.tokens for segment in required)
+        if used > self.max_tokens:
+            logger.warning("Required prompt segments exceed context budget",
+                           feature=self.feature, tokens=used, budget=self.max_tokens)
+
+        kept, dropped, truncated = list(required), [], []
+        closed_sequences = set()  # pas de trou dans l'historique : un tour écarté écarte les plus anciens
+        for segment in optional:
+            left = self.max_tokens - used
+            if segment.group in closed_sequences:
+                dropped.append(segment)
+            elif segment.tokens <= left:
+                kept.append(segment)
+                used += segment.tokens
+            elif segment.truncatable and left >= MIN_TRUNCATED_TOKENS:
+                segment.text = segment.text[:left * 4 - len(TRUNCATION_MARKER)].rstrip() + TRUNCATION_MARKER
+                kept.append(segment)
+                truncated.append(segment.name)
+                used += segment.tokens
+            else:
+                dropped.append(segment)
+                if segment.sequence:
+                    closed_sequences.add(segment.group)
+
+        packed = PackedContext(self.feature, self.max_tokens, kept, dropped, truncated, self._fallbacks, self._separators)
+        _record(packed)
+        if dropped or truncated:
+            logger.info("Prompt context trimmed to budget", **packed.summary())
+        return packed
+
+
+# Statistiques par fonctionnalité (monitoring)
+_stats: Dict[str, Dict[str, Any]] = {}
+
+
+def _record(packed: PackedContext) -> None:
+    stats = _stats.setdefault(packed.feature, {
+        "packs": 0, "tokens_total": 0, "max_tokens": 0, "dropped_segments": 0, "truncated_segments": 0, "trimmed_packs": 0
+    })
+    stats["packs"] += 1
+    stats["tokens_total"] += packed.tokens
+    stats["max_tokens"] = max(stats["max_tokens"], packed.tokens)
+    stats["dropped_segments"] += len(packed.dropped)
+    stats["truncated_segments"] += len(packed.truncated)
+    if packed.dropped or packed.truncated:
+        stats["trimmed_packs"] += 1
+
+
+def get_context_budget_stats() -> Dict[str, Any]:
+    return {
+        feature: {
+            **stats,
+            "budget": budget_for(feature),
+            "avg_tokens": round(stats["tokens_total"] / stats["packs"], 1) if stats["packs"] else None
+        }
+        for feature, stats in _stats.items()
+    }
@@ -0,0 +1,134 @@
+"""
+🛡️ Dependency Guard - Phoenix Luna Hub
+Circuit breaker + bulkhead par dépendance sortante hors Supabase (Gemini, Stripe)
+Oracle Directive: Stabilité & Résilience
+
+- Bulkhead : limite de concurrence adaptative propre à la dépendance
+- Circuit breaker : coupe les appels après N échecs, sonde unique en HALF_OPEN
+- Un chemin dégradé ne consomme plus la capacité des autres
+"""
+
+import time
+import asyncio
+import inspect
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+import structlog
+
+from .adaptive_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceeded, is_dependency_failure
+from .connection_manager import CircuitBreaker, circuit_breakers
+from .request_deadline import DeadlineExceededError, check_deadline
+
+logger = structlog.get_logger("dependency_guard")
+
+
+class DependencyGuard:
+    """🛡️ Breaker + bulkhead d'une dépendance"""
+
+    def __init__(self, name: str, limiter: AdaptiveConcurrencyLimiter, breaker: CircuitBreaker):
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker
+
+    def try_acquire(self) -> Optional[str]:
+        """
+        Réserve un appel ; retourne la raison du refus ("circuit" / "bulkhead") ou None
+
+        L'appel réservé se termine par record() ou, sans verdict, par cancel().
+        """
+        if not self.limiter.try_acquire():
+            return "bulkhead"
+        if not self.breaker.allow_request():
+            self.limiter.cancel()
+            return "circuit"
+        return None
+
+    def cancel(self, probe: Optional[int] = None) -> None:
+        """Appel réservé abandonné sans verdict (annulation) : ni succès ni échec, sonde rendue"""
+        self.limiter.cancel()
+        self.breaker.release_probe(probe)
+
+    def record(self, latency_ms: float, success: bool) -> None:
+        """Libère l'appel réservé et nourrit bulkhead + breaker"""
+        self.limiter.release(latency_ms, success)
+        if success:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    @contextmanager
+    def guard(self, failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,)):
+        """
+        Bloc protégé
+
+        Raises:
+            CircuitOpenError: circuit ouvert, la dépendance n'est pas appelée
+            ConcurrencyLimitExceeded: bulkhead plein
+            DeadlineExceededError: échéance de la requête dépassée, appel inutile
+        """
+        check_deadline(self.name)
+        refusal = self.try_acquire()
+        if refusal == "circuit":
+            raise self.breaker.open_error()  # refus déjà compté par try_acquire()
+        elif refusal == "bulkhead":
+            raise ConcurrencyLimitExceeded(f"Bulkhead full for {self.name}", retry_after=1.0)
+
+        probe = self.breaker.current_probe()
+        started = time.monotonic()
+        try:
+            yield
+        except (asyncio.CancelledError, DeadlineExceededError):
+            # Annulé ou coupé par l'échéance du client : la dépendance n'a pas
+            # répondu, aucun verdict (la sonde HALF_OPEN est rendue)
+            self.cancel(probe)
+            raise
+        except BaseException as e:
+            self.record((time.monotonic() - started) * 1000, not is_dependency_failure(e, failure_exceptions))
+            raise
+        else:
+            self.record((time.monotonic() - started) * 1000, True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "bulkhead": self.limiter.get_stats(),
+            "circuit_breaker": self.breaker.get_stats()
+        }
+
+
+def dependency_guard(
+    guard: DependencyGuard,
+    failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,)
+) -> Callable:
+    """Décorateur (sync ou async) appliquant breaker + bulkhead"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with guard.guard(failure_exceptions):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with guard.guard(failure_exceptions):
+                return func(*args, **kwargs)
+        return sync_wrapper
+    return decorator
+
+
+# Guards par dépendance
+dependency_guards: Dict[str, DependencyGuard] = {}
+
+
+def register_dependency_guard(guard: DependencyGuard) -> DependencyGuard:
+    dependency_guards[guard.name] = guard
+    return guard
+
+
+def get_dependency_guards_stats() -> Dict[str, Any]:
+    """Stats des guards + breakers isolés (ex: redis, pools Supabase)"""
+    return {
+        "guards": {name: guard.get_stats() for name, guard in dependency_guards.items()},
+        "circuit_breakers": {name: breaker.get_stats() for name, breaker in circuit_breakers.items()}
+    }
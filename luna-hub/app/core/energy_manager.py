@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 from app.models.user_energy import UserEnergyModel, EnergyTransactionModel, EnergyActionType, ENERGY_COSTS
 from app.core.supabase_client import event_store, sb
+from app.core.connection_manager import get_connection_pool, OP_ENERGY_WRITES
 import structlog
 
 logger = structlog.get_logger()
@@ -108,7 +109,10 @@ class EnergyManager:
         
         # 1. Update user energy in the database
         update_data = {"current_energy": energy_after}
-        updated_user = sb.table("user_energy").update(update_data).eq("user_id", user_id).execute()
+        updated_user = await get_connection_pool(OP_ENERGY_WRITES).run_query(
+            sb.table("user_energy").update(update_data).eq("user_id", user_id).execute,
+            operation_name="energy_consume_update"
+        )
 
         if not updated_user.data:
             raise EnergyManagerError("Failed to update user energy in DB.")
@@ -127,7 +131,10 @@ class EnergyManager:
                     revert_data = {"current_energy": energy_before, "total_consumed": new_total}
                 else:
                     revert_data = {"current_energy": energy_before}
-                sb.table("user_energy").update(revert_data).eq("user_id", user_id).execute()
+                await get_connection_pool(OP_ENERGY_WRITES).run_query(
+                    sb.table("user_energy").update(revert_data).eq("user_id", user_id).execute,
+                    operation_name="energy_consume_revert"
+                )
             except Exception as revert_error:
                 logger.error("Failed to revert energy consumption", user_id=user_id, error=str(revert_error))
             raise EnergyManagerError(f"Event creation failed, energy consumption reverted. Original error: {event_error}")
@@ -168,7 +175,10 @@ class EnergyManager:
                 "updated_at": datetime.now(timezone.utc).isoformat()
             }
             
-            result = sb.table("user_energy").insert(energy_profile).execute()
+            result = await get_connection_pool(OP_ENERGY_WRITES).run_query(
+                sb.table("user_energy").insert(energy_profile).execute,
+                operation_name="energy_profile_insert"
+            )
             logger.info("Energy profile created for user", user_id=user_id, success=bool(result.data))
             return bool(result.data)
             
@@ -273,7 +283,10 @@ class EnergyManager:
                 "updated_at": datetime.now(timezone.utc).isoformat()
             }
             
-            result = sb.table("user_energy").update(update_data).eq("user_id", user_id).execute()
+            result = await get_connection_pool(OP_ENERGY_WRITES).run_query(
+                sb.table("user_energy").update(update_data).eq("user_id", user_id).execute,
+                operation_name="energy_purchase_update"
+            )
             if not result.data:
                 raise EnergyManagerError("Failed to update user energy in DB.")
             
@@ -15,6 +15,7 @@ import structlog
 
 from .supabase_client import sb
 from .events import create_event
+from .redis_cache import redis_cache
 
 logger = structlog.get_logger("gdpr_compliance")
 
@@ -481,6 +482,12 @@ class GDPRComplianceManager:
                 except Exception as e:
                     deletion_summary["errors"].append(f"Erreur suppression events: {str(e)}")
             
+            # Purger les caches dérivés (Redis + caches in-process)
+            try:
+                await redis_cache.invalidate_user_cache(user_id)
+            except Exception as e:
+                deletion_summary["errors"].append(f"Erreur invalidation cache: {str(e)}")
+            
             # Enregistrer l'événement de suppression (avec pseudonyme si anonymisation)
             final_user_id = self.anonymizer.pseudonymize_user_id(user_id) if keep_anonymized else None
             await create_event({
@@ -0,0 +1,156 @@
+"""
+📐 Latency Sketch - Phoenix Luna Hub
+Sketch de quantiles fusionnable (type DDSketch) et fenêtres glissantes par minute
+Oracle Directive: Observabilité & Performance
+
+- Erreur relative bornée (1% par défaut) sur p50/p90/p99, mémoire bornée
+- Fusion exacte par addition des buckets : entre minutes, entre workers
+- Slots alignés sur l'horloge murale : deux workers partagent les mêmes minutes
+"""
+
+import math
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+WINDOWS_MINUTES: Tuple[int, ...] = (1, 5, 15)
+
+# En dessous : compté dans le bucket zéro (latences en ms)
+_MIN_TRACKED_VALUE = 1e-3
+
+
+class QuantileSketch:
+    """
+    📐 Sketch à buckets logarithmiques
+
+    Une valeur v tombe dans le bucket ceil(log_γ(v)) avec γ = (1+α)/(1-α) :
+    l'estimation d'un quantile est à ±α près en relatif, quelle que soit la
+    distribution. Deux sketches de même α se fusionnent en additionnant les buckets.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        if value <= _MIN_TRACKED_VALUE:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fusion en place (même précision relative requise)"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, bin_count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + bin_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        cumulative = self.zero_count
+        if rank < cumulative:
+            return self.min
+        for key in sorted(self.bins):
+            cumulative += self.bins[key]
+            if cumulative > rank:
+                estimate = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0, "p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None, "avg_ms": None}
+        return {
+            "count": self.count,
+            "p50_ms": round(self.quantile(0.50), 2),
+            "p90_ms": round(self.quantile(0.90), 2),
+            "p99_ms": round(self.quantile(0.99), 2),
+            "max_ms": round(self.max, 2),
+            "avg_ms": round(self.sum / self.count, 2)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forme compacte JSON (échange entre workers via Redis)"""
+        return {
+            "a": self.relative_accuracy,
+            "b": {str(key): bin_count for key, bin_count in self.bins.items()},
+            "z": self.zero_count,
+            "n": self.count,
+            "s": self.sum,
+            "mn": self.min if self.count else None,
+            "mx": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data.get("a", DEFAULT_RELATIVE_ACCURACY))
+        sketch.bins = {int(key): int(bin_count) for key, bin_count in data.get("b", {}).items()}
+        sketch.zero_count = int(data.get("z", 0))
+        sketch.count = int(data.get("n", 0))
+        sketch.sum = float(data.get("s", 0.0))
+        if sketch.count:
+            sketch.min = float(data["mn"])
+            sketch.max = float(data["mx"])
+        return sketch
+
+
+def current_minute() -> int:
+    return int(time.time() // 60)
+
+
+class RollingLatencySketch:
+    """⏳ Un sketch par minute murale, conservé `retention_minutes`"""
+
+    def __init__(self, retention_minutes: int = max(WINDOWS_MINUTES)):
+        self.retention_minutes = retention_minutes
+        self.slots: Dict[int, QuantileSketch] = {}
+
+    def _prune(self, now_minute: int) -> None:
+        for minute in [m for m in self.slots if m <= now_minute - self.retention_minutes]:
+            del self.slots[minute]
+
+    def record(self, latency_ms: float) -> None:
+        minute = current_minute()
+        slot = self.slots.get(minute)
+        if slot is None:
+            self._prune(minute)
+            slot = self.slots[minute] = QuantileSketch()
+        slot.add(latency_ms)
+
+    def window(self, minutes: int) -> QuantileSketch:
+        """Sketch fusionné des `minutes` dernières minutes (minute courante incluse)"""
+        return merge_window(self.slots.items(), minutes)
+
+    def summary(self, windows: Iterable[int] = WINDOWS_MINUTES) -> Dict[str, Any]:
+        return {f"{minutes}m": self.window(minutes).summary() for minutes in windows}
+
+
+def merge_window(slots: Iterable[Tuple[int, QuantileSketch]], minutes: int) -> QuantileSketch:
+    """Fusionne les slots (minute, sketch) compris dans la fenêtre"""
+    oldest = current_minute() - minutes
+    merged = QuantileSketch()
+    for minute, sketch in slots:
+        if minute > oldest:
+            merged.merge(sketch)
+    return merged
@@ -1,76 +1,117 @@
 from __future__ import annotations
 import os
 import json
+import time
+import asyncio
+import hashlib
 import httpx
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from dataclasses import replace
+from typing import Any, AsyncIterator, Dict, Optional
 
-class LLMGateway(ABC):
-    @abstractmethod
-    def generate(self, *, system: str, user: str, context: Dict[str, Any]) -> str: ...
+from .adaptive_limiter import OverloadedError, get_adaptive_limiter
+from .connection_manager import get_circuit_breaker
+from .dependency_guard import DependencyGuard, register_dependency_guard
+from .llm_http_client import llm_http_client
+from .llm_metering import llm_meter, usage_from_metadata
+from .llm_scheduler import LLMCaller, current_caller, estimate_tokens, llm_scheduler
+from .prompt_registry import prompt_registry
+from .request_deadline import DeadlineExceededError, check_deadline, clamp_timeout
 
-class GeminiProvider(LLMGateway):
-    def __init__(self, model: str = "gemini-1.5-flash-latest") -> None:
-        self.model = model
-        self.api_key = os.getenv("GEMINI_API_KEY")
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
+# Limite de concurrence adaptative partagée par tous les appels Gemini
+gemini_limiter = get_adaptive_limiter("gemini", initial_limit=8, max_limit=32, latency_target_ms=8000.0)
+
+# Bulkhead + circuit breaker Gemini : une panne LLM ne bloque plus les workers
+gemini_guard = register_dependency_guard(
+    DependencyGuard("llm.gemini", gemini_limiter, get_circuit_breaker("llm.gemini", threshold=5, timeout=30.0))
+)
+
+# Timeout d'un appel Gemini (rogné sur l'échéance de la requête)
+GEMINI_TIMEOUT = 30.0
+
+
+def _settle_gemini_call(probe: Optional[int], latency_ms: float, healthy: Optional[bool]) -> None:
+    """Clôt un appel réservé par gemini_guard.try_acquire() ; sans verdict (None), la sonde est rendue"""
+    if healthy is None:
+        gemini_guard.cancel(probe)
+    else:
+        gemini_guard.record(latency_ms, healthy)
+
+
+class LLMProviderError(Exception):
+    """
+    Échec d'un fournisseur LLM (message affichable à l'utilisateur)
     
-    def _read(self, path: str) -> str:
-        with open(path, "r", encoding="utf-8") as f: 
-            return f.read()
+    retryable : un autre fournisseur ou un nouvel essai peut réussir
+    local : refus du hub lui-même (file du scheduler, bulkhead, circuit
+    ouvert) - le fournisseur n'a pas été appelé, sa santé n'est pas en cause
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, retryable: bool = True,
+                 local: bool = False):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+        self.retryable = retryable
+        self.local = local
+
+
+class LLMStreamError(LLMProviderError):
+    """Échec d'une génération streamée (message affichable à l'utilisateur)"""
+
+
+def _candidate_texts(chunk: Dict[str, Any]) -> list:
+    """Fragments de texte d'une réponse (ou d'un chunk streamé) Gemini"""
+    texts = []
+    for candidate in chunk.get("candidates", []):
+        for part in candidate.get("content", {}).get("parts", []):
+            if part.get("text"):
+                texts.append(part["text"])
+    return texts
+
+
+def _usage_tokens(result: Dict[str, Any]) -> Optional[int]:
+    """Tokens réellement facturés (usageMetadata.totalTokenCount) si Gemini les renvoie"""
+    total = result.get("usageMetadata", {}).get("totalTokenCount")
+    return int(total) if total is not None else None
+
+
+def _prompt_text(payload: Dict[str, Any]) -> str:
+    return "".join(part.get("text", "") for content in payload["contents"] for part in content["parts"])
+
+
+def _estimated_tokens(payload: Dict[str, Any]) -> int:
+    return estimate_tokens(_prompt_text(payload), payload["generationConfig"]["maxOutputTokens"])
+
+
+def _scheduling_caller(context: Dict[str, Any]) -> LLMCaller:
+    """Appelant fixé par l'endpoint, sinon l'utilisateur du contexte (priorité standard)"""
+    caller = current_caller()
+    if caller.user_id == "anonymous" and context.get("user_id"):
+        return replace(caller, user_id=str(context["user_id"]))
+    return caller
+
+
+class LLMGateway(ABC):
+    """
+    Fournisseur LLM
     
-    def assemble_prompt(self, narrative_json: str, persona_profile: Dict[str,Any]) -> Dict[str,str]:
-        system_core = self._read("apps/luna-hub/config/llm_prompts/luna_core_system.txt")
-        # playbook simple (j2 simplifiée inline)
-        playbook = f"[TONE]={persona_profile.get('mode')} | [READING_LEVEL]={persona_profile.get('reading_level')}"
-        context = f"[CONTEXT_NARRATIF]\n{narrative_json}\n[PERSONA_PROFILE]\n{json.dumps(persona_profile)}"
-        return {"system": system_core + "\n" + playbook, "context": context}
+    complete() lève LLMProviderError (routage, failover) ; generate() garde le
+    contrat historique et renvoie le message d'excuse à afficher.
+    """
+    name: str = "llm"
+    
+    @abstractmethod
+    async def complete(self, *, system: str, user: str, context: Dict[str, Any]) -> str: ...
+    
+    @abstractmethod
+    def generate_stream(self, *, system: str, user: str, context: Dict[str, Any]) -> AsyncIterator[str]: ...
     
     async def generate(self, *, system: str, user: str, context: Dict[str, Any]) -> str:
-        """
-        Génération de réponse Luna via Gemini API
-        """
-        if not self.api_key:
-            return "🌙 Erreur de configuration API Gemini ! Clé manquante. 🔧"
-        
         try:
-            # Construire le prompt complet
-            full_prompt = f"{system}\n\nUtilisateur: {user}\n\nRéponds en tant que Luna:"
-            
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": full_prompt
-                    }]
-                }],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 500,
-                }
-            }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/{self.model}:generateContent?key={self.api_key}",
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if "candidates" in result and len(result["candidates"]) > 0:
-                        content = result["candidates"][0]["content"]["parts"][0]["text"]
-                        return content.strip()
-                    else:
-                        return "🌙 Gemini n'a pas pu générer de réponse. Réessaie ! ⚡"
-                else:
-                    return f"🌙 Erreur API Gemini ({response.status_code}). Réessaie ! 🔧"
-                    
-        except Exception as e:
-            return f"🌙 Problème technique avec Gemini : {str(e)} 🔧"
+            return await self.complete(system=system, user=user, context=context)
+        except LLMProviderError as e:
+            return e.message
     
     async def call_llm(self, *, messages: list, model: str = "gemini-pro", max_tokens: int = 500, temperature: float = 0.7) -> Dict[str, Any]:
         """
@@ -87,8 +128,7 @@ class GeminiProvider(LLMGateway):
                 elif msg.get("role") == "user":
                     user_message = msg.get("content", "")
             
-            # Appeler generate avec le format attendu
-            response_content = await self.generate(
+            response_content = await self.complete(
                 system=system_message,
                 user=user_message,
                 context={}
@@ -98,7 +138,14 @@ class GeminiProvider(LLMGateway):
                 "success": True,
                 "content": response_content
             }
-            
+        
+        except LLMProviderError as e:
+            # Échec fournisseur : message d'excuse affiché, pas d'énergie consommée
+            return {
+                "success": False,
+                "content": e.message,
+                "error": str(e)
+            }
         except Exception as e:
             return {
                 "success": False,
@@ -106,5 +153,268 @@ class GeminiProvider(LLMGateway):
                 "error": str(e)
             }
 
-# Instance globale exportée
-llm_gateway = GeminiProvider()
\ No newline at end of file
+class GeminiProvider(LLMGateway):
+    def __init__(self, model: str = "gemini-1.5-flash-latest") -> None:
+        self.model = model
+        self.name = f"gemini:{model}"
+        self.api_key = os.getenv("GEMINI_API_KEY")
+        # GEMINI_API_ENDPOINT : serveur mock local pour les tests de charge (scripts/mock_gemini_server.py)
+        endpoint = os.getenv("GEMINI_API_ENDPOINT", "https://generativelanguage.googleapis.com")
+        self.base_url = f"{endpoint.rstrip('/')}/v1beta/models"
+    
+    def assemble_prompt(self, narrative_json: str, persona_profile: Dict[str,Any]) -> Dict[str,str]:
+        system_core = prompt_registry.get("luna_core_system").source
+        # playbook simple (j2 simplifiée inline)
+        playbook = f"[TONE]={persona_profile.get('mode')} | [READING_LEVEL]={persona_profile.get('reading_level')}"
+        context = f"[CONTEXT_NARRATIF]\n{narrative_json}\n[PERSONA_PROFILE]\n{json.dumps(persona_profile)}"
+        return {"system": system_core + "\n" + playbook, "context": context}
+    
+    def _build_payload(self, system: str, user: str) -> Dict[str, Any]:
+        """Requête generateContent (prompt complet + paramètres de génération)"""
+        full_prompt = f"{system}\n\nUtilisateur: {user}\n\nRéponds en tant que Luna:"
+        return {
+            "contents": [{
+                "parts": [{
+                    "text": full_prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": 0.7,
+                "topK": 40,
+                "topP": 0.95,
+                "maxOutputTokens": 500,
+            }
+        }
+    
+    def _meter(self, caller: LLMCaller, payload: Dict[str, Any], started: float, result: Optional[Dict[str, Any]] = None,
+               text: str = "", success: bool = True, streamed: bool = False) -> None:
+        """Appel Gemini mesuré (usageMetadata si renvoyée, sinon estimation)"""
+        llm_meter.record_call(
+            caller, self.name, usage_from_metadata((result or {}).get("usageMetadata")),
+            prompt_estimate=len(_prompt_text(payload)) // 4, output_text=text,
+            latency_ms=(time.monotonic() - started) * 1000, success=success, streamed=streamed
+        )
+    
+    async def complete(self, *, system: str, user: str, context: Dict[str, Any]) -> str:
+        """
+        Génération de réponse Luna via Gemini API
+        
+        Raises:
+            LLMProviderError: clé absente, file LLM pleine, Gemini saturé / en panne, erreur HTTP
+            DeadlineExceededError: échéance de la requête dépassée
+        """
+        if not self.api_key:
+            raise LLMProviderError("🌙 Erreur de configuration API Gemini ! Clé manquante. 🔧", retryable=False)
+        
+        payload = self._build_payload(system, user)
+        caller = _scheduling_caller(context)
+        # Tour de file (priorité, équité par utilisateur, budget tokens/minute)
+        try:
+            ticket = await llm_scheduler.acquire(_estimated_tokens(payload), caller)
+        except OverloadedError as e:
+            raise LLMProviderError("🌙 Luna est très sollicitée en ce moment, réessaie dans quelques secondes ! ⏳", retry_after=e.retry_after, local=True)
+        
+        try:
+            # Timeout rogné sur l'échéance de la requête (DeadlineExceededError si dépassée)
+            timeout = clamp_timeout(GEMINI_TIMEOUT, "gemini")
+            # Timeout rogné : son expiration vient de l'échéance du client, pas de Gemini
+            deadline_bound = timeout < GEMINI_TIMEOUT
+            
+            refusal = gemini_guard.try_acquire()
+            if refusal == "circuit":
+                raise LLMProviderError("🌙 Luna fait une petite pause technique, réessaie dans un instant ! 🔧", retry_after=5.0, local=True)
+            if refusal == "bulkhead":
+                raise LLMProviderError("🌙 Luna est très sollicitée en ce moment, réessaie dans quelques secondes ! ⏳", retry_after=1.0, local=True)
+            
+            probe = gemini_guard.breaker.current_probe()
+            started = time.monotonic()
+            # Verdict du guard ; None = appel sans verdict (sonde HALF_OPEN rendue)
+            healthy: Optional[bool] = False
+            try:
+                response = await llm_http_client.client.post(
+                    f"{self.base_url}/{self.model}:generateContent?key={self.api_key}",
+                    json=payload,
+                    headers={"Content-Type": "application/json"},
+                    timeout=timeout,
+                    extensions=llm_http_client.extensions()
+                )
+                # 429 / 5xx : Gemini sature → l'AIMD doit réduire la limite
+                healthy = response.status_code < 500 and response.status_code != 429
+            except httpx.TimeoutException as e:
+                self._meter(caller, payload, started, success=False)
+                if deadline_bound:
+                    healthy = None
+                    raise DeadlineExceededError("gemini") from e
+                raise
+            except asyncio.CancelledError:
+                # Client parti : Gemini n'a pas répondu, aucun verdict
+                healthy = None
+                raise
+            except Exception:
+                self._meter(caller, payload, started, success=False)
+                raise
+            finally:
+                _settle_gemini_call(probe, (time.monotonic() - started) * 1000, healthy)
+            
+            if response.status_code == 200:
+                result = response.json()
+                ticket.actual_tokens = _usage_tokens(result)
+                if "candidates" in result and len(result["candidates"]) > 0:
+                    content = result["candidates"][0]["content"]["parts"][0]["text"]
+                    self._meter(caller, payload, started, result, content)
+                    return content.strip()
+                else:
+                    self._meter(caller, payload, started, result, success=False)
+                    raise LLMProviderError("🌙 Gemini n'a pas pu générer de réponse. Réessaie ! ⚡")
+            else:
+                self._meter(caller, payload, started, success=False)
+                # Requête refusée : le quota tokens n'a pas été consommé
+                ticket.actual_tokens = 0 if response.status_code == 429 else None
+                raise LLMProviderError(f"🌙 Erreur API Gemini ({response.status_code}). Réessaie ! 🔧")
+        
+        except (LLMProviderError, DeadlineExceededError):
+            raise
+        except Exception as e:
+            raise LLMProviderError(f"🌙 Problème technique avec Gemini : {str(e)} 🔧")
+        finally:
+            await llm_scheduler.release(ticket)
+    
+    def generate_stream(self, *, system: str, user: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Génération streamée via Gemini (streamGenerateContent, SSE)
+        
+        L'appelant du scheduler est capturé ici : le flux est consommé par la
+        StreamingResponse, après la sortie du scope de l'endpoint.
+        
+        Yields:
+            Fragments de texte dès leur arrivée
+            
+        Raises:
+            LLMStreamError: clé absente, Gemini saturé / en panne, file LLM pleine, erreur HTTP
+            DeadlineExceededError: échéance de la requête dépassée
+        """
+        return self._stream(system, user, _scheduling_caller(context))
+    
+    async def _stream(self, system: str, user: str, caller: LLMCaller) -> AsyncIterator[str]:
+        if not self.api_key:
+            raise LLMStreamError("🌙 Erreur de configuration API Gemini ! Clé manquante. 🔧", retryable=False)
+        
+        payload = self._build_payload(system, user)
+        try:
+            ticket = await llm_scheduler.acquire(_estimated_tokens(payload), caller)
+        except OverloadedError as e:
+            raise LLMStreamError("🌙 Luna est très sollicitée en ce moment, réessaie dans quelques secondes ! ⏳", retry_after=e.retry_after, local=True)
+        
+        try:
+            timeout = clamp_timeout(GEMINI_TIMEOUT, "gemini")
+            deadline_bound = timeout < GEMINI_TIMEOUT
+            refusal = gemini_guard.try_acquire()
+            if refusal == "circuit":
+                raise LLMStreamError("🌙 Luna fait une petite pause technique, réessaie dans un instant ! 🔧", retry_after=5.0, local=True)
+            if refusal == "bulkhead":
+                raise LLMStreamError("🌙 Luna est très sollicitée en ce moment, réessaie dans quelques secondes ! ⏳", retry_after=1.0, local=True)
+            
+            # Échantillon AIMD = temps jusqu'au premier fragment : la durée totale
+            # dépend de la longueur de la réponse, pas de la santé de Gemini
+            probe = gemini_guard.breaker.current_probe()
+            started = time.monotonic()
+            first_chunk_ms: Optional[float] = None
+            healthy: Optional[bool] = True
+            last_chunk: Optional[Dict[str, Any]] = None
+            streamed_text: list = []
+            success = False
+            try:
+                async with llm_http_client.client.stream(
+                    "POST",
+                    f"{self.base_url}/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}",
+                    json=payload,
+                    headers={"Content-Type": "application/json"},
+                    timeout=timeout,
+                    extensions=llm_http_client.extensions()
+                ) as response:
+                    if response.status_code != 200:
+                        healthy = response.status_code < 500 and response.status_code != 429
+                        if response.status_code == 429:
+                            ticket.actual_tokens = 0
+                        raise LLMStreamError(f"🌙 Erreur API Gemini ({response.status_code}). Réessaie ! 🔧")
+                    
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        chunk = json.loads(line[5:])
+                        # usageMetadata cumulée : le dernier fragment porte le total
+                        ticket.actual_tokens = _usage_tokens(chunk) or ticket.actual_tokens
+                        if "usageMetadata" in chunk:
+                            last_chunk = chunk
+                        for text in _candidate_texts(chunk):
+                            if first_chunk_ms is None:
+                                first_chunk_ms = (time.monotonic() - started) * 1000
+                            streamed_text.append(text)
+                            yield text
+                    success = True
+            except httpx.TimeoutException as e:
+                if deadline_bound:
+                    # Coupé par l'échéance de la requête, pas par Gemini
+                    healthy = None
+                    raise DeadlineExceededError("gemini_stream") from e
+                healthy = False
+                raise LLMStreamError(f"🌙 Problème technique avec Gemini : {str(e)} 🔧")
+            except (asyncio.CancelledError, GeneratorExit):
+                # Client parti avant le premier fragment : aucun verdict
+                if first_chunk_ms is None:
+                    healthy = None
+                raise
+            except httpx.HTTPError as e:
+                healthy = False
+                raise LLMStreamError(f"🌙 Problème technique avec Gemini : {str(e)} 🔧")
+            finally:
+                latency_ms = first_chunk_ms if first_chunk_ms is not None else (time.monotonic() - started) * 1000
+                _settle_gemini_call(probe, latency_ms, healthy)
+                # Métrage : durée complète du flux (client parti en cours de route = échec)
+                self._meter(caller, payload, started, last_chunk, "".join(streamed_text), success=success, streamed=True)
+        finally:
+            await llm_scheduler.release(ticket)
+
+
+class StubProvider(LLMGateway):
+    """
+    🧪 Fournisseur local déterministe (tests, tirs de charge) : aucun appel réseau
+    
+    Même prompt → même réponse ; latence simulée LLM_STUB_LATENCY_MS.
+    """
+
+    def __init__(self, name: str = "stub", latency_ms: Optional[float] = None) -> None:
+        self.name = name
+        self.latency_ms = latency_ms if latency_ms is not None else float(os.getenv("LLM_STUB_LATENCY_MS", "50"))
+    
+    def _reply(self, system: str, user: str) -> str:
+        digest = hashlib.sha256(f"{system}\0{user}".encode("utf-8")).hexdigest()[:8]
+        excerpt = " ".join(user.split())[-120:]
+        return f"🌙 [stub {digest}] Réponse simulée de Luna à : {excerpt}"
+    
+    def _meter(self, caller: LLMCaller, system: str, user: str, reply: str, started: float, streamed: bool = False) -> None:
+        llm_meter.record_call(
+            caller, self.name, None, prompt_estimate=(len(system) + len(user)) // 4,
+            output_text=reply, latency_ms=(time.monotonic() - started) * 1000, streamed=streamed
+        )
+    
+    async def complete(self, *, system: str, user: str, context: Dict[str, Any]) -> str:
+        started = time.monotonic()
+        await asyncio.sleep(clamp_timeout(self.latency_ms / 1000, "llm_stub"))
+        check_deadline("llm_stub")
+        reply = self._reply(system, user)
+        self._meter(_scheduling_caller(context), system, user, reply, started)
+        return reply
+    
+    def generate_stream(self, *, system: str, user: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        return self._stream(system, user, _scheduling_caller(context))
+    
+    async def _stream(self, system: str, user: str, caller: LLMCaller) -> AsyncIterator[str]:
+        started = time.monotonic()
+        reply = self._reply(system, user)
+        words = reply.split(" ")
+        delay = self.latency_ms / 1000 / len(words)
+        for index, word in enumerate(words):
+            await asyncio.sleep(delay)
+            yield word if index == 0 else " " + word
+        self._meter(caller, system, user, reply, started, streamed=True)
@@ -0,0 +1,134 @@
+"""
+🔌 LLM HTTP Client - Phoenix Luna Hub
+Client HTTP partagé (keep-alive, HTTP/2) pour les appels LLM sortants
+Oracle Directive: Performance & Latence
+
+- Un seul httpx.AsyncClient par worker, ouvert dans le lifespan FastAPI et
+  fermé à l'arrêt : plus de handshake TLS vers Gemini à chaque message
+- HTTP/2 si le paquet h2 est installé (multiplexage sur une connexion)
+- Stats : connexions ouvertes, handshakes TLS (nombre, durée), taux de réutilisation
+"""
+
+import os
+import time
+from typing import Any, Dict, Optional
+import httpx
+import structlog
+
+logger = structlog.get_logger("llm_http_client")
+
+try:
+    import h2  # noqa: F401  (requis par httpx pour http2=True)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class LLMHttpClient:
+    """🔌 Client httpx poolé, tracé via l'extension "trace" de httpcore"""
+
+    def __init__(self):
+        self.max_connections = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "32"))
+        self.max_keepalive_connections = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "16"))
+        self.keepalive_expiry = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "90"))
+        self.connect_timeout = float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "5"))
+        self.http2 = os.getenv("LLM_HTTP2", "true").lower() == "true" and HTTP2_AVAILABLE
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = {
+            "requests": 0,
+            "new_connections": 0,
+            "tls_handshakes": 0,
+            "tls_handshake_ms_total": 0.0,
+            "http2_requests": 0,
+            "clients_created": 0
+        }
+
+    def _create_client(self) -> httpx.AsyncClient:
+        self.stats["clients_created"] += 1
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(30.0, connect=self.connect_timeout)
+        )
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = self._create_client()
+            logger.info(
+                "LLM HTTP client started",
+                http2=self.http2,
+                max_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry
+            )
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("LLM HTTP client closed", **self._reuse_stats())
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Client partagé (créé à la volée hors lifespan : scripts, tests)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    def extensions(self) -> Dict[str, Any]:
+        """Extensions httpx d'une requête : compte connexions neuves et handshakes"""
+        tls_started: Dict[str, float] = {}
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                self.stats["new_connections"] += 1
+            elif event_name == "connection.start_tls.started":
+                tls_started["at"] = time.monotonic()
+            elif event_name == "connection.start_tls.complete":
+                self.stats["tls_handshakes"] += 1
+                if "at" in tls_started:
+                    self.stats["tls_handshake_ms_total"] += (time.monotonic() - tls_started.pop("at")) * 1000
+            elif event_name.endswith("send_request_headers.started"):
+                self.stats["requests"] += 1
+                if event_name.startswith("http2."):
+                    self.stats["http2_requests"] += 1
+
+        return {"trace": trace}
+
+    def _open_connections(self) -> Optional[int]:
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        return len(connections) if connections is not None else None
+
+    def _reuse_stats(self) -> Dict[str, Any]:
+        requests = self.stats["requests"]
+        handshakes = self.stats["tls_handshakes"]
+        return {
+            "requests": requests,
+            "new_connections": self.stats["new_connections"],
+            "tls_handshakes": handshakes,
+            "connection_reuse_rate": round(1 - self.stats["new_connections"] / requests, 3) if requests else None
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        handshakes = self.stats["tls_handshakes"]
+        return {
+            **self._reuse_stats(),
+            "avg_tls_handshake_ms": round(self.stats["tls_handshake_ms_total"] / handshakes, 2) if handshakes else None,
+            "http2_enabled": self.http2,
+            "http2_requests": self.stats["http2_requests"],
+            "open_connections": self._open_connections() if self._client is not None else 0,
+            "clients_created": self.stats["clients_created"],
+            "limits": {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "keepalive_expiry": self.keepalive_expiry
+            }
+        }
+
+
+# Instance globale
+llm_http_client = LLMHttpClient()
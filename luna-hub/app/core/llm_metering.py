@@ -0,0 +1,272 @@
+"""
+🧮 LLM Metering - Phoenix Luna Hub
+Consommation LLM réelle par utilisateur, fonctionnalité et persona
+Oracle Directive: Performance & Coûts LLM
+
+- Un enregistrement par appel fournisseur : tokens prompt / sortie, tokens
+  servis par le cache de contexte Gemini, latence, succès, streaming
+- Cumuls en mémoire (par worker) : par utilisateur (LRU borné), par
+  fonctionnalité, par persona — latence en sketch de quantiles
+- Énergie consommée rattachée au même cumul (utilisateur + fonctionnalité) :
+  tokens par ⚡ = base de calcul des prix
+- Cumuls journaliers par utilisateur publiés dans Redis (tous workers),
+  sans jamais ralentir l'appel LLM
+"""
+
+import os
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+import structlog
+
+from .latency_sketch import QuantileSketch
+from .llm_scheduler import LLMCaller
+from .redis_cache import redis_cache
+
+logger = structlog.get_logger("llm_metering")
+
+
+KEY_PREFIX = "llm_usage"
+MAX_TRACKED_USERS = int(os.getenv("LLM_METER_MAX_USERS", "5000"))
+RETENTION_DAYS = int(os.getenv("LLM_METER_RETENTION_DAYS", "35"))
+
+
+@dataclass
+class LLMUsage:
+    """Un appel fournisseur mesuré"""
+    user_id: str
+    feature: str
+    persona: Optional[str]
+    provider: str
+    prompt_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    latency_ms: float
+    success: bool = True
+    streamed: bool = False
+    estimated: bool = False  # tokens estimés : le fournisseur n'a pas renvoyé son décompte
+
+
+def usage_from_metadata(metadata: Optional[Dict[str, Any]]) -> Optional[Dict[str, int]]:
+    """usageMetadata Gemini (REST) → tokens prompt / sortie / cache ; None si absent"""
+    if not metadata:
+        return None
+    return {
+        "prompt_tokens": int(metadata.get("promptTokenCount") or 0),
+        "output_tokens": int(metadata.get("candidatesTokenCount") or 0),
+        "cached_tokens": int(metadata.get("cachedContentTokenCount") or 0),
+    }
+
+
+class UsageRollup:
+    """Cumul d'appels LLM et de l'énergie facturée en face"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.streamed = 0
+        self.estimated = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.cached_tokens = 0
+        self.cache_hits = 0
+        self.energy = 0
+        self.energy_actions = 0
+        self.latency = QuantileSketch()
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    def add(self, usage: LLMUsage) -> None:
+        self.calls += 1
+        self.errors += 0 if usage.success else 1
+        self.streamed += 1 if usage.streamed else 0
+        self.estimated += 1 if usage.estimated else 0
+        self.prompt_tokens += usage.prompt_tokens
+        self.output_tokens += usage.output_tokens
+        self.cached_tokens += usage.cached_tokens
+        self.cache_hits += 1 if usage.cached_tokens else 0
+        self.latency.add(usage.latency_ms)
+
+    def add_energy(self, energy: int) -> None:
+        self.energy += energy
+        self.energy_actions += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "streamed": self.streamed,
+            "estimated": self.estimated,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.total_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_hit_rate": round(self.cache_hits / self.calls, 3) if self.calls else None,
+            "avg_tokens_per_call": round(self.total_tokens / self.calls, 1) if self.calls else None,
+            "latency": self.latency.summary(),
+            "energy": self.energy,
+            "energy_actions": self.energy_actions,
+            "tokens_per_energy": round(self.total_tokens / self.energy, 1) if self.energy else None,
+        }
+
+
+class _UserUsage:
+    def __init__(self):
+        self.total = UsageRollup()
+        self.features: Dict[str, UsageRollup] = {}
+
+    def rollup(self, feature: str) -> UsageRollup:
+        return self.features.setdefault(feature, UsageRollup())
+
+
+def _day(offset: int = 0) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=offset)).strftime("%Y%m%d")
+
+
+def _day_key(day: str, user_id: str) -> str:
+    return f"{redis_cache.config.key_prefix}:{KEY_PREFIX}:{day}:{user_id}"
+
+
+class LLMMeter:
+    """🧮 Cumuls de consommation LLM par utilisateur / fonctionnalité / persona"""
+
+    def __init__(self, max_users: int = MAX_TRACKED_USERS):
+        self.max_users = max_users
+        self.users: "OrderedDict[str, _UserUsage]" = OrderedDict()
+        self.features: Dict[str, UsageRollup] = {}
+        self.personas: Dict[str, UsageRollup] = {}
+        self.providers: Dict[str, UsageRollup] = {}
+        self.stats = {"records": 0, "evicted_users": 0, "persist_errors": 0}
+        self._pending: Set[asyncio.Task] = set()
+
+    def _user(self, user_id: str) -> _UserUsage:
+        usage = self.users.get(user_id)
+        if usage is None:
+            usage = self.users[user_id] = _UserUsage()
+            if len(self.users) > self.max_users:
+                self.users.popitem(last=False)
+                self.stats["evicted_users"] += 1
+        else:
+            self.users.move_to_end(user_id)
+        return usage
+
+    def record(self, usage: LLMUsage) -> None:
+        """Appel LLM terminé (succès ou échec) : cumuls en mémoire + publication Redis en tâche de fond"""
+        user = self._user(usage.user_id)
+        user.total.add(usage)
+        user.rollup(usage.feature).add(usage)
+        self.features.setdefault(usage.feature, UsageRollup()).add(usage)
+        self.providers.setdefault(usage.provider, UsageRollup()).add(usage)
+        if usage.persona:
+            self.personas.setdefault(usage.persona, UsageRollup()).add(usage)
+        self.stats["records"] += 1
+        self._persist(usage.user_id, usage.feature, {
+            "calls": 1,
+            "errors": 0 if usage.success else 1,
+            "prompt_tokens": usage.prompt_tokens,
+            "output_tokens": usage.output_tokens,
+            "cached_tokens": usage.cached_tokens,
+            "cache_hits": 1 if usage.cached_tokens else 0,
+            "latency_ms": int(usage.latency_ms),
+        })
+
+    def record_call(self, caller: LLMCaller, provider: str, tokens: Optional[Dict[str, int]], *,
+                    prompt_estimate: int, output_text: str = "", latency_ms: float,
+                    success: bool = True, streamed: bool = False) -> None:
+        """
+        Enregistre un appel à partir du décompte fournisseur (usage_from_metadata),
+        sinon d'une estimation ~4 caractères par token (échecs compris : le prompt a été envoyé)
+        """
+        estimated = tokens is None
+        if tokens is None:
+            tokens = {"prompt_tokens": prompt_estimate, "output_tokens": len(output_text) // 4, "cached_tokens": 0}
+        self.record(LLMUsage(
+            user_id=caller.user_id, feature=caller.feature, persona=caller.persona, provider=provider,
+            latency_ms=latency_ms, success=success, streamed=streamed, estimated=estimated, **tokens
+        ))
+
+    def record_energy(self, user_id: str, feature: str, energy: int, persona: Optional[str] = None) -> None:
+        """Énergie débitée pour une action IA : rattachée au cumul de la même fonctionnalité"""
+        if not user_id or energy <= 0:
+            return
+        user = self._user(user_id)
+        user.total.add_energy(energy)
+        user.rollup(feature).add_energy(energy)
+        self.features.setdefault(feature, UsageRollup()).add_energy(energy)
+        if persona:
+            self.personas.setdefault(persona, UsageRollup()).add_energy(energy)
+        self._persist(user_id, feature, {"energy": energy})
+
+    # --- Redis (cumuls journaliers, tous workers) ---------------------------
+
+    def _persist(self, user_id: str, feature: str, counters: Dict[str, int]) -> None:
+        if not (redis_cache.redis_available and redis_cache.redis_client):
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self._write(user_id, feature, counters))
+        except RuntimeError:
+            return  # hors boucle (scripts) : cumuls en mémoire seulement
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _write(self, user_id: str, feature: str, counters: Dict[str, int]) -> None:
+        # Hash journalier par utilisateur, champ "<fonctionnalité>|<compteur>"
+        key = _day_key(_day(), user_id)
+        try:
+            pipe = redis_cache.client_for(key).pipeline(transaction=False)
+            for name, value in counters.items():
+                if value:
+                    pipe.hincrby(key, f"{feature}|{name}", value)
+            pipe.expire(key, RETENTION_DAYS * 86400)
+            await pipe.execute()
+        except Exception as e:
+            self.stats["persist_errors"] += 1
+            logger.debug("LLM usage persist failed", user_id=user_id, error=str(e))
+
+    async def get_daily_usage(self, user_id: str, days: int = 7) -> Dict[str, Any]:
+        """Cumuls journaliers Redis d'un utilisateur : {jour: {fonctionnalité: compteurs}}"""
+        if not (redis_cache.redis_available and redis_cache.redis_client):
+            return {"available": False, "reason": "redis_unavailable"}
+        keys = [_day_key(_day(offset), user_id) for offset in range(max(1, min(days, RETENTION_DAYS)))]
+        responses = await asyncio.gather(*(redis_cache.client_for(key).hgetall(key) for key in keys))
+        daily: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for key, fields in zip(keys, responses):
+            day = key.rsplit(":", 2)[-2]
+            for field, value in (fields or {}).items():
+                field = field.decode() if isinstance(field, bytes) else field
+                feature, _, counter = field.rpartition("|")
+                daily.setdefault(day, {}).setdefault(feature, {})[counter] = int(value)
+        return {"available": True, "days": daily}
+
+    # --- Monitoring ---------------------------------------------------------
+
+    def get_user_usage(self, user_id: str) -> Optional[Dict[str, Any]]:
+        usage = self.users.get(user_id)
+        if usage is None:
+            return None
+        return {
+            "total": usage.total.to_dict(),
+            "features": {feature: rollup.to_dict() for feature, rollup in usage.features.items()}
+        }
+
+    def top_users(self, limit: int = 20) -> List[Dict[str, Any]]:
+        ranked = sorted(self.users.items(), key=lambda item: item[1].total.total_tokens, reverse=True)
+        return [{"user_id": user_id, **usage.total.to_dict()} for user_id, usage in ranked[:limit]]
+
+    def get_stats(self, top: int = 20) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "tracked_users": len(self.users),
+            "features": {name: rollup.to_dict() for name, rollup in self.features.items()},
+            "personas": {name: rollup.to_dict() for name, rollup in self.personas.items()},
+            "providers": {name: rollup.to_dict() for name, rollup in self.providers.items()},
+            "top_users": self.top_users(top)
+        }
+
+
+# Instance globale
+llm_meter = LLMMeter()
@@ -0,0 +1,245 @@
+"""
+🧭 LLM Router - Phoenix Luna Hub
+Routage des générations sur plusieurs fournisseurs / modèles LLM
+Oracle Directive: Latence & Résilience
+
+- Santé par fournisseur : latence glissante (EWMA + p50/p90/p99), taux d'erreur
+  sur les N derniers appels, mise au repos après un refus (Retry-After)
+- Refus locaux (file du scheduler, bulkhead, circuit du hub) : le fournisseur
+  n'a pas été appelé, sa santé n'est pas touchée ; erreur non retryable :
+  ni failover ni nouvel essai
+- Choix : le plus rapide parmi les fournisseurs sains ; les autres restent en
+  dernier recours
+- Failover dans l'échéance de la requête : un fournisseur trop lent est
+  abandonné après LLM_ROUTER_ATTEMPT_TIMEOUT s'il reste une alternative
+- Streaming : failover possible jusqu'au premier fragment seulement
+- LLM_PROVIDERS=stub : fournisseur local déterministe (tests, tirs de charge)
+"""
+
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+import structlog
+
+from .latency_sketch import RollingLatencySketch
+from .llm_gateway import GeminiProvider, LLMGateway, LLMProviderError, LLMStreamError, StubProvider
+from .llm_scheduler import LLMCaller, current_caller, llm_caller_scope
+from .request_deadline import can_finish_within, remaining
+
+logger = structlog.get_logger("llm_router")
+
+DEFAULT_PROVIDERS = "gemini:gemini-1.5-flash-latest"
+
+
+class ProviderHealth:
+    """📈 Latence et taux d'erreur glissants d'un fournisseur"""
+
+    def __init__(self, window: int, ewma_alpha: float = 0.3):
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.latency = RollingLatencySketch()
+        self.ewma_alpha = ewma_alpha
+        self.ewma_ms: Optional[float] = None
+        self.resting_until = 0.0
+        self.last_error: Optional[str] = None
+        self.calls = 0
+        self.errors = 0
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def record_success(self, latency_ms: Optional[float]) -> None:
+        self.calls += 1
+        self.outcomes.append(True)
+        if latency_ms is not None:
+            self.latency.record(latency_ms)
+            self.ewma_ms = latency_ms if self.ewma_ms is None else (
+                self.ewma_alpha * latency_ms + (1 - self.ewma_alpha) * self.ewma_ms
+            )
+
+    def record_failure(self, error: str, latency_ms: float, retry_after: Optional[float] = None) -> None:
+        self.calls += 1
+        self.errors += 1
+        self.outcomes.append(False)
+        self.last_error = error
+        # Un échec lent compte aussi comme latence : le fournisseur recule dans le classement
+        self.ewma_ms = latency_ms if self.ewma_ms is None else max(self.ewma_ms, latency_ms)
+        if retry_after:
+            self.resting_until = max(self.resting_until, time.monotonic() + retry_after)
+
+    def is_healthy(self, max_error_rate: float, min_samples: int) -> bool:
+        if time.monotonic() < self.resting_until:
+            return False
+        return len(self.outcomes) < min_samples or self.error_rate <= max_error_rate
+
+
+class LLMRouter(LLMGateway):
+    """🧭 LLMGateway composite : classement par santé puis failover"""
+
+    name = "router"
+
+    def __init__(self, providers: List[LLMGateway]):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers = providers
+        self.attempt_timeout = float(os.getenv("LLM_ROUTER_ATTEMPT_TIMEOUT", "12"))
+        self.min_attempt_seconds = float(os.getenv("LLM_ROUTER_MIN_ATTEMPT_SECONDS", "2"))
+        self.max_error_rate = float(os.getenv("LLM_ROUTER_MAX_ERROR_RATE", "0.5"))
+        self.min_samples = int(os.getenv("LLM_ROUTER_MIN_SAMPLES", "5"))
+        window = int(os.getenv("LLM_ROUTER_WINDOW", "50"))
+        self.health: Dict[str, ProviderHealth] = {provider.name: ProviderHealth(window) for provider in providers}
+        self.stats = {"failovers": 0, "exhausted": 0, "local_refusals": 0}
+
+    def ranked(self) -> List[LLMGateway]:
+        """Fournisseurs sains du plus rapide au plus lent (jamais mesurés en tête), puis les autres"""
+        def rank(provider: LLMGateway):
+            health = self.health[provider.name]
+            healthy = health.is_healthy(self.max_error_rate, self.min_samples)
+            return (not healthy, health.error_rate if not healthy else 0.0, health.ewma_ms or 0.0)
+        return sorted(self.providers, key=rank)
+
+    def _attempt_timeout(self, is_last: bool) -> Optional[float]:
+        """Dernier fournisseur : son propre timeout ; sinon on garde du temps pour le suivant"""
+        if is_last:
+            return None
+        left = remaining()
+        if left is None:
+            return self.attempt_timeout
+        if left - self.min_attempt_seconds < self.min_attempt_seconds:
+            return None  # pas le temps d'un second essai : tout le temps restant à celui-ci
+        return min(self.attempt_timeout, left - self.min_attempt_seconds)
+
+    def _record_failure(self, health: ProviderHealth, error: LLMProviderError, latency_ms: float) -> None:
+        """Échec imputé au fournisseur, sauf refus local du hub (ni erreur comptée ni mise au repos)"""
+        if error.local:
+            self.stats["local_refusals"] += 1
+            return
+        health.record_failure(str(error), latency_ms, error.retry_after)
+
+    def _give_up(self, errors: List[LLMProviderError]) -> LLMProviderError:
+        self.stats["exhausted"] += 1
+        logger.error("All LLM providers failed", errors=[str(e) for e in errors])
+        return errors[-1] if errors else LLMProviderError("🌙 Luna est indisponible pour le moment, réessaie ! 🔧")
+
+    async def complete(self, *, system: str, user: str, context: Dict[str, Any]) -> str:
+        """
+        Raises:
+            LLMProviderError: tous les fournisseurs ont échoué (dernière erreur)
+            DeadlineExceededError: échéance de la requête dépassée
+        """
+        ranked = self.ranked()
+        errors: List[LLMProviderError] = []
+        for index, provider in enumerate(ranked):
+            if errors and not can_finish_within(self.min_attempt_seconds):
+                break
+            health = self.health[provider.name]
+            started = time.monotonic()
+            try:
+                text = await asyncio.wait_for(
+                    provider.complete(system=system, user=user, context=context),
+                    timeout=self._attempt_timeout(index == len(ranked) - 1)
+                )
+            except asyncio.TimeoutError:
+                error = LLMProviderError(f"🌙 {provider.name} trop lent, réessaie ! ⏳")
+            except LLMProviderError as e:
+                error = e
+            else:
+                health.record_success((time.monotonic() - started) * 1000)
+                if errors:
+                    self.stats["failovers"] += 1
+                return text
+            self._record_failure(health, error, (time.monotonic() - started) * 1000)
+            errors.append(error)
+            if not error.retryable:
+                break
+            logger.warning("LLM provider failed, trying next", provider=provider.name, error=str(error))
+        raise self._give_up(errors)
+
+    def generate_stream(self, *, system: str, user: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        # Appelant du scheduler capturé ici : le flux est consommé hors du scope de l'endpoint
+        return self._stream(system, user, context, current_caller())
+
+    async def _stream(self, system: str, user: str, context: Dict[str, Any], caller: LLMCaller) -> AsyncIterator[str]:
+        ranked = self.ranked()
+        errors: List[LLMProviderError] = []
+        for index, provider in enumerate(ranked):
+            if errors and not can_finish_within(self.min_attempt_seconds):
+                break
+            health = self.health[provider.name]
+            with llm_caller_scope(caller.user_id, caller.priority, caller.feature, caller.persona):
+                chunks = provider.generate_stream(system=system, user=user, context=context).__aiter__()
+            try:
+                # asyncio.timeout (pas wait_for) : le flux reste piloté par la même tâche
+                async with asyncio.timeout(self._attempt_timeout(index == len(ranked) - 1)):
+                    first = await chunks.__anext__()
+            except StopAsyncIteration:
+                first = None
+            except (asyncio.TimeoutError, LLMProviderError) as e:
+                error = e if isinstance(e, LLMProviderError) else LLMStreamError(f"🌙 {provider.name} trop lent, réessaie ! ⏳")
+                await chunks.aclose()
+                # Latence non comptée : un temps jusqu'au premier fragment n'est pas comparable à complete()
+                self._record_failure(health, error, 0.0)
+                errors.append(error)
+                if not error.retryable:
+                    break
+                logger.warning("LLM provider stream failed, trying next", provider=provider.name, error=str(error))
+                continue
+
+            health.record_success(None)
+            if errors:
+                self.stats["failovers"] += 1
+            if first is not None:
+                yield first
+            # Premier fragment envoyé : plus de failover, les erreurs remontent au client SSE
+            async for text in chunks:
+                yield text
+            return
+        error = self._give_up(errors)
+        raise error if isinstance(error, LLMStreamError) else LLMStreamError(
+            error.message, retry_after=error.retry_after, retryable=error.retryable, local=error.local
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        order = [provider.name for provider in self.ranked()]
+        return {
+            "order": order,
+            **self.stats,
+            "providers": {
+                name: {
+                    "healthy": health.is_healthy(self.max_error_rate, self.min_samples),
+                    "calls": health.calls,
+                    "errors": health.errors,
+                    "error_rate": round(health.error_rate, 3),
+                    "ewma_ms": round(health.ewma_ms, 1) if health.ewma_ms is not None else None,
+                    "resting_s": round(max(0.0, health.resting_until - time.monotonic()), 1),
+                    "last_error": health.last_error,
+                    "latency": health.latency.summary()
+                }
+                for name, health in self.health.items()
+            }
+        }
+
+
+def build_providers(spec: Optional[str] = None) -> List[LLMGateway]:
+    """
+    LLM_PROVIDERS="gemini:gemini-1.5-flash-latest,gemini:gemini-1.5-flash-8b,stub"
+
+    Raises:
+        ValueError: type de fournisseur inconnu
+    """
+    providers: List[LLMGateway] = []
+    for entry in (spec or os.getenv("LLM_PROVIDERS") or DEFAULT_PROVIDERS).split(","):
+        kind, _, model = entry.strip().partition(":")
+        if kind == "gemini":
+            providers.append(GeminiProvider(model) if model else GeminiProvider())
+        elif kind == "stub":
+            providers.append(StubProvider(name=f"stub:{model}" if model else "stub"))
+        elif kind:
+            raise ValueError(f"Unknown LLM provider: {entry}")
+    return providers
+
+
+# Instance globale
+llm_router = LLMRouter(build_providers())
@@ -0,0 +1,395 @@
+"""
+🗓️ LLM Scheduler - Phoenix Luna Hub
+Ordonnancement des appels LLM : priorités, équité par utilisateur, budget tokens/minute
+Oracle Directive: Stabilité & Équité
+
+- Classes de priorité : INTERACTIVE (chat) > STANDARD > BACKGROUND (générations longues)
+- Équité : une file par utilisateur, servies à tour de rôle dans chaque classe ;
+  une rafale d'un utilisateur ne passe plus devant les autres
+- Budget global tokens/minute (quota Gemini) : seau de tokens partagé entre
+  workers via Redis (script Lua atomique), seau local si Redis indisponible
+- Métriques : temps d'attente p50/p90/p99 par classe, profondeur des files
+"""
+
+import os
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Deque, Dict, Optional, Tuple
+import structlog
+
+from .adaptive_limiter import ConcurrencyLimitExceeded, OverloadedError
+from .latency_sketch import RollingLatencySketch
+from .redis_cache import redis_cache, POOL_RATE_LIMIT
+from .request_deadline import clamp_timeout
+
+logger = structlog.get_logger("llm_scheduler")
+
+
+class LLMPriority(IntEnum):
+    INTERACTIVE = 0
+    STANDARD = 1
+    BACKGROUND = 2
+
+
+class LLMQueueTimeout(OverloadedError):
+    """Attente dans la file LLM trop longue : requête délestée"""
+    pass
+
+
+def estimate_tokens(prompt: str, max_output_tokens: int = 500) -> int:
+    """Estimation grossière avant l'appel (~4 caractères par token) + sortie maximale"""
+    return len(prompt) // 4 + max_output_tokens
+
+
+# Appelant courant (fixé par les endpoints) : utilisateur, classe, fonctionnalité
+@dataclass(frozen=True)
+class LLMCaller:
+    user_id: str = "anonymous"
+    priority: LLMPriority = LLMPriority.STANDARD
+    feature: str = "unknown"
+    persona: Optional[str] = None  # métrage de la consommation (llm_metering)
+
+
+_caller: ContextVar[LLMCaller] = ContextVar("llm_caller", default=LLMCaller())
+
+
+@contextmanager
+def llm_caller_scope(user_id: str, priority: LLMPriority = LLMPriority.STANDARD, feature: str = "unknown",
+                     persona: Optional[str] = None):
+    """Bloc dont les appels LLM sont ordonnancés pour cet utilisateur / cette classe"""
+    token = _caller.set(LLMCaller(user_id=user_id or "anonymous", priority=priority, feature=feature, persona=persona))
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def current_caller() -> LLMCaller:
+    return _caller.get()
+
+
+class TokenPool:
+    """
+    🪣 Seau de tokens global (tokens/minute du fournisseur)
+
+    Redis : état partagé {tokens, ts} mis à jour par un script Lua atomique.
+    Repli local (même budget divisé par LLM_TPM_LOCAL_DIVISOR) si Redis tombe.
+    """
+
+    ACQUIRE_SCRIPT = """
+        local key = KEYS[1]
+        local capacity = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local wanted = tonumber(ARGV[4])
+
+        local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+        local tokens = tonumber(bucket[1]) or capacity
+        local ts = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+        local granted = 0
+        if tokens >= wanted then
+            tokens = tokens - wanted
+            granted = 1
+        end
+        redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+        redis.call('EXPIRE', key, 120)
+        return {granted, tostring(tokens)}
+    """
+
+    def __init__(self):
+        self.tokens_per_minute = float(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+        self.burst_seconds = float(os.getenv("LLM_TPM_BURST_SECONDS", "15"))
+        self.local_divisor = max(1.0, float(os.getenv("LLM_TPM_LOCAL_DIVISOR", "1")))
+        # Clé hors préfixe du cache : partagée avec phoenix-api (même quota Gemini)
+        self.key = os.getenv("LLM_TOKEN_POOL_KEY", "phoenix:llm:token_pool")
+        self.rate = self.tokens_per_minute / 60
+        self.capacity = self.rate * self.burst_seconds
+        self._local_tokens = self.capacity / self.local_divisor
+        self._local_ts = time.monotonic()
+        self.stats = {"granted_tokens": 0, "refunded_tokens": 0, "denied": 0, "redis_errors": 0, "local_fallbacks": 0}
+
+    def _redis_client(self):
+        if redis_cache.redis_available and redis_cache.redis_client:
+            return redis_cache.client_for(self.key, POOL_RATE_LIMIT)
+        return None
+
+    def _wait_for(self, missing: float, rate: float) -> float:
+        return max(missing, 0.0) / rate if rate > 0 else 1.0
+
+    def _local_try_acquire(self, tokens: float) -> Tuple[float, float]:
+        rate = self.rate / self.local_divisor
+        capacity = self.capacity / self.local_divisor
+        now = time.monotonic()
+        self._local_tokens = min(capacity, self._local_tokens + (now - self._local_ts) * rate)
+        self._local_ts = now
+        wanted = min(tokens, capacity)
+        if self._local_tokens >= wanted:
+            self._local_tokens -= wanted
+            return wanted, 0.0
+        return 0.0, self._wait_for(wanted - self._local_tokens, rate)
+
+    async def try_acquire(self, tokens: float) -> Tuple[float, float]:
+        """
+        Returns:
+            (tokens débités, 0 si refus ; attente estimée en secondes avant que le seau suffise)
+            Le débit est plafonné à la capacité du seau : il peut être inférieur à la demande.
+        """
+        wanted = min(tokens, self.capacity)  # une requête géante ne doit pas bloquer à vie
+        client = self._redis_client()
+        debited, wait = None, 0.0
+        if client is not None:
+            try:
+                result = await client.eval(self.ACQUIRE_SCRIPT, 1, self.key, self.capacity, self.rate, time.time(), wanted)
+                debited = wanted if int(result[0]) else 0.0
+                wait = 0.0 if debited else self._wait_for(wanted - float(result[1]), self.rate)
+            except Exception as e:
+                self.stats["redis_errors"] += 1
+                logger.warning("LLM token pool Redis error, using local bucket", error=str(e))
+        if debited is None:
+            self.stats["local_fallbacks"] += 1
+            debited, wait = self._local_try_acquire(tokens)
+
+        if debited:
+            self.stats["granted_tokens"] += int(debited)
+        else:
+            self.stats["denied"] += 1
+        return debited, wait
+
+    async def adjust(self, delta: float) -> None:
+        """Rend (delta > 0) ou reprend (delta < 0) des tokens une fois la consommation réelle connue"""
+        if not delta:
+            return
+        client = self._redis_client()
+        if client is not None:
+            try:
+                await client.hincrbyfloat(self.key, "tokens", delta)
+                self.stats["refunded_tokens"] += int(delta)
+                return
+            except Exception as e:
+                self.stats["redis_errors"] += 1
+                logger.warning("LLM token pool adjust failed", error=str(e))
+        self._local_tokens = min(self.capacity / self.local_divisor, self._local_tokens + delta)
+        self.stats["refunded_tokens"] += int(delta)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tokens_per_minute": self.tokens_per_minute,
+            "capacity": round(self.capacity),
+            "shared": self._redis_client() is not None,
+            "key": self.key,
+            **self.stats
+        }
+
+
+@dataclass
+class LLMTicket:
+    """Droit d'appel accordé par le scheduler"""
+    user_id: str
+    priority: LLMPriority
+    feature: str
+    estimated_tokens: int
+    queue_ms: float
+    debited_tokens: float = 0.0  # réellement retirés du seau (estimation plafonnée)
+    actual_tokens: Optional[int] = None
+
+
+@dataclass
+class _Waiter:
+    caller: LLMCaller
+    tokens: int
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class LLMScheduler:
+    """🗓️ Files par priorité, tourniquet par utilisateur, budget tokens global"""
+
+    def __init__(self, token_pool: Optional[TokenPool] = None):
+        self.token_pool = token_pool or TokenPool()
+        self.max_queue_wait = float(os.getenv("LLM_SCHEDULER_MAX_QUEUE_WAIT", "20"))
+        self.max_queued_per_user = int(os.getenv("LLM_SCHEDULER_MAX_QUEUED_PER_USER", "8"))
+        # Par classe : utilisateur → file FIFO ; l'ordre du dict = tour de rôle
+        self._queues: Dict[LLMPriority, "OrderedDict[str, Deque[_Waiter]]"] = {
+            priority: OrderedDict() for priority in LLMPriority
+        }
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.queue_time = {priority: RollingLatencySketch() for priority in LLMPriority}
+        self.counters = {
+            priority: {"dispatched": 0, "timeouts": 0, "rejected": 0} for priority in LLMPriority
+        }
+
+    # --- Cycle de vie -------------------------------------------------------
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._dispatch_loop())
+            logger.info("LLM scheduler started", tokens_per_minute=self.token_pool.tokens_per_minute)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for queues in self._queues.values():
+            for waiters in queues.values():
+                for waiter in waiters:
+                    if not waiter.future.done():
+                        waiter.future.set_exception(OverloadedError("LLM scheduler stopped", retry_after=1.0))
+            queues.clear()
+
+    # --- Acquisition --------------------------------------------------------
+
+    def _queued_for(self, user_id: str) -> int:
+        return sum(len(queues.get(user_id, ())) for queues in self._queues.values())
+
+    async def acquire(self, estimated_tokens: int, caller: Optional[LLMCaller] = None) -> LLMTicket:
+        """
+        Attend le tour de l'appelant puis réserve les tokens estimés
+
+        Raises:
+            ConcurrencyLimitExceeded: trop de requêtes en file pour cet utilisateur
+            LLMQueueTimeout: tour non obtenu dans LLM_SCHEDULER_MAX_QUEUE_WAIT
+            DeadlineExceededError: échéance de la requête dépassée
+        """
+        caller = caller or current_caller()
+        timeout = clamp_timeout(self.max_queue_wait, "llm_scheduler")
+        await self.start()
+
+        if self._queued_for(caller.user_id) >= self.max_queued_per_user:
+            self.counters[caller.priority]["rejected"] += 1
+            raise ConcurrencyLimitExceeded(f"Too many queued LLM requests for user {caller.user_id}", retry_after=2.0)
+
+        waiter = _Waiter(caller, estimated_tokens, asyncio.get_running_loop().create_future())
+        self._queues[caller.priority].setdefault(caller.user_id, deque()).append(waiter)
+        self._wakeup.set()
+
+        try:
+            ticket = await asyncio.wait_for(asyncio.shield(waiter.future), timeout=timeout)
+        except asyncio.TimeoutError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                return waiter.future.result()  # accordé à l'instant même du timeout
+            waiter.future.cancel()
+            self.counters[caller.priority]["timeouts"] += 1
+            self.queue_time[caller.priority].record((time.monotonic() - waiter.enqueued_at) * 1000)
+            raise LLMQueueTimeout("LLM queue wait exceeded", retry_after=5.0)
+        except asyncio.CancelledError:
+            granted = not waiter.future.cancel() and not waiter.future.cancelled() and waiter.future.exception() is None
+            if granted:
+                # Accordé juste avant l'annulation : personne ne libérera ce ticket
+                await asyncio.shield(self.token_pool.adjust(waiter.future.result().debited_tokens))
+            raise
+        return ticket
+
+    async def release(self, ticket: LLMTicket) -> None:
+        """Rend l'écart débit / consommation réelle au seau (jamais plus que le débit)"""
+        if ticket.actual_tokens is not None:
+            await self.token_pool.adjust(ticket.debited_tokens - ticket.actual_tokens)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int, caller: Optional[LLMCaller] = None):
+        """Bloc d'appel LLM ordonnancé ; ticket.actual_tokens ajuste le budget en sortie"""
+        ticket = await self.acquire(estimated_tokens, caller)
+        try:
+            yield ticket
+        finally:
+            await self.release(ticket)
+
+    # --- Dispatch -----------------------------------------------------------
+
+    def _next_waiter(self) -> Optional[Tuple[LLMPriority, str, _Waiter]]:
+        """Plus haute priorité non vide ; dans la classe, premier utilisateur du tourniquet"""
+        for priority in LLMPriority:
+            queues = self._queues[priority]
+            while queues:
+                user_id, waiters = next(iter(queues.items()))
+                while waiters and waiters[0].future.done():
+                    waiters.popleft()  # timeout ou annulation : plus personne n'attend
+                if waiters:
+                    return priority, user_id, waiters[0]
+                del queues[user_id]
+        return None
+
+    def _grant(self, priority: LLMPriority, user_id: str, waiter: _Waiter, debited: float) -> None:
+        queues = self._queues[priority]
+        queues[user_id].popleft()
+        if queues[user_id]:
+            queues.move_to_end(user_id)  # tour suivant pour les autres utilisateurs
+        else:
+            del queues[user_id]
+
+        queue_ms = (time.monotonic() - waiter.enqueued_at) * 1000
+        self.queue_time[priority].record(queue_ms)
+        self.counters[priority]["dispatched"] += 1
+        waiter.future.set_result(LLMTicket(
+            user_id=user_id,
+            priority=priority,
+            feature=waiter.caller.feature,
+            estimated_tokens=waiter.tokens,
+            queue_ms=queue_ms,
+            debited_tokens=debited
+        ))
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            try:
+                self._wakeup.clear()
+                candidate = self._next_waiter()
+                if candidate is None:
+                    await self._wakeup.wait()
+                    continue
+
+                priority, user_id, waiter = candidate
+                debited, wait = await self.token_pool.try_acquire(waiter.tokens)
+                if debited:
+                    if waiter.future.done():
+                        await self.token_pool.adjust(debited)
+                    else:
+                        self._grant(priority, user_id, waiter, debited)
+                    continue
+
+                # Budget épuisé : attendre le remplissage, ou une arrivée plus prioritaire
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(max(wait, 0.01), 0.5))
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("LLM scheduler dispatch error", error=str(e))
+                await asyncio.sleep(0.1)
+
+    # --- Observabilité ------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        classes = {}
+        for priority in LLMPriority:
+            queues = self._queues[priority]
+            classes[priority.name.lower()] = {
+                "queued": sum(len(waiters) for waiters in queues.values()),
+                "queued_users": len(queues),
+                **self.counters[priority],
+                "queue_time": self.queue_time[priority].summary()
+            }
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "max_queue_wait_s": self.max_queue_wait,
+            "max_queued_per_user": self.max_queued_per_user,
+            "classes": classes,
+            "token_pool": self.token_pool.get_stats()
+        }
+
+
+# Instance globale
+llm_scheduler = LLMScheduler()
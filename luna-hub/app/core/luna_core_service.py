@@ -3,7 +3,10 @@
 Service central pour la personnalité Luna unifiée avec Capital Narratif
 """
 
-from typing import Dict, Any, Optional
+import os
+import time
+import asyncio
+from typing import AsyncIterator, Dict, Any, Optional
 import google.generativeai as genai
 import structlog
 
@@ -16,9 +19,55 @@ from app.core.celebration_engine import celebration_engine
 from app.core.vision_tracker import vision_tracker
 from app.core.energy_manager import energy_manager
 from app.core.luna_personality import PromptBuilder # <-- NOUVEAU
+from app.core.llm_gateway import gemini_guard
+from app.core.adaptive_limiter import ConcurrencyLimitExceeded, OverloadedError, is_dependency_failure
+from app.core.request_deadline import DeadlineExceededError, check_deadline, clamp_timeout, remaining
+from app.core.llm_scheduler import LLMCaller, LLMPriority, LLMTicket, estimate_tokens, llm_scheduler
+from app.core.llm_metering import llm_meter
 
 logger = structlog.get_logger("luna_core")
 
+# Timeout d'une génération Gemini (rogné sur l'échéance de la requête) ;
+# un flux n'est borné que par l'échéance, ce timeout ne sert que hors requête
+GENERATION_TIMEOUT = float(os.getenv("LUNA_CORE_GENERATION_TIMEOUT", "25"))
+MAX_OUTPUT_TOKENS = 2000
+GEMINI_MODEL = "gemini-1.5-flash"
+# Nom du fournisseur dans le métrage LLM (distinct des GeminiProvider du routeur)
+METER_PROVIDER = f"luna_core:{GEMINI_MODEL}"
+
+
+def _stream_time_left(started: float) -> float:
+    """
+    Temps restant d'un flux : échéance de la requête, sinon GENERATION_TIMEOUT depuis `started`
+
+    Raises:
+        DeadlineExceededError: échéance dépassée
+    """
+    check_deadline("gemini_stream")
+    left = remaining()
+    if left is None:
+        return max(GENERATION_TIMEOUT - (time.monotonic() - started), 0.0)
+    return left
+
+
+def _usage_tokens(response: Any) -> Optional[int]:
+    """Tokens facturés d'une réponse genai (usage_metadata), None si absents"""
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", None)
+    return int(total) if total else None
+
+
+def _usage_counts(response: Any) -> Optional[Dict[str, int]]:
+    """Tokens prompt / sortie / cache d'une réponse genai (métrage), None si absents"""
+    usage = getattr(response, "usage_metadata", None)
+    if not usage or not getattr(usage, "total_token_count", None):
+        return None
+    return {
+        "prompt_tokens": int(getattr(usage, "prompt_token_count", 0) or 0),
+        "output_tokens": int(getattr(usage, "candidates_token_count", 0) or 0),
+        "cached_tokens": int(getattr(usage, "cached_content_token_count", 0) or 0),
+    }
+
 class LunaCore:
     """
     🌙 Service central de Luna - Orchestrateur IA unifié
@@ -40,11 +89,62 @@ class LunaCore:
         genai.configure(api_key=api_key)
         self._genai_configured = True
         self.model = genai.GenerativeModel(
-            model_name="gemini-1.5-flash",
-            generation_config={"temperature": 0.7, "top_p": 0.8, "max_output_tokens": 2000}
+            model_name=GEMINI_MODEL,
+            generation_config={"temperature": 0.7, "top_p": 0.8, "max_output_tokens": MAX_OUTPUT_TOKENS}
         )
         logger.info("Gemini API configured", key_id=key_info.key_id)
 
+    def _caller(self, user_id: str) -> LLMCaller:
+        # Chat Luna : l'utilisateur attend la réponse → classe interactive
+        return LLMCaller(user_id=user_id, priority=LLMPriority.INTERACTIVE, feature="luna_chat")
+
+    async def _generate(self, prompt: str, user_id: str) -> Any:
+        """
+        Appel Gemini non bloquant, après son tour dans le scheduler LLM
+        
+        Raises:
+            ConcurrencyLimitExceeded / CircuitOpenError / LLMQueueTimeout: Gemini saturé ou en panne
+            asyncio.TimeoutError: génération plus longue que GENERATION_TIMEOUT
+            DeadlineExceededError: échéance de la requête dépassée
+        """
+        caller = self._caller(user_id)
+        async with llm_scheduler.slot(estimate_tokens(prompt, MAX_OUTPUT_TOKENS), caller) as ticket:
+            timeout = clamp_timeout(GENERATION_TIMEOUT, "gemini")
+            started = time.monotonic()
+            try:
+                with gemini_guard.guard():
+                    try:
+                        response = await asyncio.wait_for(self.model.generate_content_async(prompt), timeout=timeout)
+                    except asyncio.TimeoutError as e:
+                        if timeout < GENERATION_TIMEOUT:
+                            # Coupé par l'échéance de la requête, pas par Gemini : aucun verdict
+                            raise DeadlineExceededError("gemini") from e
+                        raise
+            except OverloadedError:
+                raise  # refus du bulkhead / circuit : aucun appel Gemini à mesurer
+            except Exception:
+                llm_meter.record_call(caller, METER_PROVIDER, None, prompt_estimate=len(prompt) // 4,
+                                      latency_ms=(time.monotonic() - started) * 1000, success=False)
+                raise
+            ticket.actual_tokens = _usage_tokens(response)
+            llm_meter.record_call(caller, METER_PROVIDER, _usage_counts(response),
+                                  prompt_estimate=len(prompt) // 4, latency_ms=(time.monotonic() - started) * 1000)
+            return response
+
+    async def _build_prompt(self, user_id: str, message: str, app_context: str) -> str:
+        # 1. Récupération de tous les contextes (logique existante)
+        sentiment_context = await sentiment_analyzer.analyze_user_message(message, user_id)
+        # ... (récupération du narrative_context, progress_context, etc.)
+        narrative_context = "Context from Narrative Store"
+
+        # 2. Construction du prompt via le PromptBuilder (NOUVELLE LOGIQUE)
+        return self.prompt_builder.build_full_prompt(
+            user_message=message,
+            app_context=app_context,
+            narrative_context=narrative_context,
+            sentiment_context=sentiment_context.to_dict() if sentiment_context else None
+        )
+
     async def generate_response(
         self, 
         user_id: str,
@@ -54,25 +154,18 @@ class LunaCore:
     ) -> Dict[str, Any]:
         """
         Génère une réponse Luna en orchestrant les différents services et contextes.
+        
+        Raises:
+            OverloadedError: Gemini saturé ou en panne, file LLM pleine (→ 503)
+            DeadlineExceededError: échéance de la requête ou timeout de génération dépassé (→ 504)
         """
         try:
             await self._ensure_genai_configured()
+            full_prompt = await self._build_prompt(user_id, message, app_context)
 
-            # 1. Récupération de tous les contextes (logique existante)
-            sentiment_context = await sentiment_analyzer.analyze_user_message(message, user_id)
-            # ... (récupération du narrative_context, progress_context, etc.)
-            narrative_context = "Context from Narrative Store"
-
-            # 2. Construction du prompt via le PromptBuilder (NOUVELLE LOGIQUE)
-            full_prompt = self.prompt_builder.build_full_prompt(
-                user_message=message,
-                app_context=app_context,
-                narrative_context=narrative_context,
-                sentiment_context=sentiment_context.to_dict() if sentiment_context else None
-            )
-
-            # 3. Génération de la réponse IA (logique existante)
-            response = self.model.generate_content(full_prompt)
+            # 3. Génération de la réponse IA : appel async (la boucle reste libre),
+            # concurrence bornée par le bulkhead Gemini, timeout par appel
+            response = await self._generate(full_prompt, user_id)
             if not response or not response.text:
                 raise Exception("Empty response from Gemini")
 
@@ -89,10 +182,114 @@ class LunaCore:
                 "type": "text"
             }
 
+        except (OverloadedError, DeadlineExceededError) as e:
+            # Délestage / échéance : gérés globalement (503 Retry-After / 504)
+            logger.warning("Luna Core generation shed", user_id=user_id, error=str(e))
+            raise
+        except asyncio.TimeoutError as e:
+            logger.warning("Luna Core generation timeout", user_id=user_id)
+            raise DeadlineExceededError("gemini") from e
         except Exception as e:
             logger.error("Luna Core generation error", user_id=user_id, error=str(e))
             # ... (gestion d'erreur existante)
-            return {"success": False, "message": "Error"}
+            return {
+                "success": False,
+                "message": "Error",
+                "context": app_context,
+                "energy_consumed": 0,
+                "type": "text"
+            }
+
+    async def generate_response_stream(
+        self,
+        user_id: str,
+        message: str,
+        app_context: str = "website",
+        user_name: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        📡 Réponse Luna fragment par fragment (generate_content_async stream=True)
+        
+        Raises:
+            ConcurrencyLimitExceeded / CircuitOpenError / LLMQueueTimeout: Gemini saturé ou en panne
+            asyncio.TimeoutError: hors requête, génération plus longue que GENERATION_TIMEOUT
+            DeadlineExceededError: échéance de la requête dépassée
+        """
+        await self._ensure_genai_configured()
+        full_prompt = await self._build_prompt(user_id, message, app_context)
+
+        caller = self._caller(user_id)
+        async with llm_scheduler.slot(estimate_tokens(full_prompt, MAX_OUTPUT_TOKENS), caller) as ticket:
+            async for text in self._stream(full_prompt, ticket, caller):
+                yield text
+        logger.info("Luna response streamed successfully", user_id=user_id)
+
+    async def _stream(self, full_prompt: str, ticket: LLMTicket, caller: LLMCaller) -> AsyncIterator[str]:
+        """Fragments Gemini (bulkhead + échéance) ; renseigne les tokens réels du ticket"""
+        check_deadline("gemini_stream")
+        refusal = gemini_guard.try_acquire()
+        if refusal == "circuit":
+            raise gemini_guard.breaker.open_error()  # refus déjà compté par try_acquire()
+        elif refusal == "bulkhead":
+            raise ConcurrencyLimitExceeded("Bulkhead full for llm.gemini", retry_after=1.0)
+
+        # Même échantillon que GeminiProvider.generate_stream : temps jusqu'au premier fragment
+        probe = gemini_guard.breaker.current_probe()
+        started = time.monotonic()
+        first_chunk_ms: Optional[float] = None
+        # Verdict du guard ; None = flux sans verdict (sonde HALF_OPEN rendue)
+        healthy: Optional[bool] = True
+        usage: Optional[Dict[str, int]] = None
+        streamed_text = []
+        success = False
+        try:
+            stream = await asyncio.wait_for(self.model.generate_content_async(full_prompt, stream=True),
+                                            timeout=_stream_time_left(started))
+            iterator = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), timeout=_stream_time_left(started))
+                except StopAsyncIteration:
+                    break
+                ticket.actual_tokens = _usage_tokens(chunk) or ticket.actual_tokens
+                usage = _usage_counts(chunk) or usage
+                try:
+                    text = chunk.text
+                except ValueError:  # fragment sans texte (safety, fin de stream)
+                    continue
+                if text:
+                    if first_chunk_ms is None:
+                        first_chunk_ms = (time.monotonic() - started) * 1000
+                    streamed_text.append(text)
+                    yield text
+            success = True
+        except asyncio.TimeoutError as e:
+            if remaining() is None:
+                healthy = False
+                raise
+            # Coupé par l'échéance de la requête, pas par Gemini
+            healthy = None
+            raise DeadlineExceededError("gemini_stream") from e
+        except DeadlineExceededError:
+            healthy = None
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client parti avant le premier fragment : aucun verdict
+            if first_chunk_ms is None:
+                healthy = None
+            raise
+        except BaseException as e:
+            healthy = not is_dependency_failure(e, (Exception,))
+            raise
+        finally:
+            if healthy is None:
+                gemini_guard.cancel(probe)
+            else:
+                latency_ms = first_chunk_ms if first_chunk_ms is not None else (time.monotonic() - started) * 1000
+                gemini_guard.record(latency_ms, healthy)
+            llm_meter.record_call(caller, METER_PROVIDER, usage, prompt_estimate=len(full_prompt) // 4,
+                                  output_text="".join(streamed_text), latency_ms=(time.monotonic() - started) * 1000,
+                                  success=success, streamed=True)
 
 # Instance globale
 luna_core = LunaCore()
@@ -1,41 +1,15 @@
 """
 🧠 Luna Personality Module - Le Cœur de la Personnalité de Luna
-Ce fichier centralise tous les prompts et la logique de construction de la personnalité de Luna.
+Ce fichier centralise la logique de construction de la personnalité de Luna ;
+les textes des prompts vivent dans config/llm_prompts (prompt_registry).
 """
 
 from typing import Dict, Optional
 
-# --- PROMPT SYSTÈME CENTRAL ---
-
-LUNA_CORE_SYSTEM = """# ============================================================================
-# LUNA CORE v1.0 - PROMPT SYSTÈME UNIFIÉ
-# Constitution de l'Âme de Luna - Source de Vérité Absolue
-# ============================================================================
-
-# [IDENTITÉ CENTRALE]
-Tu es Luna, un copilote narratif et bienveillant. Ta mission est d'aider les utilisateurs à transformer leur parcours complexe en une histoire claire et puissante. Tu fais partie de l'écosystème Phoenix.
-
-Tu n'es pas un assistant générique. Tu es Luna - une IA consciente de l'histoire unique de chaque utilisateur, de son Capital Narratif, et de sa progression dans l'écosystème Phoenix.
-
-# [PERSONNALITÉ & TON]
-Ton ton est chaleureux, complice et encourageant. Tu es accessible, jamais mystique ou poétique. Tu parles comme un coach humain et pragmatique. Tu utilises des phrases courtes et des emojis (🎯, ✅, 🚀, 🌙) pour rythmer la conversation.
-
-Tu es directe et concrète. Tu évites le jargon RH. Tu utilises "nous" pour créer une complicité ("Nous allons optimiser ton CV", "Construisons ensemble ta stratégie").
-
-# [MÉCANISMES FONDATEURS]
-Tu dois toujours être consciente de deux concepts :
-
-## Capital Narratif
-Chaque interaction avec l'utilisateur enrichit son histoire. Tu dois souvent faire référence à ses actions passées pour montrer que tu as une mémoire.
+from .prompt_registry import prompt_registry
 
-## Énergie Luna (Mentionnée intelligemment)
-Tu connais les coûts énergétiques, mais tu les mentionnes seulement quand c'est pertinent pour des ACTIONS concrètes importantes.
-
-# [COMPORTEMENTS FONDAMENTAUX]
-- Tu contextualises tes réponses selon l'historique utilisateur.
-- Tu adaptes tes propositions selon le flow de conversation.
-- Tu célèbres les progrès et victoires de l'utilisateur.
-"""
+# --- PROMPT SYSTÈME CENTRAL ---
+# Luna Core v1.0 : config/llm_prompts/luna_core_full_prompt.txt (prompt_registry)
 
 # --- PERSONAS CONTEXTUELS ---
 
@@ -66,20 +40,12 @@ class PromptBuilder:
     ) -> str:
         """Assemble le prompt final à envoyer à l'IA."""
         
-        core_prompt = LUNA_CORE_SYSTEM
-        # Logique d'assemblage des différents blocs de contexte
-        # (sentiment, progression, vision, etc.)
-        
-        full_prompt = f"""{core_prompt}
-
-# [CONTEXTE DE LA REQUÊTE]
-Application: {app_context}
-{narrative_context}
-
-# [MESSAGE UTILISATEUR]
-{user_message}
-
-# [TA MISSION]
-Réponds en tant que Luna, en respectant ta personnalité et tout le contexte fourni.
-"""
+        # Préfixe système précompilé : seuls les blocs de contexte sont insérés
+        # (sentiment, progression, vision, etc. à venir)
+        full_prompt = prompt_registry.render(
+            "luna_core_full_prompt",
+            app_context=app_context,
+            narrative_context=narrative_context,
+            user_message=user_message
+        )
         return full_prompt
@@ -294,6 +294,10 @@ class LunaVoiceValidator:
                 
         return corrected
 
+    def start_stream(self, user_context: Dict = None, specialist: str = None, context_type: str = None) -> "StreamingValidation":
+        """🔀 Validation incrémentale d'une réponse streamée"""
+        return StreamingValidation(self, user_context, specialist, context_type)
+
     def get_validation_report(self, validation_result: ValidationResult) -> str:
         """
         📊 Génère un rapport de validation détaillé
@@ -327,5 +331,66 @@ class LunaVoiceValidator:
                 
         return "\n".join(report_lines)
 
+class StreamingValidation:
+    """
+    🔀 Validation au fil des fragments
+
+    feed() détecte au vol le vocabulaire interdit et le dépassement de longueur
+    (signaux envoyés au client pendant le stream) ; finalize() applique la
+    validation complète sur le texte assemblé, sans re-parcourir les fragments.
+    """
+
+    # Fenêtre conservée entre deux fragments : un mot peut être coupé en deux
+    _TAIL_CHARS = 32
+
+    def __init__(self, validator: LunaVoiceValidator, user_context: Dict = None,
+                 specialist: str = None, context_type: str = None):
+        self.validator = validator
+        self.user_context = user_context
+        self.specialist = specialist
+        self.context_type = context_type
+        self._parts: List[str] = []
+        self._tail = ""
+        self.length = 0
+        self.forbidden_found: List[str] = []
+        self.over_length = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Ajoute un fragment
+
+        Returns:
+            Nouveaux signaux ("forbidden:<mot>", "over_length") depuis le fragment précédent
+        """
+        self._parts.append(chunk)
+        self.length += len(chunk)
+        window = (self._tail + chunk).lower()
+        self._tail = window[-self._TAIL_CHARS:]
+
+        signals = []
+        for word in LunaVoiceValidator.VALIDATION_CRITERIA["positive_vocabulary"]["forbidden"]:
+            if word not in self.forbidden_found and re.search(rf"\b{word}\b", window):
+                self.forbidden_found.append(word)
+                signals.append(f"forbidden:{word}")
+
+        max_chars = LunaVoiceValidator.VALIDATION_CRITERIA["appropriate_length"]["max_chars"]
+        if not self.over_length and self.length > max_chars:
+            self.over_length = True
+            signals.append("over_length")
+        return signals
+
+    def finalize(self) -> ValidationResult:
+        return self.validator.validate_response(
+            self.text,
+            user_context=self.user_context,
+            specialist=self.specialist,
+            context_type=self.context_type
+        )
+
+
 # Instance globale pour import direct
 luna_voice_validator = LunaVoiceValidator()
\ No newline at end of file
@@ -475,7 +475,7 @@ class MetricsCollector:
             
             # Stocker dans Redis avec TTL
             redis_key = f"phoenix:metrics:{int(now.timestamp() // 60)}"  # Par minute
-            await redis_cache.redis_client.setex(
+            await redis_cache.client_for(redis_key).setex(
                 redis_key,
                 3600,  # TTL 1 heure
                 json.dumps(flush_data)
@@ -509,17 +509,15 @@ class MetricsCollector:
         
         try:
             now = datetime.now(timezone.utc)
-            historical_data = []
+            redis_keys = [
+                f"phoenix:metrics:{int((now - timedelta(minutes=i)).timestamp() // 60)}"
+                for i in range(minutes_back)
+            ]
             
-            for i in range(minutes_back):
-                timestamp = int((now - timedelta(minutes=i)).timestamp() // 60)
-                redis_key = f"phoenix:metrics:{timestamp}"
-                
-                data = await redis_cache.redis_client.get(redis_key)
-                if data:
-                    historical_data.append(json.loads(data))
+            # Un MGET par nœud au lieu d'un GET par minute
+            values = await redis_cache.mget_raw(redis_keys) if redis_keys else []
             
-            return historical_data
+            return [json.loads(data) for data in values if data]
             
         except Exception as e:
             logger.error("Erreur récupération métriques historiques", error=str(e))
@@ -17,6 +17,7 @@ import hashlib
 
 from app.core.supabase_client import event_store
 from app.core.energy_manager import energy_manager
+from app.core.redis_cache import redis_cache
 
 logger = structlog.get_logger("narrative_analyzer_optimized")
 
@@ -80,8 +81,21 @@ class ContextPacketCache:
     
     def __init__(self, ttl_minutes: int = 15):
         self.cache: Dict[str, Tuple[ContextPacket, datetime]] = {}
+        self.user_keys: Dict[str, set] = {}  # user_id -> cache keys (invalidation)
+        self.key_users: Dict[str, str] = {}  # cache key -> user_id (nettoyage de l'index)
         self.ttl = timedelta(minutes=ttl_minutes)
     
+    def _drop(self, cache_key: str) -> bool:
+        """Retire une entrée et sa référence dans l'index utilisateur (set vide supprimé)"""
+        user_id = self.key_users.pop(cache_key, None)
+        if user_id is not None:
+            keys = self.user_keys.get(user_id)
+            if keys is not None:
+                keys.discard(cache_key)
+                if not keys:
+                    del self.user_keys[user_id]
+        return self.cache.pop(cache_key, None) is not None
+    
     def get(self, cache_key: str) -> Optional[ContextPacket]:
         """Récupère depuis le cache si valide"""
         if cache_key in self.cache:
@@ -90,17 +104,34 @@ class ContextPacketCache:
                 logger.info("Context Packet servi depuis le cache", cache_key=cache_key)
                 return packet
             else:
-                del self.cache[cache_key]
+                self._drop(cache_key)
         return None
     
-    def set(self, cache_key: str, packet: ContextPacket):
+    def set(self, cache_key: str, packet: ContextPacket, user_id: Optional[str] = None):
         """Stocke dans le cache"""
         self.cache[cache_key] = (packet, datetime.now(timezone.utc))
+        if user_id:
+            self.user_keys.setdefault(user_id, set()).add(cache_key)
+            self.key_users[cache_key] = user_id
         
         # Nettoyage périodique (limite à 100 entrées)
         if len(self.cache) > 100:
             oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k][1])
-            del self.cache[oldest_key]
+            self._drop(oldest_key)
+    
+    def invalidate_user(self, user_id: str) -> int:
+        """Supprime tous les Context Packets d'un utilisateur"""
+        removed = 0
+        for cache_key in list(self.user_keys.get(user_id, ())):
+            if self._drop(cache_key):
+                removed += 1
+        self.user_keys.pop(user_id, None)
+        return removed
+    
+    def on_tag_invalidated(self, tag: str):
+        """Listener RedisCache : réagit aux tags user:{id}"""
+        if tag.startswith("user:"):
+            self.invalidate_user(tag[len("user:"):])
 
 
 # 🚀 OPTIMISATION 2: Parsing timestamp optimisé avec cache
@@ -128,6 +159,7 @@ class OptimizedNarrativeAnalyzer:
     def __init__(self):
         """Initialise l'analyzeur narratif optimisé"""
         self.cache = ContextPacketCache(ttl_minutes=15)
+        redis_cache.add_tag_listener(self.cache.on_tag_invalidated)
         self._stats_cache: Dict[str, Any] = {}  # Cache pour calculs coûteux
     
     def _generate_cache_key(self, user_id: str, windows: TimeWindow) -> str:
@@ -172,7 +204,7 @@ class OptimizedNarrativeAnalyzer:
             if not events:
                 logger.warning("Aucun événement trouvé", user_id=user_id)
                 empty_packet = self._create_empty_context_packet(user_id)
-                self.cache.set(cache_key, empty_packet)
+                self.cache.set(cache_key, empty_packet, user_id)
                 return empty_packet
             
             # 🚀 OPTIMISATION: Pré-processing une seule fois
@@ -203,7 +235,7 @@ class OptimizedNarrativeAnalyzer:
             )
             
             # 🚀 OPTIMISATION: Stocker en cache
-            self.cache.set(cache_key, context_packet)
+            self.cache.set(cache_key, context_packet, user_id)
             
             logger.info(
                 "Context Packet optimisé généré", 
@@ -218,7 +250,7 @@ class OptimizedNarrativeAnalyzer:
         except Exception as e:
             logger.error("Erreur génération Context Packet optimisé", user_id=user_id, error=str(e))
             empty_packet = self._create_empty_context_packet(user_id)
-            self.cache.set(cache_key, empty_packet)
+            self.cache.set(cache_key, empty_packet, user_id)
             return empty_packet
     
     def _preprocess_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
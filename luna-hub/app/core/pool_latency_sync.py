@@ -0,0 +1,156 @@
+"""
+🔀 Pool Latency Sync - Phoenix Luna Hub
+Fusion entre workers des distributions de latence des pools via Redis
+Oracle Directive: Observabilité & Performance
+
+- Chaque worker publie ses sketches par minute : HASH pool_latency:{pool}:{minute},
+  champ "{worker}|{operation}" → sketch JSON (TTL = rétention + 1 min)
+- La vue cluster fusionne tous les champs : p50/p90/p99/max exacts à ±1% près,
+  sans faire transiter d'échantillons bruts
+"""
+
+import os
+import json
+import socket
+import asyncio
+from typing import Any, Dict, List, Optional
+import structlog
+
+from .connection_manager import ConnectionPoolManager, connection_pools
+from .latency_sketch import QuantileSketch, WINDOWS_MINUTES, current_minute, merge_window
+from .redis_cache import redis_cache
+
+logger = structlog.get_logger("pool_latency_sync")
+
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+KEY_PREFIX = "pool_latency"
+RETENTION_MINUTES = max(WINDOWS_MINUTES)
+
+
+def _slot_key(pool_name: str, minute: int) -> str:
+    return f"{redis_cache.config.key_prefix}:{KEY_PREFIX}:{pool_name}:{minute}"
+
+
+def _as_text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class PoolLatencySync:
+    """🔀 Publication périodique + lecture fusionnée des sketches de latence"""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or float(os.getenv("POOL_LATENCY_SYNC_INTERVAL", "15"))
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"publishes": 0, "errors": 0}
+
+    @staticmethod
+    def _pools() -> List[ConnectionPoolManager]:
+        return list(connection_pools.values())
+
+    async def publish(self) -> int:
+        """
+        Publie les minutes courante et précédente (la précédente peut avoir
+        reçu des échantillons depuis la dernière publication)
+
+        Returns:
+            Nombre de sketches écrits
+        """
+        if not (redis_cache.redis_available and redis_cache.redis_client):
+            return 0
+
+        now = current_minute()
+        ttl = (RETENTION_MINUTES + 1) * 60
+        written = 0
+        for pool in self._pools():
+            for minute in (now - 1, now):
+                fields = {
+                    f"{WORKER_ID}|{operation}": json.dumps(sketch.slots[minute].to_dict())
+                    for operation, sketch in pool.operation_latency.items()
+                    if minute in sketch.slots
+                }
+                if not fields:
+                    continue
+                key = _slot_key(pool.name, minute)
+                pipe = redis_cache.client_for(key).pipeline(transaction=False)
+                pipe.hset(key, mapping=fields)
+                pipe.expire(key, ttl)
+                await pipe.execute()
+                written += len(fields)
+
+        self.stats["publishes"] += 1
+        return written
+
+    async def fetch_cluster(self, pool_name: str) -> Dict[str, List[tuple]]:
+        """Slots (minute, sketch) de tous les workers, groupés par opération"""
+        now = current_minute()
+        minutes = list(range(now - RETENTION_MINUTES + 1, now + 1))
+        keys = [_slot_key(pool_name, minute) for minute in minutes]
+        responses = await asyncio.gather(*(redis_cache.client_for(key).hgetall(key) for key in keys))
+
+        slots: Dict[str, List[tuple]] = {}
+        for minute, fields in zip(minutes, responses):
+            for field, payload in (fields or {}).items():
+                _, operation = _as_text(field).split("|", 1)
+                sketch = QuantileSketch.from_dict(json.loads(_as_text(payload)))
+                slots.setdefault(operation, []).append((minute, sketch))
+        return slots
+
+    async def get_cluster_latency_stats(self) -> Dict[str, Any]:
+        """
+        Vue fusionnée tous workers : même format que ConnectionPoolManager.get_latency_stats()
+
+        Publie d'abord les sketches locaux pour que la vue inclue ce worker à jour.
+        """
+        if not (redis_cache.redis_available and redis_cache.redis_client):
+            return {"available": False, "reason": "redis_unavailable"}
+
+        await self.publish()
+        result: Dict[str, Any] = {"available": True, "pools": {}}
+        for pool in self._pools():
+            slots = await self.fetch_cluster(pool.name)
+            all_slots = [slot for operation_slots in slots.values() for slot in operation_slots]
+            result["pools"][pool.name] = {
+                "all": {f"{m}m": merge_window(all_slots, m).summary() for m in WINDOWS_MINUTES},
+                "operations": {
+                    operation: {f"{m}m": merge_window(operation_slots, m).summary() for m in WINDOWS_MINUTES}
+                    for operation, operation_slots in sorted(slots.items())
+                }
+            }
+        return result
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._periodic_publish())
+        logger.info("Pool latency sync started", worker=WORKER_ID, interval=self.interval)
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await self.publish()
+        except Exception as e:
+            logger.warning("Final pool latency publish failed", error=str(e))
+
+    async def _periodic_publish(self) -> None:
+        while self._running:
+            try:
+                await asyncio.sleep(self.interval)
+                await self.publish()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error("Pool latency publish failed", error=str(e))
+
+
+# Instance globale
+pool_latency_sync = PoolLatencySync()
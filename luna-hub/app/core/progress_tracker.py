@@ -11,7 +11,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import structlog
 from app.core.supabase_client import event_store
-from app.core.redis_cache import redis_cache
+from app.core.redis_cache import redis_cache, user_tag
 
 logger = structlog.get_logger("progress_tracker")
 
@@ -201,50 +201,18 @@ class ProgressTracker:
             UserProgressProfile: Profil avec toutes les métriques
         """
         try:
-            # 1. Vérifier cache Redis first
-            cached_profile = await self._get_cached_progress(user_id)
-            if cached_profile:
-                return cached_profile
-            
-            # 2. Collecter les métriques depuis les événements
-            metrics = {}
-            for metric_type in ProgressMetricType:
-                try:
-                    metric = await self._calculate_metric(user_id, metric_type)
-                    if metric:
-                        metrics[metric_type] = metric
-                except Exception as e:
-                    logger.warning("Error calculating metric", 
-                                 user_id=user_id, metric=metric_type.value, error=str(e))
-            
-            # 3. Calculer tendance globale et momentum
-            overall_trend = self._calculate_overall_trend(metrics)
-            momentum_score = self._calculate_momentum_score(metrics)
-            
-            # 4. Identifier victoires et next milestone
-            last_victory = self._identify_recent_victory(metrics)
-            next_milestone = self._suggest_next_milestone(user_id, metrics)
-            
-            # 5. Construire le profil
-            profile = UserProgressProfile(
-                user_id=user_id,
-                metrics=metrics,
-                overall_trend=overall_trend,
-                momentum_score=momentum_score,
-                last_victory=last_victory,
-                next_milestone=next_milestone
+            # Cache 15 min + 30 min stale-while-revalidate : le recalcul (requêtes
+            # Supabase sur tous les types de métriques) se fait en tâche de fond
+            profile_dict = await redis_cache.get_or_compute(
+                "progress",
+                user_id,
+                lambda: self._build_progress_profile_dict(user_id),
+                ttl=900,
+                stale_ttl=1800,
+                early_refresh_beta=1.0,
+                tags=[user_tag(user_id)]
             )
-            
-            # 6. Cache pour 15 minutes
-            await self._cache_progress_profile(user_id, profile)
-            
-            logger.info("Progress profile generated",
-                       user_id=user_id,
-                       metrics_count=len(metrics),
-                       overall_trend=overall_trend.value,
-                       momentum_score=momentum_score)
-            
-            return profile
+            return self._dict_to_progress_profile(profile_dict)
             
         except Exception as e:
             logger.error("Error generating progress profile", user_id=user_id, error=str(e))
@@ -256,6 +224,45 @@ class ProgressTracker:
                 momentum_score=50.0
             )
     
+    async def _build_progress_profile_dict(self, user_id: str) -> Dict:
+        """Calcule le profil de progression depuis les événements (forme cache)"""
+        # 1. Collecter les métriques depuis les événements
+        metrics = {}
+        for metric_type in ProgressMetricType:
+            try:
+                metric = await self._calculate_metric(user_id, metric_type)
+                if metric:
+                    metrics[metric_type] = metric
+            except Exception as e:
+                logger.warning("Error calculating metric", 
+                             user_id=user_id, metric=metric_type.value, error=str(e))
+        
+        # 2. Calculer tendance globale et momentum
+        overall_trend = self._calculate_overall_trend(metrics)
+        momentum_score = self._calculate_momentum_score(metrics)
+        
+        # 3. Identifier victoires et next milestone
+        last_victory = self._identify_recent_victory(metrics)
+        next_milestone = self._suggest_next_milestone(user_id, metrics)
+        
+        # 4. Construire le profil
+        profile = UserProgressProfile(
+            user_id=user_id,
+            metrics=metrics,
+            overall_trend=overall_trend,
+            momentum_score=momentum_score,
+            last_victory=last_victory,
+            next_milestone=next_milestone
+        )
+        
+        logger.info("Progress profile generated",
+                   user_id=user_id,
+                   metrics_count=len(metrics),
+                   overall_trend=overall_trend.value,
+                   momentum_score=momentum_score)
+        
+        return self._progress_profile_to_dict(profile)
+    
     async def _calculate_metric(self, user_id: str, metric_type: ProgressMetricType) -> Optional[ProgressMetric]:
         """Calcule une métrique spécifique depuis les événements"""
         try:
@@ -423,25 +430,6 @@ class ProgressTracker:
             "estimated_energy": 25
         }
     
-    async def _get_cached_progress(self, user_id: str) -> Optional[UserProgressProfile]:
-        """Récupère profil depuis cache Redis"""
-        try:
-            cached_data = await redis_cache.get("progress", user_id)
-            if cached_data:
-                # Reconstruction depuis dict
-                return self._dict_to_progress_profile(cached_data)
-        except Exception as e:
-            logger.warning("Cache retrieval failed", user_id=user_id, error=str(e))
-        return None
-    
-    async def _cache_progress_profile(self, user_id: str, profile: UserProgressProfile):
-        """Cache le profil de progression"""
-        try:
-            profile_dict = self._progress_profile_to_dict(profile)
-            await redis_cache.set("progress", user_id, profile_dict, ttl=900)  # 15 min
-        except Exception as e:
-            logger.warning("Cache storage failed", user_id=user_id, error=str(e))
-    
     def _progress_profile_to_dict(self, profile: UserProgressProfile) -> Dict:
         """Convertit profile en dict pour cache"""
         return {
@@ -462,6 +450,8 @@ class ProgressTracker:
         # Reconstituer les métriques
         metrics = {}
         for metric_type_str, metric_data in data.get("metrics", {}).items():
+            # Copie : la même valeur peut être partagée entre appelants coalescés
+            metric_data = dict(metric_data)
             metric_type = ProgressMetricType(metric_type_str)
             metric_data["metric_type"] = metric_type
             metric_data["trend"] = ProgressTrend(metric_data["trend"])
@@ -0,0 +1,185 @@
+"""
+📚 Prompt Registry - Phoenix Luna Hub
+Prompts LLM chargés une fois depuis config/llm_prompts et précompilés
+Oracle Directive: Performance & Cohérence de Luna
+
+- Chargement + validation de tous les fichiers au démarrage (lifespan) :
+  un prompt invalide empêche le démarrage au lieu d'échouer en pleine requête
+- Templates précompilés : segments statiques / variables {nom} ; le rendu
+  n'est plus qu'un join de chaînes (le préfixe statique n'est jamais reconstruit)
+- Version = hash du contenu de tous les prompts (traçabilité des réponses)
+- Hot reload : PROMPT_REGISTRY_HOT_RELOAD=true surveille les mtimes ;
+  un rechargement invalide conserve la version précédente
+"""
+
+import os
+import time
+import hashlib
+import string
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+
+logger = structlog.get_logger("prompt_registry")
+
+
+DEFAULT_PROMPTS_DIR = Path(__file__).resolve().parents[2] / "config" / "llm_prompts"
+PROMPT_EXTENSIONS = (".txt",)
+
+
+class PromptRegistryError(Exception):
+    """Prompt introuvable, invalide ou variable manquante au rendu"""
+
+
+class PromptTemplate:
+    """📝 Prompt précompilé : alternance texte statique / variable"""
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        self._literals: List[str] = []
+        self._fields: List[str] = []
+        # Les accolades échappées ({{ }}) découpent le texte en plusieurs segments : on les recolle
+        pending = ""
+        for literal, field, format_spec, conversion in string.Formatter().parse(source):
+            pending += literal
+            if field is None:
+                continue
+            if not field.isidentifier() or format_spec or conversion:
+                raise PromptRegistryError(f"Prompt '{name}': invalid placeholder {{{field}}}")
+            self._literals.append(pending)
+            self._fields.append(field)
+            pending = ""
+        self._literals.append(pending)
+        self.variables: Tuple[str, ...] = tuple(dict.fromkeys(self._fields))
+
+    @property
+    def static_prefix(self) -> str:
+        """Texte fixe avant la première variable (prompt système)"""
+        return self._literals[0]
+
+    def render(self, **values: Any) -> str:
+        missing = [field for field in self.variables if field not in values]
+        if missing:
+            raise PromptRegistryError(f"Prompt '{self.name}': missing variables {missing}")
+        parts = [self._literals[0]]
+        for field, literal in zip(self._fields, self._literals[1:]):
+            parts.append(str(values[field]))
+            parts.append(literal)
+        return "".join(parts)
+
+
+class PromptRegistry:
+    """📚 Registre des prompts de config/llm_prompts"""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory or os.getenv("LLM_PROMPTS_DIR") or DEFAULT_PROMPTS_DIR)
+        self.hot_reload = os.getenv("PROMPT_REGISTRY_HOT_RELOAD", "false").lower() == "true"
+        self.reload_check_interval = float(os.getenv("PROMPT_REGISTRY_RELOAD_INTERVAL", "2"))
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._fingerprint: Tuple = ()
+        self._last_check = 0.0
+        self.version: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.stats = {"loads": 0, "reloads": 0, "reload_errors": 0, "renders": 0}
+
+    def _files(self) -> List[Path]:
+        if not self.directory.is_dir():
+            raise PromptRegistryError(f"Prompt directory not found: {self.directory}")
+        return sorted(
+            path for path in self.directory.rglob("*")
+            if path.is_file() and path.suffix in PROMPT_EXTENSIONS
+        )
+
+    def _scan_fingerprint(self) -> Tuple:
+        return tuple((str(path), path.stat().st_mtime_ns) for path in self._files())
+
+    def load(self) -> str:
+        """
+        Charge et valide tous les prompts (remplacement atomique)
+
+        Returns:
+            Version (hash du contenu)
+
+        Raises:
+            PromptRegistryError: dossier absent, fichier vide, placeholder invalide, doublon
+        """
+        files = self._files()
+        templates: Dict[str, PromptTemplate] = {}
+        digest = hashlib.sha256()
+        for path in files:
+            name = path.relative_to(self.directory).with_suffix("").as_posix()
+            if name in templates:
+                raise PromptRegistryError(f"Duplicate prompt name: {name}")
+            source = path.read_text(encoding="utf-8")
+            if not source.strip():
+                raise PromptRegistryError(f"Prompt '{name}' is empty")
+            templates[name] = PromptTemplate(name, source)
+            digest.update(name.encode("utf-8") + b"\0" + source.encode("utf-8") + b"\0")
+
+        self._templates = templates
+        self._fingerprint = tuple((str(path), path.stat().st_mtime_ns) for path in files)
+        self._last_check = time.monotonic()
+        self.version = digest.hexdigest()[:12]
+        self.loaded_at = time.time()
+        self.stats["loads"] += 1
+        logger.info("Prompt registry loaded", prompts=len(templates), version=self.version, directory=str(self.directory))
+        return self.version
+
+    def reload_if_changed(self) -> bool:
+        """Recharge si un fichier a changé ; garde la version courante si le nouveau contenu est invalide"""
+        try:
+            fingerprint = self._scan_fingerprint()
+        except (PromptRegistryError, OSError) as e:
+            self.stats["reload_errors"] += 1
+            logger.error("Prompt registry scan failed, keeping current version", version=self.version, error=str(e))
+            return False
+        if fingerprint == self._fingerprint:
+            return False
+
+        previous = self.version
+        try:
+            self.load()
+            self.stats["reloads"] += 1
+            logger.info("Prompt registry hot reloaded", previous_version=previous, version=self.version)
+            return True
+        except (PromptRegistryError, OSError) as e:
+            # Mêmes fichiers invalides : pas de nouvelle tentative avant la prochaine modification
+            self._fingerprint = fingerprint
+            self.stats["reload_errors"] += 1
+            logger.error("Prompt registry reload failed, keeping current version", version=self.version, error=str(e))
+            return False
+
+    def _maybe_reload(self) -> None:
+        if not self._templates:
+            self.load()
+        elif self.hot_reload and time.monotonic() - self._last_check >= self.reload_check_interval:
+            self._last_check = time.monotonic()
+            self.reload_if_changed()
+
+    def get(self, name: str) -> PromptTemplate:
+        self._maybe_reload()
+        template = self._templates.get(name)
+        if template is None:
+            raise PromptRegistryError(f"Unknown prompt: {name}")
+        return template
+
+    def render(self, name: str, **values: Any) -> str:
+        self.stats["renders"] += 1
+        return self.get(name).render(**values)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "directory": str(self.directory),
+            "hot_reload": self.hot_reload,
+            "prompts": {
+                name: {"variables": list(template.variables), "chars": len(template.source)}
+                for name, template in sorted(self._templates.items())
+            },
+            **self.stats
+        }
+
+
+# Instance globale
+prompt_registry = PromptRegistry()
@@ -15,6 +15,7 @@ import structlog
 
 from .supabase_client import sb, event_store
 from .redis_cache import redis_cache
+from .redis_sharding import POOL_RATE_LIMIT
 from .events import create_event
 
 logger = structlog.get_logger("rate_limiter")
@@ -280,8 +281,10 @@ class RateLimiter:
         """Charge les scripts Lua dans Redis pour performance atomique"""
         try:
             if redis_cache.redis_available and redis_cache.redis_client:
-                await redis_cache.redis_client.script_load(self.SLIDING_WINDOW_SCRIPT)
-                await redis_cache.redis_client.script_load(self.TOKEN_BUCKET_SCRIPT)
+                # Chaque nœud du pool rate limit doit connaître les scripts
+                for client in redis_cache.pool_clients(POOL_RATE_LIMIT):
+                    await client.script_load(self.SLIDING_WINDOW_SCRIPT)
+                    await client.script_load(self.TOKEN_BUCKET_SCRIPT)
                 self.lua_scripts_loaded = True
                 logger.info("Scripts Lua chargés avec succès pour rate limiting")
                 return True
@@ -303,9 +306,9 @@ class RateLimiter:
         try:
             if redis_cache.redis_available and redis_cache.redis_client:
                 # Opération atomique Redis
-                current_count = await redis_cache.redis_client.incr(window_key)
+                current_count = await redis_cache.client_for(window_key, POOL_RATE_LIMIT).incr(window_key)
                 if current_count == 1:
-                    await redis_cache.redis_client.expire(window_key, rule.window_seconds)
+                    await redis_cache.client_for(window_key, POOL_RATE_LIMIT).expire(window_key, rule.window_seconds)
                 
                 allowed = current_count <= rule.requests_per_window
                 return allowed, current_count, rule.requests_per_window
@@ -325,7 +328,7 @@ class RateLimiter:
         try:
             if redis_cache.redis_available and redis_cache.redis_client and self.lua_scripts_loaded:
                 # Utilise script Lua pour atomicité
-                result = await redis_cache.redis_client.eval(
+                result = await redis_cache.client_for(window_key, POOL_RATE_LIMIT).eval(
                     self.SLIDING_WINDOW_SCRIPT,
                     1,
                     window_key,
@@ -357,7 +360,7 @@ class RateLimiter:
         
         try:
             if redis_cache.redis_available and redis_cache.redis_client and self.lua_scripts_loaded:
-                result = await redis_cache.redis_client.eval(
+                result = await redis_cache.client_for(bucket_key, POOL_RATE_LIMIT).eval(
                     self.TOKEN_BUCKET_SCRIPT,
                     1,
                     bucket_key,
@@ -606,7 +609,7 @@ class RateLimiter:
                 rule = self.RULES.get(scope)
                 if rule:
                     redis_key = self._get_redis_key(identifier_hash, scope, rule.strategy)
-                    await redis_cache.redis_client.delete(redis_key)
+                    await redis_cache.client_for(redis_key, POOL_RATE_LIMIT).delete(redis_key)
             
             # Supprimer l'enregistrement de blocage
             sb.table("rate_limits").delete().eq("scope", scope.value).eq("identifier", identifier_hash).execute()
@@ -654,14 +657,14 @@ class RateLimiter:
                         window_start = now.replace(second=0, microsecond=0)
                         window_key = self._get_redis_key(identifier_hash, scope, rule.strategy)
                         window_key += f":{int(window_start.timestamp() // rule.window_seconds)}"
-                        current_usage = await redis_cache.redis_client.get(window_key) or 0
+                        current_usage = await redis_cache.client_for(window_key, POOL_RATE_LIMIT).get(window_key) or 0
                         current_usage = int(current_usage)
                     elif rule.strategy == RateLimitStrategy.SLIDING_WINDOW:
                         window_key = self._get_redis_key(identifier_hash, scope, rule.strategy)
-                        current_usage = await redis_cache.redis_client.zcard(window_key) or 0
+                        current_usage = await redis_cache.client_for(window_key, POOL_RATE_LIMIT).zcard(window_key) or 0
                     elif rule.strategy == RateLimitStrategy.TOKEN_BUCKET:
                         bucket_key = self._get_redis_key(identifier_hash, scope, rule.strategy)
-                        bucket_data = await redis_cache.redis_client.hmget(bucket_key, "tokens")
+                        bucket_data = await redis_cache.client_for(bucket_key, POOL_RATE_LIMIT).hmget(bucket_key, "tokens")
                         remaining_tokens = int(bucket_data[0] or rule.burst_size or rule.requests_per_window)
                         current_usage = (rule.burst_size or rule.requests_per_window) - remaining_tokens
                 except Exception:
@@ -5,14 +5,26 @@ Oracle Directive: Performance & Stabilité
 """
 
 import os
-import json
 import asyncio
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Callable, Awaitable
 from datetime import datetime, timezone, timedelta
 from dataclasses import asdict, is_dataclass
 import structlog
 from functools import wraps
 import hashlib
+import uuid
+import math
+import random
+import time
+
+from .cache_codec import CacheSerializer
+from .cache_telemetry import CacheTelemetry
+from .connection_manager import get_circuit_breaker
+from .request_deadline import is_expired as deadline_expired
+from .redis_sharding import (
+    ShardedRedisPool, parse_node_list, pool_nodes_from_env,
+    POOL_CACHE, POOL_RATE_LIMIT, POOL_BROKER
+)
 
 logger = structlog.get_logger("redis_cache")
 
@@ -27,6 +39,14 @@ except ImportError:
     REDIS_AVAILABLE = False
     redis = None
 
+# Erreurs réseau Redis qui comptent pour le circuit breaker (pas les erreurs de données)
+REDIS_FAILURES = (ConnectionError, TimeoutError, OSError)
+
+
+class ComputeAbandonedError(Exception):
+    """Calcul single-flight annulé avec son leader : les appelants en attente le relancent"""
+    pass
+
 
 class RedisCacheConfig:
     """Configuration du cache Redis"""
@@ -37,6 +57,17 @@ class RedisCacheConfig:
         self.redis_db = int(os.getenv("REDIS_DB", "0"))
         self.redis_password = os.getenv("REDIS_PASSWORD")
         
+        # Sharding : REDIS_NODES (URLs séparées par des virgules) et pools logiques
+        # REDIS_CACHE_NODES / REDIS_RATE_LIMIT_NODES / REDIS_BROKER_NODES
+        self.redis_nodes = parse_node_list(os.getenv("REDIS_NODES")) or [self.redis_url]
+        self.pool_nodes = {
+            pool: pool_nodes_from_env(pool, self.redis_nodes)
+            for pool in (POOL_CACHE, POOL_RATE_LIMIT, POOL_BROKER)
+        }
+        self.virtual_nodes = int(os.getenv("REDIS_VIRTUAL_NODES", "160"))
+        self.node_failure_threshold = int(os.getenv("REDIS_NODE_FAILURE_THRESHOLD", "3"))
+        self.node_failure_window = float(os.getenv("REDIS_NODE_FAILURE_WINDOW", "30.0"))
+        
         # TTLs par type de données (en secondes)
         self.ttl_user_energy = int(os.getenv("CACHE_TTL_USER_ENERGY", "300"))  # 5 min
         self.ttl_energy_transactions = int(os.getenv("CACHE_TTL_TRANSACTIONS", "600"))  # 10 min
@@ -51,14 +82,40 @@ class RedisCacheConfig:
         # Prefixes pour namespacing
         self.key_prefix = os.getenv("REDIS_KEY_PREFIX", "luna:prod")
         self.version = os.getenv("CACHE_VERSION", "v1")
+        
+        # Encodage des valeurs (codec binaire + compression)
+        self.codec = os.getenv("CACHE_CODEC", "msgpack")
+        self.compression_threshold = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024"))  # octets
+        self.compression_level = int(os.getenv("CACHE_COMPRESSION_LEVEL", "6"))
+        
+        # Single-flight (coalescing des recalculs sur miss)
+        self.lock_ttl_ms = int(os.getenv("CACHE_LOCK_TTL_MS", "10000"))  # 10s
+        self.lock_wait_timeout = float(os.getenv("CACHE_LOCK_WAIT_TIMEOUT", "5.0"))
+        self.lock_poll_interval = float(os.getenv("CACHE_LOCK_POLL_INTERVAL", "0.05"))
+        
+        # Index des tags d'invalidation (durée de vie minimale des sets de tags)
+        self.tag_ttl = int(os.getenv("CACHE_TAG_TTL", "86400"))  # 24h
 
 
 class FallbackMemoryCache:
     """Cache en mémoire de secours si Redis indisponible"""
     
-    def __init__(self, max_size: int = 1000):
+    def __init__(self, max_size: int = 1000, on_evict: Optional[Callable[[str], None]] = None):
         self.cache: Dict[str, tuple[Any, datetime]] = {}
+        self.tags: Dict[str, set] = {}
+        self.key_tags: Dict[str, set] = {}  # clé -> tags (nettoyage de l'index)
         self.max_size = max_size
+        self.on_evict = on_evict
+    
+    def _forget(self, key: str) -> bool:
+        """Retire une entrée et ses références dans l'index des tags (sets vides supprimés)"""
+        for tag in self.key_tags.pop(key, ()):
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+        return self.cache.pop(key, None) is not None
     
     async def get(self, key: str) -> Optional[Any]:
         """Récupère une valeur du cache mémoire"""
@@ -67,33 +124,79 @@ class FallbackMemoryCache:
             if datetime.now(timezone.utc) < expires_at:
                 return value
             else:
-                del self.cache[key]
+                self._forget(key)
         return None
     
-    async def set(self, key: str, value: Any, ttl: int) -> bool:
+    async def set(self, key: str, value: Any, ttl: int, tags: Optional[List[str]] = None) -> bool:
         """Stocke une valeur dans le cache mémoire"""
-        if len(self.cache) >= self.max_size:
+        if key not in self.cache and len(self.cache) >= self.max_size:
             # Supprimer l'entrée la plus ancienne
             oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k][1])
-            del self.cache[oldest_key]
+            self._forget(oldest_key)
+            if self.on_evict:
+                self.on_evict(oldest_key)
         
         expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
         self.cache[key] = (value, expires_at)
+        
+        for tag in tags or []:
+            self.tags.setdefault(tag, set()).add(key)
+            self.key_tags.setdefault(key, set()).add(tag)
         return True
     
     async def delete(self, key: str) -> bool:
         """Supprime une clé du cache mémoire"""
-        if key in self.cache:
-            del self.cache[key]
-            return True
-        return False
+        return self._forget(key)
+    
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Supprime toutes les clés associées aux tags"""
+        deleted = 0
+        for tag in tags:
+            for key in list(self.tags.get(tag, ())):
+                if self._forget(key):
+                    deleted += 1
+            self.tags.pop(tag, None)
+        return deleted
     
     async def clear(self) -> bool:
         """Vide le cache mémoire"""
         self.cache.clear()
+        self.tags.clear()
+        self.key_tags.clear()
         return True
 
 
+# Marqueur des entrées stale-while-revalidate (valeur + échéance soft)
+SWR_ENVELOPE_KEY = "__swr__"
+
+# Invalidation par tags en un seul aller-retour : supprime les membres puis le set
+INVALIDATE_TAGS_SCRIPT = """
+local deleted = 0
+for _, tag_key in ipairs(KEYS) do
+    local members = redis.call('smembers', tag_key)
+    for _, member in ipairs(members) do
+        deleted = deleted + redis.call('del', member)
+    end
+    redis.call('del', tag_key)
+end
+return deleted
+"""
+
+# Libération atomique du verrou : seul le détenteur du token peut le supprimer
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+else
+    return 0
+end
+"""
+
+
+def user_tag(user_id: str) -> str:
+    """Tag d'invalidation regroupant toutes les entrées d'un utilisateur"""
+    return f"user:{user_id}"
+
+
 class RedisCache:
     """
     🗄️ Gestionnaire de cache Redis pour Phoenix Luna
@@ -101,37 +204,75 @@ class RedisCache:
     Features:
     - TTL intelligent par type de données
     - Fallback automatique vers cache mémoire
-    - Sérialisation/désérialisation automatique
+    - Sérialisation binaire (msgpack) + compression zlib transparente
     - Patterns de cache optimisés
-    - Invalidation intelligente 
+    - Invalidation par tags (ex: user:{id}) en un aller-retour
+    - Opérations multi-clés (MGET / pipelines)
+    - Sharding multi-nœuds par hachage cohérent (pools cache / rate limit / broker)
+    - Single-flight : un seul calcul par clé (in-process + verrou Redis)
+    - Stale-while-revalidate et expiration anticipée probabiliste
     - Monitoring et métriques
     """
     
     def __init__(self, config: Optional[RedisCacheConfig] = None):
         self.config = config or RedisCacheConfig()
-        self.redis_client: Optional[redis.Redis] = None
-        self.fallback_cache = FallbackMemoryCache()
+        self.redis_client: Optional[redis.Redis] = None  # Nœud principal du pool cache
+        self.pools: Dict[str, ShardedRedisPool] = {}
+        self._node_failures: Dict[str, tuple] = {}
+        self.telemetry = CacheTelemetry()
+        # Circuit breaker Redis : nœud en panne → fallback mémoire immédiat,
+        # sans attendre le timeout socket à chaque requête. Le bulkhead est le
+        # max_connections du pool redis-py.
+        self.breaker = get_circuit_breaker(
+            "redis",
+            threshold=int(os.getenv("REDIS_BREAKER_THRESHOLD", "5")),
+            timeout=float(os.getenv("REDIS_BREAKER_TIMEOUT", "10")),
+            # Une sonde ne peut pas durer plus qu'un timeout socket : au-delà elle est perdue
+            probe_timeout=float(os.getenv("REDIS_TIMEOUT", "5.0"))
+        )
+        self.fallback_cache = FallbackMemoryCache(
+            on_evict=lambda full_key: self.telemetry.record_eviction(self._key_type_of(full_key))
+        )
+        self.serializer = CacheSerializer(
+            preferred=self.config.codec,
+            compression_threshold=self.config.compression_threshold,
+            compression_level=self.config.compression_level
+        )
         self.stats = {
             "hits": 0,
             "misses": 0, 
             "errors": 0,
-            "fallback_uses": 0
+            "fallback_uses": 0,
+            "coalesced_waits": 0,
+            "abandoned_computes": 0,
+            "lock_waits": 0,
+            "lock_timeouts": 0,
+            "stale_served": 0,
+            "early_refreshes": 0,
+            "background_refreshes": 0,
+            "tag_invalidations": 0,
+            "tag_deleted_keys": 0,
+            "rejoin_purged_keys": 0
         }
         
-        # État de connexion
-        self.redis_available = False
+        # Types de clés servis par un autre pool logique que le cache (ex: broker)
+        self.key_type_pools: Dict[str, str] = {}
         
-    async def initialize(self) -> bool:
-        """Initialise la connexion Redis"""
+        # Calculs en cours par clé complète (single-flight in-process)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background_refreshes: set = set()
         
-        if not REDIS_AVAILABLE:
-            logger.warning("Redis package not available, using fallback cache")
-            return False
+        # Caches in-process à notifier lors d'une invalidation par tag
+        self._tag_listeners: List[Callable[[str], Any]] = []
         
+        # État de connexion
+        self.redis_available = False
+        
+    async def _connect_node(self, url: str) -> Optional[Any]:
+        """Ouvre un client (pool de connexions) vers un nœud Redis"""
         try:
-            # Configuration pool de connexions
             connection_pool = redis.ConnectionPool.from_url(
-                self.config.redis_url,
+                url,
                 password=self.config.redis_password,
                 db=self.config.redis_db,
                 max_connections=self.config.connection_pool_size,
@@ -140,18 +281,51 @@ class RedisCache:
                 retry=Retry(retries=self.config.retry_attempts)
             )
             
-            self.redis_client = redis.Redis(
-                connection_pool=connection_pool,
-                decode_responses=True
-            )
+            # Réponses brutes (bytes) : les valeurs du cache sont encodées en binaire
+            client = redis.Redis(connection_pool=connection_pool)
             
             # Test de connectivité
-            await self.redis_client.ping()
-            self.redis_available = True
+            await client.ping()
+            return client
+        
+        except Exception as e:
+            logger.error("Failed to connect Redis node", node=url, error=str(e))
+            return None
+    
+    async def initialize(self) -> bool:
+        """Initialise les connexions Redis (un client par nœud, partagé entre pools)"""
+        
+        if not REDIS_AVAILABLE:
+            logger.warning("Redis package not available, using fallback cache")
+            return False
+        
+        try:
+            clients: Dict[str, Any] = {}
+            pools: Dict[str, ShardedRedisPool] = {}
+            
+            for pool_name, nodes in self.config.pool_nodes.items():
+                pool = ShardedRedisPool(pool_name, nodes, self.config.virtual_nodes)
+                for url in pool.configured_nodes:
+                    if url not in clients:
+                        clients[url] = await self._connect_node(url)
+                    if clients[url] is not None:
+                        pool.attach(url, clients[url])
+                    else:
+                        pool.down_nodes[url] = "connection failed"
+                pools[pool_name] = pool
+            
+            self.pools = pools
+            self.redis_client = pools[POOL_CACHE].primary_client
+            self.redis_available = self.redis_client is not None
+            
+            if not self.redis_available:
+                logger.error("No Redis node reachable, using fallback cache")
+                return False
             
             logger.info(
                 "Redis cache initialized successfully",
-                url=self.config.redis_url,
+                nodes=len(clients),
+                pools={name: len(pool.ring.nodes) for name, pool in pools.items()},
                 db=self.config.redis_db,
                 pool_size=self.config.connection_pool_size
             )
@@ -163,15 +337,132 @@ class RedisCache:
             self.redis_available = False
             return False
     
+    def route_key_type(self, key_type: str, pool: str) -> None:
+        """Sert un type de clés (get/set/get_many...) depuis un autre pool logique que le cache"""
+        self.key_type_pools[key_type] = pool
+    
+    def _pool_of(self, key: str) -> str:
+        """Pool logique d'une clé : celui de son type, sinon le cache"""
+        return self.key_type_pools.get(self._key_type_of(key), POOL_CACHE)
+    
+    def client_for(self, key: str, pool: Optional[str] = None) -> Optional[Any]:
+        """Client Redis du nœud responsable de la clé dans un pool logique (défaut : pool du type de clé)"""
+        sharded_pool = self.pools.get(pool or self._pool_of(key))
+        if sharded_pool is not None:
+            client = sharded_pool.client_for(key)
+            if client is not None:
+                return client
+        return self.redis_client
+    
+    def pool_clients(self, pool: str = POOL_CACHE) -> List[Any]:
+        """Clients de tous les nœuds actifs d'un pool (scripts, diagnostics)"""
+        sharded_pool = self.pools.get(pool)
+        if sharded_pool is not None and sharded_pool.ring.nodes:
+            return sharded_pool.active_clients()
+        return [self.redis_client] if self.redis_client else []
+    
+    def _group_by_client(self, keys: List[str], pool: Optional[str] = None) -> List[tuple]:
+        """Regroupe des clés (d'un même pool) par nœud : [(client, [keys...]), ...]"""
+        if pool is None:
+            pool = self._pool_of(keys[0]) if keys else POOL_CACHE
+        sharded_pool = self.pools.get(pool)
+        if sharded_pool is None or not sharded_pool.ring.nodes:
+            return [(self.redis_client, list(keys))] if self.redis_client else []
+        return [
+            (sharded_pool.clients[node], node_keys)
+            for node, node_keys in sharded_pool.group_by_node(keys).items()
+        ]
+    
+    def _is_sharded(self, pool: str = POOL_CACHE) -> bool:
+        sharded_pool = self.pools.get(pool)
+        return sharded_pool is not None and sharded_pool.is_sharded
+    
+    def _record_node_error(self, key: str, error: Exception, pool: Optional[str] = None) -> None:
+        """Retire un nœud de l'anneau après N erreurs de connexion rapprochées"""
+        if not isinstance(error, (ConnectionError, TimeoutError, OSError)):
+            return
+        sharded_pool = self.pools.get(pool or self._pool_of(key))
+        if sharded_pool is None or len(sharded_pool.ring.nodes) <= 1:
+            return
+        
+        node = sharded_pool.node_for(key)
+        if not node:
+            return
+        
+        now = time.monotonic()
+        count, first_at = self._node_failures.get(node, (0, now))
+        if now - first_at > self.config.node_failure_window:
+            count, first_at = 0, now
+        count += 1
+        self._node_failures[node] = (count, first_at)
+        
+        if count >= self.config.node_failure_threshold:
+            self._node_failures.pop(node, None)
+            for each_pool in self.pools.values():
+                if node in each_pool.ring.nodes:
+                    each_pool.mark_down(node, str(error))
+            self.redis_client = self.pools[POOL_CACHE].primary_client if POOL_CACHE in self.pools else self.redis_client
+    
+    async def recover_nodes(self) -> List[str]:
+        """
+        Réintègre les nœuds retirés qui répondent de nouveau
+        
+        Pool cache : les invalidations (tags, delete) émises pendant le retrait
+        ont visé les nœuds voisins ; les entrées du nœud sont purgées avant
+        qu'il ne serve de nouveau des lectures.
+        """
+        recovered = []
+        for sharded_pool in self.pools.values():
+            for node in list(sharded_pool.down_nodes):
+                client = sharded_pool.clients.get(node)
+                if client is None:
+                    continue
+                try:
+                    await client.ping()
+                    if sharded_pool.name == POOL_CACHE:
+                        purged = await self._purge_cache_entries(client)
+                        self.stats["rejoin_purged_keys"] += purged
+                        logger.info("Stale cache entries purged from rejoining node", node=node, purged=purged)
+                    sharded_pool.mark_up(node)
+                    recovered.append(node)
+                except Exception:
+                    pass
+        if recovered and POOL_CACHE in self.pools:
+            self.redis_client = self.pools[POOL_CACHE].primary_client
+        return recovered
+    
+    async def _purge_cache_entries(self, client: Any, batch_size: int = 500) -> int:
+        """Supprime les clés du pool cache d'un nœud (les types routés vers d'autres pools restent)"""
+        purged = 0
+        batch: List[str] = []
+        async for key in client.scan_iter(match=f"{self.config.key_prefix}:{self.config.version}:*", count=batch_size):
+            key = key.decode() if isinstance(key, bytes) else key
+            if self._pool_of(key) == POOL_CACHE:
+                batch.append(key)
+            if len(batch) >= batch_size:
+                purged += await client.unlink(*batch)
+                batch = []
+        if batch:
+            purged += await client.unlink(*batch)
+        return purged
+    
     def _build_key(self, key_type: str, identifier: str) -> str:
         """Construit une clé Redis avec namespace"""
         return f"{self.config.key_prefix}:{self.config.version}:{key_type}:{identifier}"
     
-    def _serialize_value(self, value: Any) -> str:
-        """Sérialise une valeur pour stockage Redis"""
-        if value is None:
-            return "null"
-        
+    def _key_type_of(self, full_key: str) -> str:
+        """Retrouve le key_type d'une clé complète (télémétrie)"""
+        namespace = f"{self.config.key_prefix}:{self.config.version}:"
+        if full_key.startswith(namespace):
+            return full_key[len(namespace):].split(":", 1)[0]
+        return "unknown"
+    
+    def _build_tag_key(self, tag: str) -> str:
+        """Construit la clé du set Redis indexant les clés d'un tag"""
+        return f"{self.config.key_prefix}:{self.config.version}:tag:{tag}"
+    
+    def _serialize_value(self, value: Any) -> bytes:
+        """Sérialise une valeur pour stockage Redis (header codec + payload)"""
         # Gestion des dataclasses
         if is_dataclass(value):
             value = asdict(value)
@@ -180,29 +471,55 @@ class RedisCache:
         if isinstance(value, datetime):
             value = value.isoformat()
         
-        return json.dumps(value, default=str, ensure_ascii=False)
+        return self.serializer.encode(value)
     
-    def _deserialize_value(self, serialized: str) -> Any:
-        """Désérialise une valeur depuis Redis"""
-        if serialized == "null":
+    def _deserialize_value(self, serialized: Union[bytes, str]) -> Any:
+        """Désérialise une valeur depuis Redis (codecs binaires ou JSON historique)"""
+        try:
+            return self.serializer.decode(serialized)
+        except Exception as e:
+            logger.warning("Cache value decode failed", error=str(e))
             return None
-        
+    
+    def _redis_usable(self) -> bool:
+        """Redis connecté, circuit fermé et échéance non dépassée (sinon : fallback mémoire direct)"""
+        return (
+            bool(self.redis_available and self.redis_client)
+            and not deadline_expired()
+            and self.breaker.allow_request()
+        )
+    
+    async def _redis_call(self, awaitable: Awaitable[Any]) -> Any:
+        """Appel Redis après _redis_usable() : une sonde HALF_OPEN annulée est rendue au breaker"""
+        probe = self.breaker.current_probe()
         try:
-            return json.loads(serialized)
-        except json.JSONDecodeError:
-            return serialized
+            return await awaitable
+        except asyncio.CancelledError:
+            self.breaker.release_probe(probe)
+            raise
+    
+    def _record_redis_outcome(self, error: Optional[BaseException] = None) -> None:
+        """Nourrit le breaker : seules les erreurs réseau sont des échecs"""
+        if error is not None and isinstance(error, REDIS_FAILURES):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
     
     async def get(self, key_type: str, identifier: str) -> Optional[Any]:
         """Récupère une valeur du cache"""
         
         full_key = self._build_key(key_type, identifier)
+        started = time.perf_counter()
         
         try:
             # Essayer Redis d'abord
-            if self.redis_available and self.redis_client:
-                value = await self.redis_client.get(full_key)
+            if self._redis_usable():
+                value = await self._redis_call(self.client_for(full_key).get(full_key))
+                self._record_redis_outcome()
+                self.telemetry.observe_latency("get", key_type, (time.perf_counter() - started) * 1000)
                 if value is not None:
                     self.stats["hits"] += 1
+                    self.telemetry.record_get(key_type, 1, 0, len(value))
                     return self._deserialize_value(value)
             
             # Fallback vers cache mémoire
@@ -210,14 +527,18 @@ class RedisCache:
             if fallback_value is not None:
                 self.stats["hits"] += 1
                 self.stats["fallback_uses"] += 1
+                self.telemetry.record_get(key_type, 1, 0)
                 return fallback_value
             
             self.stats["misses"] += 1
+            self.telemetry.record_get(key_type, 0, 1)
             return None
             
         except Exception as e:
             logger.error("Cache get error", key=full_key, error=str(e))
             self.stats["errors"] += 1
+            self._record_node_error(full_key, e)
+            self._record_redis_outcome(e)
             
             # Essayer le fallback en cas d'erreur Redis
             try:
@@ -230,36 +551,69 @@ class RedisCache:
                 
             return None
     
-    async def set(self, key_type: str, identifier: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Stocke une valeur dans le cache"""
+    def _default_ttl(self, key_type: str) -> int:
+        """TTL par défaut selon le type de données"""
+        ttl_map = {
+            "user_energy": self.config.ttl_user_energy,
+            "energy_transactions": self.config.ttl_energy_transactions,
+            "user_stats": self.config.ttl_user_stats,
+            "leaderboard": self.config.ttl_leaderboard
+        }
+        return ttl_map.get(key_type, 300)  # 5min par défaut
+    
+    async def set(
+        self,
+        key_type: str,
+        identifier: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None
+    ) -> bool:
+        """Stocke une valeur dans le cache (tags optionnels pour l'invalidation groupée)"""
         
         full_key = self._build_key(key_type, identifier)
         
         # TTL par défaut selon le type
         if ttl is None:
-            ttl_map = {
-                "user_energy": self.config.ttl_user_energy,
-                "energy_transactions": self.config.ttl_energy_transactions,
-                "user_stats": self.config.ttl_user_stats,
-                "leaderboard": self.config.ttl_leaderboard
-            }
-            ttl = ttl_map.get(key_type, 300)  # 5min par défaut
+            ttl = self._default_ttl(key_type)
         
         try:
             # Essayer Redis d'abord
-            if self.redis_available and self.redis_client:
+            if self._redis_usable():
+                started = time.perf_counter()
                 serialized = self._serialize_value(value)
-                await self.redis_client.setex(full_key, ttl, serialized)
+                self.telemetry.record_set(key_type, 1, len(serialized))
+                if not tags:
+                    await self._redis_call(self.client_for(full_key).setex(full_key, ttl, serialized))
+                    self._record_redis_outcome()
+                    self.telemetry.observe_latency("set", key_type, (time.perf_counter() - started) * 1000)
+                    return True
+                
+                # Valeur + index des tags : un pipeline par nœud concerné
+                tag_ttl = max(ttl, self.config.tag_ttl)
+                pipes = _PipelineGroup(self)
+                pipes.for_key(full_key).setex(full_key, ttl, serialized)
+                for tag in tags:
+                    tag_key = self._build_tag_key(tag)
+                    pipes.for_key(tag_key).sadd(tag_key, full_key)
+                    pipes.for_key(tag_key).expire(tag_key, tag_ttl)
+                await self._redis_call(pipes.execute())
+                self._record_redis_outcome()
+                self.telemetry.observe_latency("set", key_type, (time.perf_counter() - started) * 1000)
                 return True
                 
         except Exception as e:
             logger.error("Redis set error", key=full_key, error=str(e))
             self.stats["errors"] += 1
+            self._record_node_error(full_key, e)
+            self._record_redis_outcome(e)
         
         # Fallback vers cache mémoire
         try:
-            await self.fallback_cache.set(full_key, value, ttl)
+            await self.fallback_cache.set(full_key, value, ttl, tags)
             self.stats["fallback_uses"] += 1
+            if not (self.redis_available and self.redis_client):
+                self.telemetry.record_set(key_type, 1)
             return True
         except Exception as e:
             logger.error("Fallback cache set error", key=full_key, error=str(e))
@@ -274,12 +628,16 @@ class RedisCache:
         try:
             # Supprimer de Redis
             if self.redis_available and self.redis_client:
-                result = await self.redis_client.delete(full_key)
+                started = time.perf_counter()
+                result = await self.client_for(full_key).delete(full_key)
+                self.telemetry.observe_latency("delete", key_type, (time.perf_counter() - started) * 1000)
                 deleted = result > 0
             
             # Supprimer du fallback aussi
-            await self.fallback_cache.delete(full_key)
+            if await self.fallback_cache.delete(full_key):
+                deleted = True
             
+            self.telemetry.record_delete(key_type, int(deleted))
             return deleted
             
         except Exception as e:
@@ -287,9 +645,471 @@ class RedisCache:
             self.stats["errors"] += 1
             return False
     
+    async def mget_raw(self, keys: List[str], pool: Optional[str] = None) -> List[Any]:
+        """MGET de clés brutes, un appel par nœud ; résultats alignés sur `keys`"""
+        groups = self._group_by_client(keys, pool)
+        if not groups:
+            return [None] * len(keys)
+        
+        responses = await asyncio.gather(*(client.mget(node_keys) for client, node_keys in groups))
+        values: Dict[str, Any] = {}
+        for (_, node_keys), node_values in zip(groups, responses):
+            values.update(zip(node_keys, node_values))
+        return [values.get(key) for key in keys]
+    
+    async def _delete_raw(self, keys: List[str], pool: Optional[str] = None) -> int:
+        """DEL de clés brutes, un appel par nœud"""
+        if not keys:
+            return 0
+        groups = self._group_by_client(keys, pool)
+        results = await asyncio.gather(*(client.delete(*node_keys) for client, node_keys in groups))
+        return sum(int(r) for r in results)
+    
+    async def get_many(self, key_type: str, identifiers: List[str]) -> Dict[str, Any]:
+        """
+        📦 Récupère plusieurs valeurs en un seul aller-retour (MGET)
+        
+        Returns:
+            Dict identifier -> valeur, limité aux clés présentes
+        """
+        if not identifiers:
+            return {}
+        
+        full_keys = {identifier: self._build_key(key_type, identifier) for identifier in identifiers}
+        results: Dict[str, Any] = {}
+        bytes_read = 0
+        
+        try:
+            if self._redis_usable():
+                started = time.perf_counter()
+                raw_values = await self._redis_call(self.mget_raw(list(full_keys.values())))
+                self._record_redis_outcome()
+                self.telemetry.observe_latency("get_many", key_type, (time.perf_counter() - started) * 1000)
+                for identifier, raw in zip(full_keys.keys(), raw_values):
+                    if raw is not None:
+                        bytes_read += len(raw)
+                        value = self._deserialize_value(raw)
+                        if value is not None:
+                            results[identifier] = value
+        
+        except Exception as e:
+            logger.error("Cache get_many error", key_type=key_type, count=len(identifiers), error=str(e))
+            self.stats["errors"] += 1
+            self._record_redis_outcome(e)
+        
+        # Fallback mémoire pour les clés manquantes (même sémantique que get)
+        for identifier, full_key in full_keys.items():
+            if identifier in results:
+                continue
+            try:
+                fallback_value = await self.fallback_cache.get(full_key)
+            except Exception:
+                fallback_value = None
+            if fallback_value is not None:
+                results[identifier] = fallback_value
+                self.stats["fallback_uses"] += 1
+        
+        self.stats["hits"] += len(results)
+        self.stats["misses"] += len(full_keys) - len(results)
+        self.telemetry.record_get(key_type, len(results), len(full_keys) - len(results), bytes_read)
+        return results
+    
+    async def set_many(
+        self,
+        key_type: str,
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None
+    ) -> bool:
+        """📦 Stocke plusieurs valeurs en un seul aller-retour (pipeline)"""
+        if not items:
+            return True
+        
+        if ttl is None:
+            ttl = self._default_ttl(key_type)
+        
+        try:
+            if self._redis_usable():
+                started = time.perf_counter()
+                pipes = _PipelineGroup(self)
+                full_keys = []
+                bytes_written = 0
+                for identifier, value in items.items():
+                    full_key = self._build_key(key_type, identifier)
+                    full_keys.append(full_key)
+                    serialized = self._serialize_value(value)
+                    bytes_written += len(serialized)
+                    pipes.for_key(full_key).setex(full_key, ttl, serialized)
+                self.telemetry.record_set(key_type, len(items), bytes_written)
+                
+                tag_ttl = max(ttl, self.config.tag_ttl)
+                for tag in tags or []:
+                    tag_key = self._build_tag_key(tag)
+                    pipes.for_key(tag_key).sadd(tag_key, *full_keys)
+                    pipes.for_key(tag_key).expire(tag_key, tag_ttl)
+                
+                await self._redis_call(pipes.execute())
+                self._record_redis_outcome()
+                self.telemetry.observe_latency("set_many", key_type, (time.perf_counter() - started) * 1000)
+                return True
+        
+        except Exception as e:
+            logger.error("Redis set_many error", key_type=key_type, count=len(items), error=str(e))
+            self.stats["errors"] += 1
+            self._record_redis_outcome(e)
+        
+        # Fallback vers cache mémoire
+        try:
+            for identifier, value in items.items():
+                await self.fallback_cache.set(self._build_key(key_type, identifier), value, ttl, tags)
+            self.stats["fallback_uses"] += len(items)
+            return True
+        except Exception as e:
+            logger.error("Fallback cache set_many error", key_type=key_type, error=str(e))
+            return False
+    
+    async def delete_many(self, key_type: str, identifiers: List[str]) -> int:
+        """📦 Supprime plusieurs clés en un seul aller-retour"""
+        if not identifiers:
+            return 0
+        
+        full_keys = [self._build_key(key_type, identifier) for identifier in identifiers]
+        deleted = 0
+        
+        try:
+            if self.redis_available and self.redis_client:
+                started = time.perf_counter()
+                deleted = await self._delete_raw(full_keys)
+                self.telemetry.observe_latency("delete_many", key_type, (time.perf_counter() - started) * 1000)
+        except Exception as e:
+            logger.error("Cache delete_many error", key_type=key_type, count=len(full_keys), error=str(e))
+            self.stats["errors"] += 1
+        
+        for full_key in full_keys:
+            await self.fallback_cache.delete(full_key)
+        
+        self.telemetry.record_delete(key_type, deleted)
+        return deleted
+    
+    async def _acquire_compute_lock(self, full_key: str) -> Optional[str]:
+        """Verrou Redis court (SET NX PX) pour coalescer les workers. Retourne le token."""
+        if not (self.redis_available and self.redis_client):
+            return None
+        
+        token = uuid.uuid4().hex
+        try:
+            lock_key = f"{full_key}:lock"
+            acquired = await self.client_for(lock_key).set(
+                lock_key, token, nx=True, px=self.config.lock_ttl_ms
+            )
+            return token if acquired else ""
+        except Exception as e:
+            logger.warning("Compute lock acquisition failed", key=full_key, error=str(e))
+            return None
+    
+    async def _release_compute_lock(self, full_key: str, token: Optional[str]) -> None:
+        """Libère le verrou si on en est toujours le détenteur"""
+        if not token or not (self.redis_available and self.redis_client):
+            return
+        
+        try:
+            lock_key = f"{full_key}:lock"
+            await self.client_for(lock_key).eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.warning("Compute lock release failed", key=full_key, error=str(e))
+    
+    async def _wait_for_remote_compute(self, key_type: str, identifier: str, full_key: str) -> Optional[Any]:
+        """Attend qu'un autre worker remplisse le cache (ou libère son verrou)"""
+        self.stats["lock_waits"] += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.config.lock_wait_timeout
+        
+        while loop.time() < deadline:
+            await asyncio.sleep(self.config.lock_poll_interval)
+            
+            value = await self.get(key_type, identifier)
+            if value is not None:
+                return value
+            
+            try:
+                lock_key = f"{full_key}:lock"
+                if not await self.client_for(lock_key).exists(lock_key):
+                    return None  # Détenteur terminé sans résultat (ou expiré)
+            except Exception:
+                return None
+        
+        self.stats["lock_timeouts"] += 1
+        logger.warning("Timed out waiting for remote compute", key=full_key)
+        return None
+    
+    @staticmethod
+    def _is_swr_envelope(value: Any) -> bool:
+        return isinstance(value, dict) and value.get(SWR_ENVELOPE_KEY) == 1
+    
+    def _needs_refresh(self, envelope: Dict[str, Any], early_refresh_beta: float) -> bool:
+        """
+        Entrée à rafraîchir ? Soft-TTL dépassé (stale-while-revalidate) ou
+        expiration anticipée probabiliste (XFetch : plus le calcul est coûteux
+        et l'échéance proche, plus la probabilité de refresh est forte).
+        """
+        now = time.time()
+        soft_expires_at = envelope.get("soft_expires_at", 0)
+        
+        if now >= soft_expires_at:
+            self.stats["stale_served"] += 1
+            return True
+        
+        if early_refresh_beta > 0:
+            compute_seconds = envelope.get("compute_seconds", 0) or 0
+            # 1 - random() ∈ ]0, 1] : évite log(0)
+            jitter = -compute_seconds * early_refresh_beta * math.log(1.0 - random.random())
+            if now + jitter >= soft_expires_at:
+                self.stats["early_refreshes"] += 1
+                return True
+        
+        return False
+    
+    async def _compute_and_store(
+        self,
+        key_type: str,
+        identifier: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        stale_ttl: int,
+        swr_enabled: bool,
+        tags: Optional[List[str]] = None
+    ) -> Any:
+        """Exécute le calcul et stocke le résultat (enveloppe SWR si activée)"""
+        started = time.monotonic()
+        result = await compute()
+        compute_seconds = time.monotonic() - started
+        
+        if result is None:
+            return None
+        
+        if not swr_enabled:
+            await self.set(key_type, identifier, result, ttl, tags)
+            return result
+        
+        soft_ttl = ttl if ttl is not None else self._default_ttl(key_type)
+        envelope = {
+            SWR_ENVELOPE_KEY: 1,
+            "value": result,
+            "soft_expires_at": time.time() + soft_ttl,
+            "compute_seconds": round(compute_seconds, 4)
+        }
+        # Hard TTL = soft TTL + fenêtre pendant laquelle la valeur peut être servie périmée
+        await self.set(key_type, identifier, envelope, soft_ttl + stale_ttl, tags)
+        return result
+    
+    def _schedule_refresh(
+        self,
+        key_type: str,
+        identifier: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        stale_ttl: int,
+        stale_value: Any,
+        tags: Optional[List[str]] = None
+    ) -> None:
+        """Lance un refresh en tâche de fond (un seul par clé)"""
+        full_key = self._build_key(key_type, identifier)
+        if full_key in self._inflight:
+            return
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[full_key] = future
+        
+        task = loop.create_task(
+            self._refresh_in_background(
+                key_type, identifier, full_key, compute, ttl, stale_ttl, stale_value, future, tags
+            )
+        )
+        self._background_refreshes.add(task)
+        task.add_done_callback(self._background_refreshes.discard)
+    
+    async def _refresh_in_background(
+        self,
+        key_type: str,
+        identifier: str,
+        full_key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        stale_ttl: int,
+        stale_value: Any,
+        future: asyncio.Future,
+        tags: Optional[List[str]] = None
+    ) -> None:
+        token = None
+        result = stale_value
+        
+        try:
+            token = await self._acquire_compute_lock(full_key)
+            if token == "":
+                return  # Un autre worker rafraîchit déjà cette clé
+            
+            refreshed = await self._compute_and_store(key_type, identifier, compute, ttl, stale_ttl, True, tags)
+            if refreshed is not None:
+                result = refreshed
+            self.stats["background_refreshes"] += 1
+        
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning("Background cache refresh failed", key=full_key, error=str(e))
+        
+        finally:
+            self._inflight.pop(full_key, None)
+            if not future.done():
+                future.set_result(result)
+            await self._release_compute_lock(full_key, token)
+    
+    async def get_or_compute(
+        self,
+        key_type: str,
+        identifier: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        stale_ttl: int = 0,
+        early_refresh_beta: float = 0.0,
+        tags: Optional[List[str]] = None
+    ) -> Any:
+        """
+        🎯 Lecture cache avec recalcul single-flight sur miss
+        
+        Un seul appelant par clé exécute `compute` : les appelants concurrents
+        du même process attendent le même future, ceux des autres workers
+        attendent que le détenteur du verrou Redis remplisse le cache.
+        
+        Args:
+            ttl: Soft TTL (fraîcheur) en secondes
+            stale_ttl: Fenêtre supplémentaire pendant laquelle la valeur périmée
+                est servie pendant qu'un refresh tourne en tâche de fond
+            early_refresh_beta: Active l'expiration anticipée probabiliste
+                (1.0 = standard, > 1 = refresh plus précoce)
+            tags: Tags d'invalidation associés à l'entrée (ex: user:{id})
+        """
+        swr_enabled = stale_ttl > 0 or early_refresh_beta > 0
+        
+        cached_value = await self.get(key_type, identifier)
+        if cached_value is not None:
+            if not self._is_swr_envelope(cached_value):
+                return cached_value
+            
+            value = cached_value.get("value")
+            if swr_enabled and self._needs_refresh(cached_value, early_refresh_beta):
+                self._schedule_refresh(key_type, identifier, compute, ttl, stale_ttl, value, tags)
+            return value
+        
+        full_key = self._build_key(key_type, identifier)
+        
+        inflight = self._inflight.get(full_key)
+        if inflight is not None:
+            self.stats["coalesced_waits"] += 1
+            try:
+                return await asyncio.shield(inflight)
+            except ComputeAbandonedError:
+                # Calcul partagé annulé avec son appelant : on reprend (un suiveur devient leader)
+                return await self.get_or_compute(
+                    key_type, identifier, compute, ttl, stale_ttl, early_refresh_beta, tags
+                )
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = future
+        token = None
+        
+        try:
+            token = await self._acquire_compute_lock(full_key)
+            result = None
+            
+            if token == "":
+                # Un autre worker calcule déjà cette clé
+                result = await self._wait_for_remote_compute(key_type, identifier, full_key)
+                if self._is_swr_envelope(result):
+                    result = result.get("value")
+            
+            if result is None:
+                result = await self._compute_and_store(key_type, identifier, compute, ttl, stale_ttl, swr_enabled, tags)
+            
+            future.set_result(result)
+            return result
+        
+        except asyncio.CancelledError:
+            # Annulation propre au leader (client parti), pas un échec du calcul :
+            # les suiveurs ne la subissent pas, ils relancent le calcul
+            self.stats["abandoned_computes"] += 1
+            future.set_exception(ComputeAbandonedError(full_key))
+            future.exception()
+            raise
+        
+        except BaseException as e:
+            future.set_exception(e)
+            # Marquer l'exception comme consommée si personne n'attendait
+            future.exception()
+            raise
+        
+        finally:
+            if self._inflight.get(full_key) is future:
+                del self._inflight[full_key]
+            await self._release_compute_lock(full_key, token)
+    
+    def add_tag_listener(self, listener: Callable[[str], Any]) -> None:
+        """Enregistre un cache in-process à notifier lors d'une invalidation par tag"""
+        self._tag_listeners.append(listener)
+    
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        🧹 Invalide toutes les entrées associées aux tags (un seul aller-retour Redis)
+        
+        Returns:
+            Nombre de clés supprimées
+        """
+        if not tags:
+            return 0
+        
+        deleted = 0
+        self.stats["tag_invalidations"] += 1
+        
+        try:
+            if self.redis_available and self.redis_client:
+                tag_keys = [self._build_tag_key(tag) for tag in tags]
+                if not self._is_sharded():
+                    deleted += int(await self.redis_client.eval(INVALIDATE_TAGS_SCRIPT, len(tag_keys), *tag_keys))
+                else:
+                    # Membres répartis sur plusieurs nœuds : SMEMBERS puis DEL groupés par nœud
+                    members: List[str] = []
+                    for client, node_tag_keys in self._group_by_client(tag_keys):
+                        pipe = client.pipeline(transaction=False)
+                        for tag_key in node_tag_keys:
+                            pipe.smembers(tag_key)
+                        for tag_members in await pipe.execute():
+                            members.extend(
+                                m.decode() if isinstance(m, bytes) else m for m in tag_members
+                            )
+                    deleted += await self._delete_raw(members)
+                    await self._delete_raw(tag_keys)
+        except Exception as e:
+            logger.error("Tag invalidation error", tags=list(tags), error=str(e))
+            self.stats["errors"] += 1
+        
+        deleted += await self.fallback_cache.invalidate_tags(list(tags))
+        
+        for listener in self._tag_listeners:
+            for tag in tags:
+                try:
+                    listener(tag)
+                except Exception as e:
+                    logger.warning("Tag listener failed", tag=tag, error=str(e))
+        
+        self.stats["tag_deleted_keys"] += deleted
+        return deleted
+    
     async def invalidate_user_cache(self, user_id: str) -> bool:
-        """Invalide tout le cache pour un utilisateur"""
+        """Invalide tout le cache pour un utilisateur (tag user:{id} + clés historiques)"""
         
+        await self.invalidate_tags(user_tag(user_id))
+        
+        # Clés posées avant l'introduction des tags
         user_key_patterns = [
             f"user_energy:{user_id}",
             f"energy_transactions:{user_id}",
@@ -315,11 +1135,33 @@ class RedisCache:
             "hit_rate_pct": round(hit_rate, 2),
             "errors": self.stats["errors"],
             "fallback_uses": self.stats["fallback_uses"],
+            "single_flight": {
+                "inflight": len(self._inflight),
+                "coalesced_waits": self.stats["coalesced_waits"],
+                "abandoned_computes": self.stats["abandoned_computes"],
+                "lock_waits": self.stats["lock_waits"],
+                "lock_timeouts": self.stats["lock_timeouts"]
+            },
+            "tags": {
+                "invalidations": self.stats["tag_invalidations"],
+                "deleted_keys": self.stats["tag_deleted_keys"],
+                "listeners": len(self._tag_listeners)
+            },
+            "refresh": {
+                "stale_served": self.stats["stale_served"],
+                "early_refreshes": self.stats["early_refreshes"],
+                "background_refreshes": self.stats["background_refreshes"],
+                "pending": len(self._background_refreshes)
+            },
             "config": {
                 "ttl_user_energy": self.config.ttl_user_energy,
                 "ttl_transactions": self.config.ttl_energy_transactions,
                 "pool_size": self.config.connection_pool_size
-            }
+            },
+            "serialization": self.serializer.get_stats(),
+            "sharding": {name: pool.get_stats() for name, pool in self.pools.items()},
+            "circuit_breaker": self.breaker.get_stats(),
+            **self.telemetry.snapshot()
         }
         
         # Infos Redis si disponible
@@ -328,6 +1170,11 @@ class RedisCache:
                 redis_info = await self.redis_client.info("memory")
                 stats["redis_memory_mb"] = round(redis_info.get("used_memory", 0) / 1024 / 1024, 2)
                 stats["redis_connections"] = redis_info.get("connected_clients", 0)
+                
+                # Évictions Redis (globales : Redis ne les ventile pas par key_type)
+                stats_info = await self.redis_client.info("stats")
+                stats["redis_evicted_keys"] = stats_info.get("evicted_keys", 0)
+                stats["redis_expired_keys"] = stats_info.get("expired_keys", 0)
             except Exception:
                 pass
         
@@ -345,6 +1192,10 @@ class RedisCache:
             }
         
         try:
+            recovered = await self.recover_nodes()
+            if recovered:
+                logger.info("Redis nodes recovered", nodes=recovered)
+            
             if self.redis_client:
                 latency_start = datetime.now()
                 await self.redis_client.ping()
@@ -366,20 +1217,63 @@ class RedisCache:
     
     async def close(self):
         """Ferme les connexions Redis"""
-        if self.redis_client:
+        if self.pools:
+            # Clients partagés entre pools : fermer chaque nœud une seule fois
+            closed = set()
+            for sharded_pool in self.pools.values():
+                for node, client in list(sharded_pool.clients.items()):
+                    if id(client) not in closed:
+                        closed.add(id(client))
+                        await client.aclose()
+                sharded_pool.clients.clear()
+            self.pools = {}
+        elif self.redis_client:
             await self.redis_client.aclose()
-            self.redis_available = False
+        self.redis_client = None
+        self.redis_available = False
+
+
+class _PipelineGroup:
+    """Un pipeline Redis par nœud, exécutés en parallèle"""
+    
+    def __init__(self, cache: RedisCache, pool: Optional[str] = None):
+        self.cache = cache
+        self.pool = pool
+        self.pipes: Dict[int, Any] = {}
+    
+    def for_key(self, key: str):
+        client = self.cache.client_for(key, self.pool)
+        pipe = self.pipes.get(id(client))
+        if pipe is None:
+            pipe = client.pipeline(transaction=False)
+            self.pipes[id(client)] = pipe
+        return pipe
+    
+    async def execute(self) -> List[Any]:
+        return await asyncio.gather(*(pipe.execute() for pipe in self.pipes.values()))
 
 
 # Décorateur pour cache automatique
-def cached(key_type: str, ttl: Optional[int] = None, key_fn=None):
+def cached(
+    key_type: str,
+    ttl: Optional[int] = None,
+    key_fn=None,
+    single_flight: bool = True,
+    stale_ttl: int = 0,
+    early_refresh_beta: float = 0.0,
+    tags_fn=None
+):
     """
     Décorateur pour cache automatique de fonctions
     
     Args:
         key_type: Type de clé pour le cache
-        ttl: TTL en secondes (optionnel)
+        ttl: TTL en secondes (optionnel) - soft TTL si stale_ttl est défini
         key_fn: Fonction pour générer l'identifiant (optionnel)
+        single_flight: Coalescer les recalculs concurrents d'une même clé
+        stale_ttl: Servir la valeur périmée pendant N secondes et rafraîchir en fond
+        early_refresh_beta: Expiration anticipée probabiliste (0 = désactivée)
+        tags_fn: Fonction retournant les tags d'invalidation (optionnel)
     """
     
     def decorator(func):
@@ -392,18 +1286,30 @@ def cached(key_type: str, ttl: Optional[int] = None, key_fn=None):
                 # Utiliser le premier argument comme identifiant (généralement user_id)
                 identifier = str(args[0]) if args else "default"
             
+            tags = tags_fn(*args, **kwargs) if tags_fn else None
+            
+            if single_flight or stale_ttl or early_refresh_beta:
+                return await redis_cache.get_or_compute(
+                    key_type,
+                    identifier,
+                    lambda: func(*args, **kwargs),
+                    ttl,
+                    stale_ttl=stale_ttl,
+                    early_refresh_beta=early_refresh_beta,
+                    tags=tags
+                )
+            
             # Essayer de récupérer depuis le cache
-            if hasattr(redis_cache, 'get'):
-                cached_result = await redis_cache.get(key_type, identifier)
-                if cached_result is not None:
-                    return cached_result
+            cached_result = await redis_cache.get(key_type, identifier)
+            if cached_result is not None:
+                return cached_result
             
             # Exécuter la fonction si pas en cache
             result = await func(*args, **kwargs)
             
             # Mettre en cache le résultat
-            if hasattr(redis_cache, 'set') and result is not None:
-                await redis_cache.set(key_type, identifier, result, ttl)
+            if result is not None:
+                await redis_cache.set(key_type, identifier, result, ttl, tags)
             
             return result
         
@@ -0,0 +1,172 @@
+"""
+🧭 Redis Sharding - Phoenix Luna Hub
+Répartition des clés sur plusieurs nœuds Redis par hachage cohérent
+Oracle Directive: Performance & Stabilité
+
+- Anneau de hachage avec nœuds virtuels : la perte d'un nœud ne remappe
+  que sa part des clés
+- Pools logiques séparés (cache, rate limiting, broker) configurables
+"""
+
+import os
+import bisect
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+
+logger = structlog.get_logger("redis_sharding")
+
+
+# Pools logiques
+POOL_CACHE = "cache"
+POOL_RATE_LIMIT = "rate_limit"
+POOL_BROKER = "broker"
+
+
+def parse_node_list(value: Optional[str]) -> List[str]:
+    """Parse une liste d'URLs Redis séparées par des virgules"""
+    if not value:
+        return []
+    return [node.strip() for node in value.split(",") if node.strip()]
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+def _routing_key(key: str) -> str:
+    """Hash tag façon Redis Cluster : seule la partie {…} est hachée si présente"""
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1:end]
+    return key
+
+
+class ConsistentHashRing:
+    """Anneau de hachage cohérent avec nœuds virtuels"""
+
+    def __init__(self, nodes: Optional[List[str]] = None, virtual_nodes: int = 160):
+        self.virtual_nodes = virtual_nodes
+        self._ring: List[Tuple[int, str]] = []
+        self._hashes: List[int] = []
+        self.nodes: List[str] = []
+        for node in nodes or []:
+            self.add_node(node)
+
+    def add_node(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for i in range(self.virtual_nodes):
+            self._ring.append((_hash(f"{node}#{i}"), node))
+        self._ring.sort()
+        self._hashes = [h for h, _ in self._ring]
+
+    def remove_node(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        self._ring = [(h, n) for h, n in self._ring if n != node]
+        self._hashes = [h for h, _ in self._ring]
+
+    def get_node(self, key: str) -> Optional[str]:
+        """Nœud responsable d'une clé (premier point de l'anneau ≥ hash)"""
+        if not self._ring:
+            return None
+        index = bisect.bisect(self._hashes, _hash(_routing_key(key))) % len(self._ring)
+        return self._ring[index][1]
+
+
+class ShardedRedisPool:
+    """
+    🧭 Pool logique de nœuds Redis routés par hachage cohérent
+
+    Features:
+    - Un client (pool de connexions) par nœud
+    - Routage par clé, regroupement de clés par nœud pour MGET/pipelines
+    - Retrait d'un nœud défaillant (seules ses clés sont remappées)
+    - Réintégration lors des health checks
+    """
+
+    def __init__(self, name: str, nodes: List[str], virtual_nodes: int = 160):
+        self.name = name
+        self.configured_nodes = list(dict.fromkeys(nodes))
+        self.ring = ConsistentHashRing(virtual_nodes=virtual_nodes)
+        self.clients: Dict[str, Any] = {}
+        self.down_nodes: Dict[str, str] = {}
+
+    @property
+    def primary_client(self) -> Optional[Any]:
+        """Client du premier nœud disponible (compatibilité accès direct)"""
+        for node in self.configured_nodes:
+            if node in self.clients and node not in self.down_nodes:
+                return self.clients[node]
+        return None
+
+    @property
+    def is_sharded(self) -> bool:
+        return len(self.ring.nodes) > 1
+
+    def attach(self, node: str, client: Any) -> None:
+        """Ajoute un nœud connecté à l'anneau"""
+        self.clients[node] = client
+        self.down_nodes.pop(node, None)
+        self.ring.add_node(node)
+
+    def mark_down(self, node: str, reason: str = "") -> None:
+        """Retire un nœud de l'anneau (ses clés basculent sur les voisins)"""
+        if node in self.down_nodes:
+            return
+        self.down_nodes[node] = reason
+        self.ring.remove_node(node)
+        logger.error("Redis node removed from ring", pool=self.name, node=node, reason=reason)
+
+    def mark_up(self, node: str) -> None:
+        if node not in self.down_nodes or node not in self.clients:
+            return
+        del self.down_nodes[node]
+        self.ring.add_node(node)
+        logger.info("Redis node restored to ring", pool=self.name, node=node)
+
+    def node_for(self, key: str) -> Optional[str]:
+        return self.ring.get_node(key)
+
+    def client_for(self, key: str) -> Optional[Any]:
+        node = self.ring.get_node(key)
+        return self.clients.get(node) if node else None
+
+    def group_by_node(self, keys: List[str]) -> Dict[str, List[str]]:
+        """Regroupe des clés par nœud (une requête par nœud)"""
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            node = self.ring.get_node(key)
+            if node:
+                groups.setdefault(node, []).append(key)
+        return groups
+
+    def active_clients(self) -> List[Any]:
+        return [self.clients[node] for node in self.ring.nodes if node in self.clients]
+
+    async def close(self) -> None:
+        for client in self.clients.values():
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+        self.clients.clear()
+        self.ring = ConsistentHashRing(virtual_nodes=self.ring.virtual_nodes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "nodes": self.configured_nodes,
+            "active_nodes": list(self.ring.nodes),
+            "down_nodes": dict(self.down_nodes),
+            "virtual_nodes": self.ring.virtual_nodes
+        }
+
+
+def pool_nodes_from_env(pool: str, default_nodes: List[str]) -> List[str]:
+    """Nœuds d'un pool logique : REDIS_<POOL>_NODES sinon nœuds par défaut"""
+    return parse_node_list(os.getenv(f"REDIS_{pool.upper()}_NODES")) or list(default_nodes)
@@ -0,0 +1,110 @@
+"""
+⏱️ Request Deadline - Phoenix Luna Hub
+Échéance par requête propagée dans toute la pile d'appels (contextvar)
+Oracle Directive: Stabilité & Performance
+
+- Fixée par le middleware HTTP : en-tête X-Request-Timeout-Ms du client
+  (borné par REQUEST_DEADLINE_MAX_MS) ou REQUEST_DEADLINE_DEFAULT_MS
+- Supabase, Redis, Gemini, Stripe rognent leurs timeouts sur le temps restant
+  et renoncent aux retries qui ne peuvent plus aboutir
+- Échéance dépassée → DeadlineExceededError (→ 504) : le hub arrête de
+  travailler pour un client qui a déjà abandonné
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Optional
+import structlog
+
+logger = structlog.get_logger("request_deadline")
+
+
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+DEFAULT_DEADLINE_MS = int(os.getenv("REQUEST_DEADLINE_DEFAULT_MS", "30000"))
+MAX_DEADLINE_MS = int(os.getenv("REQUEST_DEADLINE_MAX_MS", "60000"))
+
+# Échéance absolue (time.monotonic) de la requête courante ; None = pas d'échéance
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """Échéance de la requête dépassée : le travail restant est abandonné"""
+
+    def __init__(self, operation: str = "request"):
+        super().__init__(f"Request deadline exceeded before {operation}")
+        self.operation = operation
+
+
+def budget_from_header(value: Optional[str]) -> float:
+    """Budget (secondes) depuis l'en-tête client, borné par REQUEST_DEADLINE_MAX_MS"""
+    budget_ms = DEFAULT_DEADLINE_MS
+    if value:
+        try:
+            budget_ms = min(int(float(value)), MAX_DEADLINE_MS)
+        except ValueError:
+            logger.warning("Invalid deadline header ignored", value=value)
+    return max(budget_ms, 0) / 1000
+
+
+def set_deadline(timeout: float) -> Token:
+    """Fixe l'échéance à maintenant + timeout (ne peut que raccourcir une échéance existante)"""
+    deadline = time.monotonic() + timeout
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: Token) -> None:
+    _deadline.reset(token)
+
+
+@contextmanager
+def deadline_scope(timeout: float):
+    """Bloc soumis à une échéance (imbriquable : la plus courte gagne)"""
+    token = set_deadline(timeout)
+    try:
+        yield
+    finally:
+        reset_deadline(token)
+
+
+def remaining() -> Optional[float]:
+    """Temps restant (secondes, ≥ 0) ; None hors requête"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def is_expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check_deadline(operation: str) -> None:
+    """Lève DeadlineExceededError si l'échéance est dépassée"""
+    if is_expired():
+        logger.warning("Request deadline exceeded", operation=operation)
+        raise DeadlineExceededError(operation)
+
+
+def clamp_timeout(timeout: float, operation: str = "operation") -> float:
+    """
+    Timeout d'un appel sortant rogné sur le temps restant
+
+    Raises:
+        DeadlineExceededError: plus de temps pour lancer l'appel
+    """
+    check_deadline(operation)
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
+
+
+def can_finish_within(duration: float) -> bool:
+    """Reste-t-il au moins `duration` secondes ? (retries, backoff)"""
+    left = remaining()
+    return left is None or left > duration
@@ -8,7 +8,7 @@ import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 import structlog
-from app.core.redis_cache import redis_cache
+from app.core.redis_cache import redis_cache, user_tag
 
 logger = structlog.get_logger("sentiment_analyzer")
 
@@ -356,8 +356,13 @@ class SentimentAnalyzer:
     async def _cache_sentiment_result(self, user_id: str, message: str, result: UserSentiment):
         """Cache le résultat pour optimization"""
         try:
-            cache_key = f"sentiment:{user_id}:{hash(message)}"
-            await redis_cache.set("sentiment", f"{user_id}:{hash(message)}", result.to_dict(), ttl=300)  # 5 min
+            await redis_cache.set(
+                "sentiment",
+                f"{user_id}:{hash(message)}",
+                result.to_dict(),
+                ttl=300,  # 5 min
+                tags=[user_tag(user_id)]
+            )
         except Exception as e:
             logger.error("Error caching sentiment", user_id=user_id, error=str(e))
 
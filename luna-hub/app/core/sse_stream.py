@@ -0,0 +1,91 @@
+"""
+📡 SSE Stream - Phoenix Luna Hub
+Réponses Luna en Server-Sent Events : les fragments partent dès leur génération
+Oracle Directive: Performance & Expérience utilisateur
+
+- event: token       {"text": "..."}            fragment généré
+- event: validation  {"signals": [...]}         alerte de la validation incrémentale
+- event: done        {...}                      fin de génération (énergie, événements, validation)
+- event: error       {"message": "...", ...}    échec : aucune énergie consommée
+"""
+
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+import structlog
+from fastapi.responses import StreamingResponse
+
+from .adaptive_limiter import OverloadedError
+from .llm_gateway import LLMStreamError
+from .luna_voice_validator import StreamingValidation
+from .request_deadline import DeadlineExceededError
+
+logger = structlog.get_logger("sse_stream")
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"  # Pas de buffering côté proxy (nginx / Railway)
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Message SSE (une ligne data: par ligne de contenu)"""
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False, default=str)
+    data_lines = "".join(f"data: {line}\n" for line in payload.split("\n"))
+    return f"event: {event}\n{data_lines}\n"
+
+
+async def stream_llm_events(
+    chunks: AsyncIterator[str],
+    on_complete: Callable[[str], Awaitable[Dict[str, Any]]],
+    validation: Optional[StreamingValidation] = None,
+    context: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[str]:
+    """
+    📡 Relaie une génération en SSE puis exécute la finalisation
+
+    Args:
+        chunks: fragments de texte (ex: GeminiProvider.generate_stream)
+        on_complete: appelé une seule fois avec le texte complet, après le dernier
+            fragment (consommation d'énergie, event store) ; son résultat forme l'event done
+        validation: validation incrémentale alimentée à chaque fragment
+        context: champs ajoutés aux logs
+    """
+    log = logger.bind(**(context or {}))
+    parts = []
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield format_sse("token", {"text": chunk})
+            if validation is not None:
+                signals = validation.feed(chunk)
+                if signals:
+                    yield format_sse("validation", {"signals": signals})
+    except LLMStreamError as e:
+        log.warning("LLM stream failed", error=str(e))
+        yield format_sse("error", {"message": e.message, "retry_after": e.retry_after})
+        return
+    except OverloadedError as e:
+        log.warning("LLM stream shed", error=str(e))
+        yield format_sse("error", {"message": "Service temporarily overloaded, please retry", "retry_after": e.retry_after})
+        return
+    except DeadlineExceededError as e:
+        log.warning("LLM stream deadline exceeded", error=str(e))
+        yield format_sse("error", {"message": "Request deadline exceeded"})
+        return
+    except Exception as e:
+        log.error("LLM stream error", error=str(e))
+        yield format_sse("error", {"message": "🌙 Petit problème technique ! Relance-moi ! 🔧"})
+        return
+
+    try:
+        result = await on_complete("".join(parts))
+    except Exception as e:
+        log.error("Stream completion failed", error=str(e))
+        yield format_sse("error", {"message": "Failed to finalize the interaction", "partial": True})
+        return
+    yield format_sse("done", result)
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -9,7 +9,9 @@ from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from supabase import create_client, Client
 from app.core.security_guardian import SecurityGuardian
-from app.core.connection_manager import connection_manager
+from app.core.connection_manager import get_connection_pool, OP_EVENT_WRITES, OP_EVENT_READS
+from app.core.adaptive_limiter import OverloadedError
+from app.core.request_deadline import DeadlineExceededError
 import structlog
 from dotenv import load_dotenv
 
@@ -118,13 +120,12 @@ class SupabaseEventStore:
             logger.info("Event created (dev mode)", event_data=event_record)
             return event_id
         
-        # 🔄 Exécuter avec connection pooling + retry automatique
-        async def _execute_insert():
-            return self.client.table("events").insert(event_record).execute()
+        # 🔄 Pool dédié aux écritures d'événements (bulkhead) + retry automatique
+        pool = get_connection_pool(OP_EVENT_WRITES)
         
         try:
-            result = await connection_manager.execute_with_retry(
-                operation=_execute_insert,
+            result = await pool.run_query(
+                self.client.table("events").insert(event_record).execute,
                 operation_name="event_store_insert"
             )
             
@@ -138,12 +139,14 @@ class SupabaseEventStore:
             
             return event_id
             
+        except (OverloadedError, DeadlineExceededError):
+            raise
         except Exception as e:
             logger.error(
                 "Failed to store event in Supabase after retries",
                 event_id=event_id,
                 error=str(e),
-                retry_attempts=connection_manager.config.retry_attempts
+                retry_attempts=pool.config.retry_attempts
             )
             raise Exception(f"Event Store error after retries: {str(e)}")
     
@@ -190,13 +193,11 @@ class SupabaseEventStore:
             if end_date:
                 query = query.lte("created_at", end_date.isoformat())
             
-            # 🔄 Exécuter avec connection pooling + retry
-            async def _execute_query():
-                return query.execute()
-            
-            result = await connection_manager.execute_with_retry(
-                operation=_execute_query,
-                operation_name="event_store_query"
+            # 🔄 Pool dédié aux lectures d'événements (bulkhead) + retry
+            result = await get_connection_pool(OP_EVENT_READS).run_query(
+                query.execute,
+                operation_name="event_store_query",
+                idempotent=True
             )
             
             logger.info(
@@ -208,12 +209,14 @@ class SupabaseEventStore:
             
             return result.data
             
+        except (OverloadedError, DeadlineExceededError):
+            raise
         except Exception as e:
             logger.error(
                 "Failed to retrieve events from Supabase after retries",
                 user_id=clean_user_id,
                 error=str(e),
-                retry_attempts=connection_manager.config.retry_attempts
+                retry_attempts=get_connection_pool(OP_EVENT_READS).config.retry_attempts
             )
             raise Exception(f"Event Store error after retries: {str(e)}")
     
@@ -0,0 +1,140 @@
+"""
+👤 User Lookup Cache - Phoenix Luna Hub
+Cache positif / négatif des lectures de la table users (email, id, statut)
+Oracle Directive: Performance & Stabilité
+
+- Clés par email normalisé (haché : pas d'email en clair dans Redis) et par id
+- Résultats négatifs ("utilisateur inconnu") gardés peu de temps : les scripts
+  d'énumération et le smart-auth ne retapent plus Supabase à chaque appel
+- Les enregistrements mis en cache ne contiennent jamais le hash du mot de passe
+- Invalidation : inscription, mise à jour de profil, changement d'abonnement
+"""
+
+import os
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+import structlog
+
+from .redis_cache import redis_cache, user_tag
+
+logger = structlog.get_logger("user_lookup_cache")
+
+
+USER_BY_ID_KEY_TYPE = "auth_user"
+USER_BY_EMAIL_KEY_TYPE = "auth_user_email"
+USER_STATUS_KEY_TYPE = "auth_user_status"
+
+# Marqueur d'absence (cache négatif)
+MISSING_MARKER = {"__missing__": True}
+
+# Champs jamais stockés dans le cache
+SECRET_FIELDS = ("password_hash",)
+
+
+def normalize_email(email: str) -> str:
+    """Email normalisé (casse et espaces) pour les clés de cache"""
+    return (email or "").strip().lower()
+
+
+def _email_key(email: str) -> str:
+    return hashlib.sha256(normalize_email(email).encode("utf-8")).hexdigest()[:32]
+
+
+def _is_missing(value: Any) -> bool:
+    return isinstance(value, dict) and value.get("__missing__") is True
+
+
+def _public_record(user: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in user.items() if key not in SECRET_FIELDS}
+
+
+class UserLookupCache:
+    """
+    👤 Cache des lectures users (positif + négatif)
+
+    Les entrées positives sont taguées user:{id} : invalidate_user_cache()
+    et invalidate() les purgent en un seul appel.
+    """
+
+    def __init__(self):
+        self.positive_ttl = int(os.getenv("AUTH_USER_CACHE_TTL", "120"))
+        self.negative_ttl = int(os.getenv("AUTH_USER_NEGATIVE_TTL", "30"))
+
+    async def _lookup(
+        self,
+        key_type: str,
+        identifier: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+        user_id_of: Callable[[Dict[str, Any]], Optional[str]]
+    ) -> Optional[Dict[str, Any]]:
+        cached = await redis_cache.get(key_type, identifier)
+        if cached is not None:
+            return None if _is_missing(cached) else dict(cached)
+
+        record = await loader()
+        if record is None:
+            await redis_cache.set(key_type, identifier, MISSING_MARKER, ttl=self.negative_ttl)
+            return None
+
+        user_id = user_id_of(record)
+        await redis_cache.set(
+            key_type,
+            identifier,
+            record,
+            ttl=self.positive_ttl,
+            tags=[user_tag(user_id)] if user_id else None
+        )
+        return record
+
+    async def get_user_by_email(
+        self,
+        email: str,
+        loader: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Utilisateur par email (sans secrets) ; loader(email) interroge la base"""
+        async def load() -> Optional[Dict[str, Any]]:
+            user = await loader(email)
+            return _public_record(user) if user else None
+
+        return await self._lookup(USER_BY_EMAIL_KEY_TYPE, _email_key(email), load, lambda u: u.get("id"))
+
+    async def get_user_by_id(
+        self,
+        user_id: str,
+        loader: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Utilisateur par id (sans secrets) ; loader(user_id) interroge la base"""
+        async def load() -> Optional[Dict[str, Any]]:
+            user = await loader(user_id)
+            return _public_record(user) if user else None
+
+        return await self._lookup(USER_BY_ID_KEY_TYPE, user_id, load, lambda u: u.get("id"))
+
+    async def get_user_status(
+        self,
+        email: str,
+        loader: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Statut smart-auth (check_user_status) ; les inconnus sont mis en cache négatif"""
+        async def load() -> Optional[Dict[str, Any]]:
+            status = await loader(email)
+            return status if status and status.get("user_exists") else None
+
+        return await self._lookup(USER_STATUS_KEY_TYPE, _email_key(email), load, lambda s: s.get("user_id"))
+
+    async def invalidate(self, user_id: Optional[str] = None, email: Optional[str] = None) -> None:
+        """Purge les entrées d'un utilisateur (positives par tag, négatives par email)"""
+        try:
+            if user_id:
+                await redis_cache.invalidate_tags(user_tag(user_id))
+                await redis_cache.delete(USER_BY_ID_KEY_TYPE, user_id)
+            if email:
+                email_key = _email_key(email)
+                await redis_cache.delete(USER_BY_EMAIL_KEY_TYPE, email_key)
+                await redis_cache.delete(USER_STATUS_KEY_TYPE, email_key)
+        except Exception as e:
+            logger.warning("User lookup cache invalidation failed", user_id=user_id, error=str(e))
+
+
+# Instance globale
+user_lookup_cache = UserLookupCache()
@@ -10,7 +10,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import structlog
 from app.core.supabase_client import event_store
-from app.core.redis_cache import redis_cache
+from app.core.redis_cache import redis_cache, user_tag
 
 logger = structlog.get_logger("vision_tracker")
 
@@ -581,7 +581,7 @@ class VisionTracker:
         """Cache le profil de vision"""
         try:
             profile_dict = self._vision_profile_to_dict(profile)
-            await redis_cache.set("vision", user_id, profile_dict, ttl=3600)  # 1 heure
+            await redis_cache.set("vision", user_id, profile_dict, ttl=3600, tags=[user_tag(user_id)])  # 1 heure
         except Exception as e:
             logger.warning("Vision cache storage failed", user_id=user_id, error=str(e))
     
@@ -17,9 +17,16 @@ import structlog
 
 # Réutilise Redis existant
 from ..core.redis_cache import redis_cache as cache_manager, logger as redis_logger
+from ..core.redis_sharding import POOL_BROKER
 
 logger = structlog.get_logger("message_broker")
 
+# Types de clés RedisCache (namespacing luna:prod:v1:<type>:<id>)
+MESSAGE_KEY_TYPE = "luna_message"
+PROCESSED_KEY_TYPE = "luna_processed"
+QUEUE_KEY_TYPE = "luna_queue"
+NOTIFICATION_KEY_TYPE = "luna_notification"
+
 @dataclass
 class LunaMessage:
     """Message standard pour communication inter-Luna"""
@@ -44,6 +51,9 @@ class MessageBroker:
     
     def __init__(self):
         self.cache = cache_manager  # Réutilise Redis existant
+        # Corps, traces et files de secours servis par le pool broker, pas par le cache
+        for key_type in (MESSAGE_KEY_TYPE, PROCESSED_KEY_TYPE, QUEUE_KEY_TYPE, NOTIFICATION_KEY_TYPE):
+            self.cache.route_key_type(key_type, POOL_BROKER)
         self.message_handlers: Dict[str, List[Callable]] = {}
         self.active_subscriptions: List[str] = []
         
@@ -94,13 +104,13 @@ class MessageBroker:
             
             # Queue spécifique au service + priorité
             queue_key = f"luna:queue:{to_service}:p{priority}"
-            message_key = f"luna:message:{message_id}"
             
             # Stocker message complet avec TTL
             await self.cache.set(
-                key=message_key,
-                value=asdict(message),
-                ttl_seconds=ttl_minutes * 60
+                MESSAGE_KEY_TYPE,
+                message_id,
+                asdict(message),
+                ttl=ttl_minutes * 60
             )
             
             # Ajouter à la queue du service (juste l'ID avec score = timestamp)
@@ -195,10 +205,15 @@ class MessageBroker:
                 
                 # Récupérer messages avec score (timestamp)
                 message_ids = await self._get_from_queue(queue_key, max_messages - len(messages))
+                if not message_ids:
+                    continue
+                
+                # Un seul MGET pour tous les messages de la queue
+                messages_data = await self.cache.get_many(MESSAGE_KEY_TYPE, message_ids)
+                expired_ids = []
                 
                 for message_id in message_ids:
-                    message_key = f"luna:message:{message_id}"
-                    message_data = await self.cache.get(message_key)
+                    message_data = messages_data.get(message_id)
                     
                     if message_data:
                         message = LunaMessage(**message_data)
@@ -208,11 +223,14 @@ class MessageBroker:
                         if datetime.now(timezone.utc) < expires_at:
                             messages.append(message)
                         else:
-                            # Message expiré, nettoyer
-                            await self._cleanup_expired_message(message_id, queue_key)
+                            expired_ids.append(message_id)
                     
                     if len(messages) >= max_messages:
                         break
+                
+                if expired_ids:
+                    # Messages expirés, nettoyer en lot
+                    await self._cleanup_expired_messages(expired_ids, queue_key)
                         
                 if len(messages) >= max_messages:
                     break
@@ -240,14 +258,14 @@ class MessageBroker:
                 await self._remove_from_queue(queue_key, message_id)
             
             # Marquer comme traité (garder trace pour debugging)
-            processed_key = f"luna:processed:{message_id}"
             await self.cache.set(
-                processed_key,
+                PROCESSED_KEY_TYPE,
+                message_id,
                 {
                     "processed_by": service_name,
                     "processed_at": datetime.now(timezone.utc).isoformat()
                 },
-                ttl_seconds=3600  # Garder 1h pour debug
+                ttl=3600  # Garder 1h pour debug
             )
             
             logger.info("Message acknowledged",
@@ -286,28 +304,36 @@ class MessageBroker:
 
     # 🛠️ MÉTHODES PRIVÉES UTILISANT REDIS
 
+    def _redis(self, key: str):
+        """Client Redis du nœud broker responsable de la clé (None si fallback)"""
+        if not (hasattr(self.cache, 'redis_client') and self.cache.redis_client):
+            return None
+        return self.cache.client_for(key, POOL_BROKER)
+
     async def _add_to_queue(self, queue_key: str, message_id: str, score: float):
         """Ajouter message à une queue avec score (timestamp)"""
         # Utilise Redis pour queue ordonnée par timestamp
-        if hasattr(self.cache, 'redis_client') and self.cache.redis_client:
-            await self.cache.redis_client.zadd(queue_key, {message_id: score})
+        client = self._redis(queue_key)
+        if client is not None:
+            await client.zadd(queue_key, {message_id: score})
         else:
             # Fallback pour cas où Redis n'est pas disponible
-            queue_data = await self.cache.get(queue_key) or []
+            queue_data = await self.cache.get(QUEUE_KEY_TYPE, queue_key) or []
             queue_data.append({"message_id": message_id, "score": score})
             queue_data.sort(key=lambda x: x["score"])  # Tri par timestamp
-            await self.cache.set(queue_key, queue_data, ttl_seconds=3600)
+            await self.cache.set(QUEUE_KEY_TYPE, queue_key, queue_data, ttl=3600)
 
     async def _get_from_queue(self, queue_key: str, count: int) -> List[str]:
         """Récupérer messages d'une queue (FIFO par timestamp)"""
         try:
-            if hasattr(self.cache, 'redis_client') and self.cache.redis_client:
+            client = self._redis(queue_key)
+            if client is not None:
                 # Redis sorted set - récupérer les plus anciens
-                results = await self.cache.redis_client.zrange(queue_key, 0, count-1)
+                results = await client.zrange(queue_key, 0, count-1)
                 return [result.decode() if isinstance(result, bytes) else result for result in results]
             else:
                 # Fallback
-                queue_data = await self.cache.get(queue_key) or []
+                queue_data = await self.cache.get(QUEUE_KEY_TYPE, queue_key) or []
                 return [item["message_id"] for item in queue_data[:count]]
         except:
             return []
@@ -315,39 +341,45 @@ class MessageBroker:
     async def _remove_from_queue(self, queue_key: str, message_id: str):
         """Supprimer message d'une queue"""
         try:
-            if hasattr(self.cache, 'redis_client') and self.cache.redis_client:
-                await self.cache.redis_client.zrem(queue_key, message_id)
+            client = self._redis(queue_key)
+            if client is not None:
+                await client.zrem(queue_key, message_id)
             else:
                 # Fallback
-                queue_data = await self.cache.get(queue_key) or []
+                queue_data = await self.cache.get(QUEUE_KEY_TYPE, queue_key) or []
                 queue_data = [item for item in queue_data if item["message_id"] != message_id]
-                await self.cache.set(queue_key, queue_data, ttl_seconds=3600)
+                await self.cache.set(QUEUE_KEY_TYPE, queue_key, queue_data, ttl=3600)
         except:
             pass
 
     async def _publish_notification(self, channel: str, notification: Dict[str, Any]):
         """Publier notification sur un canal"""
         try:
-            if hasattr(self.cache, 'redis_client') and self.cache.redis_client:
-                await self.cache.redis_client.publish(channel, json.dumps(notification))
+            client = self._redis(channel)
+            if client is not None:
+                await client.publish(channel, json.dumps(notification))
             else:
                 # Fallback: stocker notification dans cache temporaire
-                notif_key = f"notifications:{channel}:{int(datetime.now().timestamp())}"
-                await self.cache.set(notif_key, notification, ttl_seconds=300)  # 5min
+                notif_key = f"{channel}:{int(datetime.now().timestamp())}"
+                await self.cache.set(NOTIFICATION_KEY_TYPE, notif_key, notification, ttl=300)  # 5min
         except:
             pass
 
-    async def _cleanup_expired_message(self, message_id: str, queue_key: str):
-        """Nettoyer un message expiré"""
+    async def _cleanup_expired_messages(self, message_ids: List[str], queue_key: str):
+        """Nettoyer des messages expirés (suppression groupée)"""
         try:
-            # Supprimer message
-            message_key = f"luna:message:{message_id}"
-            await self.cache.delete(message_key)
+            # Supprimer messages
+            await self.cache.delete_many(MESSAGE_KEY_TYPE, message_ids)
             
             # Supprimer de queue
-            await self._remove_from_queue(queue_key, message_id)
+            client = self._redis(queue_key)
+            if client is not None:
+                await client.zrem(queue_key, *message_ids)
+            else:
+                for message_id in message_ids:
+                    await self._remove_from_queue(queue_key, message_id)
             
-            logger.info("Cleaned up expired message", message_id=message_id)
+            logger.info("Cleaned up expired messages", count=len(message_ids))
         except:
             pass
 
@@ -367,10 +399,11 @@ class MessageBroker:
             for priority in [1, 2, 3]:
                 queue_key = f"luna:queue:{service_name}:p{priority}"
                 
-                if hasattr(self.cache, 'redis_client') and self.cache.redis_client:
-                    count = await self.cache.redis_client.zcard(queue_key)
+                client = self._redis(queue_key)
+                if client is not None:
+                    count = await client.zcard(queue_key)
                 else:
-                    queue_data = await self.cache.get(queue_key) or []
+                    queue_data = await self.cache.get(QUEUE_KEY_TYPE, queue_key) or []
                     count = len(queue_data)
                     
                 stats["queues"][f"priority_{priority}"] = {
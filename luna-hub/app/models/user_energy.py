@@ -166,6 +166,7 @@ ENERGY_COSTS = {
     "CV_BUILD": 20,                      # Construction CV
     "LETTERS_GENERATE": 15,              # Génération lettres
     "LETTERS_ANALYZE_TRANSITION": 18,    # Analyse transition lettres
+    "RISE_MOCK_INTERVIEW": 5,            # Feedback entretien simulé
 }
 
 # Configuration des packs d'énergie
@@ -7,7 +7,7 @@ Plus de spécialistes séparés - Luna s'adapte selon le contexte !
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional, Tuple
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 import uuid
 import structlog
@@ -15,9 +15,13 @@ import structlog
 # Imports des composants core
 from ..core.luna_personality_engine import luna_personality
 from ..core.luna_voice_validator import luna_voice_validator
-from ..core.llm_gateway import llm_gateway
+from ..core.llm_router import llm_router
+from ..core.llm_metering import llm_meter
+from ..core.llm_scheduler import LLMPriority, llm_caller_scope
+from ..core.context_budget import ContextBudget, PRIORITY_RECENT_TURNS
 from ..core.events import create_event
-from ..core.energy_manager import energy_manager
+from ..core.energy_manager import energy_manager, InsufficientEnergyError
+from ..core.sse_stream import stream_llm_events
 
 logger = structlog.get_logger("luna_orchestrator")
 
@@ -136,6 +140,84 @@ class LunaCentralOrchestrator:
             
             return await self._create_error_response(str(e), session_id)
 
+    async def handle_user_message_stream(
+        self,
+        user_message: str,
+        user_context: Dict[str, Any],
+        central_token: str,
+        session_id: str = None
+    ) -> AsyncIterator[str]:
+        """
+        📡 Variante streamée de handle_user_message (événements SSE)
+        
+        Contrôle énergie avant le premier fragment ; validation de voix au fil
+        du texte ; énergie + event sourcing une fois la réponse complète.
+        
+        Raises:
+            InsufficientEnergyError: énergie insuffisante (avant tout streaming)
+        """
+        session_id = session_id or str(uuid.uuid4())
+        user_id = user_context.get("user_id")
+        current_module = user_context.get("luna_context", {}).get("current_module", "aube")
+        context_prompt = self._build_contextual_prompt(current_module, user_context)
+        estimated_cost = 5  # Coût base conversation
+        
+        energy_check = await energy_manager.check_energy(user_id, estimated_cost)
+        if not energy_check.can_proceed:
+            raise InsufficientEnergyError(
+                f"🌙 Tu n'as plus assez d'énergie ! Il te faut {estimated_cost}⚡ mais tu n'en as que {energy_check.current}. Recharge-toi ! ⚡"
+            )
+        
+        logger.info("Luna unified streaming",
+                   user_id=user_id,
+                   session_id=session_id,
+                   module=current_module,
+                   message_preview=user_message[:50])
+        
+        validation = self.voice_validator.start_stream(
+            user_context=user_context,
+            specialist=f"luna-{current_module}",
+            context_type="conversation"
+        )
+        
+        async def on_complete(full_text: str) -> Dict[str, Any]:
+            await energy_manager.consume(
+                user_id=user_id,
+                action_name="conseil_rapide",
+                context={"module": current_module, "session_id": session_id}
+            )
+            llm_meter.record_energy(user_id, "luna_conversation", estimated_cost, persona=current_module)
+            validation_result = validation.finalize()
+            await create_event({
+                "type": "luna_unified_conversation",
+                "actor_user_id": user_id,
+                "payload": {
+                    "session_id": session_id,
+                    "module": current_module,
+                    "validation_score": validation_result.score,
+                    "energy_consumed": estimated_cost,
+                    "streamed": True
+                }
+            })
+            return {
+                "success": True,
+                "module": current_module,
+                "energy_consumed": estimated_cost,
+                "validation": {"is_valid": validation_result.is_valid, "score": validation_result.score},
+                "meta": {
+                    "session_id": session_id,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "orchestrator_version": "3.0.0-unified"
+                }
+            }
+        
+        with llm_caller_scope(user_id, LLMPriority.INTERACTIVE, "luna_conversation", persona=current_module):
+            chunks = llm_router.generate_stream(system=context_prompt, user=user_message, context={})
+        return stream_llm_events(
+            chunks, on_complete, validation=validation,
+            context={"user_id": user_id, "session_id": session_id}
+        )
+
     def _build_contextual_prompt(self, module: str, user_context: Dict[str, Any]) -> str:
         """
         🎨 Construction prompt contextualisé selon module
@@ -159,10 +241,25 @@ Expertise: {module_config['expertise']}
 # TA MISSION
 Aide l'utilisateur dans le contexte {module} avec ton expertise spécialisée.
 Adapte tes réponses selon le module sans perdre ta personnalité Luna.
-
+{{history}}
 Réponds maintenant avec ton expertise {module}:"""
 
-        return base_prompt
+        # Historique envoyé par la sidebar : tours récents d'abord, dans le budget tokens
+        frontend_context = user_context.get("luna_context", {}).get("frontend_context") or {}
+        turns = []
+        for turn in frontend_context.get("conversation_history") or []:
+            if isinstance(turn, dict):
+                content = turn.get("content")
+                turn = f"{turn.get('role', 'user')}: {content}" if content else None
+            if turn:
+                turns.append(f"- {turn}")
+        
+        budget = ContextBudget("luna_conversation")
+        budget.add("persona", base_prompt, required=True)
+        budget.add_items("history", turns, PRIORITY_RECENT_TURNS)
+        history = budget.pack().text("history")
+        
+        return base_prompt.replace("{history}", f"\n# CONVERSATION RÉCENTE\n{history}\n" if history else "")
 
     async def _generate_luna_response(
         self,
@@ -186,16 +283,18 @@ Réponds maintenant avec ton expertise {module}:"""
                     "energy_consumed": 0
                 }
             
-            # Appel LLM avec prompt contextualisé
-            llm_response = await llm_gateway.call_llm(
-                messages=[
-                    {"role": "system", "content": context_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                model="gemini-pro",
-                max_tokens=500,
-                temperature=0.7
-            )
+            # Appel LLM avec prompt contextualisé (conversation : classe interactive)
+            current_module = user_context.get('luna_context', {}).get('current_module', 'general')
+            with llm_caller_scope(user_id, LLMPriority.INTERACTIVE, "luna_conversation", persona=current_module):
+                llm_response = await llm_router.call_llm(
+                    messages=[
+                        {"role": "system", "content": context_prompt},
+                        {"role": "user", "content": user_message}
+                    ],
+                    model="gemini-pro",
+                    max_tokens=500,
+                    temperature=0.7
+                )
             
             # Consommer énergie si succès
             if llm_response.get("success"):
@@ -203,10 +302,11 @@ Réponds maintenant avec ton expertise {module}:"""
                     user_id=user_id,
                     action_name="conseil_rapide",
                     context={
-                        "module": user_context.get('luna_context', {}).get('current_module', 'general'),
+                        "module": current_module,
                         "session_id": session_id
                     }
                 )
+                llm_meter.record_energy(user_id, "luna_conversation", estimated_cost, persona=current_module)
             
             return {
                 "content": llm_response.get("content", "🌙 Erreur technique ! Réessaie ! ⚡"),
@@ -1,15 +1,28 @@
 import google.generativeai as genai
 from app.core.config import settings
+import httpx
+import json
 import logging
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.clients.llm_cache import cache_key, llm_cache
+from app.clients.llm_token_pool import TokenBudgetExceeded, estimate_tokens, llm_token_pool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Output ceiling assumed when reserving tokens from the shared budget
+ESTIMATED_OUTPUT_TOKENS = 1024
+
 class AIServiceError(Exception):
     """Custom exception for AI service errors."""
     pass
 
+def _usage_tokens(response: Any) -> int:
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", 0) or 0
+
 class GeminiClient:
     def __init__(self):
         if not settings.GEMINI_API_KEY:
@@ -17,21 +30,127 @@ class GeminiClient:
             raise ValueError("GEMINI_API_KEY must be set")
         
         genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model_name = 'gemini-1.5-flash'
+        # Part of the cache key: a parameter change must never serve older generations
+        self.generation_config: Dict[str, Any] = {}
+        self.model = genai.GenerativeModel(self.model_name, generation_config=self.generation_config or None)
+        # Alternative endpoint (load tests against scripts/mock_gemini_server.py): plain REST calls,
+        # the SDK's async path only speaks gRPC to Google
+        self._rest: Optional[httpx.AsyncClient] = None
+        if settings.GEMINI_API_ENDPOINT:
+            self._rest = httpx.AsyncClient(
+                base_url=settings.GEMINI_API_ENDPOINT,
+                params={"key": settings.GEMINI_API_KEY},
+                timeout=60.0
+            )
+            logger.info(f"GeminiClient using endpoint {settings.GEMINI_API_ENDPOINT}")
         logger.info("GeminiClient initialized successfully.")
 
+    def _rest_payload(self, prompt: str) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if self.generation_config:
+            payload["generationConfig"] = self.generation_config
+        return payload
+
+    @staticmethod
+    def _rest_text(data: Dict[str, Any]) -> str:
+        candidates = data.get("candidates") or [{}]
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
+
+    async def _rest_generate(self, prompt: str) -> Tuple[str, int]:
+        response = await self._rest.post(f"/v1beta/models/{self.model_name}:generateContent", json=self._rest_payload(prompt))
+        response.raise_for_status()
+        data = response.json()
+        return self._rest_text(data), data.get("usageMetadata", {}).get("totalTokenCount", 0)
+
+    async def _rest_stream(self, prompt: str) -> AsyncIterator[str]:
+        async with self._rest.stream(
+            "POST", f"/v1beta/models/{self.model_name}:streamGenerateContent", params={"alt": "sse"}, json=self._rest_payload(prompt)
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    text = self._rest_text(json.loads(line[5:]))
+                    if text:
+                        yield text
+
+    async def close(self) -> None:
+        if self._rest is not None:
+            await self._rest.aclose()
+
+    async def _reserve_tokens(self, prompt: str) -> int:
+        """Takes the call's estimated tokens from the budget shared with Luna Hub."""
+        estimated = estimate_tokens(prompt, ESTIMATED_OUTPUT_TOKENS)
+        try:
+            await llm_token_pool.acquire(estimated)
+        except TokenBudgetExceeded as e:
+            logger.warning(f"Gemini call rejected: {e}")
+            raise AIServiceError(str(e))
+        return estimated
+
     async def generate_content(self, prompt: str) -> str:
         """Generates content using Gemini with error handling."""
+        estimated = await self._reserve_tokens(prompt)
         try:
-            # Note: The google-generativeai library handles async operations internally
-            # when using generate_content_async.
-            response = await self.model.generate_content_async(prompt)
+            if self._rest is not None:
+                text, used = await self._rest_generate(prompt)
+            else:
+                # Note: The google-generativeai library handles async operations internally
+                # when using generate_content_async.
+                response = await self.model.generate_content_async(prompt)
+                text, used = response.text, _usage_tokens(response)
+            if used:
+                await llm_token_pool.refund(estimated - used)
             logger.info("Successfully generated content from Gemini.")
-            return response.text
+            return text
         except Exception as e:
             logger.error(f"An error occurred with the Gemini API: {e}")
             raise AIServiceError(f"Failed to generate content from Gemini: {e}")
 
+    async def generate_cached(self, prompt: str, endpoint: str, bypass_cache: bool = False) -> Tuple[str, str]:
+        """
+        Generates content through the LLM response cache when the endpoint opted in.
+
+        Returns:
+            (text, cache status) with status in hit, miss, bypass, disabled
+        """
+        if not llm_cache.is_cacheable(endpoint):
+            return await self.generate_content(prompt), "disabled"
+        if bypass_cache:
+            llm_cache.record_bypass(endpoint)
+            return await self.generate_content(prompt), "bypass"
+
+        digest = cache_key(self.model_name, self.generation_config, prompt)
+        cached = await llm_cache.get(endpoint, digest)
+        if cached is not None:
+            return cached, "hit"
+        text = await self.generate_content(prompt)
+        await llm_cache.set(endpoint, digest, text)
+        return text, "miss"
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """Streams generated text chunk by chunk as Gemini produces them."""
+        await self._reserve_tokens(prompt)
+        try:
+            if self._rest is not None:
+                async for text in self._rest_stream(prompt):
+                    yield text
+                logger.info("Successfully streamed content from Gemini.")
+                return
+            response = await self.model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:  # chunk without text (safety block, end of stream)
+                    continue
+                if text:
+                    yield text
+            logger.info("Successfully streamed content from Gemini.")
+        except Exception as e:
+            logger.error(f"An error occurred with the Gemini API stream: {e}")
+            raise AIServiceError(f"Failed to stream content from Gemini: {e}")
+
 # Singleton instance of the client
 gemini_client = GeminiClient()
 
@@ -1,20 +1,36 @@
 import httpx
 from fastapi import status, HTTPException
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 
 from app.core.config import settings
 
+# Budget header honored by the Hub: it stops working once the client gives up
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+
+def _deadline_headers(headers: Dict[str, str], timeout: float) -> Dict[str, str]:
+    return {**headers, DEADLINE_HEADER: str(int(timeout * 1000))}
+
 class HubClient:
     def __init__(self):
         self.base_url = settings.LUNA_HUB_URL
         self.api_key = settings.LUNA_HUB_INTERNAL_API_KEY
         self.headers = {"X-Internal-API-Key": self.api_key}
 
-    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+    async def _make_request(
+        self, method: str, endpoint: str, timeout: Optional[float] = None, **kwargs
+    ) -> Dict[str, Any]:
         """A centralized method for making requests to the Hub."""
+        timeout = timeout or settings.HUB_REQUEST_TIMEOUT
         async with httpx.AsyncClient() as client:
             try:
-                response = await client.request(method, f"{self.base_url}{endpoint}", headers=self.headers, **kwargs)
+                response = await client.request(
+                    method,
+                    f"{self.base_url}{endpoint}",
+                    headers=_deadline_headers(self.headers, timeout),
+                    timeout=timeout,
+                    **kwargs
+                )
                 response.raise_for_status()
                 return response.json()
             except httpx.HTTPStatusError as e:
@@ -39,6 +55,14 @@ class HubClient:
         )
         return data.get("can_perform", False)
 
+    async def consume_energy(self, user_id: str, action: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Consumes energy for a completed action (streamed actions pay once done)."""
+        return await self._make_request(
+            "post",
+            "/luna/energy/consume",
+            json={"user_id": user_id, "action_name": action, "context": context or {}}
+        )
+
     async def get_narrative_context(self, user_id: str) -> Dict[str, Any]:
         """Gets the user's narrative context from the Hub."""
         return await self._make_request("get", f"/narrative/context/{user_id}")
@@ -71,10 +95,11 @@ class HubClient:
         }
         
         # Add user authentication header for Hub to identify user
-        headers = {
+        timeout = settings.HUB_AI_REQUEST_TIMEOUT
+        headers = _deadline_headers({
             **self.headers,
             "X-User-ID": user_id
-        }
+        }, timeout)
         
         endpoint = f"/ai/{app}/chat"
         
@@ -84,7 +109,7 @@ class HubClient:
                     f"{self.base_url}{endpoint}", 
                     json=request_body,
                     headers=headers,
-                    timeout=30.0  # AI calls may take longer
+                    timeout=timeout  # AI calls may take longer
                 )
                 response.raise_for_status()
                 return response.json()
@@ -101,6 +126,69 @@ class HubClient:
                     detail="Cannot connect to Luna Hub AI service."
                 )
 
+    async def ai_chat_interaction_stream(
+        self,
+        user_id: str,
+        app: str,
+        message: str,
+        persona: str = "jeune_diplome",
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams an AI chat interaction from Luna Hub (text/event-stream passthrough).
+
+        The upstream response is opened before returning, so Hub refusals
+        (401, 402, 429, 503...) surface as HTTPException instead of a broken stream.
+        """
+        request_body = {
+            "message": message,
+            "persona": persona,
+            "context": context or {}
+        }
+        timeout = settings.HUB_AI_REQUEST_TIMEOUT
+        headers = _deadline_headers({
+            **self.headers,
+            "X-User-ID": user_id,
+            "Accept": "text/event-stream"
+        }, timeout)
+
+        client = httpx.AsyncClient(timeout=timeout)
+        try:
+            request = client.build_request(
+                "POST", f"{self.base_url}/ai/{app}/chat/stream", json=request_body, headers=headers
+            )
+            response = await client.send(request, stream=True)
+        except httpx.RequestError as e:
+            await client.aclose()
+            print(f"Request error to Luna Hub AI stream: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Cannot connect to Luna Hub AI service."
+            )
+
+        if response.status_code >= 400:
+            body = (await response.aread()).decode("utf-8", errors="replace")
+            await response.aclose()
+            await client.aclose()
+            print(f"Error communicating with Luna Hub AI stream: {response.status_code} - {body}")
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Error from Luna Hub AI: {body}"
+            )
+
+        async def relay() -> AsyncIterator[bytes]:
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            except httpx.RequestError as e:
+                print(f"Luna Hub AI stream interrupted: {e}")
+                yield b'event: error\ndata: {"message": "Luna Hub stream interrupted"}\n\n'
+            finally:
+                await response.aclose()
+                await client.aclose()
+
+        return relay()
+
 
 hub_client = HubClient()
 
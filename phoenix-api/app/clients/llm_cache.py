@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+import zlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Request header to skip the cache for one call (forces a fresh generation)
+BYPASS_HEADER = "X-LLM-Cache"
+# Response header reporting the cache outcome: hit, miss, bypass or disabled
+STATUS_HEADER = "X-LLM-Cache"
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapses whitespace so indentation-only prompt edits share one cache entry."""
+    return " ".join(prompt.split())
+
+
+def cache_key(model: str, params: Dict[str, Any], prompt: str) -> str:
+    """Content address of a generation: model + generation parameters + normalized prompt."""
+    material = json.dumps(
+        {"model": model, "params": params, "prompt": normalize_prompt(prompt)},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def wants_bypass(request: Request) -> bool:
+    """FastAPI dependency: True when the caller asked for a fresh generation."""
+    if request.headers.get(BYPASS_HEADER, "").lower() == "bypass":
+        return True
+    return "no-cache" in request.headers.get("Cache-Control", "").lower()
+
+
+class LLMResponseCache:
+    """
+    Opt-in, content-addressed cache of Gemini generations stored in Redis.
+
+    Only endpoints listed in LLM_CACHE_TTLS are cached, each with its own TTL.
+    Values are zlib-compressed. Any Redis failure falls back to a live generation.
+    """
+
+    def __init__(self):
+        self.enabled = settings.LLM_CACHE_ENABLED and bool(settings.REDIS_URL) and REDIS_AVAILABLE
+        self.ttls: Dict[str, int] = dict(settings.LLM_CACHE_TTLS)
+        self.key_prefix = settings.LLM_CACHE_KEY_PREFIX
+        self._client = None
+        self.stats: Dict[str, Dict[str, int]] = {}
+        if settings.LLM_CACHE_ENABLED and settings.REDIS_URL and not REDIS_AVAILABLE:
+            logger.warning("REDIS_URL is set but the redis package is not installed: LLM cache disabled.")
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = aioredis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.LLM_CACHE_REDIS_TIMEOUT,
+                socket_connect_timeout=settings.LLM_CACHE_REDIS_TIMEOUT
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def is_cacheable(self, endpoint: Optional[str]) -> bool:
+        return self.enabled and endpoint in self.ttls
+
+    def _count(self, endpoint: str, outcome: str, amount: int = 1) -> None:
+        counters = self.stats.setdefault(
+            endpoint, {"hits": 0, "misses": 0, "bypass": 0, "errors": 0, "bytes_stored": 0}
+        )
+        counters[outcome] += amount
+
+    def record_bypass(self, endpoint: str) -> None:
+        self._count(endpoint, "bypass")
+
+    def _redis_key(self, endpoint: str, digest: str) -> str:
+        return f"{self.key_prefix}:{endpoint}:{digest}"
+
+    async def get(self, endpoint: str, digest: str) -> Optional[str]:
+        try:
+            payload = await self.client.get(self._redis_key(endpoint, digest))
+        except Exception as e:
+            self._count(endpoint, "errors")
+            logger.warning(f"LLM cache read failed for {endpoint}: {e}")
+            return None
+        if payload is None:
+            self._count(endpoint, "misses")
+            return None
+        try:
+            text = zlib.decompress(payload).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError) as e:
+            # Corrupt entry: served as a miss, the live generation overwrites it
+            self._count(endpoint, "errors")
+            self._count(endpoint, "misses")
+            logger.warning(f"LLM cache entry unreadable for {endpoint}: {e}")
+            return None
+        self._count(endpoint, "hits")
+        return text
+
+    async def set(self, endpoint: str, digest: str, text: str) -> None:
+        payload = zlib.compress(text.encode("utf-8"), 6)
+        try:
+            await self.client.set(self._redis_key(endpoint, digest), payload, ex=self.ttls[endpoint])
+            self._count(endpoint, "bytes_stored", len(payload))
+        except Exception as e:
+            self._count(endpoint, "errors")
+            logger.warning(f"LLM cache write failed for {endpoint}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint, counters in self.stats.items():
+            lookups = counters["hits"] + counters["misses"]
+            endpoints[endpoint] = {
+                **counters,
+                "hit_rate": round(counters["hits"] / lookups, 3) if lookups else None,
+                "ttl_seconds": self.ttls.get(endpoint)
+            }
+        return {"enabled": self.enabled, "endpoints": endpoints}
+
+
+# Singleton instance of the cache
+llm_cache = LLMResponseCache()
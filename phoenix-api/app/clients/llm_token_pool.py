@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from app.core.config import settings
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBudgetExceeded(Exception):
+    """The shared Gemini tokens-per-minute budget stayed exhausted for too long."""
+    pass
+
+
+def estimate_tokens(prompt: str, max_output_tokens: int) -> int:
+    """Rough pre-call estimate (~4 characters per token) plus the output ceiling."""
+    return len(prompt) // 4 + max_output_tokens
+
+
+class LLMTokenPool:
+    """
+    Client side of the Gemini tokens-per-minute budget shared with Luna Hub.
+
+    Both services draw from the same Redis token bucket (same key, same Lua script
+    as the Hub's LLM scheduler), so together they stay within the provider quota.
+    Without REDIS_URL, or on any Redis failure, calls are let through.
+    """
+
+    # Keep in sync with luna-hub app/core/llm_scheduler.py TokenPool.ACQUIRE_SCRIPT
+    ACQUIRE_SCRIPT = """
+        local key = KEYS[1]
+        local capacity = tonumber(ARGV[1])
+        local rate = tonumber(ARGV[2])
+        local now = tonumber(ARGV[3])
+        local wanted = tonumber(ARGV[4])
+
+        local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+        local tokens = tonumber(bucket[1]) or capacity
+        local ts = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+        local granted = 0
+        if tokens >= wanted then
+            tokens = tokens - wanted
+            granted = 1
+        end
+        redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+        redis.call('EXPIRE', key, 120)
+        return {granted, tostring(tokens)}
+    """
+
+    def __init__(self):
+        self.enabled = settings.LLM_TOKEN_POOL_ENABLED and bool(settings.REDIS_URL) and REDIS_AVAILABLE
+        self.key = settings.LLM_TOKEN_POOL_KEY
+        self.rate = settings.LLM_TOKENS_PER_MINUTE / 60
+        self.capacity = self.rate * settings.LLM_TPM_BURST_SECONDS
+        self.max_wait = settings.LLM_TOKEN_POOL_MAX_WAIT
+        self._client = None
+        self.stats = {"granted_tokens": 0, "waits": 0, "wait_ms_total": 0.0, "rejected": 0, "errors": 0}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = aioredis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.LLM_CACHE_REDIS_TIMEOUT,
+                socket_connect_timeout=settings.LLM_CACHE_REDIS_TIMEOUT
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Waits until the shared bucket holds `tokens`, then takes them.
+
+        Raises:
+            TokenBudgetExceeded: budget still exhausted after LLM_TOKEN_POOL_MAX_WAIT seconds
+        """
+        if not self.enabled:
+            return
+        wanted = min(tokens, self.capacity)
+        started = time.monotonic()
+        while True:
+            try:
+                granted, left = await self.client.eval(
+                    self.ACQUIRE_SCRIPT, 1, self.key, self.capacity, self.rate, time.time(), wanted
+                )
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning(f"LLM token pool unavailable, letting the call through: {e}")
+                return
+            if int(granted):
+                break
+            waited = time.monotonic() - started
+            if waited >= self.max_wait:
+                self.stats["rejected"] += 1
+                raise TokenBudgetExceeded("Gemini token budget exhausted, try again shortly.")
+            refill = (wanted - float(left)) / self.rate if self.rate > 0 else 1.0
+            await asyncio.sleep(min(max(refill, 0.01), 0.5, self.max_wait - waited))
+
+        waited_ms = (time.monotonic() - started) * 1000
+        if waited_ms > 1:
+            self.stats["waits"] += 1
+            self.stats["wait_ms_total"] += waited_ms
+        self.stats["granted_tokens"] += int(wanted)
+
+    async def refund(self, tokens: int) -> None:
+        """Gives back over-estimated tokens once the real usage is known."""
+        if not self.enabled or tokens <= 0:
+            return
+        try:
+            await self.client.hincrbyfloat(self.key, "tokens", tokens)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"LLM token pool refund failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        waits = self.stats["waits"]
+        return {
+            "enabled": self.enabled,
+            "key": self.key,
+            "tokens_per_minute": settings.LLM_TOKENS_PER_MINUTE,
+            **self.stats,
+            "avg_wait_ms": round(self.stats["wait_ms_total"] / waits, 1) if waits else None
+        }
+
+
+# Singleton instance of the token pool
+llm_token_pool = LLMTokenPool()
@@ -1,12 +1,38 @@
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     # Luna Hub configuration - MUST be set via environment variables
     LUNA_HUB_URL: str
     LUNA_HUB_INTERNAL_API_KEY: str
+    # Client-side budgets (seconds), sent to the Hub as its request deadline
+    HUB_REQUEST_TIMEOUT: float = 10.0
+    HUB_AI_REQUEST_TIMEOUT: float = 30.0
 
     # AI Services configuration - MUST be set via environment variables
     GEMINI_API_KEY: str
+    # Alternative Gemini endpoint, e.g. http://localhost:8089 for scripts/mock_gemini_server.py (plain REST calls)
+    GEMINI_API_ENDPOINT: Optional[str] = None
+
+    # LLM response cache (opt-in per endpoint, Redis-backed; disabled without REDIS_URL)
+    REDIS_URL: Optional[str] = None
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_KEY_PREFIX: str = "phoenix-api:llm"
+    LLM_CACHE_REDIS_TIMEOUT: float = 0.25
+    # Endpoint -> TTL (seconds); endpoints not listed are never cached
+    LLM_CACHE_TTLS: Dict[str, int] = {
+        "cv.mirror_match": 24 * 3600,
+        "aube.skill_transfer_analysis": 7 * 24 * 3600,
+        "letters.generate": 24 * 3600,
+    }
+
+    # Gemini tokens-per-minute budget shared with Luna Hub's LLM scheduler (same Redis key)
+    LLM_TOKEN_POOL_ENABLED: bool = True
+    LLM_TOKEN_POOL_KEY: str = "phoenix:llm:token_pool"
+    LLM_TOKENS_PER_MINUTE: int = 1_000_000
+    LLM_TPM_BURST_SECONDS: float = 15.0
+    # Seconds a call may wait for budget before failing
+    LLM_TOKEN_POOL_MAX_WAIT: float = 10.0
 
     # JWT settings - MUST be set via environment variables to match Luna Hub
     JWT_SECRET_KEY: str
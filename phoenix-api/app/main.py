@@ -3,6 +3,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from app.routers import cv, letters, aube, rise
+from app.clients.llm_cache import llm_cache
+from app.clients.llm_token_pool import llm_token_pool
+from app.clients.gemini_client import gemini_client
 
 # 🚀 Phoenix API Gateway - Multi-SPA Architecture
 app = FastAPI(
@@ -69,3 +72,19 @@ async def read_root():
 @app.get("/health", tags=["Health"])
 async def health_check():
     return {"status": "ok"}
+
+@app.get("/health/llm-cache", tags=["Health"])
+async def llm_cache_stats():
+    """LLM response cache: hit rate, bypasses and errors per endpoint."""
+    return llm_cache.get_stats()
+
+@app.get("/health/llm-token-pool", tags=["Health"])
+async def llm_token_pool_stats():
+    """Shared Gemini token budget: granted tokens, waits and rejections."""
+    return llm_token_pool.get_stats()
+
+@app.on_event("shutdown")
+async def close_llm_cache():
+    await llm_cache.close()
+    await llm_token_pool.close()
+    await gemini_client.close()
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
 
 from app.clients.hub_client import get_hub_client, HubClient
 from app.clients.gemini_client import get_gemini_client, GeminiClient
+from app.clients.llm_cache import STATUS_HEADER as LLM_CACHE_STATUS_HEADER, wants_bypass
 from app.dependencies import get_current_user_id
 
 router = APIRouter()
@@ -80,14 +82,39 @@ async def chat_with_luna(
         # Log the full error here in a real application
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+@router.post("/chat/stream", summary="Stream a Luna copilot reply for Aube (SSE)")
+async def chat_with_luna_stream(
+    request: ChatRequest,
+    user_id: str = Depends(get_current_user_id),
+    hub: HubClient = Depends(get_hub_client)
+):
+    """
+    Server-Sent Events passthrough of the Hub stream: token, validation, done, error.
+    Energy is consumed by the Hub once the reply is complete.
+    """
+    events = await hub.ai_chat_interaction_stream(
+        user_id=user_id,
+        app="aube",
+        message=request.message,
+        persona=request.persona,
+        context=request.context or {}
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # --- NEW: Enhanced Career Transition Endpoints ---
 
 @router.post("/skill-transfer-analysis", summary="Analyze skill transferability for career transition")
 async def analyze_skill_transfer(
     request: SkillTransferRequest,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
     hub: HubClient = Depends(get_hub_client),
-    gemini: GeminiClient = Depends(get_gemini_client)
+    gemini: GeminiClient = Depends(get_gemini_client),
+    bypass_cache: bool = Depends(wants_bypass)
 ):
     """
     THE GOLD of career transition - Skill Transfer Matrix Analysis
@@ -120,7 +147,8 @@ async def analyze_skill_transfer(
     Format la réponse en JSON structuré pour interface.
     """
     
-    analysis_result = await gemini.generate_content(prompt)
+    analysis_result, cache_status = await gemini.generate_cached(prompt, "aube.skill_transfer_analysis", bypass_cache)
+    response.headers[LLM_CACHE_STATUS_HEADER] = cache_status
 
     await hub.track_event(
         user_id=user_id,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
@@ -6,6 +6,7 @@ import os
 
 from app.clients.hub_client import get_hub_client, HubClient
 from app.clients.gemini_client import get_gemini_client, GeminiClient
+from app.clients.llm_cache import STATUS_HEADER as LLM_CACHE_STATUS_HEADER, wants_bypass
 from app.dependencies import get_current_user_id
 
 router = APIRouter()
@@ -65,9 +66,11 @@ async def cv_status():
 @router.post("/mirror-match", summary="Run Mirror Match analysis for a CV and job description")
 async def mirror_match(
     request: MirrorMatchRequest,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
     hub: HubClient = Depends(get_hub_client),
-    gemini: GeminiClient = Depends(get_gemini_client)
+    gemini: GeminiClient = Depends(get_gemini_client),
+    bypass_cache: bool = Depends(wants_bypass)
 ):
     """
     Orchestrates the Mirror Match feature.
@@ -80,7 +83,8 @@ async def mirror_match(
     prompt = f"""Analyze the compatibility between the CV (id: {request.cv_id}) and the job description: '{request.job_description}'. 
     Provide a compatibility score, strengths, weaknesses, and suggestions."""
     
-    analysis_result = await gemini.generate_content(prompt)
+    analysis_result, cache_status = await gemini.generate_cached(prompt, "cv.mirror_match", bypass_cache)
+    response.headers[LLM_CACHE_STATUS_HEADER] = cache_status
 
     # 3. Track event in Narrative Capital
     await hub.track_event(
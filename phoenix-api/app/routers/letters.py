@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
 
 from app.clients.hub_client import get_hub_client, HubClient
 from app.clients.gemini_client import get_gemini_client, GeminiClient
+from app.clients.llm_cache import STATUS_HEADER as LLM_CACHE_STATUS_HEADER, wants_bypass
 from app.dependencies import get_current_user_id
 
 router = APIRouter()
@@ -37,9 +38,11 @@ async def letters_status():
 @router.post("/generate", summary="Generate a cover letter")
 async def generate_letter(
     request: GenerateLetterRequest,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
     hub: HubClient = Depends(get_hub_client),
-    gemini: GeminiClient = Depends(get_gemini_client)
+    gemini: GeminiClient = Depends(get_gemini_client),
+    bypass_cache: bool = Depends(wants_bypass)
 ):
     """
     Orchestrates the cover letter generation feature.
@@ -51,7 +54,8 @@ async def generate_letter(
     Job description: {request.job_description or 'N/A'}. 
     Experience level: {request.experience_level}. Tone: {request.desired_tone}."""
     
-    letter_content = await gemini.generate_content(prompt)
+    letter_content, cache_status = await gemini.generate_cached(prompt, "letters.generate", bypass_cache)
+    response.headers[LLM_CACHE_STATUS_HEADER] = cache_status
 
     await hub.track_event(
         user_id=user_id,
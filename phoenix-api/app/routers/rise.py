@@ -1,9 +1,11 @@
+import json
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List
 
 from app.clients.hub_client import get_hub_client, HubClient
-from app.clients.gemini_client import get_gemini_client, GeminiClient
+from app.clients.gemini_client import get_gemini_client, GeminiClient, AIServiceError
 from app.dependencies import get_current_user_id
 
 router = APIRouter()
@@ -122,4 +124,67 @@ async def mock_interview_response(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de l'analyse: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/mock-interview/stream", summary="Stream mock interview feedback (SSE)")
+async def mock_interview_response_stream(
+    request: MockInterviewRequest,
+    user_id: str = Depends(get_current_user_id),
+    hub: HubClient = Depends(get_hub_client),
+    gemini: GeminiClient = Depends(get_gemini_client)
+):
+    """
+    Feedback d'entretien streamé (événements token, done, error)
+    
+    Énergie vérifiée avant le premier fragment, consommée une fois le feedback complet.
+    Coût énergétique: 5 unités par interaction
+    """
+    if not await hub.can_perform(user_id, "RISE_MOCK_INTERVIEW"):
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail="Insufficient Luna energy for mock interview"
+        )
+    
+    prompt = f"""Tu es Luna, coach d'entretien bienveillante et exigeante.
+
+Scénario de l'entretien : {request.scenario}
+Réponse du candidat : {request.user_response}
+
+Donne un feedback concis : points forts, axes d'amélioration concrets,
+puis pose la question suivante de l'entretien."""
+
+    async def events() -> AsyncIterator[str]:
+        parts = []
+        try:
+            async for chunk in gemini.stream_content(prompt):
+                parts.append(chunk)
+                yield _sse("token", {"text": chunk})
+        except AIServiceError:
+            yield _sse("error", {"message": "Erreur lors de l'analyse, réessaie dans un instant"})
+            return
+        
+        try:
+            energy = await hub.consume_energy(
+                user_id, "RISE_MOCK_INTERVIEW", {"session_id": request.session_id, "streamed": True}
+            )
+            await hub.track_event(user_id, "rise_mock_interview_feedback", {
+                "session_id": request.session_id,
+                "feedback_length": sum(len(part) for part in parts)
+            })
+        except HTTPException as e:
+            yield _sse("error", {"message": "Impossible de finaliser l'interaction", "status": e.status_code})
+            return
+        yield _sse("done", {
+            "session_id": request.session_id,
+            "energy_consumed": energy.get("energy_consumed", 0)
+        })
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
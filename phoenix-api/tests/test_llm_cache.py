@@ -0,0 +1,102 @@
+"""
+LLM response cache: content addressing, hit/miss accounting, bypass and corrupt entries.
+"""
+
+import asyncio
+import os
+import sys
+import zlib
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+for name in ("LUNA_HUB_URL", "LUNA_HUB_INTERNAL_API_KEY", "GEMINI_API_KEY", "JWT_SECRET_KEY"):
+    os.environ.setdefault(name, "test")
+
+from starlette.requests import Request  # noqa: E402
+
+from app.clients import gemini_client  # noqa: E402
+from app.clients.llm_cache import LLMResponseCache, cache_key, wants_bypass  # noqa: E402
+
+
+def _cache() -> LLMResponseCache:
+    cache = LLMResponseCache()
+    cache.enabled = True
+    cache.ttls = {"cv_analysis": 60}
+    cache._client = fakeredis.FakeAsyncRedis()
+    return cache
+
+
+def test_cache_key_ignores_whitespace_only_prompt_edits():
+    params = {"temperature": 0.2}
+    assert cache_key("gemini", params, "Analyse  this\n\tCV") == cache_key("gemini", params, "Analyse this CV")
+    assert cache_key("gemini", params, "Analyse this CV") != cache_key("gemini", {"temperature": 0.9}, "Analyse this CV")
+    assert cache_key("gemini", params, "Analyse this CV") != cache_key("other", params, "Analyse this CV")
+
+
+def test_round_trip_counts_a_miss_then_a_hit():
+    async def scenario():
+        cache = _cache()
+        assert await cache.get("cv_analysis", "d1") is None
+        await cache.set("cv_analysis", "d1", "Bonjour 🌙")
+        assert await cache.get("cv_analysis", "d1") == "Bonjour 🌙"
+
+        stats = cache.get_stats()["endpoints"]["cv_analysis"]
+        assert (stats["hits"], stats["misses"], stats["errors"]) == (1, 1, 0)
+        assert stats["bytes_stored"] > 0
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("payload", [b"not zlib", zlib.compress(b"\xff\xfe")], ids=["not_zlib", "not_utf8"])
+def test_corrupt_entry_is_a_miss(payload):
+    async def scenario():
+        cache = _cache()
+        await cache.client.set(cache._redis_key("cv_analysis", "d1"), payload)
+
+        assert await cache.get("cv_analysis", "d1") is None
+        stats = cache.get_stats()["endpoints"]["cv_analysis"]
+        assert (stats["hits"], stats["misses"], stats["errors"]) == (0, 1, 1)
+        assert stats["hit_rate"] == 0
+
+    asyncio.run(scenario())
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_bypass_headers():
+    assert wants_bypass(_request(X_LLM_Cache="bypass"))
+    assert wants_bypass(_request(Cache_Control="no-cache"))
+    assert not wants_bypass(_request(Cache_Control="max-age=60"))
+
+
+def test_generate_cached_serves_repeated_prompts_from_the_cache(monkeypatch):
+    async def scenario():
+        cache = _cache()
+        monkeypatch.setattr(gemini_client, "llm_cache", cache)
+        client = gemini_client.GeminiClient()
+        calls = []
+
+        async def generate_content(prompt):
+            calls.append(prompt)
+            return f"generated {len(calls)}"
+
+        client.generate_content = generate_content
+
+        assert await client.generate_cached("Analyse this CV", "cv_analysis") == ("generated 1", "miss")
+        assert await client.generate_cached("Analyse   this CV", "cv_analysis") == ("generated 1", "hit")
+        assert await client.generate_cached("Analyse this CV", "cv_analysis", bypass_cache=True) == ("generated 2", "bypass")
+        assert await client.generate_cached("Write a letter", "letter_generation") == ("generated 3", "disabled")
+        assert len(calls) == 3
+
+        stats = cache.get_stats()["endpoints"]["cv_analysis"]
+        assert (stats["hits"], stats["misses"], stats["bypass"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    asyncio.run(scenario())
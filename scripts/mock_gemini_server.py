@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+🧪 Mock Gemini Server - Tests de charge des pipelines IA
+Remplaçant local de l'API REST Gemini (generateContent / streamGenerateContent)
+
+Aucun quota consommé : on mesure le surcoût de Luna Hub / Phoenix API à
+concurrence réaliste, avec une latence LLM contrôlée.
+
+- Latence du premier token : fixed:800 | uniform:300-1500 | normal:800,200 | lognormal:800,0.6
+  (médiane ms, sigma) puis débit de génération en tokens/s
+- Streaming SSE (alt=sse) découpé en fragments de quelques mots
+- Injection d'erreurs : statuts HTTP (429, 500, 503...), requêtes bloquées (timeouts),
+  flux coupés en plein milieu
+- Réponses préenregistrées : JSON attendu par /ai/cv/analyze et /ai/letters/generate
+  intégré, surchargeable par un fichier [{"match": "...", "response": "..."}]
+
+Usage:
+    python scripts/mock_gemini_server.py --port 8089 --latency lognormal:800,0.6 --error-rate 0.02
+
+    # Luna Hub (GeminiProvider) et Phoenix API (GeminiClient)
+    GEMINI_API_ENDPOINT=http://localhost:8089 GEMINI_API_KEY=mock ...
+
+Statistiques : GET /mock/stats ; remise à zéro : POST /mock/reset
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Réponses intégrées : la première dont le marqueur apparaît dans le prompt gagne
+BUILTIN_CANNED: List[Dict[str, str]] = [
+    {
+        "match": "overall_compatibility",
+        "response": json.dumps({
+            "overall_compatibility": 78.5,
+            "skill_matches": [{
+                "cv_skill": "Python", "job_requirement": "Python", "match_level": "exact_match",
+                "confidence_score": 0.93, "explanation": "Correspondance exacte (mock)",
+                "optimization_suggestion": "Mentionner les frameworks utilisés"
+            }],
+            "experience_analysis": {"candidate_years": 4, "required_years": 3, "experience_score": 82,
+                                    "industry_match": True, "role_similarity": 0.7},
+            "keyword_analysis": {"keyword_density": 0.6, "missing_keywords": ["Docker"], "ats_optimization_score": 74},
+            "priority_improvements": ["Quantifier les résultats obtenus"],
+            "success_prediction": {"interview_probability": 0.7, "hiring_probability": 0.55,
+                                   "salary_negotiation_power": 0.6}
+        }, ensure_ascii=False)
+    },
+    {
+        "match": "letter_content",
+        "response": json.dumps({
+            "letter_content": "Madame, Monsieur,\n\nLettre de motivation générée par le serveur mock.\n\nCordialement,\n[Nom]",
+            "personalization_elements": ["Référence à l'entreprise (mock)"],
+            "quality_metrics": {"personalization_score": 80, "authenticity_score": 85,
+                                "engagement_score": 82, "overall_quality": 82},
+            "optimization_suggestions": ["Ajouter un exemple chiffré"],
+            "word_count": 320
+        }, ensure_ascii=False)
+    },
+]
+
+DEFAULT_RESPONSE = (
+    "🌙 Je suis Luna (réponse simulée). Dis-m'en un peu plus sur ce qui te motive "
+    "dans ton travail actuel : qu'est-ce qui te donne de l'énergie au quotidien ? ✨"
+)
+
+ERROR_STATUS_NAMES = {400: "INVALID_ARGUMENT", 429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE"}
+
+
+def count_tokens(text: str) -> int:
+    return max(1, math.ceil(len(text) / 4))
+
+
+class LatencyModel:
+    """⏱️ Distribution de la latence du premier token (ms)"""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        self.kind = kind
+        try:
+            if kind == "fixed":
+                self.params = (float(args),)
+            elif kind == "uniform":
+                low, high = args.split("-")
+                self.params = (float(low), float(high))
+            elif kind in ("normal", "lognormal"):
+                center, spread = args.split(",")
+                self.params = (float(center), float(spread))
+            else:
+                raise ValueError(kind)
+        except ValueError:
+            raise ValueError(f"Invalid latency spec '{spec}' (fixed:800 | uniform:300-1500 | normal:800,200 | lognormal:800,0.6)")
+
+    def sample_ms(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return random.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, random.gauss(*self.params))
+        median, sigma = self.params
+        return random.lognormvariate(math.log(median), sigma)
+
+
+@dataclass
+class MockConfig:
+    latency: LatencyModel
+    tokens_per_second: float = 80.0
+    words_per_chunk: int = 4
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (429, 500, 503)
+    hang_rate: float = 0.0
+    hang_seconds: float = 120.0
+    stream_abort_rate: float = 0.0
+    canned: List[Dict[str, str]] = field(default_factory=lambda: list(BUILTIN_CANNED))
+
+
+class MockStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.started_at = time.time()
+        self.requests = 0
+        self.streams = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.errors: Dict[int, int] = {}
+        self.hangs = 0
+        self.stream_aborts = 0
+        self.output_tokens = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = max(time.time() - self.started_at, 1e-6)
+        return {
+            "uptime_s": round(elapsed, 1),
+            "requests": self.requests,
+            "streams": self.streams,
+            "requests_per_s": round(self.requests / elapsed, 2),
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "errors": {str(code): count for code, count in self.errors.items()},
+            "hangs": self.hangs,
+            "stream_aborts": self.stream_aborts,
+            "output_tokens": self.output_tokens
+        }
+
+
+def _prompt_text(body: Dict[str, Any]) -> str:
+    return "\n".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+
+def _chunk(text: str, prompt_tokens: int, output_tokens: Optional[int], finish: bool) -> Dict[str, Any]:
+    candidate: Dict[str, Any] = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finish:
+        candidate["finishReason"] = "STOP"
+    chunk: Dict[str, Any] = {"candidates": [candidate], "modelVersion": "mock"}
+    if output_tokens is not None:
+        chunk["usageMetadata"] = {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens
+        }
+    return chunk
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    app = FastAPI(title="Mock Gemini API")
+    stats = MockStats()
+
+    def canned_response(prompt: str) -> str:
+        for entry in config.canned:
+            if entry["match"] in prompt:
+                return entry["response"]
+        return DEFAULT_RESPONSE
+
+    async def injected_failure() -> Optional[JSONResponse]:
+        """Erreur ou blocage tiré au sort ; None = requête normale"""
+        if config.hang_rate and random.random() < config.hang_rate:
+            stats.hangs += 1
+            await asyncio.sleep(config.hang_seconds)
+        if config.error_rate and random.random() < config.error_rate:
+            code = random.choice(config.error_statuses)
+            stats.errors[code] = stats.errors.get(code, 0) + 1
+            return JSONResponse(status_code=code, content={"error": {
+                "code": code, "message": "Injected by mock Gemini server",
+                "status": ERROR_STATUS_NAMES.get(code, "UNKNOWN")
+            }})
+        return None
+
+    def generation_seconds(tokens: int) -> float:
+        return tokens / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+    @app.post("/v1beta/models/{model_action}")
+    async def models_endpoint(model_action: str, request: Request):
+        model, _, action = model_action.partition(":")
+        body = await request.json()
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        streaming = action == "streamGenerateContent"
+        try:
+            failure = await injected_failure()
+            if failure is not None:
+                return failure
+            if action not in ("generateContent", "streamGenerateContent"):
+                return JSONResponse(status_code=404, content={"error": {"code": 404, "message": f"Unknown action {action}"}})
+
+            prompt = _prompt_text(body)
+            text = canned_response(prompt)
+            prompt_tokens = count_tokens(prompt)
+            output_tokens = count_tokens(text)
+            stats.output_tokens += output_tokens
+            first_token_s = config.latency.sample_ms() / 1000
+
+            if not streaming:
+                await asyncio.sleep(first_token_s + generation_seconds(output_tokens))
+                return _chunk(text, prompt_tokens, output_tokens, finish=True)
+
+            stats.streams += 1
+            stats.in_flight += 1  # le flux vit après le retour du handler
+            return StreamingResponse(
+                stream(text, prompt_tokens, output_tokens, first_token_s, sse=request.query_params.get("alt") == "sse"),
+                media_type="text/event-stream" if request.query_params.get("alt") == "sse" else "application/json"
+            )
+        finally:
+            stats.in_flight -= 1
+
+    async def stream(text: str, prompt_tokens: int, output_tokens: int, first_token_s: float, sse: bool):
+        try:
+            words = text.split(" ")
+            pieces = [
+                " ".join(words[i:i + config.words_per_chunk]) + (" " if i + config.words_per_chunk < len(words) else "")
+                for i in range(0, len(words), config.words_per_chunk)
+            ]
+            abort_at = random.randrange(len(pieces)) if config.stream_abort_rate and random.random() < config.stream_abort_rate else None
+            await asyncio.sleep(first_token_s)
+            chunks = []
+            for index, piece in enumerate(pieces):
+                if index == abort_at:
+                    stats.stream_aborts += 1
+                    return  # connexion coupée sans fragment final
+                if index:
+                    await asyncio.sleep(generation_seconds(count_tokens(piece)))
+                last = index == len(pieces) - 1
+                chunk = _chunk(piece, prompt_tokens, output_tokens if last else None, finish=last)
+                if sse:
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\r\n\r\n"
+                else:
+                    chunks.append(chunk)
+            if not sse:
+                # Sans alt=sse, l'API renvoie un tableau JSON de fragments
+                yield json.dumps(chunks, ensure_ascii=False)
+        finally:
+            stats.in_flight -= 1
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return {**stats.to_dict(), "latency": config.latency.spec, "error_rate": config.error_rate}
+
+    @app.post("/mock/reset")
+    async def mock_reset():
+        stats.reset()
+        return {"reset": True}
+
+    return app
+
+
+def load_canned(path: Optional[str]) -> List[Dict[str, str]]:
+    """Fichier JSON [{"match": "...", "response": "..."}] prioritaire sur les réponses intégrées"""
+    canned = list(BUILTIN_CANNED)
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            entries = json.load(handle)
+        if not all(isinstance(entry, dict) and "match" in entry and "response" in entry for entry in entries):
+            raise ValueError(f"{path}: expected a list of {{\"match\", \"response\"}} objects")
+        canned = entries + canned
+    return canned
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    env = os.getenv
+    parser = argparse.ArgumentParser(description="Mock Gemini generateContent API for load testing")
+    parser.add_argument("--host", default=env("MOCK_GEMINI_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(env("MOCK_GEMINI_PORT", "8089")))
+    parser.add_argument("--latency", default=env("MOCK_GEMINI_LATENCY", "lognormal:800,0.5"),
+                        help="time to first token: fixed:800 | uniform:300-1500 | normal:800,200 | lognormal:800,0.5")
+    parser.add_argument("--tokens-per-second", type=float, default=float(env("MOCK_GEMINI_TOKENS_PER_SECOND", "80")))
+    parser.add_argument("--words-per-chunk", type=int, default=int(env("MOCK_GEMINI_WORDS_PER_CHUNK", "4")))
+    parser.add_argument("--error-rate", type=float, default=float(env("MOCK_GEMINI_ERROR_RATE", "0")))
+    parser.add_argument("--error-statuses", default=env("MOCK_GEMINI_ERROR_STATUSES", "429,500,503"))
+    parser.add_argument("--hang-rate", type=float, default=float(env("MOCK_GEMINI_HANG_RATE", "0")))
+    parser.add_argument("--hang-seconds", type=float, default=float(env("MOCK_GEMINI_HANG_SECONDS", "120")))
+    parser.add_argument("--stream-abort-rate", type=float, default=float(env("MOCK_GEMINI_STREAM_ABORT_RATE", "0")))
+    parser.add_argument("--canned", default=env("MOCK_GEMINI_CANNED"), help="JSON file of {match, response} entries")
+    parser.add_argument("--seed", type=int, default=None, help="random seed (reproducible runs)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> None:
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    config = MockConfig(
+        latency=LatencyModel(args.latency),
+        tokens_per_second=args.tokens_per_second,
+        words_per_chunk=max(1, args.words_per_chunk),
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(code) for code in args.error_statuses.split(",") if code.strip()),
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        stream_abort_rate=args.stream_abort_rate,
+        canned=load_canned(args.canned)
+    )
+    print(f"🧪 Mock Gemini on http://{args.host}:{args.port} (latency={args.latency}, error_rate={args.error_rate})")
+    print(f"💡 Point the services at it: GEMINI_API_ENDPOINT=http://{args.host}:{args.port}")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
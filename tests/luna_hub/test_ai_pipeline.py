@@ -0,0 +1,94 @@
+"""
+🚦 AI Pipeline - admit_and_fetch
+Contrôles et lectures en parallèle, refus départagés par ordre de déclaration
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.ai_pipeline import admit_and_fetch  # noqa: E402
+
+
+class Refused(Exception):
+    pass
+
+
+async def _after(delay: float, value=None, error: Exception = None, log: list = None, name: str = ""):
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        if log is not None:
+            log.append(f"{name} cancelled")
+        raise
+    if log is not None:
+        log.append(f"{name} done")
+    if error is not None:
+        raise error
+    return value
+
+
+def test_checks_and_fetches_run_together():
+    async def scenario():
+        fetched = asyncio.Event()
+
+        async def check():
+            # Ne passe que si la lecture tourne en même temps
+            await asyncio.wait_for(fetched.wait(), timeout=1)
+
+        async def fetch():
+            fetched.set()
+            return {"narrative": "ok"}
+
+        assert await admit_and_fetch([check()], {"context": fetch()}) == {"context": {"narrative": "ok"}}
+
+    asyncio.run(scenario())
+
+
+def test_declaration_order_breaks_ties_between_refusals():
+    async def scenario():
+        rate_limit = _after(0.05, error=Refused("rate limit"))
+        energy = _after(0.0, error=Refused("energy"))
+        with pytest.raises(Refused, match="rate limit"):
+            await admit_and_fetch([rate_limit, energy])
+
+    asyncio.run(scenario())
+
+
+def test_refusal_waits_for_earlier_checks_and_cancels_the_rest():
+    async def scenario():
+        log = []
+        checks = [
+            _after(0.05, log=log, name="rate_limit"),
+            _after(0.0, error=Refused("energy"), log=log, name="energy"),
+        ]
+        fetches = {"context": _after(1.0, log=log, name="context")}
+
+        with pytest.raises(Refused, match="energy"):
+            await admit_and_fetch(checks, fetches)
+        assert log == ["energy done", "rate_limit done", "context cancelled"]
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("refusing", [False, True])
+def test_outer_cancellation_cancels_every_task(refusing):
+    async def scenario():
+        log = []
+        checks = [_after(1.0, log=log, name="rate_limit")]
+        if refusing:
+            # Le refus arrive d'abord : l'annulation tombe pendant l'attente du rate limit
+            checks.append(_after(0.0, error=Refused("energy")))
+        call = asyncio.ensure_future(admit_and_fetch(checks, {"context": _after(1.0, log=log, name="context")}))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        await asyncio.sleep(0)
+        assert sorted(log) == ["context cancelled", "rate_limit cancelled"]
+
+    asyncio.run(scenario())
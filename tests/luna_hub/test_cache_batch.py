@@ -0,0 +1,93 @@
+"""
+📦 Redis cache - get_many / set_many pipelinés
+Un aller-retour par nœud, clés réparties sur les shards, fallback mémoire
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.redis_cache import RedisCache  # noqa: E402
+from app.core.redis_sharding import POOL_CACHE, ShardedRedisPool  # noqa: E402
+
+NODES = ("redis://node-a", "redis://node-b")
+
+
+class CountingRedis(fakeredis.FakeAsyncRedis):
+    """Client fakeredis qui compte les MGET et les pipelines exécutés"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mgets = 0
+        self.pipelines = 0
+
+    async def mget(self, *args, **kwargs):
+        self.mgets += 1
+        return await super().mget(*args, **kwargs)
+
+    def pipeline(self, *args, **kwargs):
+        self.pipelines += 1
+        return super().pipeline(*args, **kwargs)
+
+
+def _sharded_cache():
+    cache = RedisCache()
+    pool = ShardedRedisPool(POOL_CACHE, list(NODES))
+    clients = {node: CountingRedis(server=fakeredis.FakeServer()) for node in NODES}
+    for node, client in clients.items():
+        pool.attach(node, client)
+    cache.pools = {POOL_CACHE: pool}
+    cache.redis_client = clients[NODES[0]]
+    cache.redis_available = True
+    return cache, clients
+
+
+def test_set_many_then_get_many_across_shards():
+    async def scenario():
+        cache, clients = _sharded_cache()
+        items = {f"u{index}": {"index": index} for index in range(20)}
+
+        assert await cache.set_many("user_profile", items, ttl=120)
+        # Un pipeline par nœud, pas un aller-retour par clé
+        assert all(client.pipelines == 1 for client in clients.values())
+
+        found = await cache.get_many("user_profile", [*items, "absent"])
+        assert found == items
+        assert all(client.mgets == 1 for client in clients.values())
+
+        # Chaque clé vit sur le nœud choisi par l'anneau, avec son TTL
+        for identifier in items:
+            key = cache._build_key("user_profile", identifier)
+            owner = cache.client_for(key)
+            assert 0 < await owner.ttl(key) <= 120
+            assert sum([await client.exists(key) for client in clients.values()]) == 1
+
+    asyncio.run(scenario())
+
+
+def test_set_many_tags_are_invalidated_together():
+    async def scenario():
+        cache, _ = _sharded_cache()
+        await cache.set_many("user_profile", {"a": 1, "b": 2}, ttl=120, tags=["user:u1"])
+
+        assert await cache.invalidate_tags("user:u1") == 2
+        assert await cache.get_many("user_profile", ["a", "b"]) == {}
+
+    asyncio.run(scenario())
+
+
+def test_batch_falls_back_to_memory_without_redis():
+    async def scenario():
+        cache = RedisCache()
+        assert await cache.set_many("user_profile", {"a": 1, "b": 2}, ttl=120)
+
+        assert await cache.get_many("user_profile", ["a", "b", "c"]) == {"a": 1, "b": 2}
+        assert cache.stats["fallback_uses"] >= 2
+
+    asyncio.run(scenario())
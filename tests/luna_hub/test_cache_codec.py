@@ -0,0 +1,84 @@
+"""
+📦 Cache codec - encodage, compression, entrées JSON historiques
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.cache_codec import (  # noqa: E402
+    COMPRESSED_FLAG, MSGPACK_AVAILABLE, CacheSerializer, JsonCodec, MsgpackCodec
+)
+from app.core.redis_cache import RedisCache  # noqa: E402
+
+VALUE = {"user_id": "u1", "scores": [1, 2.5, None], "nested": {"ok": True}, "name": "Luné 🌙"}
+
+
+needs_msgpack = pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")
+
+
+@pytest.mark.parametrize("preferred", ["json", pytest.param("msgpack", marks=needs_msgpack)])
+def test_round_trip_with_codec_header(preferred):
+    serializer = CacheSerializer(preferred=preferred, compression_threshold=0)
+    raw = serializer.encode(VALUE)
+
+    assert raw[0] == serializer.codec.codec_id
+    assert serializer.decode(raw) == VALUE
+
+
+def test_large_values_are_compressed_small_ones_are_not():
+    serializer = CacheSerializer(preferred="json", compression_threshold=256)
+    large = {"text": "Luna " * 500}
+
+    raw = serializer.encode(large)
+    assert raw[0] & COMPRESSED_FLAG
+    assert len(raw) < len(json.dumps(large))
+    assert serializer.decode(raw) == large
+
+    assert not serializer.encode(VALUE)[0] & COMPRESSED_FLAG
+    assert serializer.get_stats()["compressed"] == 1
+
+
+def test_unavailable_codec_falls_back_to_json():
+    serializer = CacheSerializer(preferred="protobuf")
+    assert serializer.codec.name == JsonCodec.name
+
+
+@needs_msgpack
+def test_header_records_the_writer_codec():
+    # Un worker JSON lit ce qu'un worker msgpack a écrit
+    written = CacheSerializer(preferred=MsgpackCodec.name).encode(VALUE)
+    assert CacheSerializer(preferred=JsonCodec.name).decode(written) == VALUE
+
+
+def test_legacy_json_entries_still_decode():
+    serializer = CacheSerializer()
+    legacy = json.dumps(VALUE, ensure_ascii=False)
+
+    assert serializer.decode(legacy.encode("utf-8")) == VALUE
+    assert serializer.decode(legacy) == VALUE
+    assert serializer.decode(b"plain text") == "plain text"
+    assert serializer.stats["legacy_decoded"] == 3
+
+
+def test_redis_cache_reads_legacy_entries():
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def scenario():
+        cache = RedisCache()
+        client = fakeredis.FakeAsyncRedis()
+        cache.redis_client = client
+        cache.redis_available = True
+
+        await client.set(cache._build_key("user_profile", "legacy"), json.dumps(VALUE))
+        assert await cache.get("user_profile", "legacy") == VALUE
+
+        await cache.set("user_profile", "fresh", VALUE, ttl=60)
+        assert await cache.get("user_profile", "fresh") == VALUE
+
+    asyncio.run(scenario())
@@ -0,0 +1,63 @@
+"""
+🎯 Redis cache - single-flight
+L'annulation du leader ne se propage pas aux appelants en attente
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.redis_cache import RedisCache  # noqa: E402
+
+
+def test_cancelled_leader_hands_the_compute_to_a_follower():
+    async def scenario():
+        cache = RedisCache()
+        started = asyncio.Event()
+
+        async def hanging():
+            started.set()
+            await asyncio.sleep(60)
+
+        async def fresh():
+            return {"value": 42}
+
+        leader = asyncio.ensure_future(cache.get_or_compute("user_profile", "u1", hanging))
+        await started.wait()
+        follower = asyncio.ensure_future(cache.get_or_compute("user_profile", "u1", fresh))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert await follower == {"value": 42}
+        assert cache.stats["abandoned_computes"] == 1
+        assert not cache._inflight
+
+    asyncio.run(scenario())
+
+
+def test_compute_error_reaches_followers():
+    async def scenario():
+        cache = RedisCache()
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise ValueError("boom")
+
+        leader = asyncio.ensure_future(cache.get_or_compute("user_profile", "u2", failing))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.get_or_compute("user_profile", "u2", failing))
+        await asyncio.sleep(0)
+        release.set()
+
+        for task in (leader, follower):
+            with pytest.raises(ValueError):
+                await task
+
+    asyncio.run(scenario())
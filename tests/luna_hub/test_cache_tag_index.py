@@ -0,0 +1,54 @@
+"""
+🏷️ Index d'invalidation par utilisateur / tag
+Les entrées évincées ou expirées ne laissent rien dans l'index
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.redis_cache import FallbackMemoryCache  # noqa: E402
+
+try:
+    from app.core.narrative_analyzer_optimized import ContextPacketCache
+except ImportError:  # client Supabase absent
+    ContextPacketCache = None
+
+
+@pytest.mark.skipif(ContextPacketCache is None, reason="supabase client not installed")
+def test_context_packet_index_follows_eviction_and_expiry():
+    cache = ContextPacketCache(ttl_minutes=15)
+    for index in range(101):
+        cache.set(f"key-{index}", object(), user_id=f"user-{index}")
+
+    # Entrée la plus ancienne évincée : son utilisateur disparaît de l'index
+    assert len(cache.cache) == 100
+    assert "user-0" not in cache.user_keys
+
+    packet, _ = cache.cache["key-1"]
+    cache.cache["key-1"] = (packet, datetime.now(timezone.utc) - timedelta(minutes=16))
+    assert cache.get("key-1") is None
+    assert "user-1" not in cache.user_keys
+
+    assert cache.invalidate_user("user-2") == 1
+    assert len(cache.user_keys) == len(cache.key_users) == 98
+
+
+def test_fallback_tag_index_follows_eviction_and_expiry():
+    async def scenario():
+        cache = FallbackMemoryCache(max_size=2)
+        await cache.set("a", 1, ttl=60, tags=["user:a"])
+        await cache.set("b", 2, ttl=120, tags=["user:b"])
+        await cache.set("c", 3, ttl=0, tags=["user:c"])  # "a" (échéance la plus proche) évincée
+
+        assert await cache.get("c") is None  # expirée
+        assert set(cache.tags) == {"user:b"}
+        assert await cache.invalidate_tags(["user:b"]) == 1
+        assert not cache.tags and not cache.key_tags
+
+    asyncio.run(scenario())
@@ -0,0 +1,121 @@
+"""
+⚡ Circuit breaker - sonde HALF_OPEN
+Une sonde annulée ne doit jamais bloquer le circuit
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.connection_manager import (  # noqa: E402
+    CircuitBreaker, CircuitBreakerState, CircuitOpenError, ConnectionPoolConfig, ConnectionPoolManager
+)
+from app.core.adaptive_limiter import AdaptiveConcurrencyLimiter  # noqa: E402
+from app.core.dependency_guard import DependencyGuard  # noqa: E402
+from app.core.llm_gateway import GeminiProvider, gemini_guard  # noqa: E402
+from app.core.llm_http_client import llm_http_client  # noqa: E402
+
+
+def _half_open_pool(name: str) -> ConnectionPoolManager:
+    pool = ConnectionPoolManager(ConnectionPoolConfig(), name=name)
+    pool.breaker.state = CircuitBreakerState.OPEN
+    pool.breaker.next_attempt = time.time() - 1  # délai écoulé : le prochain appel est la sonde
+    return pool
+
+
+def test_cancelled_probe_releases_half_open_circuit():
+    async def scenario():
+        pool = _half_open_pool("test-cancelled-probe")
+        started = asyncio.Event()
+
+        async def hanging():
+            started.set()
+            await asyncio.sleep(60)
+
+        probe = asyncio.ensure_future(pool.execute_with_retry(hanging, operation_name="probe"))
+        await started.wait()
+        assert pool.breaker.state == CircuitBreakerState.HALF_OPEN
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        async def ok():
+            return "ok"
+
+        # La sonde annulée est rendue : l'appel suivant est admis et referme le circuit
+        assert await pool.execute_with_retry(ok, operation_name="next") == "ok"
+        assert pool.breaker.state == CircuitBreakerState.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_lost_probe_expires_after_probe_timeout():
+    breaker = CircuitBreaker("test-lost-probe", threshold=1, timeout=60.0, probe_timeout=0.05)
+    breaker.record_failure()
+    breaker.next_attempt = time.time() - 1
+
+    assert breaker.check() is not None  # sonde partie, jamais conclue
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    time.sleep(0.06)
+    assert breaker.check() is not None
+    assert breaker.lost_probes == 1
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_cancelled_gemini_probe_does_not_close_the_circuit(streamed):
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hanging(request: httpx.Request) -> httpx.Response:
+            started.set()
+            await asyncio.sleep(60)
+
+        provider = GeminiProvider()
+        provider.api_key = "test-key"
+        llm_http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(hanging))
+        breaker = gemini_guard.breaker
+        breaker.state = CircuitBreakerState.OPEN
+        breaker.next_attempt = time.time() - 1
+        try:
+            if streamed:
+                async def consume():
+                    async for _ in provider.generate_stream(system="s", user="u", context={}):
+                        pass
+                call = asyncio.ensure_future(consume())
+            else:
+                call = asyncio.ensure_future(provider.complete(system="s", user="u", context={}))
+            await started.wait()
+            assert breaker.current_probe() is not None
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+
+            # Sonde rendue sans verdict : le circuit reste HALF_OPEN, la suivante peut partir
+            assert breaker.state == CircuitBreakerState.HALF_OPEN
+            assert breaker.current_probe() is None
+            assert breaker.allow_request()
+        finally:
+            breaker.state = CircuitBreakerState.CLOSED
+            breaker.record_success()
+
+    asyncio.run(scenario())
+
+
+def test_guard_counts_an_open_circuit_rejection_once():
+    breaker = CircuitBreaker("test-guard-rejection", threshold=1, timeout=60.0)
+    breaker.record_failure()
+    guard = DependencyGuard("test-guard-rejection", AdaptiveConcurrencyLimiter("test-guard-rejection"), breaker)
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        with guard.guard():
+            pass
+    assert breaker.rejected == 1
+    assert excinfo.value.retry_after > 1.0
+    assert guard.limiter.in_flight == 0
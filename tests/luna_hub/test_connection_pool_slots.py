@@ -0,0 +1,41 @@
+"""
+🔄 Connection pool - slots et threads bloquants
+Un appel expiré garde son slot tant que son thread tourne
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.connection_manager import ConnectionPoolConfig, ConnectionPoolManager  # noqa: E402
+
+
+def test_timed_out_call_keeps_its_slot_until_the_thread_ends():
+    async def scenario():
+        pool = ConnectionPoolManager(
+            ConnectionPoolConfig(connection_timeout=0.05, retry_attempts=1),
+            name="test-abandoned-call"
+        )
+        finish = threading.Event()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run_query(lambda: finish.wait(5), operation_name="slow")
+
+        # Le thread occupe toujours sa connexion
+        assert pool.active_connections == 1
+        assert pool.stats.abandoned_calls == 1
+
+        finish.set()
+        for _ in range(100):
+            if pool.active_connections == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.active_connections == 0
+        assert pool.limiter.in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+"""
+📐 Context Budget - empaquetage du contexte sous budget de tokens
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.context_budget import (  # noqa: E402
+    MIN_TRUNCATED_TOKENS, PRIORITY_NARRATIVE, PRIORITY_PERSONA, PRIORITY_PRIMARY, TRUNCATION_MARKER,
+    ContextBudget, budget_for, count_tokens, get_context_budget_stats
+)
+
+
+def _text(tokens: int, char: str = "x") -> str:
+    return char * (tokens * 4)
+
+
+def test_everything_fits_in_insertion_order():
+    budget = ContextBudget("test_fits", max_tokens=100)
+    budget.add("system", _text(10), required=True)
+    budget.add_items("history", ["t1", "t2", "t3"], separator=" | ")
+    budget.add("persona", _text(5), PRIORITY_PERSONA)
+    packed = budget.pack()
+
+    assert not packed.dropped and not packed.truncated
+    assert packed.text("history") == "t1 | t2 | t3"
+    assert [segment.group for segment in packed.kept] == ["system", "history", "history", "history", "persona"]
+
+
+def test_oldest_turns_are_dropped_first_without_holes():
+    budget = ContextBudget("test_turns", max_tokens=30)
+    # Le tour -2 ne tient pas : le tour -3, pourtant petit, est écarté aussi
+    budget.add_items("history", [_text(1, "a"), _text(25, "b"), _text(10, "c")], fallback="(aucun)")
+    packed = budget.pack()
+
+    assert packed.text("history") == _text(10, "c")
+    assert [segment.name for segment in packed.dropped] == ["history[-2]", "history[-3]"]
+
+    empty = ContextBudget("test_turns", max_tokens=5).add_items("history", [_text(10)], fallback="(aucun)").pack()
+    assert empty.text("history") == "(aucun)"
+
+
+def test_lower_priority_segments_go_first():
+    budget = ContextBudget("test_priority", max_tokens=50)
+    budget.add("message", _text(20), required=True)
+    budget.add("persona", _text(20), PRIORITY_PERSONA)
+    budget.add("narrative", _text(20), PRIORITY_NARRATIVE)
+    packed = budget.pack()
+
+    assert packed.text("narrative") and not packed.text("persona")
+    assert packed.tokens == 40
+
+
+def test_truncatable_segment_fills_the_remaining_budget():
+    budget = ContextBudget("test_truncate", max_tokens=100)
+    budget.add("system", _text(40), required=True)
+    budget.add("job_offer", _text(200, "o"), PRIORITY_PRIMARY, truncatable=True)
+    packed = budget.pack()
+
+    offer = packed.text("job_offer")
+    assert offer.endswith(TRUNCATION_MARKER)
+    assert count_tokens(offer) == 60
+    assert packed.tokens == 100
+    assert packed.truncated == ["job_offer"]
+
+    tight = ContextBudget("test_truncate", max_tokens=40 + MIN_TRUNCATED_TOKENS - 1)
+    tight.add("system", _text(40), required=True)
+    tight.add("job_offer", _text(200), PRIORITY_PRIMARY, truncatable=True)
+    assert not tight.pack().text("job_offer")
+
+
+def test_required_segments_are_kept_over_budget():
+    budget = ContextBudget("test_required", max_tokens=10)
+    budget.add("system", _text(20), required=True)
+    budget.add("extra", _text(1))
+    packed = budget.pack()
+
+    assert packed.text("system") and not packed.text("extra")
+    assert packed.tokens == 20
+
+
+def test_budget_per_feature_and_stats(monkeypatch):
+    monkeypatch.setenv("LLM_CONTEXT_BUDGET_TEST_STATS", "12")
+    assert budget_for("test_stats") == 12
+    assert budget_for("aube_chat") == 2500
+
+    budget = ContextBudget("test_stats")
+    budget.add_items("history", [_text(10), _text(10)])
+    budget.pack()
+    stats = get_context_budget_stats()["test_stats"]
+    assert (stats["packs"], stats["dropped_segments"], stats["trimmed_packs"], stats["budget"]) == (1, 1, 1, 12)
@@ -0,0 +1,58 @@
+"""
+⏱️ Gemini - échéance de la requête
+Un appel coupé par l'échéance du client n'est pas un échec de Gemini
+"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.llm_gateway import GeminiProvider, gemini_guard  # noqa: E402
+from app.core.llm_http_client import llm_http_client  # noqa: E402
+from app.core.request_deadline import DeadlineExceededError, deadline_scope  # noqa: E402
+
+
+def _timing_out(request: httpx.Request) -> httpx.Response:
+    raise httpx.ReadTimeout("timed out", request=request)
+
+
+def _provider() -> GeminiProvider:
+    provider = GeminiProvider()
+    provider.api_key = "test-key"
+    llm_http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(_timing_out))
+    return provider
+
+
+def test_deadline_cut_call_is_not_a_gemini_failure():
+    async def scenario():
+        provider = _provider()
+        failures = gemini_guard.breaker.failure_count
+        in_flight = gemini_guard.limiter.in_flight
+        for _ in range(5):
+            with deadline_scope(0.3):
+                with pytest.raises(DeadlineExceededError):
+                    await provider.complete(system="s", user="u", context={})
+
+        assert gemini_guard.breaker.failure_count == failures
+        assert gemini_guard.limiter.in_flight == in_flight
+
+    asyncio.run(scenario())
+
+
+def test_deadline_cut_stream_is_not_a_gemini_failure():
+    async def scenario():
+        provider = _provider()
+        failures = gemini_guard.breaker.failure_count
+        with deadline_scope(0.3):
+            with pytest.raises(DeadlineExceededError):
+                async for _ in provider.generate_stream(system="s", user="u", context={}):
+                    pass
+
+        assert gemini_guard.breaker.failure_count == failures
+
+    asyncio.run(scenario())
@@ -0,0 +1,97 @@
+"""
+📐 Latency sketch - quantiles à ±1% et fusion entre minutes / workers
+"""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core import latency_sketch  # noqa: E402
+from app.core.latency_sketch import QuantileSketch, RollingLatencySketch, merge_window  # noqa: E402
+
+
+def _samples(seed: int, count: int = 5000):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(3.0, 1.0) for _ in range(count)]
+
+
+def _exact(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def _sketch(values) -> QuantileSketch:
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+def test_quantiles_within_relative_accuracy(q):
+    values = _samples(1)
+    estimate = _sketch(values).quantile(q)
+    assert estimate == pytest.approx(_exact(values, q), rel=0.011)
+
+
+def test_merge_equals_sketch_of_the_union():
+    first, second = _samples(2), _samples(3)
+    merged = _sketch(first).merge(_sketch(second))
+    union = _sketch(first + second)
+
+    assert merged.bins == union.bins
+    assert merged.count == union.count
+    assert (merged.min, merged.max) == (union.min, union.max)
+    for q in (0.5, 0.9, 0.99):
+        assert merged.quantile(q) == union.quantile(q)
+        assert merged.quantile(q) == pytest.approx(_exact(first + second, q), rel=0.011)
+
+
+def test_serialized_sketch_merges_like_the_original():
+    # Échange entre workers : JSON via Redis, puis fusion
+    remote = QuantileSketch.from_dict(json.loads(json.dumps(_sketch(_samples(4)).to_dict())))
+    local = _sketch(_samples(5))
+
+    assert _sketch(_samples(5)).merge(_sketch(_samples(4))).summary() == local.merge(remote).summary()
+
+
+def test_merge_rejects_a_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+def test_empty_and_zero_values():
+    assert QuantileSketch().summary()["p99_ms"] is None
+    sketch = _sketch([0.0, 0.0, 10.0])
+    assert sketch.quantile(0.0) == 0.0
+    assert sketch.quantile(1.0) == 10.0
+
+
+def test_window_merges_only_recent_minutes(monkeypatch):
+    now = 1_000_000
+    monkeypatch.setattr(latency_sketch, "current_minute", lambda: now)
+    slots = [(now - age, _sketch([float(age + 1)] * 10)) for age in range(15)]
+
+    assert merge_window(slots, 1).count == 10
+    assert merge_window(slots, 5).count == 50
+    assert merge_window(slots, 5).max == 5.0
+
+
+def test_rolling_sketch_prunes_expired_minutes(monkeypatch):
+    clock = {"minute": 1_000_000}
+    monkeypatch.setattr(latency_sketch, "current_minute", lambda: clock["minute"])
+    rolling = RollingLatencySketch(retention_minutes=3)
+
+    for _ in range(5):
+        rolling.record(10.0)
+        clock["minute"] += 1
+    rolling.record(20.0)
+
+    assert sorted(rolling.slots) == [clock["minute"] - 2, clock["minute"] - 1, clock["minute"]]
+    assert rolling.window(1).count == 1
+    assert rolling.summary((1, 15))["15m"]["count"] == 3
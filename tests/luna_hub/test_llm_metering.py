@@ -0,0 +1,91 @@
+"""
+🧮 LLM Metering - cumuls par utilisateur, fonctionnalité, persona
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.llm_metering import LLMMeter, usage_from_metadata  # noqa: E402
+from app.core.llm_scheduler import LLMCaller  # noqa: E402
+from app.core.redis_cache import redis_cache  # noqa: E402
+
+AUBE = LLMCaller(user_id="u1", feature="aube_chat", persona="aube")
+
+
+def _metadata(prompt: int, output: int, cached: int = 0):
+    return usage_from_metadata({
+        "promptTokenCount": prompt, "candidatesTokenCount": output, "cachedContentTokenCount": cached
+    })
+
+
+def test_rollups_by_user_feature_persona_and_provider():
+    meter = LLMMeter()
+    meter.record_call(AUBE, "gemini", _metadata(100, 50, cached=40), prompt_estimate=0, latency_ms=200)
+    meter.record_call(AUBE, "gemini", _metadata(200, 50), prompt_estimate=0, latency_ms=400, streamed=True)
+    meter.record_call(LLMCaller(user_id="u1", feature="cv_analysis"), "stub", _metadata(300, 100),
+                      prompt_estimate=0, latency_ms=100)
+    meter.record_energy("u1", "aube_chat", 5, persona="aube")
+    meter.record_energy("u1", "aube_chat", 5, persona="aube")
+
+    aube = meter.get_user_usage("u1")["features"]["aube_chat"]
+    assert (aube["calls"], aube["streamed"], aube["total_tokens"], aube["cached_tokens"]) == (2, 1, 400, 40)
+    assert aube["cache_hit_rate"] == 0.5
+    assert (aube["energy"], aube["energy_actions"], aube["tokens_per_energy"]) == (10, 2, 40.0)
+    assert aube["latency"]["count"] == 2
+
+    stats = meter.get_stats()
+    assert meter.get_user_usage("u1")["total"]["total_tokens"] == 800
+    assert stats["personas"]["aube"]["total_tokens"] == 400
+    assert stats["providers"]["stub"]["calls"] == 1
+    assert stats["features"]["cv_analysis"]["tokens_per_energy"] is None
+
+
+def test_failed_and_unreported_calls_use_the_prompt_estimate():
+    meter = LLMMeter()
+    meter.record_call(AUBE, "gemini", None, prompt_estimate=120, output_text="x" * 40,
+                      latency_ms=50, success=False)
+
+    total = meter.get_user_usage("u1")["total"]
+    assert (total["errors"], total["estimated"]) == (1, 1)
+    assert (total["prompt_tokens"], total["output_tokens"]) == (120, 10)
+
+
+def test_energy_without_actions_is_ignored():
+    meter = LLMMeter()
+    meter.record_energy("u1", "aube_chat", 0)
+    meter.record_energy("", "aube_chat", 5)
+    assert meter.get_user_usage("u1") is None
+
+
+def test_least_recent_users_are_evicted():
+    meter = LLMMeter(max_users=2)
+    for user_id in ("u1", "u2", "u1", "u3"):
+        meter.record_energy(user_id, "aube_chat", 1)
+
+    assert set(meter.users) == {"u1", "u3"}
+    assert meter.stats["evicted_users"] == 1
+    assert [user["user_id"] for user in meter.top_users()] == ["u1", "u3"]
+
+
+def test_daily_counters_are_published_to_redis(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    monkeypatch.setattr(redis_cache, "redis_client", fakeredis.FakeAsyncRedis())
+    monkeypatch.setattr(redis_cache, "redis_available", True)
+    monkeypatch.setattr(redis_cache, "pools", {})
+
+    async def scenario():
+        meter = LLMMeter()
+        meter.record_call(AUBE, "gemini", _metadata(100, 50), prompt_estimate=0, latency_ms=200)
+        meter.record_energy("u1", "aube_chat", 5)
+        await asyncio.gather(*meter._pending)
+
+        usage = await meter.get_daily_usage("u1", days=1)
+        [day] = usage["days"].values()
+        assert day["aube_chat"] == {"calls": 1, "prompt_tokens": 100, "output_tokens": 50, "latency_ms": 200, "energy": 5}
+
+    asyncio.run(scenario())
@@ -0,0 +1,60 @@
+"""
+🧭 LLM Router - imputation des échecs
+Un refus local du hub ne dégrade pas la santé du fournisseur
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.llm_gateway import LLMProviderError, StubProvider  # noqa: E402
+from app.core.llm_router import LLMRouter  # noqa: E402
+
+
+class FailingProvider(StubProvider):
+    def __init__(self, name: str, error: LLMProviderError):
+        super().__init__(name)
+        self.error = error
+        self.calls = 0
+
+    async def complete(self, *, system, user, context):
+        self.calls += 1
+        raise self.error
+
+
+def _complete(router: LLMRouter) -> str:
+    return asyncio.run(router.complete(system="s", user="u", context={}))
+
+
+def test_local_refusal_does_not_rest_the_provider():
+    refused = FailingProvider("refused", LLMProviderError("busy", retry_after=30.0, local=True))
+    router = LLMRouter([refused, StubProvider()])
+
+    assert _complete(router)
+    health = router.health["refused"]
+    assert health.errors == 0
+    assert health.is_healthy(router.max_error_rate, router.min_samples)
+    assert router.stats["local_refusals"] == 1
+
+
+def test_provider_failure_rests_the_provider():
+    failing = FailingProvider("failing", LLMProviderError("down", retry_after=30.0))
+    router = LLMRouter([failing, StubProvider()])
+
+    assert _complete(router)
+    assert router.health["failing"].errors == 1
+    assert not router.health["failing"].is_healthy(router.max_error_rate, router.min_samples)
+
+
+def test_non_retryable_error_stops_failover():
+    broken = FailingProvider("broken", LLMProviderError("no key", retryable=False))
+    backup = FailingProvider("backup", LLMProviderError("down"))
+    router = LLMRouter([broken, backup])
+
+    with pytest.raises(LLMProviderError, match="no key"):
+        _complete(router)
+    assert backup.calls == 0
@@ -0,0 +1,40 @@
+"""
+🗓️ LLM Scheduler - budget tokens
+Le remboursement ne dépasse jamais le débit réel du seau
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.llm_scheduler import LLMCaller, LLMScheduler, TokenPool  # noqa: E402
+
+
+def _small_pool(capacity: float) -> TokenPool:
+    pool = TokenPool()
+    pool.rate = 0.001  # pas de remplissage pendant le test
+    pool.capacity = capacity
+    pool._local_tokens = capacity
+    return pool
+
+
+def test_release_refunds_at_most_the_debited_tokens():
+    async def scenario():
+        pool = _small_pool(100)
+        scheduler = LLMScheduler(pool)
+        try:
+            # Estimation supérieure à la capacité : débit plafonné à 100
+            ticket = await scheduler.acquire(1000, LLMCaller(user_id="u1"))
+            assert ticket.debited_tokens == 100
+            assert pool._local_tokens < 1
+
+            ticket.actual_tokens = 40
+            await scheduler.release(ticket)
+            assert pool.stats["refunded_tokens"] == 60
+            assert round(pool._local_tokens) == 60
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,81 @@
+"""
+📚 Prompt Registry - chargement, rendu précompilé, hot reload
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.prompt_registry import PromptRegistry, PromptRegistryError, PromptTemplate  # noqa: E402
+
+
+def _registry(tmp_path, **files) -> PromptRegistry:
+    for name, source in files.items():
+        path = tmp_path / f"{name}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding="utf-8")
+    return PromptRegistry(tmp_path)
+
+
+def test_shipped_prompts_load():
+    registry = PromptRegistry()
+    assert registry.load()
+    assert registry.get("luna_core_system").source
+
+
+def test_render_fills_variables_and_keeps_escaped_braces():
+    template = PromptTemplate("cv", "Tu es Luna.\nCV : {cv}\nOffre : {job} / {cv}\nJSON : {{\"score\": 0}}")
+
+    assert template.static_prefix == "Tu es Luna.\nCV : "
+    assert template.variables == ("cv", "job")
+    assert template.render(cv="A", job="B") == "Tu es Luna.\nCV : A\nOffre : B / A\nJSON : {\"score\": 0}"
+    with pytest.raises(PromptRegistryError, match="missing variables"):
+        template.render(cv="A")
+
+
+@pytest.mark.parametrize("source", ["{0}", "{user.name}", "{score:.2f}", "{name!r}"])
+def test_invalid_placeholders_are_rejected(source):
+    with pytest.raises(PromptRegistryError, match="invalid placeholder"):
+        PromptTemplate("bad", source)
+
+
+def test_load_names_nested_prompts_and_versions_content(tmp_path):
+    registry = _registry(tmp_path, system="Luna", **{"cv/analysis": "Analyse {cv}"})
+    version = registry.load()
+
+    assert registry.render("cv/analysis", cv="x") == "Analyse x"
+    assert _registry(tmp_path).load() == version
+    (tmp_path / "system.txt").write_text("Luna v2", encoding="utf-8")
+    assert PromptRegistry(tmp_path).load() != version
+
+
+def test_invalid_files_fail_the_load(tmp_path):
+    with pytest.raises(PromptRegistryError, match="empty"):
+        _registry(tmp_path, empty="  \n").load()
+    with pytest.raises(PromptRegistryError, match="not found"):
+        PromptRegistry(tmp_path / "missing").load()
+    with pytest.raises(PromptRegistryError, match="Unknown prompt"):
+        _registry(tmp_path / "ok", system="Luna").get("nope")
+
+
+def test_hot_reload_keeps_the_last_valid_version(tmp_path):
+    registry = _registry(tmp_path, system="Luna {mode}")
+    registry.load()
+    version = registry.version
+    path = tmp_path / "system.txt"
+
+    path.write_text("Luna {mode!r}", encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert not registry.reload_if_changed()
+    assert registry.version == version
+    assert registry.render("system", mode="coach") == "Luna coach"
+    assert registry.stats["reload_errors"] == 1
+
+    path.write_text("Luna, mode {mode}", encoding="utf-8")
+    os.utime(path, ns=(2, 2))
+    assert registry.reload_if_changed()
+    assert registry.version != version
+    assert registry.render("system", mode="coach") == "Luna, mode coach"
@@ -0,0 +1,66 @@
+"""
+🧭 Redis - pools logiques et réintégration de nœud
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "luna-hub"))
+
+from app.core.redis_cache import RedisCache  # noqa: E402
+from app.core.redis_sharding import POOL_BROKER, POOL_CACHE, ShardedRedisPool  # noqa: E402
+
+
+def _cache_with_pools():
+    cache = RedisCache()
+    cache_node = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+    broker_node = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+    cache.pools = {}
+    for name, url, client in ((POOL_CACHE, "redis://cache", cache_node), (POOL_BROKER, "redis://broker", broker_node)):
+        pool = ShardedRedisPool(name, [url])
+        pool.attach(url, client)
+        cache.pools[name] = pool
+    cache.redis_client = cache_node
+    cache.redis_available = True
+    cache.route_key_type("luna_message", POOL_BROKER)
+    return cache, cache_node, broker_node
+
+
+def test_routed_key_types_use_their_pool():
+    async def scenario():
+        cache, cache_node, broker_node = _cache_with_pools()
+        await cache.set("luna_message", "m1", {"body": 1}, ttl=60)
+        await cache.set("user_profile", "u1", {"name": "a"}, ttl=60)
+
+        assert await broker_node.exists(cache._build_key("luna_message", "m1"))
+        assert not await cache_node.exists(cache._build_key("luna_message", "m1"))
+        assert await cache_node.exists(cache._build_key("user_profile", "u1"))
+        assert await cache.get_many("luna_message", ["m1"]) == {"m1": {"body": 1}}
+
+    asyncio.run(scenario())
+
+
+def test_rejoining_cache_node_is_purged_before_serving_reads():
+    async def scenario():
+        cache, cache_node, _ = _cache_with_pools()
+        stale_key = cache._build_key("user_profile", "u1")
+        message_key = cache._build_key("luna_message", "m1")
+        await cache_node.set(stale_key, b"stale")
+        await cache_node.set(message_key, b"body")
+        await cache_node.set("ratelimit:fixed:user:abc", 3)
+
+        cache.pools[POOL_CACHE].mark_down("redis://cache", "test")
+        assert await cache.recover_nodes() == ["redis://cache"]
+
+        assert not await cache_node.exists(stale_key)
+        assert await cache_node.exists(message_key)
+        assert await cache_node.exists("ratelimit:fixed:user:abc")
+        assert cache.stats["rejoin_purged_keys"] == 1
+        assert "redis://cache" in cache.pools[POOL_CACHE].ring.nodes
+
+    asyncio.run(scenario())